@@ -0,0 +1,119 @@
+"""
+This script compares benchmark results against a stored baseline and flags regressions.
+
+Usage:
+    python -m benchmarks.compare baseline.json results.json [--threshold 0.1]
+
+A benchmark regresses when its mean time exceeds the baseline mean by more than the threshold
+and the difference is larger than the combined standard deviations of the two runs.
+Exits with status 1 if any benchmark regressed so the script can gate performance work in CI.
+"""
+
+from __future__ import annotations
+import argparse
+from dataclasses import dataclass
+import sys
+import pyperf
+
+DEFAULT_THRESHOLD = 0.1
+
+
+@dataclass(frozen=True)
+class Comparison:
+    name: str
+    baseline_mean: float
+    mean: float
+    noise: float
+    """Combined standard deviation of baseline and result."""
+
+    @property
+    def ratio(self) -> float:
+        return self.mean / self.baseline_mean
+
+    def is_regression(self, threshold: float) -> bool:
+        return self.ratio > 1.0 + threshold and self.mean - self.baseline_mean > self.noise
+
+    def is_improvement(self, threshold: float) -> bool:
+        return self.ratio < 1.0 - threshold and self.baseline_mean - self.mean > self.noise
+
+
+def _stdev(benchmark: pyperf.Benchmark) -> float:
+    return benchmark.stdev() if benchmark.get_nvalue() > 1 else 0.0
+
+
+def compare(
+    baseline: pyperf.BenchmarkSuite, results: pyperf.BenchmarkSuite
+) -> tuple[list[Comparison], list[str], list[str]]:
+    """Compares benchmark results to baseline.
+
+    Args:
+        baseline: baseline benchmarks
+        results: new benchmarks
+
+    Returns:
+        comparisons of common benchmarks, names of new benchmarks and names of benchmarks missing from results
+    """
+    baseline_benchmarks = {benchmark.get_name(): benchmark for benchmark in baseline.get_benchmarks()}
+    comparisons = []
+    new_names = []
+    for benchmark in results.get_benchmarks():
+        name = benchmark.get_name()
+        baseline_benchmark = baseline_benchmarks.pop(name, None)
+        if baseline_benchmark is None:
+            new_names.append(name)
+            continue
+        comparisons.append(
+            Comparison(
+                name, baseline_benchmark.mean(), benchmark.mean(), _stdev(baseline_benchmark) + _stdev(benchmark)
+            )
+        )
+    return comparisons, new_names, list(baseline_benchmarks)
+
+
+def _format_time(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} us"
+    if seconds < 1.0:
+        return f"{seconds * 1e3:.1f} ms"
+    return f"{seconds:.2f} s"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare benchmark results against a baseline.")
+    parser.add_argument("baseline", help="baseline pyperf JSON file")
+    parser.add_argument("results", help="pyperf JSON file to compare")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"relative slowdown that counts as a regression, default {DEFAULT_THRESHOLD}",
+    )
+    args = parser.parse_args(argv)
+    comparisons, new_names, missing_names = compare(
+        pyperf.BenchmarkSuite.load(args.baseline), pyperf.BenchmarkSuite.load(args.results)
+    )
+    regressions = []
+    for comparison in comparisons:
+        if comparison.is_regression(args.threshold):
+            verdict = "REGRESSION"
+            regressions.append(comparison)
+        elif comparison.is_improvement(args.threshold):
+            verdict = "faster"
+        else:
+            verdict = "same"
+        print(
+            f"{comparison.name}: {_format_time(comparison.baseline_mean)} -> {_format_time(comparison.mean)}"
+            f" ({comparison.ratio:.2f}x) {verdict}"
+        )
+    for name in new_names:
+        print(f"{name}: not in baseline")
+    for name in missing_names:
+        print(f"{name}: missing from results")
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+This script benchmarks auto filtering a populated CompoundParameterValueModel and listing auto filter menu values.
+"""
+
+import os
+import sys
+
+if sys.platform == "win32" and "HOMEPATH" not in os.environ:
+    import pathlib
+
+    os.environ["HOMEPATH"] = str(pathlib.Path(sys.executable).parent)
+
+import time
+from typing import Optional
+import pyperf
+from PySide6.QtCore import QModelIndex, QSettings
+from PySide6.QtWidgets import QApplication
+from benchmarks.data_generator import ensure_database
+from benchmarks.utils import StdOutLogger, make_runner
+from spinetoolbox.spine_db_editor.mvcmodels.compound_models import CompoundParameterValueModel
+from spinetoolbox.spine_db_manager import SpineDBManager
+
+
+def filter_model(loops: int, model: CompoundParameterValueModel) -> float:
+    entity_byname_column = model.header.index("entity byname")
+    duration = 0.0
+    for _ in range(loops):
+        start = time.perf_counter()
+        model.set_auto_filter("alternative_name", {"Base"})
+        model.set_auto_filter("parameter_definition_name", {"demand", "unit_capacity", "connection_capacity"})
+        model.refresh()
+        model.auto_filter_data_list(entity_byname_column)
+        model.set_auto_filter("alternative_name", None)
+        model.set_auto_filter("parameter_definition_name", None)
+        model.refresh()
+        duration += time.perf_counter() - start
+    return duration
+
+
+def run_benchmark(output_file: Optional[str]):
+    if not QApplication.instance():
+        QApplication()
+    runner = make_runner()
+    args = runner.parse_args()
+    url = ensure_database(args.value_count)
+    db_mngr = SpineDBManager(QSettings(), parent=None)
+    logger = StdOutLogger()
+    db_map = db_mngr.get_db_map(url, logger)
+    model = CompoundParameterValueModel(None, db_mngr, db_map)
+    model.init_model()
+    model.reset_db_maps([db_map])
+    while model.canFetchMore(QModelIndex()):
+        model.fetchMore(QModelIndex())
+        QApplication.processEvents()
+    QApplication.processEvents()
+    benchmark = runner.bench_time_func(
+        f"CompoundParameterValueModel.set_auto_filter[{args.value_count} values]",
+        filter_model,
+        model,
+    )
+    if output_file:
+        pyperf.add_runs(output_file, benchmark)
+    model.tear_down()
+    db_mngr.close_all_sessions()
+    db_mngr.deleteLater()
+
+
+if __name__ == "__main__":
+    run_benchmark(output_file="")
@@ -0,0 +1,66 @@
+"""
+This script benchmarks populating CompoundParameterValueModel from a generated database.
+"""
+
+import os
+import sys
+
+if sys.platform == "win32" and "HOMEPATH" not in os.environ:
+    import pathlib
+
+    os.environ["HOMEPATH"] = str(pathlib.Path(sys.executable).parent)
+
+import time
+from typing import Optional
+import pyperf
+from PySide6.QtCore import QModelIndex, QSettings
+from PySide6.QtWidgets import QApplication
+from benchmarks.data_generator import ensure_database
+from benchmarks.utils import StdOutLogger, make_runner
+from spinetoolbox.spine_db_editor.mvcmodels.compound_models import CompoundParameterValueModel
+from spinetoolbox.spine_db_manager import SpineDBManager
+
+
+def populate_model(loops: int, db_mngr: SpineDBManager, url: str, logger: StdOutLogger) -> float:
+    duration = 0.0
+    for _ in range(loops):
+        start = time.perf_counter()
+        db_map = db_mngr.get_db_map(url, logger)
+        model = CompoundParameterValueModel(None, db_mngr, db_map)
+        model.init_model()
+        model.reset_db_maps([db_map])
+        while model.canFetchMore(QModelIndex()):
+            model.fetchMore(QModelIndex())
+            QApplication.processEvents()
+        QApplication.processEvents()
+        model.rowCount()
+        duration += time.perf_counter() - start
+        model.tear_down()
+        model.deleteLater()
+        db_mngr.close_session(url)
+    return duration
+
+
+def run_benchmark(output_file: Optional[str]):
+    if not QApplication.instance():
+        QApplication()
+    runner = make_runner()
+    args = runner.parse_args()
+    url = ensure_database(args.value_count)
+    db_mngr = SpineDBManager(QSettings(), parent=None)
+    logger = StdOutLogger()
+    benchmark = runner.bench_time_func(
+        f"CompoundParameterValueModel population[{args.value_count} values]",
+        populate_model,
+        db_mngr,
+        url,
+        logger,
+    )
+    if output_file:
+        pyperf.add_runs(output_file, benchmark)
+    db_mngr.close_all_sessions()
+    db_mngr.deleteLater()
+
+
+if __name__ == "__main__":
+    run_benchmark(output_file="")
@@ -0,0 +1,353 @@
+"""
+This script generates deterministic SpineOpt-like databases for benchmarks.
+
+The generated database has a handful of commodities and a network of nodes, units and connections
+tied together by multi-dimensional classes. Every entity gets a value for each of its class' parameters
+in the Base alternative; a fixed share of the values is overridden in the other alternatives.
+Values are a mix of floats, strings, booleans, time series and maps like in real models.
+
+Databases are cached by value count, seed and generator version so expensive sizes are generated only once.
+"""
+
+from __future__ import annotations
+import argparse
+from collections.abc import Iterator
+import datetime
+import os
+import random
+import tempfile
+from sqlalchemy import MetaData
+from spinedb_api import DatabaseMapping, Map, TimeSeriesFixedResolution, to_database
+
+GENERATOR_VERSION = 1
+"""Bump when generated data changes so that cached databases get regenerated."""
+DEFAULT_SEED = 0
+VALUE_COUNTS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+"""Database sizes the benchmark suite is designed for."""
+CACHE_DIR_ENV_VAR = "SPINETOOLBOX_BENCHMARK_DATA"
+
+ALTERNATIVES = ("Base", "high_demand", "low_cost", "no_wind")
+SCENARIOS = {
+    "base": ("Base",),
+    "high_demand": ("high_demand", "Base"),
+    "low_cost": ("low_cost", "Base"),
+    "stress": ("no_wind", "high_demand", "Base"),
+}
+"""Maps scenario names to alternatives in rank order."""
+COMMODITIES = ("electricity", "gas", "heat")
+_OVERRIDE_PROBABILITY = 0.2
+_INACTIVE_PROBABILITY = 0.05
+_TIME_SERIES_LENGTH = 24
+_VALUE_BATCH_SIZE = 100_000
+_ENTITY_CLASSES = (
+    ("commodity", ()),
+    ("node", ()),
+    ("unit", ()),
+    ("connection", ()),
+    ("node__commodity", ("node", "commodity")),
+    ("unit__from_node", ("unit", "node")),
+    ("unit__to_node", ("unit", "node")),
+    ("connection__from_node", ("connection", "node")),
+    ("connection__to_node", ("connection", "node")),
+)
+_PARAMETERS = {
+    "commodity": (("commodity_physics", "str"),),
+    "node": (("demand", "time_series"), ("node_state_cap", "float"), ("has_state", "bool")),
+    "unit": (
+        ("number_of_units", "float"),
+        ("unit_availability_factor", "time_series"),
+        ("online_variable_type", "str"),
+        ("start_up_cost", "float"),
+    ),
+    "connection": (("connection_availability_factor", "float"), ("connection_type", "str")),
+    "node__commodity": (),
+    "unit__from_node": (("unit_capacity", "float"), ("fuel_cost", "time_series")),
+    "unit__to_node": (("unit_capacity", "float"), ("vom_cost", "float")),
+    "connection__from_node": (("connection_capacity", "float"), ("connection_flow_cost", "map")),
+    "connection__to_node": (("connection_capacity", "float"),),
+}
+_STRING_CHOICES = {
+    "commodity_physics": ("commodity_physics_none", "commodity_physics_lodf", "commodity_physics_ptdf"),
+    "online_variable_type": ("unit_online_variable_type_binary", "unit_online_variable_type_integer"),
+    "connection_type": ("connection_type_normal", "connection_type_lossless_bidirectional"),
+}
+_VALUES_PER_BLOCK_ESTIMATE = 30
+"""Conservative number of values per node block; Base alone yields 22 values and overrides add about 13 more."""
+
+
+def cache_dir() -> str:
+    """Returns the directory where generated databases are cached."""
+    return os.environ.get(CACHE_DIR_ENV_VAR, os.path.join(tempfile.gettempdir(), "spinetoolbox_benchmark_dbs"))
+
+
+def database_path(value_count: int, seed: int = DEFAULT_SEED) -> str:
+    """Returns path to cached database.
+
+    Args:
+        value_count: number of parameter values
+        seed: random seed
+
+    Returns:
+        path to SQLite file
+    """
+    return os.path.join(cache_dir(), f"spineopt_like_v{GENERATOR_VERSION}_{value_count}_{seed}.sqlite")
+
+
+def ensure_database(value_count: int, seed: int = DEFAULT_SEED) -> str:
+    """Generates a database unless it exists in cache.
+
+    Args:
+        value_count: number of parameter values
+        seed: random seed
+
+    Returns:
+        URL to the database
+    """
+    path = database_path(value_count, seed)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + ".tmp"
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        generate_database("sqlite:///" + temp_path, value_count, seed)
+        os.replace(temp_path, path)
+    return "sqlite:///" + path
+
+
+def generate_database(url: str, value_count: int, seed: int = DEFAULT_SEED) -> None:
+    """Writes a SpineOpt-like database.
+
+    The same value count and seed always produce the same data.
+
+    Args:
+        url: URL of a new database
+        value_count: number of parameter values to generate
+        seed: random seed
+    """
+    block_count = -(-value_count // _VALUES_PER_BLOCK_ESTIMATE) + 1
+    rng = random.Random(seed)
+    entities = _make_entities(block_count)
+    with DatabaseMapping(url, create=True) as db_map:
+        _add_items(db_map, "alternative", [{"name": name} for name in ALTERNATIVES if name != "Base"])
+        _add_items(db_map, "scenario", [{"name": name} for name in SCENARIOS])
+        _add_items(
+            db_map,
+            "scenario_alternative",
+            [
+                {"scenario_name": scenario, "alternative_name": alternative, "rank": rank}
+                for scenario, alternatives in SCENARIOS.items()
+                for rank, alternative in enumerate(alternatives, start=1)
+            ],
+        )
+        _add_items(
+            db_map,
+            "entity_class",
+            [{"name": name, "dimension_name_list": dimensions} for name, dimensions in _ENTITY_CLASSES],
+        )
+        _add_items(
+            db_map,
+            "parameter_definition",
+            [
+                {"entity_class_name": class_name, "name": name}
+                for class_name, parameters in _PARAMETERS.items()
+                for name, _ in parameters
+            ],
+        )
+        for class_name, _ in _ENTITY_CLASSES:
+            _add_items(
+                db_map,
+                "entity",
+                [
+                    {"entity_class_name": class_name, "entity_byname": byname, "name": "__".join(byname)}
+                    for byname in entities[class_name]
+                ],
+            )
+        _add_items(
+            db_map,
+            "entity_alternative",
+            [
+                {
+                    "entity_class_name": "unit",
+                    "entity_byname": byname,
+                    "alternative_name": alternative,
+                    "active": False,
+                }
+                for byname in entities["unit"]
+                for alternative in ALTERNATIVES[1:]
+                if rng.random() < _INACTIVE_PROBABILITY
+            ],
+        )
+        db_map.commit_session("Add structure.")
+    with DatabaseMapping(url) as db_map:
+        _insert_values(db_map, _generate_values(entities, value_count, rng))
+
+
+def _add_items(db_map: DatabaseMapping, item_type: str, items: list[dict]) -> None:
+    """Adds items to database mapping raising on errors.
+
+    Args:
+        db_map: database mapping
+        item_type: item type
+        items: items to add
+    """
+    _, errors = db_map.add_items(item_type, *items, strict=True)
+    if errors:
+        raise RuntimeError(f"failed to add {item_type} items: {errors[0]}")
+
+
+def _insert_values(db_map: DatabaseMapping, values: Iterator[dict]) -> None:
+    """Inserts parameter values directly to the database in a single commit.
+
+    Going through the mapped tables would make the largest databases take hours to generate.
+
+    Args:
+        db_map: database mapping
+        values: parameter value items
+    """
+    alternative_ids = {row.name: row.id for row in db_map.query(db_map.alternative_sq)}
+    class_ids = {row.name: row.id for row in db_map.query(db_map.entity_class_sq)}
+    definition_ids = {(row.entity_class_id, row.name): row.id for row in db_map.query(db_map.parameter_definition_sq)}
+    entity_ids = {(row.class_id, row.name): row.id for row in db_map.query(db_map.entity_sq)}
+    metadata = MetaData()
+    metadata.reflect(bind=db_map.engine, only=("commit", "parameter_value"))
+    commit_table = metadata.tables["commit"]
+    value_table = metadata.tables["parameter_value"]
+    with db_map.engine.begin() as connection:
+        commit_id = connection.execute(
+            commit_table.insert(),
+            {"comment": "Add parameter values.", "date": datetime.datetime(2030, 1, 1), "user": "benchmarks"},
+        ).inserted_primary_key[0]
+        while True:
+            rows = []
+            for _, item in zip(range(_VALUE_BATCH_SIZE), values):
+                class_id = class_ids[item["entity_class_name"]]
+                rows.append(
+                    {
+                        "parameter_definition_id": definition_ids[(class_id, item["parameter_definition_name"])],
+                        "entity_id": entity_ids[(class_id, "__".join(item["entity_byname"]))],
+                        "entity_class_id": class_id,
+                        "alternative_id": alternative_ids[item["alternative_name"]],
+                        "type": item["type"],
+                        "value": item["value"],
+                        "commit_id": commit_id,
+                    }
+                )
+            if not rows:
+                break
+            connection.execute(value_table.insert(), rows)
+
+
+def _make_entities(block_count: int) -> dict[str, list[tuple[str, ...]]]:
+    """Creates entity bynames of a network with given number of node blocks.
+
+    Each block has one node, two units and a connection to the next node.
+
+    Args:
+        block_count: number of blocks
+
+    Returns:
+        mapping from class name to entity bynames
+    """
+    nodes = [f"node_{i}" for i in range(block_count)]
+    units = [f"unit_{i}" for i in range(2 * block_count)]
+    connections = [f"connection_{i}" for i in range(block_count)]
+    return {
+        "commodity": [(name,) for name in COMMODITIES],
+        "node": [(name,) for name in nodes],
+        "unit": [(name,) for name in units],
+        "connection": [(name,) for name in connections],
+        "node__commodity": [(node, COMMODITIES[i % len(COMMODITIES)]) for i, node in enumerate(nodes)],
+        "unit__from_node": [(unit, nodes[(i // 2 + 1) % block_count]) for i, unit in enumerate(units) if i % 2 == 0],
+        "unit__to_node": [(unit, nodes[i // 2]) for i, unit in enumerate(units)],
+        "connection__from_node": [(connection, nodes[i]) for i, connection in enumerate(connections)],
+        "connection__to_node": [(connection, nodes[(i + 1) % block_count]) for i, connection in enumerate(connections)],
+    }
+
+
+def _generate_values(
+    entities: dict[str, list[tuple[str, ...]]], value_count: int, rng: random.Random
+) -> Iterator[dict]:
+    """Yields parameter value items block by block until value count is reached.
+
+    Args:
+        entities: mapping from class name to entity bynames
+        value_count: number of values to generate
+        rng: random number generator
+
+    Yields:
+        parameter value item
+    """
+    block_count = len(entities["node"])
+    per_block = {
+        class_name: -(-len(bynames) // block_count)
+        for class_name, bynames in entities.items()
+        if class_name != "commodity"
+    }
+    generated = 0
+    for block in range(-1, block_count):
+        for class_name, parameters in _PARAMETERS.items():
+            if not parameters:
+                continue
+            if block < 0:
+                if class_name != "commodity":
+                    continue
+                bynames = entities[class_name]
+            elif class_name == "commodity":
+                continue
+            else:
+                count = per_block[class_name]
+                bynames = entities[class_name][block * count : (block + 1) * count]
+            for byname in bynames:
+                for parameter_name, value_type in parameters:
+                    for alternative in ALTERNATIVES:
+                        if alternative != "Base" and rng.random() >= _OVERRIDE_PROBABILITY:
+                            continue
+                        value, type_ = to_database(_make_value(parameter_name, value_type, rng))
+                        yield {
+                            "entity_class_name": class_name,
+                            "entity_byname": byname,
+                            "parameter_definition_name": parameter_name,
+                            "alternative_name": alternative,
+                            "value": value,
+                            "type": type_,
+                        }
+                        generated += 1
+                        if generated == value_count:
+                            return
+
+
+def _make_value(parameter_name: str, value_type: str, rng: random.Random):
+    """Creates a random parameter value.
+
+    Args:
+        parameter_name: parameter's name
+        value_type: one of "float", "str", "bool", "time_series" or "map"
+        rng: random number generator
+
+    Returns:
+        parameter value
+    """
+    if value_type == "float":
+        return round(rng.uniform(0.0, 1000.0), 3)
+    if value_type == "str":
+        return rng.choice(_STRING_CHOICES[parameter_name])
+    if value_type == "bool":
+        return rng.random() < 0.5
+    if value_type == "time_series":
+        values = [round(rng.uniform(0.0, 100.0), 3) for _ in range(_TIME_SERIES_LENGTH)]
+        return TimeSeriesFixedResolution("2030-01-01T00:00", "1h", values, ignore_year=False, repeat=False)
+    if value_type == "map":
+        return Map(["peak", "off_peak"], [round(rng.uniform(0.0, 100.0), 3), round(rng.uniform(0.0, 50.0), 3)])
+    raise ValueError(f"unknown value type {value_type}")
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate a SpineOpt-like benchmark database.")
+    parser.add_argument("--value-count", type=int, default=VALUE_COUNTS[0], help="number of parameter values")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="random seed")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = _parse_args()
+    print(ensure_database(arguments.value_count, arguments.seed))
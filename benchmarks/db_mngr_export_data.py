@@ -0,0 +1,60 @@
+"""
+This script benchmarks exporting a generated database to JSON through SpineDBManager.export_data().
+"""
+
+import os
+import sys
+
+if sys.platform == "win32" and "HOMEPATH" not in os.environ:
+    import pathlib
+
+    os.environ["HOMEPATH"] = str(pathlib.Path(sys.executable).parent)
+
+import tempfile
+import time
+from typing import Optional
+import pyperf
+from PySide6.QtCore import QSettings
+from PySide6.QtWidgets import QApplication
+from benchmarks.data_generator import ensure_database
+from benchmarks.utils import ExportCaller, make_runner
+from spinedb_api import DatabaseMapping
+from spinetoolbox.spine_db_manager import SpineDBManager
+
+
+def export_to_json(loops: int, db_mngr: SpineDBManager, db_map: DatabaseMapping, file_path: str) -> float:
+    caller = ExportCaller()
+    duration = 0.0
+    for _ in range(loops):
+        start = time.perf_counter()
+        db_mngr.export_data(caller, {db_map: {}}, file_path, "JSON file (*.json)")
+        duration += time.perf_counter() - start
+    return duration
+
+
+def run_benchmark(output_file: Optional[str]):
+    if not QApplication.instance():
+        QApplication()
+    runner = make_runner()
+    args = runner.parse_args()
+    url = ensure_database(args.value_count)
+    db_mngr = SpineDBManager(QSettings(), parent=None)
+    db_map = db_mngr.get_db_map(url, ExportCaller())
+    with db_map:
+        db_map.fetch_all()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        benchmark = runner.bench_time_func(
+            f"SpineDBManager.export_data[JSON, {args.value_count} values]",
+            export_to_json,
+            db_mngr,
+            db_map,
+            os.path.join(temp_dir, "export.json"),
+        )
+    if output_file:
+        pyperf.add_runs(output_file, benchmark)
+    db_mngr.close_all_sessions()
+    db_mngr.deleteLater()
+
+
+if __name__ == "__main__":
+    run_benchmark(output_file="")
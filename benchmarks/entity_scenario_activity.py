@@ -0,0 +1,56 @@
+"""
+This script benchmarks resolving the activities of all entities in all scenarios of a generated database.
+"""
+
+import os
+import sys
+
+if sys.platform == "win32" and "HOMEPATH" not in os.environ:
+    import pathlib
+
+    os.environ["HOMEPATH"] = str(pathlib.Path(sys.executable).parent)
+
+import time
+from typing import Optional
+import pyperf
+from benchmarks.data_generator import ensure_database
+from benchmarks.utils import make_runner
+from spinedb_api import DatabaseMapping
+from spinedb_api.temp_id import TempId
+from spinetoolbox.cache_graphs import EntityScenarioActivityGraph
+
+
+def resolve_activities(
+    loops: int, db_map: DatabaseMapping, entity_ids: list[TempId], scenario_ids: list[TempId]
+) -> float:
+    duration = 0.0
+    for _ in range(loops):
+        graph = EntityScenarioActivityGraph()
+        start = time.perf_counter()
+        for scenario_id in scenario_ids:
+            graph.entity_activities(db_map, entity_ids, scenario_id)
+        duration += time.perf_counter() - start
+    return duration
+
+
+def run_benchmark(output_file: Optional[str]):
+    runner = make_runner()
+    args = runner.parse_args()
+    db_map = DatabaseMapping(ensure_database(args.value_count))
+    with db_map:
+        entity_ids = [item["id"] for item in db_map.get_entity_items()]
+        scenario_ids = [item["id"] for item in db_map.get_scenario_items()]
+        benchmark = runner.bench_time_func(
+            f"EntityScenarioActivityGraph.entity_activities[cold, {args.value_count} values]",
+            resolve_activities,
+            db_map,
+            entity_ids,
+            scenario_ids,
+        )
+    if output_file:
+        pyperf.add_runs(output_file, benchmark)
+    db_map.close()
+
+
+if __name__ == "__main__":
+    run_benchmark(output_file="")
@@ -0,0 +1,100 @@
+"""
+This script benchmarks headless execution of a project that merges a generated database into another one.
+
+The project has a Data Store pointing at the generated database connected via a Merger
+to a target Data Store that is purged before every write.
+Requires the spine_items package.
+"""
+
+import os
+import sys
+
+if sys.platform == "win32" and "HOMEPATH" not in os.environ:
+    import pathlib
+
+    os.environ["HOMEPATH"] = str(pathlib.Path(sys.executable).parent)
+
+import json
+from typing import Optional
+import pyperf
+from benchmarks.data_generator import cache_dir, database_path, ensure_database
+from benchmarks.utils import make_runner
+from spine_engine.utils.serialization import serialize_path
+from spinedb_api import DatabaseMapping
+from spinetoolbox.config import LATEST_PROJECT_VERSION
+
+
+def _sqlite_url_dict(path: str, project_dir: str) -> dict:
+    return {"dialect": "sqlite", "host": "", "port": "", "database": serialize_path(path, project_dir)}
+
+
+def make_project(value_count: int) -> str:
+    """Creates a project that merges the generated database into an empty one.
+
+    Args:
+        value_count: number of parameter values in the source database
+
+    Returns:
+        path to project directory
+    """
+    source_path = database_path(value_count)
+    ensure_database(value_count)
+    project_dir = os.path.join(cache_dir(), f"headless_project_{value_count}")
+    target_path = os.path.join(project_dir, "target.sqlite")
+    os.makedirs(os.path.join(project_dir, ".spinetoolbox"), exist_ok=True)
+    if not os.path.exists(target_path):
+        DatabaseMapping("sqlite:///" + target_path, create=True).close()
+    project_dict = {
+        "project": {
+            "version": LATEST_PROJECT_VERSION,
+            "description": "Headless execution benchmark.",
+            "specifications": {},
+            "connections": [
+                {"name": "from source to merger", "from": ["source", "right"], "to": ["merger", "left"]},
+                {
+                    "name": "from merger to target",
+                    "from": ["merger", "right"],
+                    "to": ["target", "left"],
+                    "options": {"purge_before_writing": True},
+                },
+            ],
+            "jumps": [],
+            "settings": {"enable_execute_all": True},
+        },
+        "items": {
+            "source": {
+                "type": "Data Store",
+                "description": "",
+                "x": 0.0,
+                "y": 0.0,
+                "url": _sqlite_url_dict(source_path, project_dir),
+            },
+            "merger": {"type": "Merger", "description": "", "x": 100.0, "y": 0.0, "cancel_on_error": False},
+            "target": {
+                "type": "Data Store",
+                "description": "",
+                "x": 200.0,
+                "y": 0.0,
+                "url": _sqlite_url_dict(target_path, project_dir),
+            },
+        },
+    }
+    with open(os.path.join(project_dir, ".spinetoolbox", "project.json"), "w", encoding="utf-8") as project_file:
+        json.dump(project_dict, project_file, indent=4)
+    return project_dir
+
+
+def run_benchmark(output_file: Optional[str]):
+    runner = make_runner()
+    args = runner.parse_args()
+    project_dir = make_project(args.value_count)
+    benchmark = runner.bench_command(
+        f"headless execution[merge, {args.value_count} values]",
+        [sys.executable, "-m", "spinetoolbox", "--execute-only", project_dir],
+    )
+    if output_file:
+        pyperf.add_runs(output_file, benchmark)
+
+
+if __name__ == "__main__":
+    run_benchmark(output_file="")
@@ -0,0 +1,76 @@
+"""
+This script benchmarks populating PivotModel with the parameter values of a generated database.
+
+The data is laid out like ParameterValuePivotTableModel lays out a multi-dimensional class:
+entities, parameter, alternative and database indexes mapping to value ids.
+"""
+
+import os
+import sys
+
+if sys.platform == "win32" and "HOMEPATH" not in os.environ:
+    import pathlib
+
+    os.environ["HOMEPATH"] = str(pathlib.Path(sys.executable).parent)
+
+import time
+from typing import Optional
+import pyperf
+from benchmarks.data_generator import ensure_database
+from benchmarks.utils import make_runner
+from spinedb_api import DatabaseMapping
+from spinetoolbox.spine_db_editor.mvcmodels.pivot_model import PivotModel
+
+
+class _NameHeader:
+    """Stands in for TopLeftHeaderItem when header ids are names."""
+
+    @staticmethod
+    def accepts(header_id):
+        return True
+
+    @staticmethod
+    def header_data(header_id):
+        return header_id
+
+
+_HEADERS = {name: _NameHeader() for name in ("unit", "node", "parameter", "alternative", "database")}
+
+
+def reset_pivot_model(loops: int, data: dict[tuple, int]) -> float:
+    duration = 0.0
+    for _ in range(loops):
+        model = PivotModel()
+        model_data = dict(data)
+        start = time.perf_counter()
+        model.reset_model(
+            model_data, _HEADERS, ("unit", "node"), ("parameter",), ("alternative", "database"), ("Base", "db")
+        )
+        duration += time.perf_counter() - start
+    return duration
+
+
+def load_data(url: str) -> dict[tuple, int]:
+    with DatabaseMapping(url) as db_map:
+        class_id = db_map.entity_class(name="unit__to_node")["id"]
+        return {
+            (*item["element_name_list"], item["parameter_definition_name"], item["alternative_name"], "db"): item["id"]
+            for item in db_map.get_parameter_value_items(entity_class_id=class_id)
+        }
+
+
+def run_benchmark(output_file: Optional[str]):
+    runner = make_runner()
+    args = runner.parse_args()
+    data = load_data(ensure_database(args.value_count))
+    benchmark = runner.bench_time_func(
+        f"PivotModel.reset_model[unit__to_node, {args.value_count} values]",
+        reset_pivot_model,
+        data,
+    )
+    if output_file:
+        pyperf.add_runs(output_file, benchmark)
+
+
+if __name__ == "__main__":
+    run_benchmark(output_file="")
@@ -0,0 +1,132 @@
+"""
+This script runs the benchmark suite and collects the results into a single pyperf JSON file.
+
+Usage:
+    python -m benchmarks.run_suite -o results.json [--value-counts 1000 10000 ...] [--only NAME ...] [--fast | --rigorous]
+
+Benchmarks that depend on database size run once per value count.
+Databases are generated before the benchmarks run and cached between runs, see benchmarks.data_generator.
+Compare the results against a baseline with benchmarks.compare.
+"""
+
+from __future__ import annotations
+import argparse
+import importlib.util
+import os
+import subprocess
+import sys
+from benchmarks.data_generator import VALUE_COUNTS, ensure_database
+
+SIZED_BENCHMARKS = (
+    "worker_fetch_parameter_values",
+    "compound_parameter_value_model_population",
+    "compound_model_auto_filter",
+    "pivot_model_reset_model",
+    "db_mngr_export_data",
+    "entity_scenario_activity",
+    "headless_execution",
+)
+"""Benchmarks that accept the --value-count argument."""
+FIXED_BENCHMARKS = (
+    "db_mngr_get_value",
+    "db_mngr_get_item",
+    "db_mngr_get_icon_mngr",
+    "compound_model_filter_accepts_model",
+)
+"""Benchmarks that set up their own small databases."""
+DEFAULT_VALUE_COUNTS = VALUE_COUNTS[:3]
+_REQUIRED_PACKAGES = {"headless_execution": "spine_items"}
+_REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_suite(
+    output_file: str, value_counts: list[int], names: list[str] | None = None, pyperf_args: list[str] | None = None
+) -> list[str]:
+    """Runs benchmarks appending their results to output file.
+
+    Args:
+        output_file: path to pyperf JSON file
+        value_counts: database sizes for sized benchmarks
+        names: names of benchmarks to run; None runs all
+        pyperf_args: extra arguments for pyperf runners
+
+    Returns:
+        names of benchmarks that failed
+    """
+    output_file = os.path.abspath(output_file)
+    pyperf_args = pyperf_args if pyperf_args is not None else []
+    failed = []
+    for name in FIXED_BENCHMARKS:
+        if names is not None and name not in names:
+            continue
+        if not _run(name, output_file, pyperf_args):
+            failed.append(name)
+    sized_benchmarks = [name for name in SIZED_BENCHMARKS if names is None or name in names]
+    for name in list(sized_benchmarks):
+        package = _REQUIRED_PACKAGES.get(name)
+        if package is not None and importlib.util.find_spec(package) is None:
+            print(f"Skipping {name}: {package} is not installed.")
+            sized_benchmarks.remove(name)
+    if not sized_benchmarks:
+        return failed
+    for value_count in value_counts:
+        print(f"Preparing database with {value_count} values...")
+        ensure_database(value_count)
+        for name in sized_benchmarks:
+            if not _run(name, output_file, ["--value-count", str(value_count)] + pyperf_args):
+                failed.append(f"{name}[{value_count}]")
+    return failed
+
+
+def _run(name: str, output_file: str, args: list[str]) -> bool:
+    """Runs a benchmark module in a subprocess.
+
+    pyperf starts its workers by script path, so the repository root is added to PYTHONPATH
+    to keep the benchmarks and spinetoolbox packages importable in the workers.
+
+    Args:
+        name: benchmark module name
+        output_file: path to pyperf JSON file
+        args: extra command line arguments
+
+    Returns:
+        True if benchmark succeeded, False otherwise
+    """
+    command = [sys.executable, "-m", "benchmarks." + name, "--append", output_file] + args
+    environment = dict(os.environ)
+    python_path = environment.get("PYTHONPATH")
+    environment["PYTHONPATH"] = _REPOSITORY_ROOT if not python_path else os.pathsep.join((_REPOSITORY_ROOT, python_path))
+    completed = subprocess.run(command, cwd=_REPOSITORY_ROOT, env=environment, check=False)
+    return completed.returncode == 0
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run Spine Toolbox benchmark suite.")
+    parser.add_argument("-o", "--output", required=True, help="pyperf JSON file to append results to")
+    parser.add_argument(
+        "--value-counts",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_VALUE_COUNTS),
+        help=f"database sizes in parameter values; the suite is designed for {', '.join(map(str, VALUE_COUNTS))}",
+    )
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        choices=FIXED_BENCHMARKS + SIZED_BENCHMARKS,
+        metavar="NAME",
+        help=f"run only given benchmarks: {', '.join(FIXED_BENCHMARKS + SIZED_BENCHMARKS)}",
+    )
+    speed = parser.add_mutually_exclusive_group()
+    speed.add_argument("--fast", action="store_true", help="get rough results quickly")
+    speed.add_argument("--rigorous", action="store_true", help="spend more time to get reliable results")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = _parse_args()
+    extra_args = ["--fast"] if arguments.fast else ["--rigorous"] if arguments.rigorous else []
+    failures = run_suite(arguments.output, arguments.value_counts, arguments.only, extra_args)
+    if failures:
+        print(f"Failed benchmarks: {', '.join(failures)}", file=sys.stderr)
+        sys.exit(1)
@@ -1,9 +1,47 @@
+import pyperf
+from benchmarks.data_generator import CACHE_DIR_ENV_VAR, VALUE_COUNTS
+
+
 class _EmitPrinter:
     @staticmethod
     def emit(text):
         print(text)
 
 
+class _EmitIgnorer:
+    @staticmethod
+    def emit(*args):
+        pass
+
+
 class StdOutLogger:
     msg = _EmitPrinter()
     msg_error = _EmitPrinter()
+
+
+class ExportCaller(StdOutLogger):
+    file_exported = _EmitIgnorer()
+
+
+def make_runner() -> pyperf.Runner:
+    """Creates a benchmark runner that accepts the size of the generated database as a command line argument.
+
+    The size is given by --value-count since pyperf reserves --values for its own use.
+    Worker processes inherit the database cache directory unless --inherit-environ is given explicitly.
+
+    Returns:
+        runner; call its parse_args() before setting up the benchmark
+    """
+
+    def add_cmdline_args(cmd, args):
+        cmd.extend(("--value-count", str(args.value_count)))
+
+    runner = pyperf.Runner(add_cmdline_args=add_cmdline_args)
+    runner.argparser.add_argument(
+        "--value-count",
+        type=int,
+        default=VALUE_COUNTS[0],
+        help="number of parameter values in the generated database",
+    )
+    runner.argparser.set_defaults(inherit_environ=[CACHE_DIR_ENV_VAR])
+    return runner
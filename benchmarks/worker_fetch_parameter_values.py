@@ -0,0 +1,62 @@
+"""
+This script benchmarks fetching all parameter values of a generated database through SpineDBWorker.
+"""
+
+import os
+import sys
+
+if sys.platform == "win32" and "HOMEPATH" not in os.environ:
+    import pathlib
+
+    os.environ["HOMEPATH"] = str(pathlib.Path(sys.executable).parent)
+
+import time
+from typing import Optional
+import pyperf
+from PySide6.QtCore import QSettings
+from PySide6.QtWidgets import QApplication
+from benchmarks.data_generator import ensure_database
+from benchmarks.utils import StdOutLogger, make_runner
+from spinetoolbox.fetch_parent import FlexibleFetchParent
+from spinetoolbox.spine_db_manager import SpineDBManager
+
+
+def fetch_parameter_values(loops: int, db_mngr: SpineDBManager, url: str, logger: StdOutLogger) -> float:
+    duration = 0.0
+    for _ in range(loops):
+        start = time.perf_counter()
+        db_map = db_mngr.get_db_map(url, logger)
+        fetch_parent = FlexibleFetchParent("parameter_value")
+        while not fetch_parent.is_fetched(db_map):
+            if db_mngr.can_fetch_more(db_map, fetch_parent):
+                db_mngr.fetch_more(db_map, fetch_parent)
+            QApplication.processEvents()
+        duration += time.perf_counter() - start
+        fetch_parent.set_obsolete(True)
+        db_mngr.close_session(url)
+    return duration
+
+
+def run_benchmark(output_file: Optional[str]):
+    if not QApplication.instance():
+        QApplication()
+    runner = make_runner()
+    args = runner.parse_args()
+    url = ensure_database(args.value_count)
+    db_mngr = SpineDBManager(QSettings(), parent=None)
+    logger = StdOutLogger()
+    benchmark = runner.bench_time_func(
+        f"SpineDBWorker.fetch_more[parameter_value, {args.value_count} values]",
+        fetch_parameter_values,
+        db_mngr,
+        url,
+        logger,
+    )
+    if output_file:
+        pyperf.add_runs(output_file, benchmark)
+    db_mngr.close_all_sessions()
+    db_mngr.deleteLater()
+
+
+if __name__ == "__main__":
+    run_benchmark(output_file="")
@@ -10,11 +10,12 @@
 # this program. If not, see <http://www.gnu.org/licenses/>.
 ######################################################################################################################
 from __future__ import annotations
+from collections.abc import Iterable
 import math
-from typing import ClassVar
-import networkx as nx
+from typing import Any, ClassVar
 from PySide6.QtCore import Slot
 from spinedb_api import DatabaseMapping
+from spinedb_api.db_mapping_base import MappedItemBase, MappedTable
 from spinedb_api.helpers import ItemType
 from spinedb_api.temp_id import TempId
 from .fetch_parent import DBMapMixedItems
@@ -24,43 +25,135 @@ class GraphBase:
     INVALIDATING_ITEM_TYPES: ClassVar[set[str]] = NotImplemented
 
     def __init__(self):
-        self._graphs: dict[DatabaseMapping, nx.DiGraph] = {}
+        self._graphs: dict[DatabaseMapping, Any] = {}
 
     @Slot(object)
     def invalidate_caches(self, db_map: DatabaseMapping) -> None:
         if db_map in self._graphs:
             del self._graphs[db_map]
 
-    @Slot(str, object)
-    def maybe_invalidate_caches_after_data_changed(self, item_type: ItemType, db_map_data: DBMapMixedItems) -> None:
+    def update_caches_after_data_changed(self, item_type: ItemType, db_map_data: DBMapMixedItems) -> None:
+        """Brings the graphs up to date after items have been added, updated or removed.
+
+        The default implementation drops the graphs of affected database mappings.
+
+        Args:
+            item_type: changed item type
+            db_map_data: changed items by database mapping
+        """
         if item_type not in self.INVALIDATING_ITEM_TYPES:
             return
         for db_map in db_map_data:
             if db_map in self._graphs:
                 del self._graphs[db_map]
 
-    @Slot(str, object)
-    def maybe_invalidate_caches_after_fetch(self, item_type: ItemType, db_map: DatabaseMapping) -> None:
+    @Slot(object, str)
+    def maybe_invalidate_caches_after_fetch(self, db_map: DatabaseMapping, item_type: ItemType) -> None:
         if (item_type not in self.INVALIDATING_ITEM_TYPES) or db_map not in self._graphs:
             return
         del self._graphs[db_map]
 
 
+class DimensionGraph:
+    """Adjacency from items to the items they are built from, e.g. from entities to their elements.
+
+    Adjacency lists are read from the mapped table the first time they are needed,
+    so items that enter the mapping later need no bookkeeping.
+    """
+
+    def __init__(self, mapped_table: MappedTable, id_list_field: str):
+        """
+        Args:
+            mapped_table: mapped table of the items
+            id_list_field: field that contains the ids of the items an item is built from
+        """
+        self._mapped_table = mapped_table
+        self._id_list_field = id_list_field
+        self._dimension_ids: dict[TempId, tuple[TempId, ...]] = {}
+
+    def successors(self, item_id: TempId) -> tuple[TempId, ...]:
+        """Returns the ids of the items given item is built from.
+
+        Args:
+            item_id: item id
+
+        Returns:
+            dimension or element ids
+        """
+        try:
+            return self._dimension_ids[item_id]
+        except KeyError:
+            item = self._mapped_table.get(item_id)
+            if item is None or not item.is_valid():
+                return ()
+            dimension_ids = self._dimension_ids[item_id] = tuple(item[self._id_list_field])
+            return dimension_ids
+
+    def discard(self, ids: Iterable[TempId]) -> None:
+        """Forgets the adjacency lists of changed items so they are read again when needed.
+
+        Args:
+            ids: ids of updated or removed items
+        """
+        for id_ in ids:
+            self._dimension_ids.pop(id_, None)
+
+
+class ClassDimensionGraph(DimensionGraph):
+    """Adjacency from entity classes to their dimensions and from superclasses to their subclasses."""
+
+    def __init__(self, db_map: DatabaseMapping):
+        """
+        Args:
+            db_map: database mapping
+        """
+        super().__init__(db_map.mapped_table("entity_class"), "dimension_id_list")
+        self._superclass_subclass_table = db_map.mapped_table("superclass_subclass")
+        self._subclass_ids: dict[TempId, tuple[TempId, ...]] | None = None
+
+    def successors(self, item_id: TempId) -> tuple[TempId, ...]:
+        if self._subclass_ids is None:
+            subclass_ids = {}
+            for superclass_subclass in self._superclass_subclass_table.values():
+                if not superclass_subclass.is_valid():
+                    continue
+                subclass_ids.setdefault(superclass_subclass["superclass_id"], []).append(
+                    superclass_subclass["subclass_id"]
+                )
+            self._subclass_ids = {superclass_id: tuple(ids) for superclass_id, ids in subclass_ids.items()}
+        return super().successors(item_id) + self._subclass_ids.get(item_id, ())
+
+    def discard_superclass_subclasses(self) -> None:
+        """Forgets superclass-subclass relations so they are read again when needed."""
+        self._subclass_ids = None
+
+
 class SuperclassGraphBase(GraphBase):
+    """Answers whether items are built from other items, directly or through intermediate items.
+
+    Graphs are updated with deltas when items change instead of being rebuilt.
+    """
+
     def is_any_id_reachable(self, db_map: DatabaseMapping, source_id: TempId, target_ids: set[TempId]) -> bool:
-        if db_map not in self._graphs:
-            self._graphs[db_map] = self._build_graph(db_map)
-        graph = self._graphs[db_map]
-        relationship_ids = list(graph.predecessors(source_id))
-        while relationship_ids:
-            relationship_id = relationship_ids.pop(-1)
-            if relationship_id in target_ids:
+        if not target_ids:
+            return False
+        graph = self._graphs.get(db_map)
+        if graph is None:
+            graph = self._graphs[db_map] = self._make_graph(db_map)
+        visited = set()
+        dimension_ids = list(graph.successors(source_id))
+        while dimension_ids:
+            dimension_id = dimension_ids.pop(-1)
+            if dimension_id in target_ids:
                 return True
-            relationship_ids += graph.predecessors(relationship_id)
+            if dimension_id in visited:
+                continue
+            visited.add(dimension_id)
+            dimension_ids += graph.successors(dimension_id)
         return False
 
     @staticmethod
-    def _build_graph(db_map: DatabaseMapping) -> nx.DiGraph:
+    def _make_graph(db_map: DatabaseMapping) -> DimensionGraph:
         raise NotImplementedError()
 
 
@@ -68,89 +161,278 @@ class RelationshipClassGraph(SuperclassGraphBase):
     INVALIDATING_ITEM_TYPES: ClassVar[set[str]] = {"entity_class", "superclass_subclass"}
 
     @staticmethod
-    def _build_graph(db_map: DatabaseMapping) -> nx.DiGraph:
-        graph = _build_graph(db_map, "entity_class", "dimension_id_list")
-        for superclass_subclass in db_map.mapped_table("superclass_subclass").values():
-            if not superclass_subclass.is_valid():
+    def _make_graph(db_map: DatabaseMapping) -> ClassDimensionGraph:
+        return ClassDimensionGraph(db_map)
+
+    def update_caches_after_data_changed(self, item_type: ItemType, db_map_data: DBMapMixedItems) -> None:
+        if item_type not in self.INVALIDATING_ITEM_TYPES:
+            return
+        for db_map, items in db_map_data.items():
+            graph = self._graphs.get(db_map)
+            if graph is None:
                 continue
-            graph.add_edge(superclass_subclass["subclass_id"], superclass_subclass["superclass_id"])
-        return graph
+            if item_type == "entity_class":
+                graph.discard(item["id"] for item in items if item)
+            else:
+                graph.discard_superclass_subclasses()
+
+    @Slot(object, str)
+    def maybe_invalidate_caches_after_fetch(self, db_map: DatabaseMapping, item_type: ItemType) -> None:
+        if item_type == "superclass_subclass" and db_map in self._graphs:
+            self._graphs[db_map].discard_superclass_subclasses()
 
 
 class RelationshipGraph(SuperclassGraphBase):
-    INVALIDATING_ITEM_TYPES: ClassVar[set[str]] = {"entity", "entity_class", "superclass_subclass"}
+    INVALIDATING_ITEM_TYPES: ClassVar[set[str]] = {"entity"}
 
     @staticmethod
-    def _build_graph(db_map: DatabaseMapping) -> nx.DiGraph:
-        return _build_graph(db_map, "entity", "element_id_list")
+    def _make_graph(db_map: DatabaseMapping) -> DimensionGraph:
+        return DimensionGraph(db_map.mapped_table("entity"), "element_id_list")
 
+    def update_caches_after_data_changed(self, item_type: ItemType, db_map_data: DBMapMixedItems) -> None:
+        if item_type not in self.INVALIDATING_ITEM_TYPES:
+            return
+        for db_map, items in db_map_data.items():
+            graph = self._graphs.get(db_map)
+            if graph is not None:
+                graph.discard(item["id"] for item in items if item)
 
-def _build_graph(db_map: DatabaseMapping, item_type: ItemType, id_list_name: str) -> nx.DiGraph:
-    graph = nx.DiGraph()
-    for item in db_map.mapped_table(item_type).values():
-        if not item.is_valid():
-            continue
-        item_id = item["id"]
-        if not graph.has_node(item_id):
-            graph.add_node(item_id)
-        for dimension_id in item[id_list_name]:
-            if not graph.has_node(dimension_id):
-                graph.add_node(dimension_id)
-            graph.add_edge(dimension_id, item_id)
-    return graph
+    @Slot(object, str)
+    def maybe_invalidate_caches_after_fetch(self, db_map: DatabaseMapping, item_type: ItemType) -> None:
+        """Fetched entities are new to the graph and get read when needed so there is nothing to invalidate."""
 
 
-class EntityScenarioActivityGraph(GraphBase):
-    INVALIDATING_ITEM_TYPES: ClassVar[set[str]] = {"scenario_alternative", "entity_alternative"}
+class ScenarioActivity:
+    """Resolved entity activities in a single scenario."""
 
-    def is_entity_active(self, db_map: DatabaseMapping, entity_id: TempId, scenario_id: TempId) -> bool | None:
-        if db_map not in self._graphs:
-            self._graphs[db_map] = self._build_graph(db_map)
-        graph = self._graphs[db_map]
-        if scenario_id not in graph:
-            return None
+    def __init__(self, alternative_ranks: dict[TempId, int]):
+        """
+        Args:
+            alternative_ranks: mapping from scenario's alternative ids to their ranks
+        """
+        self.alternative_ranks = alternative_ranks
+        self.activities: dict[TempId, bool | None] = {}
+
+
+class EntityActivityIndex:
+    """Entity alternatives of a database mapping indexed by entity and resolved activities per scenario."""
+
+    def __init__(self, db_map: DatabaseMapping):
+        """
+        Args:
+            db_map: database mapping
+        """
+        self._db_map = db_map
+        db_map.fetch_all("scenario_alternative")
+        db_map.fetch_all("entity_alternative")
+        self._alternative_activities: dict[TempId, dict[TempId, bool]] = {}
+        self._entity_alternative_keys: dict[TempId, tuple[TempId, TempId]] = {}
+        for entity_alternative in db_map.mapped_table("entity_alternative").values():
+            if entity_alternative.is_valid():
+                self._insert_entity_alternative(entity_alternative)
+        self._scenarios: dict[TempId, ScenarioActivity | None] = {}
+
+    def entity_activities(self, entity_ids: Iterable[TempId], scenario_id: TempId) -> list[bool | None]:
+        """Returns the activities of entities in a scenario.
+
+        Args:
+            entity_ids: entity ids
+            scenario_id: scenario id
+
+        Returns:
+            True if entity is active, False if it is inactive and None if the scenario does not decide
+        """
+        scenario = self._scenario(scenario_id)
+        if scenario is None:
+            return [None for _ in entity_ids]
+        return [self._resolve(entity_id, scenario) for entity_id in entity_ids]
+
+    def update_entity_alternatives(self, entity_alternatives: Iterable[dict]) -> None:
+        """Applies changed entity alternatives to the index.
+
+        Args:
+            entity_alternatives: added, updated or removed entity alternatives
+        """
+        table = self._db_map.mapped_table("entity_alternative")
+        for item in entity_alternatives:
+            self._remove_entity_alternative(item["id"])
+            entity_alternative = table.get(item["id"])
+            if entity_alternative is not None and entity_alternative.is_valid():
+                self._insert_entity_alternative(entity_alternative)
+        self.forget_activities()
+
+    def _insert_entity_alternative(self, entity_alternative: MappedItemBase) -> None:
+        """Adds an entity alternative to the activity index.
+
+        Args:
+            entity_alternative: entity alternative item
+        """
+        entity_id = entity_alternative["entity_id"]
+        alternative_id = entity_alternative["alternative_id"]
+        self._alternative_activities.setdefault(entity_id, {})[alternative_id] = entity_alternative["active"]
+        self._entity_alternative_keys[entity_alternative["id"]] = (entity_id, alternative_id)
+
+    def _remove_entity_alternative(self, entity_alternative_id: TempId) -> None:
+        """Removes an entity alternative from the activity index by the entity and alternative it was indexed under.
+
+        Args:
+            entity_alternative_id: entity alternative id
+        """
+        key = self._entity_alternative_keys.pop(entity_alternative_id, None)
+        if key is None:
+            return
+        entity_id, alternative_id = key
+        activities = self._alternative_activities.get(entity_id)
+        if activities is not None:
+            activities.pop(alternative_id, None)
+            if not activities:
+                del self._alternative_activities[entity_id]
+
+    def update_scenario_alternatives(self, scenario_alternatives: Iterable[dict]) -> None:
+        """Drops the resolved activities of scenarios whose alternatives have changed.
+
+        Args:
+            scenario_alternatives: added, updated or removed scenario alternatives
+        """
+        table = self._db_map.mapped_table("scenario_alternative")
+        for item in scenario_alternatives:
+            scenario_alternative = table.get(item["id"])
+            scenario_id = scenario_alternative["scenario_id"] if scenario_alternative is not None else None
+            if scenario_id is None:
+                self._scenarios.clear()
+                return
+            self._scenarios.pop(scenario_id, None)
+
+    def forget_activities(self) -> None:
+        """Drops resolved activities but keeps the scenario alternatives."""
+        for scenario in self._scenarios.values():
+            if scenario is not None:
+                scenario.activities.clear()
+
+    def _scenario(self, scenario_id: TempId) -> ScenarioActivity | None:
+        """Returns the activity table of a scenario.
+
+        Args:
+            scenario_id: scenario id
+
+        Returns:
+            activity table or None if scenario has no alternatives
+        """
+        try:
+            return self._scenarios[scenario_id]
+        except KeyError:
+            pass
+        alternative_ranks = {}
+        for scenario_alternative in self._db_map.mapped_table("scenario_alternative").values():
+            if scenario_alternative.is_valid() and scenario_alternative["scenario_id"] == scenario_id:
+                alternative_ranks[scenario_alternative["alternative_id"]] = scenario_alternative["rank"]
+        scenario = self._scenarios[scenario_id] = ScenarioActivity(alternative_ranks) if alternative_ranks else None
+        return scenario
+
+    def _resolve(self, entity_id: TempId, scenario: ScenarioActivity) -> bool | None:
+        """Resolves entity's activity in a scenario.
+
+        The entity alternative of the highest ranking alternative wins.
+        Undecided multidimensional entities are inactive if any of their elements is inactive
+        or undecided in a class that is not active by default.
+
+        Args:
+            entity_id: entity id
+            scenario: scenario's activity table
+
+        Returns:
+            True if entity is active, False if it is inactive and None if the scenario does not decide
+        """
+        try:
+            return scenario.activities[entity_id]
+        except KeyError:
+            pass
         activity = None
         max_rank = -math.inf
-        for alternative_id in graph.successors(scenario_id):
-            if not (alternative_id, entity_id) in graph.edges:
-                continue
-            rank = graph.edges[scenario_id, alternative_id]["rank"]
-            if rank < max_rank:
+        for alternative_id, active in self._alternative_activities.get(entity_id, {}).items():
+            rank = scenario.alternative_ranks.get(alternative_id)
+            if rank is None or rank < max_rank:
                 continue
-            activity = graph.edges[alternative_id, entity_id]["active"]
+            activity = active
             max_rank = rank
         if activity is None:
-            class_table = db_map.mapped_table("entity_class")
-            entity_table = db_map.mapped_table("entity")
-            entity = entity_table[entity_id]
-            for element_id in entity["element_id_list"]:
-                element_activity = self.is_entity_active(db_map, element_id, scenario_id)
-                if element_activity is False:
-                    return False
-                elif element_activity is None:
-                    entity_class = class_table[entity_table[element_id]["class_id"]]
-                    if not entity_class["active_by_default"]:
-                        return False
+            entity = self._db_map.mapped_table("entity").get(entity_id)
+            if entity is not None:
+                activity = self._resolve_from_elements(entity["element_id_list"], scenario)
+        scenario.activities[entity_id] = activity
         return activity
 
-    @staticmethod
-    def _build_graph(db_map: DatabaseMapping) -> nx.DiGraph:
-        graph = nx.DiGraph()
-        db_map.fetch_all("scenario_alternative")
-        for scenario_alternative in db_map.mapped_table("scenario_alternative").values():
-            if not scenario_alternative.is_valid():
-                continue
-            scenario_id = scenario_alternative["scenario_id"]
-            graph.add_node(scenario_id)
-            alternative_id = scenario_alternative["alternative_id"]
-            graph.add_node(alternative_id)
-            graph.add_edge(scenario_id, alternative_id, rank=scenario_alternative["rank"])
-        for entity_alternative in db_map.mapped_table("entity_alternative").values():
-            if not entity_alternative.is_valid():
+    def _resolve_from_elements(self, element_ids: Iterable[TempId], scenario: ScenarioActivity) -> bool | None:
+        """Resolves the activity of an undecided entity from its elements.
+
+        Args:
+            element_ids: entity's element ids
+            scenario: scenario's activity table
+
+        Returns:
+            False if the entity is inactive because of its elements, None otherwise
+        """
+        class_table = self._db_map.mapped_table("entity_class")
+        entity_table = self._db_map.mapped_table("entity")
+        for element_id in element_ids:
+            element_activity = self._resolve(element_id, scenario)
+            if element_activity is False:
+                return False
+            if element_activity is None and not class_table[entity_table[element_id]["class_id"]]["active_by_default"]:
+                return False
+        return None
+
+
+class EntityScenarioActivityGraph(GraphBase):
+    """Answers whether entities are active in scenarios.
+
+    Activities are resolved once per scenario and entity and kept until relevant items change.
+    """
+
+    INVALIDATING_ITEM_TYPES: ClassVar[set[str]] = {
+        "scenario_alternative",
+        "entity_alternative",
+        "entity",
+        "entity_class",
+    }
+
+    def is_entity_active(self, db_map: DatabaseMapping, entity_id: TempId, scenario_id: TempId) -> bool | None:
+        return self.entity_activities(db_map, (entity_id,), scenario_id)[0]
+
+    def entity_activities(
+        self, db_map: DatabaseMapping, entity_ids: Iterable[TempId], scenario_id: TempId
+    ) -> list[bool | None]:
+        """Returns the activities of many entities in a scenario.
+
+        Args:
+            db_map: database mapping
+            entity_ids: entity ids
+            scenario_id: scenario id
+
+        Returns:
+            True if entity is active, False if it is inactive and None if the scenario does not decide
+        """
+        index = self._graphs.get(db_map)
+        if index is None:
+            index = self._graphs[db_map] = EntityActivityIndex(db_map)
+        return index.entity_activities(entity_ids, scenario_id)
+
+    def update_caches_after_data_changed(self, item_type: ItemType, db_map_data: DBMapMixedItems) -> None:
+        if item_type not in self.INVALIDATING_ITEM_TYPES:
+            return
+        for db_map, items in db_map_data.items():
+            index = self._graphs.get(db_map)
+            if index is None:
                 continue
-            alternative_id = entity_alternative["alternative_id"]
-            if alternative_id in graph:
-                entity_id = entity_alternative["entity_id"]
-                graph.add_node(entity_id)
-                graph.add_edge(alternative_id, entity_id, active=entity_alternative["active"])
-        return graph
+            items = [item for item in items if item]
+            if item_type == "entity_alternative":
+                index.update_entity_alternatives(items)
+            elif item_type == "scenario_alternative":
+                index.update_scenario_alternatives(items)
+            else:
+                index.forget_activities()
+
+    @Slot(object, str)
+    def maybe_invalidate_caches_after_fetch(self, db_map: DatabaseMapping, item_type: ItemType) -> None:
+        """Scenario and entity alternatives are fetched completely when the index is built
+        so fetching brings in nothing that would invalidate it."""
@@ -0,0 +1,237 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+"""An index from database commits to the items they modified last."""
+
+from __future__ import annotations
+import json
+import os
+from typing import Optional
+from sqlalchemy import func
+from spinedb_api import DatabaseMapping
+from spinedb_api.helpers import ItemType
+
+COMMIT_INDEX_SUFFIX = ".commit_index.json"
+"""Suffix of commit index files that are stored next to SQLite databases."""
+_FILE_VERSION = 1
+
+
+def commit_index_path(db_map: DatabaseMapping) -> Optional[str]:
+    """Returns the path of the commit index file of a database.
+
+    Args:
+        db_map: database mapping
+
+    Returns:
+        path next to the database file or None if the database is not an SQLite file
+    """
+    url = db_map.sa_url
+    if not url.drivername.startswith("sqlite") or not url.database or url.database == ":memory:":
+        return None
+    return url.database + COMMIT_INDEX_SUFFIX
+
+
+class CommitIndex:
+    """Maps commits to the database ids of the items that were added or updated last by the commits.
+
+    The index of an item type is built the first time it is needed by querying only the item and commit ids
+    of the type's table. Afterwards, only items with commit ids newer than the newest indexed commit are queried.
+    Optionally, the index is loaded from and saved to a file.
+
+    Items that have been removed from the database may linger in the index;
+    users should skip ids they cannot find.
+    """
+
+    INDEXED_ITEM_TYPES: tuple[ItemType, ...] = (
+        "alternative",
+        "scenario",
+        "scenario_alternative",
+        "entity",
+        "entity_alternative",
+        "parameter_value_list",
+        "list_value",
+        "parameter_definition",
+        "parameter_value",
+        "metadata",
+        "entity_metadata",
+        "parameter_value_metadata",
+    )
+    """Item types that have a commit id."""
+
+    def __init__(self, db_map: DatabaseMapping, path: Optional[str] = None):
+        """
+        Args:
+            db_map: database mapping
+            path: path to index file; if None, the index is not persisted
+        """
+        self._db_map = db_map
+        self._path = path
+        self._commit_by_item: dict[ItemType, dict[int, int]] = {}
+        self._items_by_commit: dict[ItemType, dict[int, dict[int, None]]] = {}
+        self._indexed_up_to: dict[ItemType, int] = {}
+        self._latest_commit: Optional[tuple[int, str]] = None
+        self._loaded_latest_commit: Optional[tuple[int, str]] = None
+        self._dirty = False
+        if path is not None:
+            self._load()
+
+    def item_ids(self, commit_id: int) -> dict[ItemType, list[int]]:
+        """Returns the database ids of items that were last modified by given commit.
+
+        Caller is responsible for holding the database mapping's lock.
+
+        Args:
+            commit_id: commit's database id
+
+        Returns:
+            mapping from item type to item ids
+        """
+        with self._db_map:
+            self._update_latest_commit()
+            item_ids = {}
+            for item_type in self.INDEXED_ITEM_TYPES:
+                ids = self._index(item_type).get(commit_id)
+                if ids:
+                    item_ids[item_type] = list(ids)
+        return item_ids
+
+    def save(self) -> None:
+        """Writes the index to its file if it has changed."""
+        if self._path is None or not self._dirty or self._latest_commit is None:
+            return
+        item_types = {}
+        for item_type, indexed_up_to in self._indexed_up_to.items():
+            commit_by_item = self._commit_by_item[item_type]
+            item_types[item_type] = {
+                "indexed_up_to": indexed_up_to,
+                "item_ids": list(commit_by_item),
+                "commit_ids": list(commit_by_item.values()),
+            }
+        data = {"version": _FILE_VERSION, "latest_commit": list(self._latest_commit), "item_types": item_types}
+        try:
+            temp_path = self._path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as index_file:
+                json.dump(data, index_file)
+            os.replace(temp_path, self._path)
+        except OSError:
+            return
+        self._dirty = False
+
+    def _load(self) -> None:
+        """Reads the index from its file."""
+        try:
+            with open(self._path, encoding="utf-8") as index_file:
+                data = json.load(index_file)
+            if data["version"] != _FILE_VERSION:
+                return
+            latest_commit_id, latest_commit_signature = data["latest_commit"]
+            for item_type, type_data in data["item_types"].items():
+                if item_type not in self.INDEXED_ITEM_TYPES:
+                    continue
+                self._commit_by_item[item_type] = {}
+                self._items_by_commit[item_type] = {}
+                for item_id, commit_id in zip(type_data["item_ids"], type_data["commit_ids"]):
+                    self._insert(item_type, item_id, commit_id)
+                self._indexed_up_to[item_type] = type_data["indexed_up_to"]
+        except (OSError, ValueError, KeyError, TypeError):
+            self._clear()
+            return
+        self._loaded_latest_commit = (latest_commit_id, latest_commit_signature)
+
+    def _clear(self) -> None:
+        """Empties the index."""
+        self._commit_by_item.clear()
+        self._items_by_commit.clear()
+        self._indexed_up_to.clear()
+
+    def _update_latest_commit(self) -> None:
+        """Queries the latest commit and drops a loaded index that does not belong to the database."""
+        commit_sq = self._db_map.commit_sq
+        latest_commit_id = self._db_map.query(func.max(commit_sq.c.id)).scalar()
+        if latest_commit_id is None:
+            self._latest_commit = None
+            return
+        if self._latest_commit is not None and self._latest_commit[0] == latest_commit_id:
+            return
+        signature = self._commit_signature(latest_commit_id)
+        self._latest_commit = (latest_commit_id, signature)
+        if self._loaded_latest_commit is not None:
+            loaded_id, loaded_signature = self._loaded_latest_commit
+            self._loaded_latest_commit = None
+            if loaded_id != latest_commit_id:
+                signature = self._commit_signature(loaded_id)
+            if signature != loaded_signature:
+                self._clear()
+
+    def _commit_signature(self, commit_id: int) -> Optional[str]:
+        """Returns a string that identifies a commit across database files.
+
+        Args:
+            commit_id: commit's database id
+
+        Returns:
+            commit's date and comment or None if commit does not exist
+        """
+        commit_sq = self._db_map.commit_sq
+        commit = self._db_map.query(commit_sq.c.date, commit_sq.c.comment).filter(commit_sq.c.id == commit_id).first()
+        if commit is None:
+            return None
+        return f"{commit.date} {commit.comment}"
+
+    def _index(self, item_type: ItemType) -> dict[int, dict[int, None]]:
+        """Returns the index of an item type, building or updating it if necessary.
+
+        Args:
+            item_type: item type
+
+        Returns:
+            mapping from commit id to item ids
+        """
+        if self._latest_commit is None:
+            return {}
+        latest_commit_id = self._latest_commit[0]
+        indexed_up_to = self._indexed_up_to.get(item_type)
+        if indexed_up_to is not None and indexed_up_to >= latest_commit_id:
+            return self._items_by_commit[item_type]
+        if indexed_up_to is None:
+            self._commit_by_item[item_type] = {}
+            self._items_by_commit[item_type] = {}
+        subquery = getattr(self._db_map, item_type + "_sq")
+        query = self._db_map.query(subquery.c.id, subquery.c.commit_id)
+        if indexed_up_to is not None:
+            query = query.filter(subquery.c.commit_id > indexed_up_to)
+        for item_id, commit_id in query:
+            self._insert(item_type, item_id, commit_id)
+        self._indexed_up_to[item_type] = latest_commit_id
+        self._dirty = True
+        return self._items_by_commit[item_type]
+
+    def _insert(self, item_type: ItemType, item_id: int, commit_id: Optional[int]) -> None:
+        """Adds an item to the index or moves it under a new commit.
+
+        Args:
+            item_type: item type
+            item_id: item's database id
+            commit_id: item's commit id
+        """
+        commit_by_item = self._commit_by_item[item_type]
+        items_by_commit = self._items_by_commit[item_type]
+        old_commit_id = commit_by_item.get(item_id)
+        if old_commit_id is not None:
+            old_ids = items_by_commit[old_commit_id]
+            del old_ids[item_id]
+            if not old_ids:
+                del items_by_commit[old_commit_id]
+        if commit_id is None:
+            commit_by_item.pop(item_id, None)
+            return
+        commit_by_item[item_id] = commit_id
+        items_by_commit.setdefault(commit_id, {})[item_id] = None
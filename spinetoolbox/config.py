@@ -47,6 +47,9 @@ SPINE_TOOLBOX_REPO_URL: Literal["https://github.com/spine-tools/Spine-Toolbox"]
 )
 
 PLUGINS_PATH = os.path.abspath(os.path.join(str(Path.home()), ".spinetoolbox", "plugins"))
+TYPE_VALIDATION_CACHE_PATH = os.path.abspath(
+    os.path.join(str(Path.home()), ".spinetoolbox", "cache", "type_validation_cache.json")
+)
 
 PLUGIN_REGISTRY_URL = "https://spine-tools.github.io/PluginRegistry/registry.json"
 # Jupyter kernel constants
@@ -60,5 +63,6 @@ PROJECT_LOCAL_DATA_FILENAME: Literal["project_local_data.json"] = "project_local
 PROJECT_CONSUMER_REPLAY_FILENAME: Literal["consumer_replay.json"] = "consumer_replay.json"
 SPECIFICATION_LOCAL_DATA_FILENAME: Literal["specification_local_data.json"] = "specification_local_data.json"
 PROJECT_ZIP_FILENAME: Literal["project_package"] = "project_package"  # ZIP-file name for remote execution
+PROJECT_UPLOAD_MANIFEST_FILENAME: Literal["upload_manifest.json"] = "upload_manifest.json"
 
 FG_COLOR = "#F0F0F0"
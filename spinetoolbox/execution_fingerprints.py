@@ -0,0 +1,260 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+"""Contains input fingerprints of project items that enable incremental execution."""
+
+from __future__ import annotations
+from collections.abc import Iterable
+import hashlib
+import json
+import os
+from typing import Any, Optional
+import networkx as nx
+from spine_engine.project_item.project_item_resource import ProjectItemResource
+from .config import PROJECT_CONFIG_DIR_NAME, PROJECT_LOCAL_DATA_DIR_NAME
+
+FINGERPRINTS_FILENAME = "execution_fingerprints.json"
+_LAYOUT_KEYS = {"x", "y", "description"}
+"""Item dict keys that do not affect execution."""
+
+
+def item_fingerprint(
+    item_dict: dict,
+    specification_dict: Optional[dict],
+    connection_dicts: Iterable[dict],
+    resource_stamps: Iterable[Any],
+) -> str:
+    """Computes a digest of everything that goes into an item's execution.
+
+    Program files listed in specification's ``includes`` are stamped as well.
+
+    Args:
+        item_dict: serialized item
+        specification_dict: serialized item specification including ``definition_file_path``
+        connection_dicts: serialized incoming connections including their filter settings
+        resource_stamps: stamps of item's input resources
+
+    Returns:
+        hex digest
+    """
+    inputs = {
+        "item": {key: value for key, value in item_dict.items() if key not in _LAYOUT_KEYS},
+        "specification": specification_dict,
+        "program_files": specification_stamps(specification_dict),
+        "connections": list(connection_dicts),
+        "resources": list(resource_stamps),
+    }
+    serialized = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def resource_stamp(resource: ProjectItemResource, include_file_state: bool = True) -> list:
+    """Returns a stamp that identifies a resource and changes when the file behind it changes.
+
+    Args:
+        resource: resource to stamp
+        include_file_state: if True, include size and modification time of resource's file
+
+    Returns:
+        JSON serializable stamp
+    """
+    stamp = [resource.type_, resource.label, resource.url, resource.metadata.get("filter_id")]
+    if include_file_state and resource.hasfilepath:
+        stamp.append(file_stamp(resource.path))
+    return stamp
+
+
+def input_stamps(
+    item_dict: dict,
+    project_dir: str,
+    forward_resources: Iterable[ProjectItemResource],
+    backward_resources: Iterable[ProjectItemResource],
+) -> list:
+    """Stamps the files and resources an item's execution depends on.
+
+    GUI and headless execution both stamp items through this function
+    so they agree on when an item is up to date.
+
+    Args:
+        item_dict: serialized item
+        project_dir: path to project directory
+        forward_resources: resources from direct predecessors as converted by incoming connections
+        backward_resources: resources from direct successors
+
+    Returns:
+        list: JSON serializable stamps
+    """
+    stamps = path_stamps(item_dict, project_dir)
+    stamps += [resource_stamp(resource) for resource in forward_resources]
+    stamps += [resource_stamp(resource, include_file_state=False) for resource in backward_resources]
+    return stamps
+
+
+def path_stamps(item_dict: dict, project_dir: str) -> list:
+    """Stamps the files referred to by serialized paths in an item dict.
+
+    Args:
+        item_dict: serialized item
+        project_dir: path to project directory
+
+    Returns:
+        list: JSON serializable stamps
+    """
+    stamps = []
+    _collect_path_stamps(item_dict, project_dir, stamps)
+    return stamps
+
+
+def _collect_path_stamps(value: Any, project_dir: str, stamps: list) -> None:
+    """Recursively stamps serialized paths in given value.
+
+    Args:
+        value: item dict or a part of it
+        project_dir: path to project directory
+        stamps: stamp accumulator
+    """
+    if isinstance(value, dict):
+        if value.get("type") in ("path", "file_url") and isinstance(value.get("path"), str):
+            path = os.path.join(project_dir, value["path"]) if value.get("relative") else value["path"]
+            stamps.append([value["path"], file_stamp(os.path.normpath(path))])
+            return
+        for child in value.values():
+            _collect_path_stamps(child, project_dir, stamps)
+    elif isinstance(value, list):
+        for child in value:
+            _collect_path_stamps(child, project_dir, stamps)
+
+
+def specification_stamps(specification_dict: Optional[dict]) -> list:
+    """Stamps the program files listed in a specification's ``includes``.
+
+    Args:
+        specification_dict: serialized specification including ``definition_file_path``
+
+    Returns:
+        list: JSON serializable stamps
+    """
+    if not specification_dict or not isinstance(specification_dict.get("includes"), list):
+        return []
+    main_path = specification_dict.get("includes_main_path") or ""
+    definition_file_path = specification_dict.get("definition_file_path")
+    if definition_file_path and not os.path.isabs(main_path):
+        main_path = os.path.join(os.path.dirname(definition_file_path), main_path)
+    return [
+        [include, file_stamp(os.path.normpath(os.path.join(main_path, include)))]
+        for include in specification_dict["includes"]
+        if isinstance(include, str)
+    ]
+
+
+def file_stamp(path: str) -> Optional[list[int]]:
+    """Returns size and modification time of a file or None if the file does not exist.
+
+    Args:
+        path: path to file
+
+    Returns:
+        list of int: file size and modification time in nanoseconds
+    """
+    try:
+        stat = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def incremental_execution_permits(
+    dag: nx.DiGraph, execution_permits: dict[str, bool], fingerprints: dict[str, str], store: ExecutionFingerprints
+) -> dict[str, bool]:
+    """Narrows execution permits to items whose inputs have changed since their last successful execution.
+
+    Items downstream of an item that executes are executed too since their inputs may change.
+
+    Args:
+        dag: DAG to execute
+        execution_permits: mapping from item name to a boolean telling if the item is permitted to execute
+        fingerprints: current fingerprints of permitted items
+        store: fingerprints from previous executions
+
+    Returns:
+        dict: narrowed execution permits
+    """
+    permits = {}
+    for item_name in nx.topological_sort(dag):
+        if not execution_permits.get(item_name, False):
+            permits[item_name] = False
+            continue
+        permits[item_name] = store.get(item_name) != fingerprints[item_name] or any(
+            permits[predecessor] for predecessor in dag.predecessors(item_name)
+        )
+    return permits
+
+
+class ExecutionFingerprints:
+    """Input fingerprints of successfully executed items stored in project's local data directory."""
+
+    def __init__(self, project_dir: str):
+        """
+        Args:
+            project_dir: path to project directory
+        """
+        self._path = os.path.join(
+            project_dir, PROJECT_CONFIG_DIR_NAME, PROJECT_LOCAL_DATA_DIR_NAME, FINGERPRINTS_FILENAME
+        )
+        self._fingerprints: dict[str, str] = self._load()
+
+    def _load(self) -> dict[str, str]:
+        """Reads stored fingerprints from disk.
+
+        Returns:
+            dict: mapping from item name to fingerprint
+        """
+        try:
+            with open(self._path, encoding="utf-8") as fingerprint_file:
+                fingerprints = json.load(fingerprint_file)
+        except (OSError, ValueError):
+            return {}
+        return fingerprints if isinstance(fingerprints, dict) else {}
+
+    def get(self, item_name: str) -> Optional[str]:
+        """Returns the fingerprint of item's last successful execution.
+
+        Args:
+            item_name: item's name
+
+        Returns:
+            str: fingerprint or None if item has not executed successfully
+        """
+        return self._fingerprints.get(item_name)
+
+    def set(self, item_name: str, fingerprint: str) -> None:
+        """Stores item's fingerprint.
+
+        Args:
+            item_name: item's name
+            fingerprint: item's fingerprint
+        """
+        self._fingerprints[item_name] = fingerprint
+
+    def discard(self, item_names: Iterable[str]) -> None:
+        """Forgets fingerprints of given items so they will be executed next time.
+
+        Args:
+            item_names: item names
+        """
+        for name in item_names:
+            self._fingerprints.pop(name, None)
+
+    def save(self) -> None:
+        """Writes fingerprints to disk."""
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        with open(self._path, "w", encoding="utf-8") as fingerprint_file:
+            json.dump(self._fingerprints, fingerprint_file, indent=2, sort_keys=True)
@@ -0,0 +1,193 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+"""Contains a bounded buffer that collects execution messages between GUI updates."""
+
+from __future__ import annotations
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+import os
+import tempfile
+from threading import Lock
+from typing import Any, Optional, TextIO
+from .helpers import MessageType
+
+MESSAGE_BUFFER_CAPACITY = 1000
+"""Maximum number of messages kept per item and filter between GUI updates."""
+
+
+@dataclass
+class MessageBatch:
+    """Messages of a single item and filter collected since the previous batch."""
+
+    item: Any
+    filter_id: str
+    head: list[tuple[bool, MessageType, str]] = field(default_factory=list)
+    """Event messages that were pushed out of the ring before the dropped process messages."""
+    dropped_count: int = 0
+    """Number of process messages that were dropped."""
+    spool_path: Optional[str] = None
+    """Path to the file that contains the full process output since the first dropped message."""
+    messages: list[tuple[bool, MessageType, str]] = field(default_factory=list)
+    """Messages as (is process message, message type, message text) tuples."""
+
+
+class _Ring:
+    """Messages of a single item and filter."""
+
+    def __init__(self):
+        self.messages: deque[tuple[bool, MessageType, str]] = deque()
+        self.head: list[tuple[bool, MessageType, str]] = []
+        self.dropped_count = 0
+
+
+class ExecutionMessageBuffer:
+    """Coalesces event and process messages per item and filter id.
+
+    The engine worker thread adds messages while the GUI thread takes them out in batches.
+    Event messages are never dropped but process messages are:
+    when a ring fills up, the oldest process messages are dropped
+    and the full process output from that point onwards is written to a spool file on disk.
+    """
+
+    def __init__(self, capacity: int = MESSAGE_BUFFER_CAPACITY):
+        """
+        Args:
+            capacity: maximum number of messages per item and filter between batches
+        """
+        self._capacity = capacity
+        self._lock = Lock()
+        self._rings: dict[tuple[Any, str], _Ring] = {}
+        self._spools: dict[tuple[Any, str], tuple[Optional[TextIO], Optional[str]]] = {}
+
+    def add_event_message(self, item: Any, filter_id: str, msg_type: MessageType, msg_text: str) -> bool:
+        """Adds an event message.
+
+        Args:
+            item: project item or connection
+            filter_id: filter identifier
+            msg_type: message type
+            msg_text: message text
+
+        Returns:
+            True if the buffer was empty before the message was added, False otherwise
+        """
+        return self._add(item, filter_id, (False, msg_type, msg_text), None)
+
+    def add_process_message(
+        self, item: Any, filter_id: str, msg_type: MessageType, msg_text: str, spool_dir: Optional[str] = None
+    ) -> bool:
+        """Adds a process message.
+
+        Args:
+            item: project item or connection
+            filter_id: filter identifier
+            msg_type: message type
+            msg_text: message text
+            spool_dir: directory where to create the spool file if messages need to be dropped;
+                if None, system's temporary directory is used
+
+        Returns:
+            True if the buffer was empty before the message was added, False otherwise
+        """
+        return self._add(item, filter_id, (True, msg_type, msg_text), spool_dir)
+
+    def _add(self, item: Any, filter_id: str, message: tuple[bool, MessageType, str], spool_dir: Optional[str]) -> bool:
+        """Adds a message to item's ring dropping the oldest process message if the ring is full.
+
+        Args:
+            item: project item or connection
+            filter_id: filter identifier
+            message: message to add
+            spool_dir: directory for the spool file
+
+        Returns:
+            True if the buffer was empty before the message was added, False otherwise
+        """
+        key = (item, filter_id)
+        with self._lock:
+            was_empty = not self._rings
+            ring = self._rings.get(key)
+            if ring is None:
+                ring = self._rings[key] = _Ring()
+            spool, _ = self._spools.get(key, (None, None))
+            if len(ring.messages) == self._capacity:
+                if key not in self._spools:
+                    self._spools[key] = spool, _ = self._open_spool(spool_dir)
+                    self._write_to_spool(spool, ring.messages)
+                while len(ring.messages) >= self._capacity:
+                    is_process_message, *_ = oldest = ring.messages.popleft()
+                    if is_process_message:
+                        ring.dropped_count += 1
+                    else:
+                        ring.head.append(oldest)
+            ring.messages.append(message)
+            if spool is not None:
+                self._write_to_spool(spool, (message,))
+            return was_empty
+
+    @staticmethod
+    def _open_spool(spool_dir: Optional[str]) -> tuple[Optional[TextIO], Optional[str]]:
+        """Opens a new spool file.
+
+        Args:
+            spool_dir: directory for the spool file
+
+        Returns:
+            opened file and its path or Nones if the file could not be opened
+        """
+        try:
+            if spool_dir is not None:
+                os.makedirs(spool_dir, exist_ok=True)
+            handle, path = tempfile.mkstemp(prefix="process_output_", suffix=".log", dir=spool_dir, text=True)
+        except OSError:
+            return None, None
+        return open(handle, "w", encoding="utf-8"), path
+
+    @staticmethod
+    def _write_to_spool(spool: Optional[TextIO], messages: Iterable[tuple[bool, MessageType, str]]) -> None:
+        """Writes process messages to a spool file.
+
+        Args:
+            spool: spool file
+            messages: messages to write
+        """
+        if spool is None:
+            return
+        spool.writelines(text + "\n" for is_process_message, _, text in messages if is_process_message)
+
+    def take_batches(self) -> list[MessageBatch]:
+        """Empties the buffer.
+
+        Returns:
+            collected messages in batches
+        """
+        with self._lock:
+            rings = self._rings
+            self._rings = {}
+            batches = []
+            for (item, filter_id), ring in rings.items():
+                spool, spool_path = self._spools.get((item, filter_id), (None, None))
+                if spool is not None:
+                    spool.flush()
+                batches.append(
+                    MessageBatch(item, filter_id, ring.head, ring.dropped_count, spool_path, list(ring.messages))
+                )
+            return batches
+
+    def close(self) -> None:
+        """Closes the spool files."""
+        with self._lock:
+            for spool, _ in self._spools.values():
+                if spool is not None:
+                    spool.close()
+            self._spools.clear()
@@ -0,0 +1,280 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+"""Contains a profiler that records execution timelines from engine events."""
+
+from __future__ import annotations
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass, field
+import json
+from threading import Lock
+import time
+from typing import Any, Optional
+import networkx as nx
+
+
+@dataclass
+class Span:
+    """A timed interval of a DAG's execution."""
+
+    item_name: str
+    direction: str
+    filter_id: str
+    start: float
+    end: Optional[float] = None
+    item_state: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        """Span's length in seconds; zero for unfinished spans."""
+        return self.end - self.start if self.end is not None else 0.0
+
+
+@dataclass
+class DagProfile:
+    """Timings of a single DAG."""
+
+    dag_id: Hashable
+    label: str
+    start: float
+    graph: Optional[nx.DiGraph] = None
+    end: Optional[float] = None
+    item_spans: list[Span] = field(default_factory=list)
+    """Spans from item execution start to finish."""
+    filter_spans: list[Span] = field(default_factory=list)
+    """Spans from the first to the last message of each filtered execution."""
+
+    @property
+    def wall_time(self) -> float:
+        """Time from DAG start to its end or to the end of its last finished item, in seconds."""
+        end = self.end if self.end is not None else max((span.end for span in self._finished_spans()), default=None)
+        return end - self.start if end is not None else 0.0
+
+    @property
+    def busy_time(self) -> float:
+        """Sum of item execution times in seconds."""
+        return sum(span.duration for span in self.item_spans)
+
+    def item_times(self) -> dict[str, float]:
+        """Returns total execution time of each item in both directions.
+
+        Returns:
+            dict: mapping from item name to seconds
+        """
+        times = {}
+        for span in self.item_spans:
+            times[span.item_name] = times.get(span.item_name, 0.0) + span.duration
+        return times
+
+    def critical_path(self) -> tuple[list[str], float]:
+        """Finds the chain of dependent items with the largest total execution time.
+
+        Returns:
+            tuple: item names along the path and the path's total time in seconds
+        """
+        if self.graph is None:
+            return [], 0.0
+        times = self.item_times()
+        path_times = {}
+        predecessors = {}
+        for node in nx.topological_sort(self.graph):
+            best_predecessor = max(self.graph.predecessors(node), key=path_times.get, default=None)
+            path_times[node] = times.get(node, 0.0) + (
+                path_times[best_predecessor] if best_predecessor is not None else 0.0
+            )
+            predecessors[node] = best_predecessor
+        if not path_times:
+            return [], 0.0
+        node = max(path_times, key=path_times.get)
+        total = path_times[node]
+        path = []
+        while node is not None:
+            path.append(node)
+            node = predecessors[node]
+        path.reverse()
+        return path, total
+
+    def _finished_spans(self):
+        return (span for span in self.item_spans if span.end is not None)
+
+
+class ExecutionProfiler:
+    """Collects per item, direction and filter timings from engine events of one or more DAGs.
+
+    Engine events carry no timestamps, so events are timed when they are recorded.
+    The engine does not signal when a filtered execution starts or ends;
+    filter spans cover the time from the first to the last message of the filter.
+    Recording is thread-safe so DAGs executing in different threads may share a profiler.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        """
+        Args:
+            clock: function that returns current time in seconds
+        """
+        self._clock = clock
+        self._lock = Lock()
+        self._origin = None
+        self._dags: dict[Hashable, DagProfile] = {}
+        self._open_item_spans: dict[tuple[Hashable, str, str], Span] = {}
+        self._filter_spans: dict[tuple[Hashable, str, str], Span] = {}
+
+    def start_dag(self, dag_id: Hashable, label: str | None = None, graph: nx.DiGraph | None = None) -> None:
+        """Starts profiling a DAG.
+
+        Args:
+            dag_id: DAG identifier that is passed to :meth:`record_event`
+            label: DAG's name in reports; defaults to the identifier
+            graph: DAG's graph used to find critical paths
+        """
+        with self._lock:
+            now = self._now()
+            self._dags[dag_id] = DagProfile(dag_id, label if label is not None else str(dag_id), now, graph)
+
+    def record_event(self, dag_id: Hashable, event_type: str, data: Any) -> None:
+        """Records an engine event.
+
+        Args:
+            dag_id: identifier of the DAG that sent the event
+            event_type: engine event type
+            data: event data
+        """
+        if event_type not in ("exec_started", "exec_finished", "event_msg", "process_msg", "dag_exec_finished"):
+            return
+        with self._lock:
+            now = self._now()
+            profile = self._dags.get(dag_id)
+            if profile is None:
+                profile = self._dags[dag_id] = DagProfile(dag_id, str(dag_id), now)
+            if event_type == "exec_started":
+                span = Span(data["item_name"], _direction_name(data["direction"]), "", now)
+                self._open_item_spans[(dag_id, span.item_name, span.direction)] = span
+                profile.item_spans.append(span)
+            elif event_type == "exec_finished":
+                span = self._open_item_spans.pop((dag_id, data["item_name"], _direction_name(data["direction"])), None)
+                if span is None:
+                    return
+                span.end = now
+                span.item_state = str(data["item_state"])
+            elif event_type == "dag_exec_finished":
+                profile.end = now
+            else:
+                filter_id = data.get("filter_id")
+                if not filter_id:
+                    return
+                key = (dag_id, data["item_name"], filter_id)
+                span = self._filter_spans.get(key)
+                if span is None:
+                    span = self._filter_spans[key] = Span(data["item_name"], "FORWARD", filter_id, now, now)
+                    profile.filter_spans.append(span)
+                else:
+                    span.end = now
+
+    def dag_profiles(self) -> list[DagProfile]:
+        """Returns the profiles of all recorded DAGs in start order.
+
+        Returns:
+            list of DagProfile: DAG profiles
+        """
+        with self._lock:
+            return list(self._dags.values())
+
+    def summary(self) -> list[str]:
+        """Summarizes each DAG's timings in human-readable form.
+
+        Returns:
+            list of str: one line per DAG
+        """
+        lines = []
+        for profile in self.dag_profiles():
+            line = f"DAG {profile.label}: {profile.wall_time:.2f} s wall time, {profile.busy_time:.2f} s busy"
+            path, path_time = profile.critical_path()
+            if path:
+                line += f", critical path {' -> '.join(path)} ({path_time:.2f} s)"
+            lines.append(line)
+        return lines
+
+    def chrome_trace(self) -> dict:
+        """Converts recorded timings to Chrome's trace event format.
+
+        Each DAG becomes a process; its item and filter spans are packed greedily on non-overlapping threads
+        so that gaps between spans show idle time.
+
+        Returns:
+            dict: trace that can be serialized to JSON
+        """
+        events = []
+        for pid, profile in enumerate(self.dag_profiles(), start=1):
+            events.append(_metadata_event("process_name", pid, 0, f"DAG {profile.label}"))
+            events.append(_metadata_event("thread_name", pid, 0, "DAG"))
+            dag_end = profile.start + profile.wall_time
+            events.append(self._complete_event(f"DAG {profile.label}", "dag", pid, 0, profile.start, dag_end, {}))
+            lane_ends = []
+            spans = sorted(profile.item_spans + profile.filter_spans, key=lambda s: (s.start, not s.filter_id))
+            for span in spans:
+                end = span.end if span.end is not None else dag_end
+                for lane, lane_end in enumerate(lane_ends):
+                    if lane_end <= span.start:
+                        lane_ends[lane] = end
+                        break
+                else:
+                    lane = len(lane_ends)
+                    lane_ends.append(end)
+                    events.append(_metadata_event("thread_name", pid, lane + 1, f"Lane {lane + 1}"))
+                if span.filter_id:
+                    name = f"{span.item_name} [{span.filter_id}]"
+                    args = {"item": span.item_name, "filter_id": span.filter_id}
+                    category = "filter"
+                else:
+                    name = span.item_name if span.direction == "FORWARD" else f"{span.item_name} ({span.direction})"
+                    args = {"item": span.item_name, "direction": span.direction, "state": span.item_state}
+                    category = "item"
+                events.append(self._complete_event(name, category, pid, lane + 1, span.start, end, args))
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: str) -> None:
+        """Writes recorded timings to a JSON file in Chrome's trace event format.
+
+        Args:
+            path: output file path
+        """
+        with open(path, "w", encoding="utf-8") as trace_file:
+            json.dump(self.chrome_trace(), trace_file)
+
+    def _now(self) -> float:
+        now = self._clock()
+        if self._origin is None:
+            self._origin = now
+        return now
+
+    def _complete_event(self, name, category, pid, tid, start, end, args):
+        return {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "pid": pid,
+            "tid": tid,
+            "ts": _microseconds(start - self._origin),
+            "dur": _microseconds(end - start),
+            "args": args,
+        }
+
+
+def _direction_name(direction: Any) -> str:
+    return getattr(direction, "name", str(direction))
+
+
+def _microseconds(seconds: float) -> float:
+    return round(seconds * 1e6, 3)
+
+
+def _metadata_event(name: str, pid: int, tid: int, value: str) -> dict:
+    return {"name": name, "ph": "M", "pid": pid, "tid": tid, "args": {"name": value}}
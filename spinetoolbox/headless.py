@@ -14,31 +14,40 @@
 
 from __future__ import annotations
 import argparse
+from collections import deque
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from enum import IntEnum, unique
 import os
 import pathlib
+import queue
 import sys
 from typing import Any
 import networkx as nx
 from PySide6.QtCore import QCoreApplication, QEvent, QObject, QSettings, Signal, Slot
 from spine_engine import SpineEngineState
 from spine_engine.exception import EngineInitFailed
-from spine_engine.load_project_items import load_item_specification_factories
+from spine_engine.load_project_items import load_executable_item_classes, load_item_specification_factories
 from spine_engine.logger_interface import LoggerInterface
+from spine_engine.project_item.executable_item_base import ExecutableItemBase
 from spine_engine.server.util.zip_handler import ZipHandler
-from spine_engine.utils.helpers import ExecutionDirection, get_file_size
+from spine_engine.spine_engine import ItemExecutionFinishState
+from spine_engine.utils.helpers import AppSettings, ExecutionDirection, get_file_size
 from spine_engine.utils.serialization import deserialize_path
 from .config import (
     LATEST_PROJECT_VERSION,
     PROJECT_CONFIG_DIR_NAME,
     PROJECT_CONSUMER_REPLAY_FILENAME,
     PROJECT_LOCAL_DATA_DIR_NAME,
+    PROJECT_UPLOAD_MANIFEST_FILENAME,
     PROJECT_ZIP_FILENAME,
 )
+from .execution_fingerprints import ExecutionFingerprints, incremental_execution_permits, input_stamps, item_fingerprint
+from .execution_profiler import ExecutionProfiler
 from .helpers import (
     HTMLTagFilter,
+    QuietLogger,
     make_settings_dict_for_engine,
 )
 from .load_project import (
@@ -67,9 +76,18 @@ from .project_upgrader import (
     check_project_version,
     upgrade_project,
 )
-from .server.engine_client import ClientSecurityModel, EngineClient, RemoteEngineInitFailed
+from .server.engine_client import (
+    ClientSecurityModel,
+    IncrementalUploadNotSupported,
+    RemoteEngineInitFailed,
+)
+from .server.engine_client_pool import engine_client_pool
+from .server.project_manifest import make_manifest
 from .spine_engine_manager import make_engine_manager
 
+_DAG_FAILED = "_dag_failed"
+"""Event type for DAGs that fail before the engine reports their end."""
+
 
 class HeadlessLogger(QObject):
     """A :class:`LoggerInterface` compliant logger that uses Python's standard logging facilities."""
@@ -217,6 +235,7 @@ class ActionsWithProject(QObject):
         self._startup_event_type = startup_event_type
         self._start.connect(self._execute)
         self._node_messages = {}
+        self._successful_items = set()
         self._project_dir: pathlib.Path | None = None
         self._app_settings: QSettings | None = None
         self._item_dicts: dict | None = None
@@ -394,6 +413,11 @@ class ActionsWithProject(QObject):
         deselected = {name for name_list in self._args.deselect for name in name_list} if self._args.deselect else None
         executed_items = set()
         skipped_items = set()
+        engine_data_list = []
+        executed_dags = []
+        fingerprint_store = ExecutionFingerprints(str(self._project_dir)) if self._args.incremental else None
+        executable_items = self._make_executable_items(settings) if fingerprint_store is not None else {}
+        up_to_date_items = []
         for dag in dags:
             item_names_in_dag = set(dag.nodes)
             if not nx.is_directed_acyclic_graph(dag):
@@ -411,30 +435,50 @@ class ActionsWithProject(QObject):
             if all(not permitted for permitted in execution_permits.values()):
                 continue
             executed_items |= {name for name, selected in execution_permits.items() if selected}
-            engine_data = {
-                "items": item_dicts_in_dag,
-                "specifications": self._specification_dicts,
-                "connections": self._connection_dicts,
-                "jumps": self._jump_dicts,
-                "execution_permits": execution_permits,
-                "items_module_name": "spine_items",
-                "settings": settings,
-                "project_dir": self._project_dir.as_posix(),
-            }
-            exec_remotely = bool(self._server_config)
-            engine_manager = make_engine_manager(exec_remotely, job_id=job_id)
-            try:
-                engine_manager.run_engine(engine_data)
-            except EngineInitFailed as error:
-                self._logger.msg_error.emit(f"Engine failed to start: {error}")
-                return Status.ERROR
-            while True:
-                event_type, data = engine_manager.get_engine_event()
-                self._process_engine_event(event_type, data)
-                if event_type == "dag_exec_finished":
-                    if data == str(SpineEngineState.FAILED):
-                        return Status.ERROR
-                    break
+            if fingerprint_store is not None:
+                fingerprints = {
+                    name: self._item_fingerprint(name, executable_items)
+                    for name, permitted in execution_permits.items()
+                    if permitted
+                }
+                execution_permits = incremental_execution_permits(
+                    dag, execution_permits, fingerprints, fingerprint_store
+                )
+                up_to_date_items += [name for name in fingerprints if not execution_permits[name]]
+                if all(not permitted for permitted in execution_permits.values()):
+                    continue
+            engine_data_list.append(
+                {
+                    "items": item_dicts_in_dag,
+                    "specifications": self._specification_dicts,
+                    "connections": self._connection_dicts,
+                    "jumps": self._jump_dicts,
+                    "execution_permits": execution_permits,
+                    "items_module_name": "spine_items",
+                    "settings": settings,
+                    "project_dir": self._project_dir.as_posix(),
+                }
+            )
+            executed_dags.append(dag)
+        if fingerprint_store is not None:
+            if up_to_date_items:
+                self._logger.msg.emit(f"Skipping up-to-date items: {', '.join(up_to_date_items)}")
+            fingerprint_store.discard(
+                name
+                for engine_data in engine_data_list
+                for name, permitted in engine_data["execution_permits"].items()
+                if permitted
+            )
+            self._save_fingerprints(fingerprint_store)
+        self._successful_items.clear()
+        status = self._execute_dags(engine_data_list, job_id, executed_dags)
+        if fingerprint_store is not None:
+            executable_items = self._make_executable_items(settings)
+            for name in self._successful_items:
+                fingerprint_store.set(name, self._item_fingerprint(name, executable_items))
+            self._save_fingerprints(fingerprint_store)
+        if status != Status.OK:
+            return status
         selected_invalid = selected - executed_items if selected is not None else None
         deselected_invalid = deselected - skipped_items if deselected is not None else None
         if selected_invalid:
@@ -447,6 +491,168 @@ class ActionsWithProject(QObject):
             )
         return Status.OK
 
+    def _make_executable_items(self, settings: dict) -> dict[str, ExecutableItemBase]:
+        """Instantiates executable items so their resources can be stamped.
+
+        Items that cannot be instantiated are left out and contribute no resources to fingerprints.
+
+        Args:
+            settings: engine settings
+
+        Returns:
+            mapping from item name to executable item
+        """
+        app_settings = AppSettings(settings)
+        specification_factories = load_item_specification_factories("spine_items")
+        executable_item_classes = load_executable_item_classes("spine_items")
+        specifications = {}
+        for item_type, spec_dicts in self._specification_dicts.items():
+            factory = specification_factories.get(item_type)
+            if factory is None:
+                continue
+            item_specifications = specifications[item_type] = {}
+            for spec_dict in spec_dicts:
+                try:
+                    specification = factory.make_specification(spec_dict, app_settings, None)
+                except Exception:  # pylint: disable=broad-except
+                    continue
+                item_specifications[specification.name] = specification
+        logger = QuietLogger()
+        executable_items = {}
+        for name, item_dict in self._item_dicts.items():
+            item_class = executable_item_classes.get(item_dict["type"])
+            if item_class is None:
+                continue
+            try:
+                executable_items[name] = item_class.from_dict(
+                    item_dict, name, self._project_dir.as_posix(), app_settings, specifications, logger
+                )
+            except Exception:  # pylint: disable=broad-except
+                continue
+        return executable_items
+
+    def _item_fingerprint(self, name: str, executable_items: dict[str, ExecutableItemBase]) -> str:
+        """Computes a digest of item's settings, specification, incoming connections and resources.
+
+        Args:
+            name: item's name
+            executable_items: executable items that provide resources
+
+        Returns:
+            fingerprint
+        """
+        item_dict = self._item_dicts[name]
+        specification_name = item_dict.get("specification")
+        specification_dict = next(
+            (
+                spec_dict
+                for spec_dict in self._specification_dicts.get(item_dict["type"], [])
+                if spec_dict["name"] == specification_name
+            ),
+            None,
+        )
+        connection_dicts = []
+        forward_resources = []
+        backward_resources = []
+        for connection_dict in self._connection_dicts:
+            connection = HeadlessConnection.from_dict(connection_dict)
+            if connection.destination == name:
+                connection_dicts.append(connection_dict)
+                source = executable_items.get(connection.source)
+                if source is not None:
+                    resources = source.output_resources(ExecutionDirection.FORWARD)
+                    forward_resources += connection.convert_forward_resources(resources)
+            elif connection.source == name:
+                destination = executable_items.get(connection.destination)
+                if destination is not None:
+                    backward_resources += destination.output_resources(ExecutionDirection.BACKWARD)
+        stamps = input_stamps(item_dict, str(self._project_dir), forward_resources, backward_resources)
+        return item_fingerprint(item_dict, specification_dict, connection_dicts, stamps)
+
+    def _save_fingerprints(self, fingerprint_store: ExecutionFingerprints) -> None:
+        """Writes execution fingerprints to disk.
+
+        Args:
+            fingerprint_store: fingerprints to save
+        """
+        try:
+            fingerprint_store.save()
+        except OSError as error:
+            self._logger.msg_warning.emit(f"Failed to save execution fingerprints: {error}")
+
+    def _execute_dags(self, engine_data_list: list[dict], job_id: str, dags: list[nx.DiGraph] | None = None) -> Status:
+        """Executes DAGs running at most as many of them concurrently as given by the --jobs argument.
+
+        Events from all running DAGs are processed in this thread in the order they arrive.
+        If a DAG fails, no new DAGs are started but the already running ones are allowed to finish.
+        If the --profile-out argument was given, execution timeline is written to the given file.
+
+        Args:
+            engine_data_list: engine data for each DAG
+            job_id: remote execution job id
+            dags: graph of each DAG
+
+        Returns:
+            status code
+        """
+        if not engine_data_list:
+            return Status.OK
+        exec_remotely = bool(self._server_config)
+        job_count = min(self._args.jobs, len(engine_data_list))
+        events = queue.Queue()
+        status = Status.OK
+        pending_dags = deque(enumerate(engine_data_list))
+        running_dag_count = 0
+        profile_out = self._args.profile_out
+        profiler = ExecutionProfiler() if profile_out else None
+        with ThreadPoolExecutor(max_workers=job_count, thread_name_prefix="DAG execution") as executor:
+            while pending_dags or running_dag_count:
+                while pending_dags and running_dag_count < job_count:
+                    dag_number, engine_data = pending_dags.popleft()
+                    if profiler is not None:
+                        dag = dags[dag_number] if dags is not None else None
+                        profiler.start_dag(dag_number, f"{dag_number + 1}/{len(engine_data_list)}", dag)
+                    executor.submit(_run_dag, dag_number, engine_data, exec_remotely, job_id, events, profiler)
+                    running_dag_count += 1
+                dag_number, event_type, data = events.get()
+                if event_type == _DAG_FAILED:
+                    self._logger.msg_error.emit(data)
+                    finished = True
+                    failed = True
+                else:
+                    self._process_engine_event(event_type, data)
+                    finished = event_type == "dag_exec_finished"
+                    failed = finished and data == str(SpineEngineState.FAILED)
+                if not finished:
+                    continue
+                running_dag_count -= 1
+                if failed:
+                    status = Status.ERROR
+                    pending_dags.clear()
+        if profiler is not None and not self._write_profile(profiler, profile_out):
+            return Status.ERROR
+        return status
+
+    def _write_profile(self, profiler: ExecutionProfiler, path: str) -> bool:
+        """Logs execution time summary and writes the timeline to a Chrome trace file.
+
+        Args:
+            profiler: execution profiler
+            path: output file path
+
+        Returns:
+            True if the file was written successfully, False otherwise
+        """
+        for line in profiler.summary():
+            self._logger.msg.emit(line)
+        try:
+            profiler.write_chrome_trace(path)
+        except OSError as error:
+            self._logger.msg_error.emit(f"Failed to write execution profile: {error}")
+            return False
+        self._logger.msg.emit(f"Execution profile written to {path}")
+        return True
+
     def _process_engine_event(self, event_type: str, data: dict) -> None:
         try:
             handler: Callable[[dict], None] = {
@@ -488,6 +694,8 @@ class ActionsWithProject(QObject):
             data: execution end data
         """
         item_name = data["item_name"]
+        if data["direction"] == ExecutionDirection.FORWARD and data["item_state"] == ItemExecutionFinishState.SUCCESS:
+            self._successful_items.add(item_name)
         messages = self._node_messages.get(item_name)
         if messages is None:
             return
@@ -618,35 +826,102 @@ class ActionsWithProject(QObject):
         security_on = self._server_config["security_model"].lower() != ""
         sec_model = ClientSecurityModel.STONEHOUSE if security_on else ClientSecurityModel.NONE
         try:
-            engine_client = EngineClient(host, port, sec_model, self._server_config["security_folder"])
+            engine_client = engine_client_pool.acquire(host, port, sec_model, self._server_config["security_folder"])
         except RemoteEngineInitFailed as e:
             self._logger.msg_error.emit(f"Server is not responding in {host}:{port}. {e}.")
             return ""
         engine_client.set_start_time()  # Set start_time for upload operation
+        _, project_name = os.path.split(self._project_dir)
+        if engine_client.supports_incremental_upload():
+            manifest_path = os.path.join(
+                self._project_dir,
+                PROJECT_CONFIG_DIR_NAME,
+                PROJECT_LOCAL_DATA_DIR_NAME,
+                PROJECT_UPLOAD_MANIFEST_FILENAME,
+            )
+            self._logger.msg.emit(f"Synchronizing project <b>{project_name}</b> with server")
+            try:
+                manifest = make_manifest(str(self._project_dir), manifest_path)
+                job_id = engine_client.sync_project(project_name, str(self._project_dir), manifest)
+            except IncrementalUploadNotSupported:
+                self._logger.msg_warning.emit("Server rejected incremental upload. Uploading whole project.")
+            except (RemoteEngineInitFailed, OSError) as e:
+                self._logger.msg_error.emit(f"Synchronizing project failed: {e}")
+                # The socket may still have a reply outstanding, so the client cannot be reused.
+                engine_client_pool.discard(engine_client)
+                return ""
+            else:
+                t = engine_client.get_elapsed_time()
+                self._logger.msg.emit(f"Synchronization time: {t}. Job ID: <b>{job_id}</b>")
+                engine_client_pool.release(engine_client)
+                return job_id
         # Archive the project into a zip-file
         dest_dir = os.path.join(self._project_dir, os.pardir)  # Parent dir of project_dir
-        _, project_name = os.path.split(self._project_dir)
         self._logger.msg.emit(f"Squeezing project <b>{project_name}</b> into {PROJECT_ZIP_FILENAME}.zip")
         try:
             ZipHandler.package(src_folder=self._project_dir, dst_folder=dest_dir, fname=PROJECT_ZIP_FILENAME)
         except Exception as e:
             self._logger.msg_error.emit(f"{e}")
-            engine_client.close()
+            engine_client_pool.release(engine_client)
             return ""
         project_zip_file = os.path.abspath(os.path.join(self._project_dir, os.pardir, PROJECT_ZIP_FILENAME + ".zip"))
         if not os.path.isfile(project_zip_file):
             self._logger.msg_error.emit(f"Project zip-file {project_zip_file} does not exist")
-            engine_client.close()
+            engine_client_pool.release(engine_client)
             return ""
         file_size = get_file_size(os.path.getsize(project_zip_file))
         self._logger.msg_warning.emit(f"Uploading project [{file_size}] ...")
         job_id = engine_client.upload_project(project_name, project_zip_file)
         t = engine_client.get_elapsed_time()
         self._logger.msg.emit(f"Upload time: {t}. Job ID: <b>{job_id}</b>")
-        engine_client.close()
+        engine_client_pool.release(engine_client)
         return job_id
 
 
+def _run_dag(
+    dag_number: int,
+    engine_data: dict,
+    exec_remotely: bool,
+    job_id: str,
+    events: queue.Queue,
+    profiler: ExecutionProfiler | None = None,
+) -> None:
+    """Runs a single DAG in an engine and forwards its events to given queue.
+
+    Args:
+        dag_number: DAG identifier
+        engine_data: engine data
+        exec_remotely: True to execute on remote server
+        job_id: remote execution job id
+        events: queue for (DAG number, event type, data) tuples
+        profiler: profiler that records the events as they arrive
+    """
+    try:
+        engine_manager = make_engine_manager(exec_remotely, job_id=job_id)
+        engine_manager.run_engine(engine_data)
+    except EngineInitFailed as error:
+        events.put((dag_number, _DAG_FAILED, f"Engine failed to start: {error}"))
+        return
+    except Exception as error:  # pylint: disable=broad-except
+        events.put((dag_number, _DAG_FAILED, f"Engine failed: {error}"))
+        return
+    try:
+        while True:
+            try:
+                event_type, data = engine_manager.get_engine_event()
+            except Exception as error:  # pylint: disable=broad-except
+                events.put((dag_number, _DAG_FAILED, f"Engine failed: {error}"))
+                return
+            if profiler is not None:
+                profiler.record_event(dag_number, event_type, data)
+            events.put((dag_number, event_type, data))
+            if event_type == "dag_exec_finished":
+                return
+    finally:
+        if exec_remotely:
+            engine_manager.clean_up()
+
+
 def headless_main(args: argparse.Namespace) -> int:
     """
     Executes a project using :class:`QCoreApplication`.
@@ -661,7 +936,9 @@ def headless_main(args: argparse.Namespace) -> int:
     startup_event_type = QEvent.Type(QEvent.registerEventType())
     task = ActionsWithProject(args, startup_event_type, application)
     application.postEvent(task, QEvent(startup_event_type))
-    return application.exec()
+    status = application.exec()
+    engine_client_pool.close_all()
+    return status
 
 
 def open_project(
@@ -0,0 +1,398 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+"""Indexes from item field values to items that SpineDBManager keeps up to date as data changes."""
+
+from __future__ import annotations
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+from typing import Any, ClassVar, Optional
+from PySide6.QtCore import Slot
+from spinedb_api import DatabaseMapping
+from spinedb_api.db_mapping_base import MappedItemBase
+from spinedb_api.helpers import ItemType
+from spinedb_api.temp_id import TempId
+from .fetch_parent import DBMapMixedItems
+
+
+class ItemIndex:
+    """Maps values of an item field to the ids of the items that have the value.
+
+    Removed items are kept in the index so that restoring them needs no bookkeeping;
+    users of the index must check the validity of the items they get.
+    """
+
+    def __init__(self, field: str, multivalued: bool):
+        """
+        Args:
+            field: indexed field
+            multivalued: True if field value is a sequence of values each of which should be indexed
+        """
+        self._field = field
+        self._multivalued = multivalued
+        self._ids_by_value: dict[Any, dict[TempId, None]] = {}
+        self._values_by_id: dict[TempId, tuple] = {}
+
+    def insert(self, items: Iterable) -> None:
+        """Adds items to the index or re-indexes them if they are already in the index.
+
+        Args:
+            items: mapped or public items
+        """
+        for item in items:
+            item_id = item["id"]
+            old_values = self._values_by_id.get(item_id)
+            new_values = self._values(item)
+            if old_values == new_values:
+                continue
+            if old_values is not None:
+                self._drop(item_id, old_values)
+            self._values_by_id[item_id] = new_values
+            for value in new_values:
+                self._ids_by_value.setdefault(value, {})[item_id] = None
+
+    def ids(self, values: Iterable) -> list[TempId]:
+        """Returns ids of items that have any of given values.
+
+        Args:
+            values: field values
+
+        Returns:
+            item ids
+        """
+        ids = {}
+        for value in values:
+            ids.update(self._ids_by_value.get(value, {}))
+        return list(ids)
+
+    def matches(self, item: MappedItemBase, values: set) -> bool:
+        """Checks if item's field currently has any of given values.
+
+        Args:
+            item: item
+            values: field values
+
+        Returns:
+            True if item matches, False otherwise
+        """
+        return not values.isdisjoint(self._values(item))
+
+    def __len__(self):
+        return len(self._values_by_id)
+
+    def _values(self, item) -> tuple:
+        """Returns the indexed values of an item.
+
+        Args:
+            item: mapped or public item
+
+        Returns:
+            indexed values
+        """
+        value = item.get(self._field)
+        if self._multivalued:
+            return tuple(dict.fromkeys(value)) if value is not None else ()
+        return (value,)
+
+    def _drop(self, item_id: TempId, values: tuple) -> None:
+        """Removes item id from given values' entries.
+
+        Args:
+            item_id: item id
+            values: values the item was indexed under
+        """
+        for value in values:
+            ids = self._ids_by_value.get(value)
+            if ids is None:
+                continue
+            ids.pop(item_id, None)
+            if not ids:
+                del self._ids_by_value[value]
+
+
+class CascadeIndex:
+    """Reverse indexes for finding the items that depend on other items.
+
+    Indexes are built lazily per database mapping and item type
+    and updated by :meth:`update_indexes_after_data_changed` and :meth:`insert_fetched_items` afterwards.
+    """
+
+    INDEXED_FIELDS: ClassVar[dict[ItemType, tuple[str, bool]]] = {
+        "entity_class": ("dimension_id_list", True),
+        "entity": ("element_id_list", True),
+        "parameter_definition": ("entity_class_id", False),
+        "parameter_value": ("entity_id", False),
+        "scenario_alternative": ("scenario_id", False),
+        "entity_group": ("entity_id", False),
+    }
+    """Mapping from item type to the indexed field and a flag telling if the field holds multiple ids."""
+
+    def __init__(self):
+        self._indexes: dict[DatabaseMapping, dict[ItemType, ItemIndex]] = {}
+
+    def find(self, db_map: DatabaseMapping, item_type: ItemType, ids: Iterable[TempId]) -> list[MappedItemBase]:
+        """Returns valid items of given type that refer to any of given ids in their indexed field.
+
+        Caller is responsible for fetching all items of given type and holding the database mapping's lock.
+
+        Args:
+            db_map: database mapping
+            item_type: type of items to find
+            ids: referred ids
+
+        Returns:
+            matching items
+        """
+        ids = set(ids)
+        mapped_table = db_map.mapped_table(item_type)
+        db_map_indexes = self._indexes.setdefault(db_map, {})
+        index = db_map_indexes.get(item_type)
+        if index is None:
+            index = db_map_indexes[item_type] = ItemIndex(*self.INDEXED_FIELDS[item_type])
+            index.insert(mapped_table.values())
+        elif len(index) < len(mapped_table):
+            # Some items were mapped without passing through the index, e.g. by fetching directly from db_map.
+            index.insert(mapped_table.values())
+        items = []
+        for item_id in index.ids(ids):
+            item = mapped_table.get(item_id)
+            if item is not None and item.is_valid() and index.matches(item, ids):
+                items.append(item)
+        return items
+
+    @Slot(object)
+    def invalidate_caches(self, db_map: DatabaseMapping) -> None:
+        """Drops all indexes of given database mapping.
+
+        Args:
+            db_map: database mapping
+        """
+        self._indexes.pop(db_map, None)
+
+    def update_indexes_after_data_changed(self, item_type: ItemType, db_map_data: DBMapMixedItems) -> None:
+        """Adds or re-indexes added or updated items.
+
+        Args:
+            item_type: item type
+            db_map_data: mapping from database mapping to added or updated items
+        """
+        if item_type not in self.INDEXED_FIELDS:
+            return
+        for db_map, items in db_map_data.items():
+            index = self._indexes.get(db_map, {}).get(item_type)
+            if index is not None:
+                index.insert(item for item in items if item)
+
+    def insert_fetched_items(self, db_map: DatabaseMapping, item_type: ItemType, items: Iterable) -> None:
+        """Adds fetched items to the index of their type.
+
+        Caller is responsible for holding the database mapping's lock.
+
+        Args:
+            db_map: database mapping
+            item_type: fetched item type
+            items: fetched items
+        """
+        index = self._indexes.get(db_map, {}).get(item_type)
+        if index is not None:
+            index.insert(items)
+
+
+_REFERENCE_ID_FIELDS: dict[ItemType, tuple[str, ...]] = {
+    "scenario_alternative": ("alternative_id", "scenario_id"),
+    "entity_class": ("dimension_id_list",),
+    "entity_class_display_mode": ("display_mode_id", "entity_class_id"),
+    "superclass_subclass": ("subclass_id", "superclass_id"),
+    "entity": ("class_id", "element_id_list"),
+    "entity_group": ("entity_class_id", "entity_id", "member_id"),
+    "entity_alternative": ("alternative_id", "entity_class_id", "entity_id"),
+    "list_value": ("parameter_value_list_id",),
+    "parameter_type": ("entity_class_id", "parameter_definition_id"),
+    "parameter_definition": ("entity_class_id", "parameter_group_id", "parameter_value_list_id"),
+    "parameter_value": ("alternative_id", "entity_class_id", "entity_id", "parameter_definition_id"),
+    "entity_metadata": ("entity_id", "metadata_id"),
+    "parameter_value_metadata": ("metadata_id", "parameter_value_id"),
+    "entity_location": ("entity_class_id", "entity_id"),
+}
+"""Fields of each item type that refer to other items by id; they change only when the item itself is updated."""
+FIELD_INDEX_BUDGET = 1000000
+"""Maximum total number of items in field indexes before least recently used indexes are evicted."""
+
+
+class FieldIndexCache:
+    """Lazily built indexes for finding items by the value of an arbitrary field.
+
+    There is one index per database mapping, item type and field.
+    Indexes of reference id fields and names are updated by :meth:`update_indexes_after_data_changed`
+    since those fields change only when the item itself is updated.
+    Other fields may be computed from other items, so their indexes are dropped whenever data changes.
+    Fetched items are added to all indexes of their type by :meth:`insert_fetched_items`.
+    Least recently used indexes are evicted once the indexes hold more than a budgeted number of items.
+    """
+
+    def __init__(self, budget: int = FIELD_INDEX_BUDGET):
+        """
+        Args:
+            budget: maximum total number of indexed items
+        """
+        self._budget = budget
+        self._indexes: OrderedDict[tuple[DatabaseMapping, ItemType, str], Optional[ItemIndex]] = OrderedDict()
+
+    def find(self, db_map: DatabaseMapping, item_type: ItemType, field: str, value: Any) -> list[MappedItemBase]:
+        """Returns valid items of given type whose field has given value.
+
+        Caller is responsible for fetching all items of given type and holding the database mapping's lock.
+
+        Args:
+            db_map: database mapping
+            item_type: item type
+            field: field name
+            value: field value
+
+        Returns:
+            matching items
+        """
+        mapped_table = db_map.mapped_table(item_type)
+        if not isinstance(value, Hashable):
+            return [item for item in mapped_table.valid_values() if item.get(field) == value]
+        key = (db_map, item_type, field)
+        try:
+            index = self._indexes[key]
+        except KeyError:
+            index = self._build_index(mapped_table, field)
+            self._indexes[key] = index
+            self._evict()
+        else:
+            self._indexes.move_to_end(key)
+            if index is not None and len(index) < len(mapped_table):
+                try:
+                    index.insert(mapped_table.values())
+                except TypeError:
+                    index = self._indexes[key] = None
+        if index is None:
+            return [item for item in mapped_table.valid_values() if item.get(field) == value]
+        items = []
+        for item_id in index.ids((value,)):
+            item = mapped_table.get(item_id)
+            if item is not None and item.is_valid() and item.get(field) == value:
+                items.append(item)
+        return items
+
+    @staticmethod
+    def _build_index(mapped_table, field: str) -> Optional[ItemIndex]:
+        """Indexes all items of a mapped table.
+
+        Args:
+            mapped_table (MappedTable): mapped table
+            field: field to index
+
+        Returns:
+            index or None if the field has unhashable values
+        """
+        index = ItemIndex(field, multivalued=False)
+        try:
+            index.insert(mapped_table.values())
+        except TypeError:
+            return None
+        return index
+
+    def _evict(self) -> None:
+        """Drops least recently used indexes until the indexes fit in the budget.
+
+        The most recently used index is always kept.
+        """
+        total_size = sum(len(index) for index in self._indexes.values() if index is not None)
+        while total_size > self._budget and len(self._indexes) > 1:
+            _, index = self._indexes.popitem(last=False)
+            if index is not None:
+                total_size -= len(index)
+
+    @staticmethod
+    def _is_plain_field(item_type: ItemType, field: str) -> bool:
+        """Checks if field's value changes only when the item itself is updated.
+
+        Args:
+            item_type: item type
+            field: field name
+
+        Returns:
+            True if field is a reference id field or name, False otherwise
+        """
+        return field == "name" or field in _REFERENCE_ID_FIELDS.get(item_type, ())
+
+    @Slot(object)
+    def invalidate_caches(self, db_map: DatabaseMapping) -> None:
+        """Drops all indexes of given database mapping.
+
+        Args:
+            db_map: database mapping
+        """
+        for key in [key for key in self._indexes if key[0] is db_map]:
+            del self._indexes[key]
+
+    def update_indexes_after_data_changed(self, item_type: ItemType, db_map_data: DBMapMixedItems) -> None:
+        """Re-indexes changed items in plain field indexes of the same type and drops computed field indexes.
+
+        Args:
+            item_type: item type
+            db_map_data: mapping from database mapping to added, updated or removed items
+        """
+        for db_map, items in db_map_data.items():
+            self._update_indexes(db_map, item_type, items)
+
+    def insert_fetched_items(self, db_map: DatabaseMapping, item_type: ItemType, items: Iterable) -> None:
+        """Adds fetched items to every index of their type.
+
+        Fetching does not change the items that are already in the mapping,
+        so computed field indexes of other item types stay valid.
+        Caller is responsible for holding the database mapping's lock.
+
+        Args:
+            db_map: database mapping
+            item_type: fetched item type
+            items: fetched items
+        """
+        items = list(items)
+        for key, index in list(self._indexes.items()):
+            key_db_map, key_item_type, _ = key
+            if key_db_map is not db_map or key_item_type != item_type or index is None:
+                continue
+            try:
+                index.insert(items)
+            except TypeError:
+                self._indexes[key] = None
+
+    def _update_indexes(self, db_map: DatabaseMapping, item_type: ItemType, items: Iterable) -> None:
+        """Updates indexes of a database mapping after items have changed.
+
+        Args:
+            db_map: database mapping
+            item_type: type of changed items
+            items: changed items
+        """
+        mapped_items = None
+        for key, index in list(self._indexes.items()):
+            key_db_map, key_item_type, field = key
+            if key_db_map is not db_map:
+                continue
+            if not self._is_plain_field(key_item_type, field):
+                del self._indexes[key]
+                continue
+            if key_item_type != item_type or index is None:
+                continue
+            if mapped_items is None:
+                mapped_table = db_map.mapped_table(item_type)
+                mapped_items = [mapped_table.get(item["id"]) for item in items if item]
+                mapped_items = [item for item in mapped_items if item is not None]
+            try:
+                index.insert(mapped_items)
+            except TypeError:
+                self._indexes[key] = None
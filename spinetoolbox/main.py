@@ -22,7 +22,7 @@ plugin_path = os.path.join(dirname, "plugins", "platforms")
 os.environ["QT_QPA_PLATFORM_PLUGIN_PATH"] = plugin_path
 
 # pylint: disable=wrong-import-position, wrong-import-order
-from argparse import ArgumentParser
+from argparse import ArgumentParser, ArgumentTypeError
 import logging
 import sys
 from PySide6.QtCore import QTimer
@@ -61,6 +61,7 @@ def main():
     app.setApplicationName("Spine Toolbox")
     TOOLBOX_FONT.get_family_from_font_database()
     window = ToolboxUI()
+    window.execution_profile_path = args.profile_out
     window.show()
     QTimer.singleShot(0, lambda: window.init_tasks(args.project))
     # Enter main event loop and wait until exit() is called
@@ -68,6 +69,24 @@ def main():
     return return_code
 
 
+def _positive_int(value):
+    """Converts command line argument to positive integer.
+
+    Args:
+        value (str): argument
+
+    Returns:
+        int: converted value
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise ArgumentTypeError(f"invalid integer '{value}'") from None
+    if number < 1:
+        raise ArgumentTypeError("value must be greater than zero")
+    return number
+
+
 def _make_argument_parser():
     """Returns a command line argument parser configured for Toolbox use.
 
@@ -97,4 +116,18 @@ def _make_argument_parser():
         metavar="ITEM",
     )
     parser.add_argument("--execute-remotely", help="execute remotely", action="append", metavar="SERVER CONFIG FILE")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="headless mode: maximum number of independent DAGs to execute concurrently",
+        type=_positive_int,
+        default=1,
+        metavar="N",
+    )
+    parser.add_argument(
+        "--incremental",
+        help="headless mode: execute only items whose inputs have changed since their last successful execution",
+        action="store_true",
+    )
+    parser.add_argument("--profile-out", help="write execution timeline to FILE in Chrome trace format", metavar="FILE")
     return parser
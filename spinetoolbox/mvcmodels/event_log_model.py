@@ -0,0 +1,459 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Contains EventLogModel and the spool file that stores its records."""
+
+from __future__ import annotations
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from html import escape
+from html.parser import HTMLParser
+import tempfile
+from typing import Any, Optional
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+
+INDENT_ROLE = Qt.ItemDataRole.UserRole + 1
+"""Role for the indentation level of a log line."""
+ITEM_NAME_ROLE = Qt.ItemDataRole.UserRole + 2
+"""Role for the name of the project item the log line belongs to."""
+
+
+class EventLogSpool:
+    """Append-only file of log records.
+
+    Records are identified by their running number. Only record offsets are kept in memory.
+    """
+
+    READ_CACHE_SIZE = 1024
+    """Number of recently read records kept in memory."""
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile(prefix="event_log_", suffix=".spool")
+        self._offsets = array("Q", [0])
+        self._read_cache: OrderedDict[int, str] = OrderedDict()
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    @property
+    def closed(self) -> bool:
+        """True if the spool file has been closed."""
+        return self._file.closed
+
+    def append(self, record: str) -> int:
+        """Appends a record to the spool.
+
+        Args:
+            record: record to append
+
+        Returns:
+            record's id
+        """
+        data = record.encode("utf-8")
+        end = self._offsets[-1]
+        self._file.seek(end)
+        self._file.write(data)
+        self._offsets.append(end + len(data))
+        return len(self._offsets) - 2
+
+    def read(self, record_id: int) -> str:
+        """Reads a record.
+
+        Args:
+            record_id: record's id
+
+        Returns:
+            record
+        """
+        record = self._read_cache.get(record_id)
+        if record is not None:
+            self._read_cache.move_to_end(record_id)
+            return record
+        start = self._offsets[record_id]
+        self._file.seek(start)
+        record = self._file.read(self._offsets[record_id + 1] - start).decode("utf-8")
+        self._read_cache[record_id] = record
+        if len(self._read_cache) > self.READ_CACHE_SIZE:
+            self._read_cache.popitem(last=False)
+        return record
+
+    def close(self) -> None:
+        """Closes and deletes the spool file."""
+        self._file.close()
+        self._read_cache.clear()
+
+
+@dataclass
+class _Segment:
+    """A run of consecutive log lines of an item, a filter or messages outside executions."""
+
+    indent: int
+    item_name: Optional[str] = None
+    title: Optional[str] = None
+    """Title line that is shown before the records."""
+    records: array = field(default_factory=lambda: array("Q"))
+    """Ids of the records in the spool."""
+
+    def __len__(self):
+        return len(self.records) + (1 if self.title is not None else 0)
+
+
+@dataclass
+class _Section:
+    """Log lines of an item in an execution or a run of messages outside executions."""
+
+    timestamp: Optional[str]
+    segments: list[_Segment] = field(default_factory=list)
+
+
+class EventLogModel(QAbstractListModel):
+    """A list model of Event Log lines.
+
+    Log lines are stored in a spool file. The model keeps an index from execution time stamp,
+    item name and filter id to lines so the visible rows can be resolved without reading the log.
+    Switching between executions touches only the index while drawing reads only the visible lines.
+    """
+
+    def __init__(self, parent=None):
+        """
+        Args:
+            parent (QObject, optional): parent object
+        """
+        super().__init__(parent)
+        self._spool = EventLogSpool()
+        self._sections: list[_Section] = []
+        self._item_sections: dict[tuple[str, str], _Section] = {}
+        self._filter_segments: dict[tuple[str, str, str], _Segment] = {}
+        self._visible_timestamp: Optional[str] = None
+        self._visible_segments: list[_Segment] = []
+        self._segment_positions: dict[int, int] = {}
+        self._segment_starts: list[int] = [0]
+        """First rows of visible segments with total row count as the last element."""
+        self._max_line_length = 0
+
+    @property
+    def max_line_length(self) -> int:
+        """Length of the longest line in characters."""
+        return self._max_line_length
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._segment_starts[-1]
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or self._spool.closed:
+            return None
+        segment, line = self._locate(index.row())
+        if role == Qt.ItemDataRole.DisplayRole:
+            if segment.title is not None:
+                if line == 0:
+                    return segment.title
+                line -= 1
+            return self._spool.read(segment.records[line])
+        if role == INDENT_ROLE:
+            if segment.title is not None and line == 0:
+                return segment.indent - 1
+            return segment.indent
+        if role == ITEM_NAME_ROLE:
+            return segment.item_name
+        return None
+
+    def execution_timestamps(self) -> list[str]:
+        """Returns time stamps of executions that have log lines.
+
+        Returns:
+            execution time stamps in execution order
+        """
+        return list(dict.fromkeys(section.timestamp for section in self._sections if section.timestamp is not None))
+
+    def visible_timestamp(self) -> Optional[str]:
+        """Returns the time stamp of visible execution.
+
+        Returns:
+            time stamp or None if all executions are visible
+        """
+        return self._visible_timestamp
+
+    def set_visible_timestamp(self, timestamp: Optional[str]) -> None:
+        """Shows the lines of a single execution or all executions.
+
+        Lines outside executions are always visible.
+
+        Args:
+            timestamp: execution time stamp or None to show all executions
+        """
+        if timestamp == self._visible_timestamp:
+            return
+        self.beginResetModel()
+        self._visible_timestamp = timestamp
+        self._rebuild_visible_segments()
+        self.endResetModel()
+
+    def append(self, message: str) -> None:
+        """Appends a message that does not belong to any execution.
+
+        Args:
+            message: formatted message
+        """
+        if self._spool.closed:
+            return
+        if self._sections and self._sections[-1].timestamp is None:
+            segment = self._sections[-1].segments[0]
+        else:
+            segment = _Segment(0)
+            self._add_section(_Section(None, [segment]))
+        self._append_lines(segment, message)
+
+    def add_message(self, timestamp: str, item_name: str, filter_id: str, message: str) -> None:
+        """Adds a message to an item's execution log.
+
+        Args:
+            timestamp: execution time stamp
+            item_name: item name
+            filter_id: filter identifier
+            message: formatted message
+        """
+        if self._spool.closed:
+            return
+        section = self._item_sections.get((timestamp, item_name))
+        if section is None:
+            section = _Section(timestamp, [_Segment(1, item_name, _make_title(item_name))])
+            self._item_sections[timestamp, item_name] = section
+            self._add_section(section)
+        if filter_id:
+            segment = self._filter_segments.get((timestamp, item_name, filter_id))
+            if segment is None:
+                segment = _Segment(2, item_name, _make_title(filter_id))
+                self._filter_segments[timestamp, item_name, filter_id] = segment
+                self._add_segment(section, segment)
+        else:
+            segment = section.segments[-1]
+            if segment.title is not None and len(section.segments) > 1:
+                segment = _Segment(1, item_name)
+                self._add_segment(section, segment)
+        self._append_lines(segment, message)
+
+    def item_title_row(self, timestamp: Optional[str], item_name: str) -> Optional[int]:
+        """Returns the row of an item's title line.
+
+        Args:
+            timestamp: execution time stamp
+            item_name: item name
+
+        Returns:
+            row or None if the title is not visible
+        """
+        section = self._item_sections.get((timestamp, item_name))
+        if section is None:
+            return None
+        position = self._segment_positions.get(id(section.segments[0]))
+        if position is None:
+            return None
+        return self._segment_starts[position]
+
+    def clear(self) -> None:
+        """Removes all lines and starts a new spool file."""
+        self.beginResetModel()
+        self._spool.close()
+        self._spool = EventLogSpool()
+        self._sections.clear()
+        self._item_sections.clear()
+        self._filter_segments.clear()
+        self._visible_timestamp = None
+        self._max_line_length = 0
+        self._rebuild_visible_segments()
+        self.endResetModel()
+
+    def close(self) -> None:
+        """Deletes the spool file; messages added after closing are discarded."""
+        self._spool.close()
+
+    def _is_visible(self, section: _Section) -> bool:
+        return (
+            section.timestamp is None or self._visible_timestamp is None or section.timestamp == self._visible_timestamp
+        )
+
+    def _add_section(self, section: _Section) -> None:
+        """Adds a section to the end of the log.
+
+        Args:
+            section: section to add
+        """
+        self._sections.append(section)
+        if not self._is_visible(section):
+            return
+        for segment in section.segments:
+            self._insert_visible_segment(len(self._visible_segments), segment)
+
+    def _add_segment(self, section: _Section, segment: _Segment) -> None:
+        """Adds a segment to the end of a section.
+
+        Args:
+            section: section
+            segment: segment to add
+        """
+        previous = section.segments[-1]
+        section.segments.append(segment)
+        if self._is_visible(section):
+            self._insert_visible_segment(self._segment_positions[id(previous)] + 1, segment)
+
+    def _insert_visible_segment(self, position: int, segment: _Segment) -> None:
+        """Inserts a segment to visible segments.
+
+        Args:
+            position: position in visible segments
+            segment: segment to insert
+        """
+        row = self._segment_starts[position]
+        if len(segment):
+            self.beginInsertRows(QModelIndex(), row, row + len(segment) - 1)
+        self._visible_segments.insert(position, segment)
+        for moved_position in range(position, len(self._visible_segments)):
+            self._segment_positions[id(self._visible_segments[moved_position])] = moved_position
+        self._segment_starts.insert(position + 1, row)
+        self._shift_starts(position + 1, len(segment))
+        if len(segment):
+            self.endInsertRows()
+
+    def _append_lines(self, segment: _Segment, message: str) -> None:
+        """Splits a message into lines and appends them to a segment.
+
+        Args:
+            segment: segment
+            message: formatted message
+        """
+        lines = _split_lines(message)
+        position = self._segment_positions.get(id(segment))
+        if position is not None:
+            row = self._segment_starts[position] + len(segment)
+            self.beginInsertRows(QModelIndex(), row, row + len(lines) - 1)
+        for line, length in lines:
+            segment.records.append(self._spool.append(line))
+            self._max_line_length = max(self._max_line_length, length)
+        if position is not None:
+            self._shift_starts(position + 1, len(lines))
+            self.endInsertRows()
+
+    def _rebuild_visible_segments(self) -> None:
+        """Collects the segments of visible sections."""
+        self._visible_segments = [
+            segment for section in self._sections if self._is_visible(section) for segment in section.segments
+        ]
+        self._segment_positions = {id(segment): position for position, segment in enumerate(self._visible_segments)}
+        starts = [0]
+        for segment in self._visible_segments:
+            starts.append(starts[-1] + len(segment))
+        self._segment_starts = starts
+
+    def _shift_starts(self, first: int, row_count: int) -> None:
+        """Moves the first rows of visible segments forward after rows have been inserted.
+
+        Only the starts after the insertion point are touched,
+        so appending to the last segment is cheap.
+
+        Args:
+            first: position of the first start to shift
+            row_count: number of inserted rows
+        """
+        if row_count == 0:
+            return
+        starts = self._segment_starts
+        for position in range(first, len(starts)):
+            starts[position] += row_count
+
+    def _locate(self, row: int) -> tuple[_Segment, int]:
+        """Finds the segment that contains given row.
+
+        Args:
+            row: row
+
+        Returns:
+            segment and the row's position within the segment
+        """
+        starts = self._segment_starts
+        position = bisect_right(starts, row) - 1
+        return self._visible_segments[position], row - starts[position]
+
+
+def _make_title(title: str) -> str:
+    return f"<b>{title}</b>"
+
+
+class _LineSplitter(HTMLParser):
+    """Splits HTML text to lines at line breaks reopening the tags that span multiple lines."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._open_tags: list[tuple[str, str]] = []
+        self._lines: list[tuple[str, int]] = []
+        self._line = ""
+        self._length = 0
+
+    def split(self, text: str) -> list[tuple[str, int]]:
+        self.feed(text)
+        self.close()
+        self._break_line()
+        return self._lines
+
+    def _break_line(self) -> None:
+        self._line += "".join(f"</{tag}>" for tag, _ in reversed(self._open_tags))
+        self._lines.append((self._line, self._length))
+        self._line = "".join(start_tag for _, start_tag in self._open_tags)
+        self._length = 0
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Any]]) -> None:
+        if tag == "br":
+            self._break_line()
+            return
+        start_tag = self.get_starttag_text()
+        self._line += start_tag
+        self._open_tags.append((tag, start_tag))
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, Any]]) -> None:
+        if tag == "br":
+            self._break_line()
+            return
+        self._line += self.get_starttag_text()
+
+    def handle_endtag(self, tag: str) -> None:
+        for i in range(len(self._open_tags) - 1, -1, -1):
+            if self._open_tags[i][0] == tag:
+                del self._open_tags[i]
+                break
+        self._line += f"</{tag}>"
+
+    def handle_data(self, data: str) -> None:
+        data = data.replace("\r\n", "\n")
+        first, *rest = data.split("\n")
+        self._add_text(first)
+        for text in rest:
+            self._break_line()
+            self._add_text(text)
+
+    def _add_text(self, text: str) -> None:
+        self._line += escape(text, quote=False)
+        self._length += len(text)
+
+
+def _split_lines(text: str) -> list[tuple[str, int]]:
+    """Splits formatted message into lines.
+
+    Args:
+        text: formatted message
+
+    Returns:
+        lines and their lengths in characters without markup
+    """
+    return _LineSplitter().split(text)
@@ -11,14 +11,26 @@
 ######################################################################################################################
 """Contains utilities for validating parameter types."""
 
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
-from multiprocessing import Process, Queue
-import queue
+from hashlib import blake2b
+import json
+import logging
+import os
+import time
 from typing import Any, Iterable, Optional, Tuple
 from PySide6.QtCore import QObject, QTimer, Signal, Slot
 from spinedb_api.db_mapping_helpers import is_parameter_type_valid, type_check_args
+from spinedb_api.parameter_value import Map
 
 CHUNK_SIZE = 100
+MIN_CHUNK_SIZE = 10
+MAX_CHUNK_SIZE = 5000
+CHUNK_DURATION = 0.1
+"""Targeted time in seconds it takes a worker to validate a chunk."""
+MAX_CACHE_SIZE = 500000
+"""Maximum number of validation results kept in the result cache."""
 
 
 @dataclass(frozen=True)
@@ -35,32 +47,50 @@ class ValidatableValue:
 
 
 class ParameterTypeValidator(QObject):
-    """Handles parameter type validation in a concurrent process."""
+    """Handles parameter type validation in a pool of concurrent processes.
+
+    Values that are cheap to validate are validated in the calling process,
+    only values that need parsing are sent to worker processes.
+    Validation results are cached by value hash and the cache can be persisted on disk.
+    """
 
     validated = Signal(list, list)
+    _chunk_validated = Signal(object, list)
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, worker_count=None, cache_path=None):
         """
         Args:
             parent (QObject, optional): parent object
+            worker_count (int, optional): number of worker processes; if None, use a count based on CPU count
+            cache_path (str, optional): path to result cache file; if None, results are not persisted
         """
         super().__init__(parent)
-        self._sender = Queue()
-        self._receiver = Queue()
-        self._process = Process(target=schedule, name="Type validation worker", args=(self._receiver, self._sender))
-        self._timer = QTimer(self)
-        self._timer.setInterval(100)
-        self._timer.timeout.connect(self._communicate)
+        if worker_count is None:
+            worker_count = min(4, max(1, (os.cpu_count() or 2) - 1))
+        self._worker_count = worker_count
+        self._executor = None
         self._task_queue = []
-        self._sent_task_count = 0
+        self._chunks_in_flight = 0
+        self._chunk_size = CHUNK_SIZE
+        self._cache_path = cache_path
+        self._cache = None
+        self._hashes_in_flight = {}
+        self._finished_batches = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(0)
+        self._flush_timer.timeout.connect(self._emit_finished)
+        self._chunk_validated.connect(self._handle_chunk_validated)
 
-    def set_interval(self, interval):
-        """Sets the interval between communication attempts with the validation process.
+    @property
+    def chunk_size(self):
+        """Current number of values sent to a worker at once."""
+        return self._chunk_size
 
-        Args:
-            interval (int): interval in milliseconds
-        """
-        self._timer.setInterval(interval)
+    @property
+    def pending_task_count(self):
+        """Number of values and result batches that are still waiting to be validated or emitted."""
+        return len(self._hashes_in_flight) + len(self._finished_batches)
 
     def start_validating(self, db_mngr, db_map, value_item_ids):
         """Initiates validation of given parameter definition/value items.
@@ -70,93 +100,206 @@ class ParameterTypeValidator(QObject):
             db_map (DatabaseMapping): database mapping
             value_item_ids (Iterable of TempId): item ids to validate
         """
-        if not self._process.is_alive():
-            self._process.start()
+        cache = self._result_cache()
+        finished_keys = []
+        finished_results = []
         with db_mngr.get_lock(db_map):
             for item_id in value_item_ids:
                 mapped_table = db_map.mapped_table(item_id.item_type)
                 item = mapped_table.find_item_by_id(item_id)
                 args = type_check_args(item)
-                self._task_queue.append(
-                    ValidatableValue(ValidationKey(item_id.item_type, id(db_map), item_id.private_id), args)
-                )
-        if not self._timer.isActive():
-            chunk = self._task_queue[:CHUNK_SIZE]
-            self._task_queue = self._task_queue[CHUNK_SIZE:]
-            self._sender.put(chunk)
-            self._sent_task_count += len(chunk)
-            self._timer.start()
+                key = ValidationKey(item_id.item_type, id(db_map), item_id.private_id)
+                if not _needs_worker(args):
+                    finished_keys.append(key)
+                    finished_results.append(is_parameter_type_valid(*args))
+                    continue
+                value_hash = _value_hash(args)
+                is_valid = cache.get(value_hash)
+                if is_valid is not None:
+                    finished_keys.append(key)
+                    finished_results.append(is_valid)
+                    continue
+                self._hashes_in_flight[key] = value_hash
+                self._task_queue.append(ValidatableValue(key, args))
+        if finished_keys:
+            self._finished_batches.append((finished_keys, finished_results))
+            if not self._flush_timer.isActive():
+                self._flush_timer.start()
+        self._submit_chunks()
 
     @Slot()
-    def _communicate(self):
-        """Communicates with the validation process."""
-        self._timer.stop()
-        if not self._process.is_alive():
+    def _emit_finished(self):
+        """Emits validation results that did not need worker processes."""
+        batches = self._finished_batches
+        self._finished_batches = []
+        for keys, results in batches:
+            self.validated.emit(keys, results)
+
+    def _submit_chunks(self):
+        """Sends chunks of values to workers until every worker has enough to do."""
+        while self._task_queue and self._chunks_in_flight < 2 * self._worker_count:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self._worker_count)
+            chunk = self._task_queue[: self._chunk_size]
+            del self._task_queue[: self._chunk_size]
+            future = self._executor.submit(validate_chunk, chunk)
+            self._chunks_in_flight += 1
+            future.add_done_callback(
+                lambda finished_future, submitted=chunk: self._chunk_validated.emit(finished_future, submitted)
+            )
+
+    @Slot(object, list)
+    def _handle_chunk_validated(self, future, chunk):
+        """Processes the results of a validated chunk.
+
+        If the worker failed, the chunk is validated in this process instead.
+
+        Args:
+            future (Future): finished validation task
+            chunk (list of ValidatableValue): values in the chunk
+        """
+        self._chunks_in_flight -= 1
+        if future.cancelled():
+            for validatable_value in chunk:
+                self._hashes_in_flight.pop(validatable_value.key, None)
+            self._submit_chunks()
             return
-        try:
-            results = self._receiver.get_nowait()
-        except queue.Empty:
-            self._sender.put("wake up")
+        error = future.exception()
+        if error is None:
+            keys, results, elapsed_time = future.result()
+            self._adapt_chunk_size(len(keys), elapsed_time)
         else:
-            self.validated.emit(*results)
-            self._sent_task_count -= len(results[0])
-        if self._task_queue and self._sent_task_count < 3 * CHUNK_SIZE:
-            chunk = self._task_queue[:CHUNK_SIZE]
-            self._task_queue = self._task_queue[CHUNK_SIZE:]
-            self._sender.put(chunk)
-            self._sent_task_count += len(chunk)
-        if not self._task_queue and self._sent_task_count == 0:
+            logging.error("Parameter type validation worker failed: %s", error, exc_info=error)
+            if isinstance(error, BrokenProcessPool) and self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            keys, results, _ = validate_chunk(chunk)
+        cache = self._result_cache()
+        for key, is_valid in zip(keys, results):
+            value_hash = self._hashes_in_flight.pop(key, None)
+            if value_hash is not None:
+                cache[value_hash] = is_valid
+        self._emit_finished()
+        self.validated.emit(keys, results)
+        self._submit_chunks()
+
+    def _adapt_chunk_size(self, value_count, elapsed_time):
+        """Scales chunk size such that validating a chunk takes roughly CHUNK_DURATION seconds.
+
+        Args:
+            value_count (int): number of values in validated chunk
+            elapsed_time (float): time in seconds it took to validate the chunk
+        """
+        if value_count < self._chunk_size:
             return
-        self._timer.start()
+        if elapsed_time <= 0.0:
+            target = 2 * self._chunk_size
+        else:
+            target = int(value_count * CHUNK_DURATION / elapsed_time)
+        target = max(self._chunk_size // 2, min(2 * self._chunk_size, target))
+        self._chunk_size = max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, target))
+
+    def _result_cache(self):
+        """Returns the result cache loading it from disk if needed.
+
+        Returns:
+            dict: mapping from value hash to validation result
+        """
+        if self._cache is None:
+            self._cache = _load_cache(self._cache_path) if self._cache_path is not None else {}
+        return self._cache
 
     def tear_down(self):
-        """Cleans up the validation process."""
-        self._timer.stop()
-        if self._process.is_alive():
-            self._sender.put("quit")
-            finished = False
-            while not finished:
-                finished = self._receiver.get() == "finished"
-            self._process.join()
+        """Cleans up the validation processes and persists the result cache."""
+        self._flush_timer.stop()
+        self._finished_batches.clear()
+        self._task_queue.clear()
+        self._hashes_in_flight.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        if self._cache_path is not None and self._cache:
+            _save_cache(self._cache_path, self._cache)
 
 
-def validate_chunk(validatable_values):
-    """Validates given parameter definitions/values.
+def _needs_worker(args):
+    """Checks if validating a value requires parsing it.
 
     Args:
-        validatable_values (Iterable of ValidatableValue): values to validate
+        args (tuple): arguments for is_parameter_type_valid()
 
     Returns:
-        dict: mapping from ValidationKey to boolean
+        bool: True if value should be validated by a worker, False if validation is cheap
     """
-    results = {}
-    for validatable_value in validatable_values:
-        results[validatable_value.key] = is_parameter_type_valid(*validatable_value.args)
-    return results
+    parameter_types, database_value, _, value_type = args
+    return bool(parameter_types) and database_value is not None and value_type == Map.TYPE
 
 
-def schedule(sender, receiver):
-    """Loops over incoming messages and sends responses back.
+def _value_hash(args):
+    """Computes a hash for validation arguments.
 
     Args:
-        sender (Queue): Queue for sending validation results
-        receiver (Queue): Queue for receiving tasks
+        args (tuple): arguments for is_parameter_type_valid()
+
+    Returns:
+        str: hex digest
     """
-    validatable_values = []
-    while True:
-        if not receiver.empty() or not validatable_values:
-            while True:
-                task = receiver.get()
-                if task == "quit":
-                    sender.put("finished")
-                    return
-                if task == "wake up":
-                    break
-                validatable_values += task
-                if receiver.empty():
-                    break
-        chunk = validatable_values[:CHUNK_SIZE]
-        if chunk:
-            validatable_values = validatable_values[CHUNK_SIZE:]
-            results = validate_chunk(chunk)
-            sender.put((list(results.keys()), list(results.values())))
+    parameter_types, database_value, _, value_type = args
+    hasher = blake2b(digest_size=16)
+    hasher.update(repr((tuple(parameter_types), value_type)).encode())
+    hasher.update(database_value)
+    return hasher.hexdigest()
+
+
+def _load_cache(path):
+    """Loads validation result cache from disk.
+
+    Args:
+        path (str): path to cache file
+
+    Returns:
+        dict: mapping from value hash to validation result
+    """
+    try:
+        with open(path, encoding="utf-8") as cache_file:
+            cache = json.load(cache_file)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_cache(path, cache):
+    """Writes validation result cache to disk keeping only the most recent results.
+
+    Args:
+        path (str): path to cache file
+        cache (dict): mapping from value hash to validation result
+    """
+    if len(cache) > MAX_CACHE_SIZE:
+        cache = dict(list(cache.items())[-MAX_CACHE_SIZE:])
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as cache_file:
+            json.dump(cache, cache_file)
+        os.replace(temp_path, path)
+    except OSError:
+        pass
+
+
+def validate_chunk(validatable_values):
+    """Validates given parameter definitions/values.
+
+    Args:
+        validatable_values (Iterable of ValidatableValue): values to validate
+
+    Returns:
+        tuple: validation keys, validation results and time in seconds the validation took
+    """
+    start = time.perf_counter()
+    keys = []
+    results = []
+    for validatable_value in validatable_values:
+        keys.append(validatable_value.key)
+        results.append(is_parameter_type_valid(*validatable_value.args))
+    return keys, results, time.perf_counter() - start
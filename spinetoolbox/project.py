@@ -46,9 +46,17 @@ from .config import (
     PROJECT_FILENAME,
     PROJECT_LOCAL_DATA_DIR_NAME,
     PROJECT_LOCAL_DATA_FILENAME,
+    PROJECT_UPLOAD_MANIFEST_FILENAME,
     PROJECT_ZIP_FILENAME,
     SPECIFICATION_LOCAL_DATA_FILENAME,
 )
+from .execution_fingerprints import (
+    ExecutionFingerprints,
+    incremental_execution_permits,
+    input_stamps,
+    item_fingerprint,
+)
+from .execution_profiler import ExecutionProfiler
 from .helpers import (
     busy_effect,
     create_dir,
@@ -74,7 +82,9 @@ from .project_upgrader import (
     upgrade_project,
 )
 from .pydantic_models.consumer_replay import CommandStack, build_command_list, set_superseded_commands_obsolete
-from .server.engine_client import EngineClient
+from .server.engine_client import IncrementalUploadNotSupported
+from .server.engine_client_pool import engine_client_pool
+from .server.project_manifest import make_manifest
 from .spine_engine_worker import SpineEngineWorker
 
 
@@ -147,6 +157,8 @@ class SpineToolboxProject(MetaObject):
         self._settings = settings
         self._engine_workers = []
         self._execution_in_progress = False
+        self._execution_profiler = None
+        self._execution_fingerprints = None
         self._consumer_replay: CommandStack | None = None
         self._first_consumer_index: int = 0
         self.project_dir: Optional[str] = None  # Full path to project directory
@@ -178,6 +190,11 @@ class SpineToolboxProject(MetaObject):
     def settings(self) -> ProjectSettings:
         return self._settings
 
+    @property
+    def execution_profiler(self) -> Optional[ExecutionProfiler]:
+        """Profiler of the latest execution."""
+        return self._execution_profiler
+
     def set_settings(self, settings: ProjectSettings) -> None:
         self._settings = settings
         self.settings_updated.emit()
@@ -458,13 +475,10 @@ class SpineToolboxProject(MetaObject):
         connection_dicts = project_info["project"]["connections"]
         connections = list(map(self.connection_from_dict, connection_dicts))
         for connection in connections:
-            self.add_connection(connection, silent=True, notify_resource_changes=False)
-        for connection in connections:
-            destination = self._project_items[connection.destination]
-            source = self._project_items[connection.source]
-            self._notify_rsrc_changes(destination, source)
-        for connection in connections:
-            connection.link.update_icons()
+            self.add_connection(connection, silent=True, notify_resource_changes=False, update_ranks=False)
+        for dag in self._dag_iterator():
+            self._update_ranks(dag)
+        self._propagate_resources()
         self._logger.msg.emit("Restoring jumps...")
         jump_dicts = project_info["project"].get("jumps", [])
         for jump in map(self.jump_from_dict, jump_dicts):
@@ -825,7 +839,7 @@ class SpineToolboxProject(MetaObject):
         """
         return [c for c in self._connections if item_name in (c.source, c.destination)]
 
-    def add_connection(self, *args, silent=False, notify_resource_changes=True):
+    def add_connection(self, *args, silent=False, notify_resource_changes=True, update_ranks=True):
         """Adds a connection to the project.
 
         A single argument is expected to be the ``Logging connection`` instance.
@@ -835,6 +849,7 @@ class SpineToolboxProject(MetaObject):
             *args: connection to add
             silent (bool): If False, prints 'Link establ...' msg to Event Log
             notify_resource_changes (bool): If True, updates resources of successor and predecessor items
+            update_ranks (bool): If True, updates the execution ranks of items in connection's DAG
 
         Returns:
             bool: True if connection was added successfully, False otherwise
@@ -845,7 +860,7 @@ class SpineToolboxProject(MetaObject):
             connection = LoggingConnection(*args, toolbox=self._toolbox)
         if connection in self._connections:
             return False
-        if None in (self.dag_with_node(connection.source), self.dag_with_node(connection.destination)):
+        if connection.source not in self._project_items or connection.destination not in self._project_items:
             return False
         self._connections.append(connection)
         dag = self.dag_with_node(connection.source)
@@ -876,9 +891,53 @@ class SpineToolboxProject(MetaObject):
             self._notify_rsrc_changes(destination, source)
         if not silent:
             destination.notify_destination(source)
-        self._update_ranks(dag)
+        if update_ranks:
+            self._update_ranks(dag)
         return True
 
+    def _propagate_resources(self):
+        """Updates resources of all items and connections in a single pass over the project's DAGs.
+
+        Forward resources are propagated in topological order and backward resources in reverse order,
+        so each item's resources are computed only once and only after the resources it depends on
+        have been updated. Link icons are updated once at the end.
+        """
+        incoming_connections = {}
+        outgoing_connections = {}
+        for connection in self._connections:
+            incoming_connections.setdefault(connection.destination, []).append(connection)
+            outgoing_connections.setdefault(connection.source, []).append(connection)
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self._project_items)
+        graph.add_edges_from((connection.source, connection.destination) for connection in self._connections)
+        item_names = list(nx.topological_sort(graph))
+        resource_cache = {}
+        for item_name in item_names:
+            item = self._project_items[item_name]
+            connections = incoming_connections.get(item_name)
+            if connections:
+                self._update_successor(item, connections, resource_cache)
+            if item_name not in outgoing_connections:
+                continue
+            resources = item.resources_for_direct_successors()
+            resource_cache[item_name] = resources
+            for connection in outgoing_connections[item_name]:
+                connection.receive_resources_from_source(resources, update_icons=False)
+        resource_cache = {}
+        for item_name in reversed(item_names):
+            item = self._project_items[item_name]
+            connections = outgoing_connections.get(item_name)
+            if connections:
+                self._update_predecessor(item, connections, resource_cache)
+            if item_name not in incoming_connections:
+                continue
+            resources = item.resources_for_direct_predecessors()
+            resource_cache[item_name] = resources
+            for connection in incoming_connections[item_name]:
+                connection.receive_resources_from_destination(resources)
+        for connection in self._connections:
+            connection.link.update_icons()
+
     def _notify_rsrc_changes(self, destination, source):
         """Notifies connection destination and connection source item that resources may have changed.
 
@@ -1105,6 +1164,12 @@ class SpineToolboxProject(MetaObject):
         if not dags:
             self._logger.msg.emit("Nothing to execute.")
             return
+        self._execution_fingerprints = None
+        if self._app_settings.value("appSettings/incrementalExecution", defaultValue="false") == "true":
+            dags, execution_permits_list = self._skip_up_to_date_items(dags, execution_permits_list)
+            if not dags:
+                self._logger.msg.emit("All items are up to date. Nothing to execute.")
+                return
         self.project_execution_about_to_start.emit()
         self._logger.msg.emit("")
         self._logger.msg.emit("-------------------------------------------------")
@@ -1113,6 +1178,74 @@ class SpineToolboxProject(MetaObject):
         self._execution_in_progress = True
         self._execute_dags(dags, execution_permits_list)
 
+    def _skip_up_to_date_items(self, dags, execution_permits_list):
+        """Narrows execution permits to items whose inputs have changed since their last successful execution.
+
+        Args:
+            dags (list of DiGraph): DAGs to execute
+            execution_permits_list (list of dict): permitted items by DAG
+
+        Returns:
+            tuple: DAGs that have items to execute and their narrowed execution permits
+        """
+        fingerprint_store = ExecutionFingerprints(self.project_dir)
+        narrowed_dags = []
+        narrowed_permits_list = []
+        skipped_items = []
+        for dag, execution_permits in zip(dags, execution_permits_list):
+            fingerprints = {
+                name: self._item_fingerprint(name) for name, permitted in execution_permits.items() if permitted
+            }
+            permits = incremental_execution_permits(dag, execution_permits, fingerprints, fingerprint_store)
+            skipped_items += [name for name in fingerprints if not permits[name]]
+            if any(permits.values()):
+                narrowed_dags.append(dag)
+                narrowed_permits_list.append(permits)
+        if skipped_items:
+            self._logger.msg.emit(f"Skipping up-to-date items: {', '.join(skipped_items)}")
+        fingerprint_store.discard(
+            name for permits in narrowed_permits_list for name, permitted in permits.items() if permitted
+        )
+        self._execution_fingerprints = fingerprint_store
+        self._save_execution_fingerprints()
+        return narrowed_dags, narrowed_permits_list
+
+    def _item_fingerprint(self, name):
+        """Computes a digest of item's settings, specification, incoming connections and resources.
+
+        Args:
+            name (str): item's name
+
+        Returns:
+            str: fingerprint
+        """
+        item = self._project_items[name]
+        item_dict = item.item_dict()
+        specification = item.specification()
+        specification_dict = (
+            {**specification.to_dict(), "definition_file_path": specification.definition_file_path}
+            if specification is not None
+            else None
+        )
+        incoming_connections = self.incoming_connections(name)
+        forward_resources = []
+        for connection in incoming_connections:
+            resources = self._project_items[connection.source].resources_for_direct_successors()
+            forward_resources += connection.convert_forward_resources(resources)
+        backward_resources = []
+        for connection in self.outgoing_connections(name):
+            backward_resources += self._project_items[connection.destination].resources_for_direct_predecessors()
+        stamps = input_stamps(item_dict, self.project_dir, forward_resources, backward_resources)
+        connection_dicts = [connection.to_dict() for connection in incoming_connections]
+        return item_fingerprint(item_dict, specification_dict, connection_dicts, stamps)
+
+    def _save_execution_fingerprints(self):
+        """Writes execution fingerprints to disk."""
+        try:
+            self._execution_fingerprints.save()
+        except OSError as error:
+            self._logger.msg_warning.emit(f"Failed to save execution fingerprints: {error}")
+
     def _execute_dags(self, dags, execution_permits_list):
         if self._engine_workers:
             self._logger.msg_error.emit("Execution already in progress.")
@@ -1122,6 +1255,7 @@ class SpineToolboxProject(MetaObject):
             self.project_execution_finished.emit()
             return
         settings = make_settings_dict_for_engine(self._app_settings)
+        self._execution_profiler = ExecutionProfiler()
         darker_fg_color = QColor(FG_COLOR).darker().name()
 
         def darker(x):
@@ -1188,7 +1322,9 @@ class SpineToolboxProject(MetaObject):
             "settings": settings,
             "project_dir": self.project_dir.replace(os.sep, "/"),
         }
-        worker = SpineEngineWorker(data, dag, dag_identifier, items, connections, self._logger, job_id)
+        worker = SpineEngineWorker(
+            data, dag, dag_identifier, items, connections, self._logger, job_id, self._execution_profiler
+        )
         return worker
 
     @Slot(object)
@@ -1208,10 +1344,19 @@ class SpineToolboxProject(MetaObject):
         # (needed to create DatabaseMapping instances). It seems that the lock gets confused when
         # being acquired by threads from different processes or maybe even different QThreads.
         # Can't say I really understand the whole extent of it.
+        successful_items = set()
         for finished_worker in self._engine_workers:
             for item, direction in finished_worker.successful_executions:
                 item.handle_execution_successful(direction)
+                if direction == ExecutionDirection.FORWARD:
+                    successful_items.add(item.name)
             finished_worker.clean_up()
+        if self._execution_fingerprints is not None:
+            for name in successful_items:
+                if name in self._project_items:
+                    self._execution_fingerprints.set(name, self._item_fingerprint(name))
+            self._save_execution_fingerprints()
+            self._execution_fingerprints = None
         self.finalize_remote_execution(worker.job_id)
         self._engine_workers.clear()
         self.project_execution_finished.emit()
@@ -1440,15 +1585,22 @@ class SpineToolboxProject(MetaObject):
     def descendant_names(self, name):
         """Yields descendant item names.
 
+        Each descendant is yielded once even if it can be reached through several paths.
+
         Args:
             name (str): name of the project item whose descendants to collect
 
         Yields:
             str: descendant name
         """
-        for succ_name in self.successor_names(name):
-            yield succ_name
-            yield from self.descendant_names(succ_name)
+        visited = set()
+        pending = [name]
+        while pending:
+            for succ_name in self.successor_names(pending.pop()):
+                if succ_name not in visited:
+                    visited.add(succ_name)
+                    yield succ_name
+                    pending.append(succ_name)
 
     def outgoing_connections(self, name):
         """Collects outgoing connections.
@@ -1580,13 +1732,33 @@ class SpineToolboxProject(MetaObject):
             return ""
         self._logger.msg.emit(f"Connecting to Spine Engine Server at <b>{host}:{port}</b>")
         try:
-            engine_client = EngineClient(host, port, sec_model, sec_folder)
+            engine_client = engine_client_pool.acquire(host, port, sec_model, sec_folder)
         except RemoteEngineInitFailed as e:
             self._logger.msg_error.emit(
                 f"Server is not responding. {e}. " f"Check settings in <b>File->Settings->Engine</b>."
             )
             return ""
         engine_client.set_start_time()  # Set start_time for upload operation
+        _, project_dir_name = os.path.split(self.project_dir)
+        if engine_client.supports_incremental_upload():
+            manifest_path = os.path.join(self.config_dir, PROJECT_LOCAL_DATA_DIR_NAME, PROJECT_UPLOAD_MANIFEST_FILENAME)
+            self._logger.msg.emit(f"Synchronizing project <b>{self.name}</b> with server")
+            QCoreApplication.processEvents()
+            try:
+                manifest = make_manifest(self.project_dir, manifest_path)
+                job_id = engine_client.sync_project(project_dir_name, self.project_dir, manifest)
+            except IncrementalUploadNotSupported:
+                self._logger.msg_warning.emit("Server rejected incremental upload. Uploading whole project.")
+            except (RemoteEngineInitFailed, OSError) as e:
+                self._logger.msg_error.emit(f"Synchronizing project failed: {e}")
+                # The socket may still have a reply outstanding, so the client cannot be reused.
+                engine_client_pool.discard(engine_client)
+                return ""
+            else:
+                t = engine_client.get_elapsed_time()
+                self._logger.msg.emit(f"Synchronization time: {t}. Job ID: <b>{job_id}</b>")
+                engine_client_pool.release(engine_client)
+                return job_id
         # Archive the project into a zip-file
         dest_dir = os.path.join(self.project_dir, os.pardir)  # Parent dir of project_dir
         self._logger.msg.emit(f"Squeezing project <b>{self.name}</b> into {PROJECT_ZIP_FILENAME}.zip")
@@ -1595,21 +1767,20 @@ class SpineToolboxProject(MetaObject):
             ZipHandler.package(src_folder=self.project_dir, dst_folder=dest_dir, fname=PROJECT_ZIP_FILENAME)
         except Exception as e:
             self._logger.msg_error.emit(f"{e}")
-            engine_client.close()
+            engine_client_pool.release(engine_client)
             return ""
         project_zip_file = os.path.abspath(os.path.join(self.project_dir, os.pardir, PROJECT_ZIP_FILENAME + ".zip"))
         if not os.path.isfile(project_zip_file):
             self._logger.msg_error.emit(f"Project zip-file {project_zip_file} does not exist")
-            engine_client.close()
+            engine_client_pool.release(engine_client)
             return ""
         file_size = get_file_size(os.path.getsize(project_zip_file))
         self._logger.msg_warning.emit(f"Uploading project [{file_size}] ...")
         QCoreApplication.processEvents()
-        _, project_dir_name = os.path.split(self.project_dir)
         job_id = engine_client.upload_project(project_dir_name, project_zip_file)
         t = engine_client.get_elapsed_time()
         self._logger.msg.emit(f"Upload time: {t}. Job ID: <b>{job_id}</b>")
-        engine_client.close()
+        engine_client_pool.release(engine_client)
         return job_id
 
     def finalize_remote_execution(self, job_id):
@@ -1623,14 +1794,14 @@ class SpineToolboxProject(MetaObject):
             return
         host, port, sec_model, sec_folder = self._toolbox.engine_server_settings()
         try:
-            engine_client = EngineClient(host, port, sec_model, sec_folder)
+            engine_client = engine_client_pool.acquire(host, port, sec_model, sec_folder)
         except RemoteEngineInitFailed as e:
             self._logger.msg_error.emit(
                 f"Server is not responding. {e}. " f"Check settings in <b>File->Settings->Engine</b>."
             )
             return
         engine_client.remove_project_from_server(job_id)
-        engine_client.close()
+        engine_client_pool.release(engine_client)
         project_zip_file = os.path.abspath(os.path.join(self.project_dir, os.pardir, PROJECT_ZIP_FILENAME + ".zip"))
         if not os.path.isfile(project_zip_file):
             return
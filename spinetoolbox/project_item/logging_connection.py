@@ -348,11 +348,17 @@ class LoggingConnection(LogMixin, HeadlessConnection):
         if self is self._toolbox.active_link_item:
             self._toolbox.link_properties_widgets[LoggingConnection].set_filter_type_enabled(filter_type, enabled)
 
-    def receive_resources_from_source(self, resources):
-        """See base class."""
+    def receive_resources_from_source(self, resources, update_icons=True):
+        """See base class.
+
+        Args:
+            resources (list of ProjectItemResource): source item's resources
+            update_icons (bool): if False, link icons are left for the caller to update
+        """
         super().receive_resources_from_source(resources)
         self._pop_unused_db_maps()
-        self.link.update_icons()
+        if update_icons:
+            self.link.update_icons()
 
     def replace_resources_from_source(self, old, new):
         """See base class."""
@@ -21,6 +21,11 @@ import zmq
 import zmq.auth
 from spine_engine.exception import RemoteEngineInitFailed
 from spine_engine.server.util.server_message import ServerMessage
+from spine_engine.utils.helpers import get_file_size
+from .project_manifest import file_digest, read_file_chunks
+
+UPLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+"""Maximum number of bytes sent in a single message during incremental project upload."""
 
 
 class ClientSecurityModel(Enum):
@@ -28,6 +33,14 @@ class ClientSecurityModel(Enum):
     STONEHOUSE = 1  # ZMQ stonehouse security model
 
 
+class IncrementalUploadNotSupported(RemoteEngineInitFailed):
+    """Raised when the server does not understand incremental project upload requests."""
+
+
+INCREMENTAL_UPLOAD_CAPABILITY = "sync_project"
+"""Server capability advertised in ping replies by servers that support incremental project upload."""
+
+
 class EngineClient:
     def __init__(self, host, port, sec_model, sec_folder, ping=True):
         """
@@ -41,6 +54,8 @@ class EngineClient:
         self.protocol = "tcp"  # Hard-coded to tcp for now
         self.host = host
         self.port = port  # Request socket port
+        self.sec_model = sec_model
+        self.sec_folder = sec_folder
         self._context = zmq.Context()
         self.dealer_socket = self._context.socket(zmq.DEALER)
         self.dealer_socket.setsockopt(zmq.LINGER, 1)
@@ -50,6 +65,7 @@ class EngineClient:
         self.poller.register(self.pull_socket, zmq.POLLIN)
         self.client_project_dir = None
         self.start_time = 0
+        self.server_capabilities = frozenset()
         if sec_model == ClientSecurityModel.STONEHOUSE:
             # Security configs
             # implementation below based on https://github.com/zeromq/pyzmq/blob/main/examples/security/stonehouse.py
@@ -71,7 +87,7 @@ class EngineClient:
         self.dealer_socket.connect(self.protocol + "://" + self.host + ":" + str(self.port))
         if ping:
             try:
-                self._check_connectivity(1000)  # Ping server
+                self.check_connectivity(1000)  # Ping server
             except RemoteEngineInitFailed:
                 self.close()
                 raise
@@ -84,6 +100,14 @@ class EngineClient:
         """
         self.pull_socket.connect(self.protocol + "://" + self.host + ":" + port)
 
+    def reset(self):
+        """Prepares the client for reuse by replacing the PULL socket and forgetting the project directory."""
+        self.poller.unregister(self.pull_socket)
+        self.pull_socket.close()
+        self.pull_socket = self._context.socket(zmq.PULL)
+        self.poller.register(self.pull_socket, zmq.POLLIN)
+        self.client_project_dir = None
+
     def rcv_next(self, dealer_or_pull):
         """Polls all sockets and returns a new reply based on given socket 'name'.
 
@@ -101,7 +125,7 @@ class EngineClient:
                     return self.dealer_socket.recv_multipart()
                 continue
 
-    def _check_connectivity(self, timeout):
+    def check_connectivity(self, timeout):
         """Pings server, waits for the response, and acts accordingly.
 
         Args:
@@ -127,6 +151,15 @@ class EngineClient:
             raise RemoteEngineInitFailed(
                 f"Ping failed. Request Id '{random_id}' does not match reply Id '{response_id}'"
             )
+        self.server_capabilities = _server_capabilities(response.getData())
+
+    def supports_incremental_upload(self):
+        """Checks if the server advertised incremental project upload support when it was pinged.
+
+        Returns:
+            bool: True if projects can be uploaded with :meth:`sync_project`, False otherwise
+        """
+        return INCREMENTAL_UPLOAD_CAPABILITY in self.server_capabilities
 
     def set_start_time(self):
         """Sets a start time for an operation. Call get_elapsed_time() after
@@ -153,6 +186,66 @@ class EngineClient:
         response_server_message = ServerMessage.parse(response[1])
         return response_server_message.getId()
 
+    def sync_project(self, project_dir_name, project_dir, manifest, chunk_size=UPLOAD_CHUNK_SIZE):
+        """Uploads the project incrementally. Server must be available before calling this method.
+
+        First, the project manifest is sent to the server which replies with a job id
+        and the relative paths of the files it does not have.
+        Then, the missing files are streamed in chunks, each chunk waiting for the server's acknowledgement.
+        Finally, the server is told that the project is complete.
+
+        Args:
+            project_dir_name (str): Project directory name
+            project_dir (str): Absolute path to project directory
+            manifest (dict): Project manifest, see :func:`project_manifest.make_manifest`
+            chunk_size (int): Maximum number of bytes to send in one message
+
+        Returns:
+            str: Project execution job Id
+
+        Raises:
+            IncrementalUploadNotSupported: if the server does not support incremental uploads
+            RemoteEngineInitFailed: if the server fails to receive the project
+        """
+        request_data = json.dumps({"project_dir_name": project_dir_name, "manifest": manifest})
+        response = self._send_sync_request(ServerMessage("sync_project", "1", request_data))
+        if _is_server_error(response):
+            raise IncrementalUploadNotSupported(response.getData()[1])
+        job_id = response.getId()
+        for relative_path in response.getData()["missing"]:
+            file_path = os.path.join(project_dir, *relative_path.split("/"))
+            offset = 0
+            chunks = read_file_chunks(file_path, chunk_size)
+            chunk = next(chunks, b"")
+            while True:
+                next_chunk = next(chunks, None)
+                chunk_data = json.dumps({"path": relative_path, "offset": offset, "final": next_chunk is None})
+                response = self._send_sync_request(ServerMessage("upload_file_chunk", job_id, chunk_data), chunk)
+                if _is_server_error(response):
+                    raise RemoteEngineInitFailed(response.getData()[1])
+                if next_chunk is None:
+                    break
+                offset += len(chunk)
+                chunk = next_chunk
+        response = self._send_sync_request(ServerMessage("finish_sync", job_id, ""))
+        if _is_server_error(response):
+            raise RemoteEngineInitFailed(response.getData()[1])
+        return job_id
+
+    def _send_sync_request(self, request, *frames):
+        """Sends a project synchronization request and waits for the response.
+
+        Args:
+            request (ServerMessage): request
+            *frames: additional binary frames
+
+        Returns:
+            ServerMessage: server's response
+        """
+        self.dealer_socket.send_multipart([request.to_bytes(), *frames])
+        response = self.dealer_socket.recv_multipart()
+        return ServerMessage.parse(response[1])
+
     def start_execution(self, engine_data, job_id):
         """Sends the start execution request along with job Id and engine (dag) data to the server.
         Response message data contains the push/pull socket port if execution starts successfully.
@@ -197,22 +290,108 @@ class EngineClient:
         self.socket.send_multipart([req.to_bytes()])
 
     def download_files(self, q):
-        """Pulls files from server until b'END' is received."""
+        """Pulls files from server until b'END' is received.
+
+        Files arrive either whole as [relative path, file data] frames, or in chunks
+        as [b"file_chunk", header, chunk data] frames. Chunk header is a JSON object with
+        "path", "offset", "size" and "final" fields; the final chunk's header also has the file's "digest"
+        computed by :func:`project_manifest.file_digest`.
+
+        Args:
+            q (Queue): queue for server status messages
+        """
         i = 0
-        while True:
-            rcv = self.rcv_next("pull")
-            if rcv[0] == b"END":
-                if i > 0:
-                    q.put(("server_status_msg", {"msg_type": "neutral", "text": f"Downloaded {i} files"}))
-                break
-            if rcv[0] == b"incoming_file":
-                q.put(
-                    ("server_status_msg", {"msg_type": "warning", "text": "Downloading file " + rcv[1].decode("utf-8")})
-                )
+        downloads = {}
+        try:
+            while True:
+                rcv = self.rcv_next("pull")
+                if rcv[0] == b"END":
+                    if i > 0:
+                        q.put(("server_status_msg", {"msg_type": "neutral", "text": f"Downloaded {i} files"}))
+                    break
+                if rcv[0] == b"incoming_file":
+                    q.put(
+                        (
+                            "server_status_msg",
+                            {"msg_type": "warning", "text": "Downloading file " + rcv[1].decode("utf-8")},
+                        )
+                    )
+                elif rcv[0] == b"file_chunk":
+                    header = json.loads(rcv[1].decode("utf-8"))
+                    result = self.save_downloaded_chunk(downloads, header, rcv[2], q)
+                    if result is not None:
+                        success, txt = result
+                        q.put(("server_status_msg", {"msg_type": success, "text": txt}))
+                        i += 1
+                else:
+                    success, txt = self.save_downloaded_file(rcv[0], rcv[1])
+                    q.put(("server_status_msg", {"msg_type": success, "text": txt}))
+                    i += 1
+        finally:
+            for download in downloads.values():
+                if download is not None:
+                    download.abort()
+
+    def save_downloaded_chunk(self, downloads, header, chunk, q):
+        """Writes a downloaded file chunk into a partial file in project directory.
+
+        Once the final chunk arrives, the checksum is verified and the partial file replaces the destination file.
+        The partial file is removed if the transfer fails.
+
+        Args:
+            downloads (dict): mapping from relative path to ongoing download
+            header (dict): chunk header
+            chunk (bytes): chunk data
+            q (Queue): queue for progress messages
+
+        Returns:
+            tuple: message type and text if the file is finished, None otherwise
+        """
+        rel_path = header["path"]
+        if not self.client_project_dir:
+            return "fail", f"Project dir should be {self.client_project_dir} but it was not found"
+        if rel_path in downloads and downloads[rel_path] is None:
+            # The transfer of this file has been rejected; skip its remaining chunks.
+            if header["offset"] != 0:
+                if header["final"]:
+                    del downloads[rel_path]
+                return None
+            del downloads[rel_path]
+        download = downloads.get(rel_path)
+        if download is None:
+            dst_fpath = os.path.abspath(os.path.join(self.client_project_dir, rel_path))
+            try:
+                download = _FileDownload(dst_fpath, header["size"], header["offset"])
+            except OSError as e:
+                return "fail", f"Opening '{dst_fpath}' for writing failed. [{type(e).__name__}: {e}"
+            except ValueError as e:
+                if not header["final"]:
+                    downloads[rel_path] = None
+                return "fail", str(e)
+            downloads[rel_path] = download
+        try:
+            download.write(header["offset"], chunk)
+        except OSError as e:
+            download.abort()
+            if header["final"]:
+                del downloads[rel_path]
             else:
-                success, txt = self.save_downloaded_file(rcv[0], rcv[1])
-                q.put(("server_status_msg", {"msg_type": success, "text": txt}))
-                i += 1
+                downloads[rel_path] = None
+            return "fail", f"Writing to '{download.path}' failed. [{type(e).__name__}: {e}"
+        progress = download.take_progress_report()
+        if progress is not None:
+            q.put(("server_status_msg", {"msg_type": "neutral", "text": f"{rel_path}: {progress}"}))
+        if not header["final"]:
+            return None
+        del downloads[rel_path]
+        rel_path_wo_fname, fname = os.path.split(rel_path)
+        try:
+            download.finish(header["digest"])
+        except OSError as e:
+            return "fail", f"Saving the received file to '{download.path}' failed. [{type(e).__name__}: {e}"
+        except ValueError as e:
+            return "fail", str(e)
+        return "neutral", f"<b>{fname}</b> saved to  <b>[project_dir]/{rel_path_wo_fname}</b>"
 
     def save_downloaded_file(self, b_rel_path, file_data):
         """Saves downloaded file to project directory.
@@ -356,3 +535,116 @@ class EngineClient:
             self.pull_socket.close()
         if not self._context.closed:
             self._context.term()
+
+
+class _FileDownload:
+    """A file that is being downloaded in chunks."""
+
+    PARTIAL_SUFFIX = ".part"
+    REPORT_INTERVAL = 64 * 1024 * 1024
+    """Number of received bytes between progress reports."""
+
+    def __init__(self, path, size, offset):
+        """
+        Args:
+            path (str): absolute path to destination file
+            size (int): total file size in bytes
+            offset (int): offset of the first received chunk
+
+        Raises:
+            ValueError: raised if transfer does not start from the beginning of the file
+        """
+        if offset != 0:
+            raise ValueError(f"Download of '{path}' did not start from the beginning of the file.")
+        self.path = path
+        self._size = size
+        self._partial_path = path + self.PARTIAL_SUFFIX
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(self._partial_path, "wb")
+        self._received = 0
+        self._next_report = self.REPORT_INTERVAL
+
+    def write(self, offset, chunk):
+        """Writes a chunk to the partial file.
+
+        Args:
+            offset (int): chunk's offset from file's beginning
+            chunk (bytes): chunk data
+        """
+        self._file.seek(offset)
+        self._file.write(chunk)
+        self._received = max(self._received, offset + len(chunk))
+
+    def take_progress_report(self):
+        """Returns a progress report if enough data has been received since the last report.
+
+        Returns:
+            str: progress report or None
+        """
+        if self._received < self._next_report or self._received >= self._size:
+            return None
+        self._next_report = self._received + self.REPORT_INTERVAL
+        return f"{get_file_size(self._received)} of {get_file_size(self._size)} downloaded"
+
+    def finish(self, digest):
+        """Verifies the checksum and moves the partial file to its final destination.
+
+        The partial file is removed if it cannot be moved.
+
+        Args:
+            digest (str): expected digest as hex string
+
+        Raises:
+            ValueError: raised if the checksum does not match
+        """
+        self._file.close()
+        if file_digest(self._partial_path) != digest:
+            self._remove_partial_file()
+            raise ValueError(f"Checksum of downloaded file '{self.path}' does not match.")
+        try:
+            os.replace(self._partial_path, self.path)
+        except OSError:
+            self._remove_partial_file()
+            raise
+
+    def abort(self):
+        """Closes and removes the partial file of an unfinished transfer."""
+        self._file.close()
+        self._remove_partial_file()
+
+    def _remove_partial_file(self):
+        """Removes the partial file if it exists."""
+        try:
+            os.remove(self._partial_path)
+        except OSError:
+            pass
+
+
+def _server_capabilities(ping_data):
+    """Reads the capabilities a server advertises in its ping reply.
+
+    Args:
+        ping_data (Any): data of the ping reply
+
+    Returns:
+        frozenset of str: capabilities; empty if the server does not advertise any
+    """
+    if not isinstance(ping_data, dict):
+        return frozenset()
+    capabilities = ping_data.get("capabilities")
+    if not isinstance(capabilities, list):
+        return frozenset()
+    return frozenset(capability for capability in capabilities if isinstance(capability, str))
+
+
+def _is_server_error(response):
+    """Checks if server response is an error reply.
+
+    Args:
+        response (ServerMessage): server response
+
+    Returns:
+        bool: True if response is an error, False otherwise
+    """
+    data = response.getData()
+    return isinstance(data, list) and len(data) == 2 and data[0] == "server_init_failed"
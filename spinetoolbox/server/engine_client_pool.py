@@ -0,0 +1,139 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""A process-wide pool of connected Spine Engine Server clients.
+
+Connecting an :class:`EngineClient` means setting up sockets and pinging the server.
+The pool keeps released clients connected so that subsequent uploads and DAG executions
+targeting the same server can skip that.
+A client is checked out by one user at a time since ZMQ sockets must not be shared between threads.
+"""
+
+import threading
+import time
+from spine_engine.exception import RemoteEngineInitFailed
+from .engine_client import EngineClient
+
+HEALTH_CHECK_INTERVAL = 30.0
+"""Time in seconds a client can stay idle before it is pinged again on checkout."""
+HEALTH_CHECK_TIMEOUT = 1000
+"""Time in milliseconds to wait for a ping reply when checking an idle client."""
+MAX_IDLE_CLIENTS = 8
+"""Maximum number of idle clients kept per server."""
+
+
+class EngineClientPool:
+    """Keeps idle engine clients connected to servers for reuse."""
+
+    def __init__(self, health_check_interval=HEALTH_CHECK_INTERVAL):
+        """
+        Args:
+            health_check_interval (float): time in seconds after which idle clients are pinged before reuse
+        """
+        self._health_check_interval = health_check_interval
+        self._lock = threading.Lock()
+        self._idle_clients = {}
+
+    def acquire(self, host, port, sec_model, sec_folder):
+        """Checks out a client connected to given server.
+
+        Idle clients are reused; a new client is created if there are none.
+        Clients that have been idle for long are pinged first and dropped if the server does not respond.
+
+        Args:
+            host (str): IP address of the Spine Engine Server
+            port (int or str): Port of the client facing (frontend) socket on Spine Engine Server
+            sec_model (ClientSecurityModel): Client security scheme
+            sec_folder (str): Path to security file directory
+
+        Returns:
+            EngineClient: connected client
+
+        Raises:
+            RemoteEngineInitFailed: if the server is not responding
+        """
+        key = _pool_key(host, port, sec_model, sec_folder)
+        while True:
+            with self._lock:
+                idle_clients = self._idle_clients.get(key)
+                client, released_at = idle_clients.pop() if idle_clients else (None, None)
+            if client is None:
+                return EngineClient(host, port, sec_model, sec_folder)
+            if time.monotonic() - released_at > self._health_check_interval:
+                try:
+                    client.check_connectivity(HEALTH_CHECK_TIMEOUT)
+                except RemoteEngineInitFailed:
+                    client.close()
+                    continue
+            client.set_start_time()
+            return client
+
+    def release(self, client):
+        """Returns a client to the pool.
+
+        Args:
+            client (EngineClient): client checked out by :meth:`acquire`
+        """
+        client.reset()
+        key = _pool_key(client.host, client.port, client.sec_model, client.sec_folder)
+        with self._lock:
+            idle_clients = self._idle_clients.setdefault(key, [])
+            if len(idle_clients) < MAX_IDLE_CLIENTS:
+                idle_clients.append((client, time.monotonic()))
+                return
+        client.close()
+
+    @staticmethod
+    def discard(client):
+        """Closes a checked out client that is in unknown state instead of returning it to the pool.
+
+        Args:
+            client (EngineClient): client checked out by :meth:`acquire`
+        """
+        client.close()
+
+    def idle_client_count(self):
+        """Counts idle clients in the pool.
+
+        Returns:
+            int: number of idle clients
+        """
+        with self._lock:
+            return sum(len(clients) for clients in self._idle_clients.values())
+
+    def close_all(self):
+        """Closes all idle clients."""
+        with self._lock:
+            idle_clients = self._idle_clients
+            self._idle_clients = {}
+        for clients in idle_clients.values():
+            for client, _ in clients:
+                client.close()
+
+
+def _pool_key(host, port, sec_model, sec_folder):
+    """Makes a key that identifies a server and the security settings used to connect to it.
+
+    Args:
+        host (str): IP address of the Spine Engine Server
+        port (int or str): Port of the client facing (frontend) socket on Spine Engine Server
+        sec_model (ClientSecurityModel): Client security scheme
+        sec_folder (str): Path to security file directory
+
+    Returns:
+        tuple: pool key
+    """
+    return host, str(port), sec_model, sec_folder
+
+
+engine_client_pool = EngineClientPool()
+"""Process-wide engine client pool."""
@@ -0,0 +1,128 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Content-addressed manifests of project directories for incremental uploads to Spine Engine Server.
+
+A manifest maps each file's path relative to the project directory (using forward slashes)
+to the file's content digest and size.
+Computing digests of large input files is expensive,
+so digests are cached on disk and recomputed only when a file's size or modification time changes.
+"""
+
+from hashlib import blake2b
+import json
+import os
+
+DIGEST_BLOCK_SIZE = 1024 * 1024
+"""Number of bytes read at once when computing digests."""
+
+
+def file_digest(path):
+    """Computes the content digest of a file.
+
+    Args:
+        path (str): path to file
+
+    Returns:
+        str: digest as hex string
+    """
+    hasher = blake2b(digest_size=32)
+    with open(path, "rb") as file:
+        while block := file.read(DIGEST_BLOCK_SIZE):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def make_manifest(project_dir, digest_cache_path=None):
+    """Builds a manifest of all files in project directory.
+
+    Args:
+        project_dir (str): path to project directory
+        digest_cache_path (str, optional): path to digest cache file; if None, all digests are recomputed
+
+    Returns:
+        dict: mapping from relative file path to dict with "digest" and "size" keys
+    """
+    old_cache = _load_digest_cache(digest_cache_path) if digest_cache_path is not None else {}
+    new_cache = {}
+    manifest = {}
+    excluded_path = os.path.abspath(digest_cache_path) if digest_cache_path is not None else None
+    for dir_path, _, file_names in os.walk(project_dir):
+        for file_name in file_names:
+            path = os.path.join(dir_path, file_name)
+            if excluded_path is not None and os.path.abspath(path) == excluded_path:
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            relative_path = os.path.relpath(path, project_dir).replace(os.sep, "/")
+            cached = old_cache.get(relative_path)
+            if cached is not None and cached["size"] == stat.st_size and cached["mtime"] == stat.st_mtime_ns:
+                digest = cached["digest"]
+            else:
+                try:
+                    digest = file_digest(path)
+                except OSError:
+                    continue
+            new_cache[relative_path] = {"digest": digest, "size": stat.st_size, "mtime": stat.st_mtime_ns}
+            manifest[relative_path] = {"digest": digest, "size": stat.st_size}
+    if digest_cache_path is not None:
+        _save_digest_cache(digest_cache_path, new_cache)
+    return manifest
+
+
+def read_file_chunks(path, chunk_size):
+    """Yields the contents of a file in chunks.
+
+    Args:
+        path (str): path to file
+        chunk_size (int): maximum chunk size in bytes
+
+    Yields:
+        bytes: file chunk
+    """
+    with open(path, "rb") as file:
+        while chunk := file.read(chunk_size):
+            yield chunk
+
+
+def _load_digest_cache(path):
+    """Loads digest cache.
+
+    Args:
+        path (str): path to cache file
+
+    Returns:
+        dict: cached digests
+    """
+    try:
+        with open(path, encoding="utf-8") as cache_file:
+            cache = json.load(cache_file)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_digest_cache(path, cache):
+    """Saves digest cache.
+
+    Args:
+        path (str): path to cache file
+        cache (dict): digests to save
+    """
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as cache_file:
+            json.dump(cache, cache_file)
+    except OSError:
+        pass
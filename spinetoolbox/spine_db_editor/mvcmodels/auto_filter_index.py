@@ -0,0 +1,232 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+"""Indexes that speed up auto filtering of single models and populating auto filter menus."""
+
+from __future__ import annotations
+from collections.abc import Callable, Collection, Iterable
+from typing import Any
+from spinedb_api.temp_id import TempId
+
+
+class AutoFilterIndex:
+    """Maps the values of filtered fields to the ids of the items that have them.
+
+    Field indexes are built lazily the first time a field is filtered
+    and kept up to date by the owner through :meth:`add`, :meth:`remove` and :meth:`update`.
+    The ids that pass the whole auto filter are cached until the filter or the indexes change.
+    """
+
+    def __init__(self, field_value: Callable[[TempId, str], Any]):
+        """
+        Args:
+            field_value: callable that returns the filtered value of given item's field
+        """
+        self._field_value = field_value
+        self._ids_by_value: dict[str, dict[Any, set[TempId]]] = {}
+        self._value_by_id: dict[str, dict[TempId, Any]] = {}
+        self._accepted_ids: set[TempId] | None = None
+
+    def accepted_ids(self, all_ids: Collection[TempId], auto_filter: dict[str, set]) -> set[TempId]:
+        """Returns the ids that pass given auto filter.
+
+        Args:
+            all_ids: ids of all items in the model
+            auto_filter: mapping from field to accepted values
+
+        Returns:
+            accepted ids
+        """
+        if self._accepted_ids is not None:
+            return self._accepted_ids
+        accepted = None
+        for field, values in auto_filter.items():
+            ids_by_value = self._field_index(field, all_ids)
+            if len(values) < len(ids_by_value):
+                field_ids = set().union(*(ids_by_value[value] for value in values if value in ids_by_value))
+            else:
+                field_ids = set().union(*(ids for value, ids in ids_by_value.items() if value in values))
+            accepted = field_ids if accepted is None else accepted & field_ids
+        self._accepted_ids = accepted if accepted is not None else set(all_ids)
+        return self._accepted_ids
+
+    def invalidate_filter(self) -> None:
+        """Drops cached accepted ids; must be called when the auto filter changes."""
+        self._accepted_ids = None
+
+    def clear(self) -> None:
+        """Drops all indexes."""
+        self._ids_by_value.clear()
+        self._value_by_id.clear()
+        self._accepted_ids = None
+
+    def add(self, ids: Iterable[TempId], auto_filter: dict[str, set]) -> None:
+        """Indexes new items.
+
+        Args:
+            ids: ids of added items
+            auto_filter: mapping from field to accepted values
+        """
+        ids = list(ids)
+        for field, value_by_id in self._value_by_id.items():
+            ids_by_value = self._ids_by_value[field]
+            for id_ in ids:
+                value = value_by_id[id_] = self._field_value(id_, field)
+                ids_by_value.setdefault(value, set()).add(id_)
+        if self._accepted_ids is None:
+            return
+        if not auto_filter.keys() <= self._value_by_id.keys():
+            self._accepted_ids = None
+            return
+        for id_ in ids:
+            if all(self._value_by_id[field][id_] in values for field, values in auto_filter.items()):
+                self._accepted_ids.add(id_)
+            else:
+                self._accepted_ids.discard(id_)
+
+    def remove(self, ids: Iterable[TempId]) -> None:
+        """Removes items from the indexes.
+
+        Args:
+            ids: ids of removed items
+        """
+        ids = list(ids)
+        for field, value_by_id in self._value_by_id.items():
+            ids_by_value = self._ids_by_value[field]
+            for id_ in ids:
+                value = value_by_id.pop(id_)
+                value_ids = ids_by_value[value]
+                value_ids.discard(id_)
+                if not value_ids:
+                    del ids_by_value[value]
+        if self._accepted_ids is not None:
+            self._accepted_ids.difference_update(ids)
+
+    def update(self, ids: Iterable[TempId], auto_filter: dict[str, set]) -> None:
+        """Re-indexes updated items.
+
+        Args:
+            ids: ids of updated items
+            auto_filter: mapping from field to accepted values
+        """
+        ids = list(ids)
+        self.remove(ids)
+        self.add(ids, auto_filter)
+
+    def _field_index(self, field: str, all_ids: Iterable[TempId]) -> dict[Any, set[TempId]]:
+        """Returns index of given field building it if necessary.
+
+        Args:
+            field: field name
+            all_ids: ids of all items in the model
+
+        Returns:
+            mapping from value to ids
+        """
+        ids_by_value = self._ids_by_value.get(field)
+        if ids_by_value is not None:
+            return ids_by_value
+        ids_by_value = {}
+        value_by_id = {}
+        for id_ in all_ids:
+            value = value_by_id[id_] = self._field_value(id_, field)
+            ids_by_value.setdefault(value, set()).add(id_)
+        self._ids_by_value[field] = ids_by_value
+        self._value_by_id[field] = value_by_id
+        return ids_by_value
+
+
+class ColumnValueCounts:
+    """Keeps track of the distinct display values of a single model column and how many rows have each value.
+
+    Added and updated items are marked stale and their values are computed
+    by the owner the next time the counts are needed.
+    """
+
+    def __init__(self):
+        self._value_by_id: dict[TempId, tuple[Any, Any]] = {}
+        self._counts: dict[Any, int] = {}
+        self._edit_data: dict[Any, Any] = {}
+        self._stale_ids: set[TempId] = set()
+
+    def stale_ids(self) -> set[TempId]:
+        """Returns ids whose values need to be (re)computed."""
+        return self._stale_ids
+
+    def counts(self) -> dict[Any, int]:
+        """Returns a mapping from display value to number of items that have it."""
+        return self._counts
+
+    def edit_data(self) -> dict[Any, Any]:
+        """Returns a mapping from display value to edit data."""
+        return self._edit_data
+
+    def value(self, item_id: TempId) -> tuple[Any, Any]:
+        """Returns item's display value and edit data.
+
+        Args:
+            item_id: item id
+
+        Returns:
+            display value and edit data
+        """
+        return self._value_by_id[item_id]
+
+    def insert(self, item_id: TempId, display_value: Any, edit_data: Any) -> None:
+        """Counts an item's value.
+
+        Args:
+            item_id: item id
+            display_value: item's display value
+            edit_data: item's edit data
+        """
+        self._discard(item_id)
+        self._stale_ids.discard(item_id)
+        self._value_by_id[item_id] = (display_value, edit_data)
+        self._counts[display_value] = self._counts.get(display_value, 0) + 1
+        self._edit_data[display_value] = edit_data
+
+    def invalidate(self, ids: Iterable[TempId]) -> None:
+        """Marks items stale.
+
+        Args:
+            ids: ids of added or updated items
+        """
+        for id_ in ids:
+            self._discard(id_)
+            self._stale_ids.add(id_)
+
+    def remove(self, ids: Iterable[TempId]) -> None:
+        """Stops counting items.
+
+        Args:
+            ids: ids of removed items
+        """
+        for id_ in ids:
+            self._discard(id_)
+            self._stale_ids.discard(id_)
+
+    def _discard(self, item_id: TempId) -> None:
+        """Removes item's value from the counts.
+
+        Args:
+            item_id: item id
+        """
+        value = self._value_by_id.pop(item_id, None)
+        if value is None:
+            return
+        display_value = value[0]
+        count = self._counts[display_value] - 1
+        if count:
+            self._counts[display_value] = count
+        else:
+            del self._counts[display_value]
+            del self._edit_data[display_value]
@@ -0,0 +1,647 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Provides a pivot model that stores its data in columnar NumPy arrays."""
+
+from collections import Counter
+from collections.abc import MutableMapping
+import numpy as np
+from .pivot_model import PivotModel
+
+
+class ColumnarPivotData(MutableMapping):
+    """A mapping from pivot keys to values.
+
+    Each index is stored as an integer coded column and values are stored in an object array.
+    The codes of a key are packed into a single composite integer which is used for lookups
+    through a sorted array of composite keys.
+    Keys added since the sorted array was last built are kept in a small pending dictionary.
+    """
+
+    _INITIAL_CAPACITY = 1024
+    _MAX_PENDING = 4096
+    """Number of pending keys above which the sorted composite keys are rebuilt."""
+    _MAX_INT64_BITS = 63
+
+    def __init__(self, dimension_count):
+        """
+        Args:
+            dimension_count (int): number of indexes in keys
+        """
+        self._dimension_count = dimension_count
+        self._encoders = [{} for _ in range(dimension_count)]
+        self._decoders = [[] for _ in range(dimension_count)]
+        self._bits = [1] * dimension_count
+        self._shifts = [0] * dimension_count
+        self._codes = np.empty((self._INITIAL_CAPACITY, dimension_count), dtype=np.int64)
+        self._values = np.empty(self._INITIAL_CAPACITY, dtype=object)
+        self._alive = np.zeros(self._INITIAL_CAPACITY, dtype=bool)
+        self._composite = np.empty(self._INITIAL_CAPACITY, dtype=np.int64)
+        self._row_count = 0
+        self._first_row = 0
+        self._length = 0
+        self._sorted_keys = np.empty(0, dtype=np.int64)
+        self._sorted_rows = np.empty(0, dtype=np.int64)
+        self._pending = {}
+        self._update_shifts()
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        rows = np.flatnonzero(self._alive[: self._row_count])
+        if not self._dimension_count:
+            return iter(len(rows) * [()])
+        columns = [self.decode(dimension, self._codes[rows, dimension]) for dimension in range(self._dimension_count)]
+        return zip(*columns)
+
+    def __contains__(self, key):
+        composite = self._composite_key(key)
+        return composite is not None and self._find_row(composite) >= 0
+
+    def __getitem__(self, key):
+        composite = self._composite_key(key)
+        row = self._find_row(composite) if composite is not None else -1
+        if row < 0:
+            raise KeyError(key)
+        return self._values[row]
+
+    def __setitem__(self, key, value):
+        self.update({key: value})
+
+    def __delitem__(self, key):
+        composite = self._composite_key(key)
+        row = self._find_row(composite) if composite is not None else -1
+        if row < 0:
+            raise KeyError(key)
+        self._delete_rows(np.array([row], dtype=np.int64))
+
+    def update(self, other=(), /):
+        """Sets multiple items at once.
+
+        Args:
+            other (Mapping or Iterable of tuple): items to set
+        """
+        items = other.items() if hasattr(other, "items") else other
+        keys = []
+        values = []
+        for key, value in items:
+            keys.append(key)
+            values.append(value)
+        if not keys:
+            return
+        codes = self._encode_keys(keys)
+        composites = self._pack(codes)
+        rows = self._find_rows(composites)
+        existing = rows >= 0
+        if existing.any():
+            existing_rows = rows[existing]
+            self._values[existing_rows] = _object_array([v for v, e in zip(values, existing) if e])
+        new = ~existing
+        new_count = int(new.sum())
+        if not new_count:
+            return
+        first = self._row_count
+        last = first + new_count
+        self._reserve(last)
+        self._codes[first:last] = codes[new]
+        self._values[first:last] = _object_array([v for v, n in zip(values, new) if n])
+        self._alive[first:last] = True
+        new_composites = composites[new]
+        self._composite[first:last] = new_composites
+        self._row_count = last
+        self._length += new_count
+        if len(self._pending) + new_count > self._MAX_PENDING:
+            self._build_sorted_keys()
+        else:
+            self._pending.update(zip(new_composites.tolist(), range(first, last)))
+
+    def rows_of(self, keys):
+        """Returns rows of keys without adding new values to encoders.
+
+        Args:
+            keys (list of tuple): keys
+
+        Returns:
+            np.ndarray: rows; -1 for keys that are not in data
+        """
+        rows = np.full(len(keys), -1, dtype=np.int64)
+        if not keys or not self._length:
+            return rows
+        sized = np.fromiter((len(key) == self._dimension_count for key in keys), dtype=bool, count=len(keys))
+        sized_keys = [key for key, is_sized in zip(keys, sized) if is_sized]
+        codes = np.zeros((len(sized_keys), self._dimension_count), dtype=np.int64)
+        for dimension, (encoder, values) in enumerate(zip(self._encoders, zip(*sized_keys))):
+            codes[:, dimension] = [encoder.get(value, -1) for value in values]
+        known = (codes >= 0).all(axis=1)
+        sized_rows = np.full(len(sized_keys), -1, dtype=np.int64)
+        if known.any():
+            sized_rows[known] = self._find_rows(self._pack(codes[known]))
+        rows[sized] = sized_rows
+        return rows
+
+    def contains_many(self, keys):
+        """Tests multiple keys for membership at once.
+
+        Args:
+            keys (list of tuple): keys
+
+        Returns:
+            np.ndarray: boolean mask of keys that are in data
+        """
+        return self.rows_of(keys) >= 0
+
+    def delete_many(self, keys):
+        """Deletes multiple keys at once; keys that are not in data are ignored.
+
+        Args:
+            keys (list of tuple): keys
+        """
+        rows = self.rows_of(keys)
+        self._delete_rows(np.unique(rows[rows >= 0]))
+
+    def first_key(self):
+        """Returns the first key in data.
+
+        Returns:
+            tuple: key or None if data is empty
+        """
+        if not self._length:
+            return None
+        while not self._alive[self._first_row]:
+            self._first_row += 1
+        row = self._first_row
+        return tuple(self._decoders[dimension][code] for dimension, code in enumerate(self._codes[row].tolist()))
+
+    def decoder(self, dimension):
+        """Returns the values of an index in code order.
+
+        Args:
+            dimension (int): index position
+
+        Returns:
+            list: index values; the code of a value is its position in the list
+        """
+        return self._decoders[dimension]
+
+    def decode(self, dimension, codes):
+        """Decodes an array of codes.
+
+        Args:
+            dimension (int): index position
+            codes (np.ndarray): codes
+
+        Returns:
+            list: decoded values
+        """
+        decoder = _object_array(self._decoders[dimension])
+        return decoder[codes].tolist()
+
+    def code_of(self, dimension, value):
+        """Returns the code of given index value or None if value is not in data.
+
+        Args:
+            dimension (int): index position
+            value (Any): index value
+
+        Returns:
+            int: code
+        """
+        return self._encoders[dimension].get(value)
+
+    def value_counts(self, dimensions, filter_dimensions=(), filter_value=()):
+        """Counts unique combinations of values of given indexes.
+
+        Args:
+            dimensions (Sequence of int): index positions
+            filter_dimensions (Sequence of int): index positions to filter by
+            filter_value (tuple): values of the filter indexes that keys must have to be counted
+
+        Returns:
+            dict: mapping from value combination to count
+        """
+        unique_codes, counts = self.unique_codes(dimensions, filter_dimensions, filter_value)
+        if not len(counts):
+            return {}
+        if not dimensions:
+            return {(): int(counts[0])}
+        columns = [self.decode(dimension, unique_codes[:, i]) for i, dimension in enumerate(dimensions)]
+        return dict(zip(zip(*columns), counts.tolist()))
+
+    def unique_codes(self, dimensions, filter_dimensions=(), filter_value=()):
+        """Finds unique combinations of codes of given indexes.
+
+        Args:
+            dimensions (Sequence of int): index positions
+            filter_dimensions (Sequence of int): index positions to filter by
+            filter_value (tuple): values of the filter indexes that keys must have to be included
+
+        Returns:
+            tuple: unique code combinations, one column per dimension, and their counts
+        """
+        empty = np.empty((0, len(dimensions)), dtype=np.int64), np.empty(0, dtype=np.int64)
+        mask = self._alive[: self._row_count].copy()
+        for dimension, value in zip(filter_dimensions, filter_value):
+            code = self.code_of(dimension, value)
+            if code is None:
+                return empty
+            mask &= self._codes[: self._row_count, dimension] == code
+        codes = self._codes[: self._row_count][mask][:, list(dimensions)]
+        if not len(codes):
+            return empty
+        if not dimensions:
+            return np.empty((1, 0), dtype=np.int64), np.array([len(codes)], dtype=np.int64)
+        bits = [self._bits[dimension] for dimension in dimensions]
+        if sum(bits) > self._MAX_INT64_BITS:
+            return np.unique(codes, axis=0, return_counts=True)
+        shifts = np.cumsum([0] + bits[:-1])
+        packed = (codes << shifts).sum(axis=1)
+        unique_packed, counts = np.unique(packed, return_counts=True)
+        masks = (1 << np.array(bits, dtype=np.int64)) - 1
+        return (unique_packed[:, np.newaxis] >> shifts) & masks, counts
+
+    def gather(self, composites, valid):
+        """Returns values for an array of composite keys.
+
+        Args:
+            composites (np.ndarray): composite keys
+            valid (np.ndarray): mask of keys that may exist in data
+
+        Returns:
+            np.ndarray: values, None where key is not in data
+        """
+        result = np.full(composites.shape, None, dtype=object)
+        if not valid.any():
+            return result
+        rows = np.full(composites.shape, -1, dtype=np.int64)
+        rows[valid] = self._find_rows(composites[valid])
+        found = rows >= 0
+        result[found] = self._values[rows[found]]
+        return result
+
+    def pack_codes(self, dimensions, codes):
+        """Packs partial key codes into composite key parts.
+
+        Args:
+            dimensions (Sequence of int): index positions
+            codes (np.ndarray): codes, one column per dimension
+
+        Returns:
+            np.ndarray: composite key parts
+        """
+        packed = np.zeros(len(codes), dtype=self._composite.dtype)
+        for i, dimension in enumerate(dimensions):
+            packed += codes[:, i].astype(self._composite.dtype) << self._shifts[dimension]
+        return packed
+
+    def _encode_keys(self, keys):
+        """Encodes keys to codes adding new values to encoders as needed.
+
+        Args:
+            keys (list of tuple): keys
+
+        Returns:
+            np.ndarray: codes
+        """
+        codes = np.empty((len(keys), self._dimension_count), dtype=np.int64)
+        grown = False
+        for dimension, values in enumerate(zip(*keys)):
+            encoder = self._encoders[dimension]
+            decoder = self._decoders[dimension]
+            column = []
+            for value in values:
+                code = encoder.get(value)
+                if code is None:
+                    code = encoder[value] = len(decoder)
+                    decoder.append(value)
+                column.append(code)
+            codes[:, dimension] = column
+            max_code = len(decoder) - 1
+            if max_code >= 1 << self._bits[dimension]:
+                self._bits[dimension] = max_code.bit_length() + 1
+                grown = True
+        if grown:
+            self._update_shifts()
+            self._composite[: self._row_count] = self._pack(self._codes[: self._row_count])
+            self._build_sorted_keys()
+        return codes
+
+    def _update_shifts(self):
+        """Recalculates bit shifts of indexes and switches composite keys to Python ints if they overflow int64."""
+        shift = 0
+        for dimension, bits in enumerate(self._bits):
+            self._shifts[dimension] = shift
+            shift += bits
+        dtype = np.int64 if shift <= self._MAX_INT64_BITS else object
+        if self._composite.dtype != dtype:
+            self._composite = self._composite.astype(dtype)
+            self._sorted_keys = self._sorted_keys.astype(dtype)
+
+    def _pack(self, codes):
+        """Packs codes into composite keys.
+
+        Args:
+            codes (np.ndarray): codes
+
+        Returns:
+            np.ndarray: composite keys
+        """
+        return self.pack_codes(range(self._dimension_count), codes)
+
+    def _composite_key(self, key):
+        """Returns composite key for a key or None if the key contains unknown values.
+
+        Args:
+            key (tuple): key
+
+        Returns:
+            int: composite key
+        """
+        if len(key) != self._dimension_count:
+            return None
+        composite = 0
+        for dimension, value in enumerate(key):
+            code = self._encoders[dimension].get(value)
+            if code is None:
+                return None
+            composite += code << self._shifts[dimension]
+        return composite
+
+    def _find_row(self, composite):
+        """Returns row of composite key or -1 if key is not in data.
+
+        Args:
+            composite (int): composite key
+
+        Returns:
+            int: row
+        """
+        row = self._pending.get(composite)
+        if row is not None:
+            return row
+        position = np.searchsorted(self._sorted_keys, composite)
+        if position < len(self._sorted_keys) and self._sorted_keys[position] == composite:
+            row = self._sorted_rows[position]
+            if self._alive[row]:
+                return int(row)
+        return -1
+
+    def _find_rows(self, composites):
+        """Returns rows of composite keys; -1 for keys that are not in data.
+
+        Args:
+            composites (np.ndarray): composite keys
+
+        Returns:
+            np.ndarray: rows
+        """
+        rows = np.full(len(composites), -1, dtype=np.int64)
+        if len(self._sorted_keys):
+            positions = np.searchsorted(self._sorted_keys, composites)
+            in_bounds = positions < len(self._sorted_keys)
+            matches = np.zeros(len(composites), dtype=bool)
+            matches[in_bounds] = self._sorted_keys[positions[in_bounds]] == composites[in_bounds]
+            candidate_rows = self._sorted_rows[positions[matches]]
+            alive = self._alive[candidate_rows]
+            match_indexes = np.flatnonzero(matches)
+            rows[match_indexes[alive]] = candidate_rows[alive]
+        if self._pending:
+            pending = self._pending
+            for i, composite in enumerate(composites.tolist()):
+                row = pending.get(composite)
+                if row is not None:
+                    rows[i] = row
+        return rows
+
+    def _build_sorted_keys(self):
+        """Rebuilds sorted composite keys from live rows and clears pending keys."""
+        rows = np.flatnonzero(self._alive[: self._row_count])
+        composites = self._composite[rows]
+        order = np.argsort(composites, kind="stable")
+        self._sorted_keys = composites[order]
+        self._sorted_rows = rows[order]
+        self._pending = {}
+
+    def _delete_rows(self, rows):
+        """Marks rows removed.
+
+        Args:
+            rows (np.ndarray): unique rows of live keys
+        """
+        if not len(rows):
+            return
+        self._alive[rows] = False
+        self._values[rows] = None
+        if self._pending:
+            for composite in self._composite[rows].tolist():
+                self._pending.pop(composite, None)
+        self._length -= len(rows)
+        if self._length < self._row_count // 2 and self._row_count > self._INITIAL_CAPACITY:
+            self._compact()
+
+    def _reserve(self, row_count):
+        """Makes sure arrays can hold given number of rows.
+
+        Args:
+            row_count (int): required row count
+        """
+        capacity = len(self._values)
+        if row_count <= capacity:
+            return
+        while capacity < row_count:
+            capacity *= 2
+        self._codes = _resized(self._codes, capacity)
+        self._values = _resized(self._values, capacity)
+        self._alive = _resized(self._alive, capacity)
+        self._composite = _resized(self._composite, capacity)
+
+    def _compact(self):
+        """Drops removed rows from arrays."""
+        rows = np.flatnonzero(self._alive[: self._row_count])
+        self._row_count = len(rows)
+        self._first_row = 0
+        self._codes[: self._row_count] = self._codes[rows]
+        self._values[: self._row_count] = self._values[rows]
+        self._values[self._row_count :] = None
+        self._composite[: self._row_count] = self._composite[rows]
+        self._alive[: self._row_count] = True
+        self._alive[self._row_count :] = False
+        self._build_sorted_keys()
+
+
+class ColumnarPivotModel(PivotModel):
+    """A pivot model that stores data in columnar arrays.
+
+    Uses less memory than :class:`PivotModel` and computes headers and visible data blocks
+    with vectorized operations, which pays off with very large pivot tables.
+    """
+
+    def _make_data(self, data):
+        """See base class."""
+        columnar_data = ColumnarPivotData(len(self.index_ids))
+        columnar_data.update(data)
+        return columnar_data
+
+    def _positions(self, indexes):
+        """Returns positions of given indexes in keys.
+
+        Args:
+            indexes (Iterable of str): index ids
+
+        Returns:
+            list of int: positions
+        """
+        return [self.index_ids.index(i) for i in indexes if i in self.index_ids]
+
+    def _count_index_values(self):
+        """See base class."""
+        if not self._data:
+            return {}
+        return {
+            index_id: Counter({value[0]: count for value, count in self._data.value_counts((position,)).items()})
+            for position, index_id in enumerate(self.index_ids)
+        }
+
+    def _count_header_values(self, indexes):
+        """See base class."""
+        if not indexes:
+            return {}
+        return self._data.value_counts(self._positions(indexes), self._positions(self.pivot_frozen), self.frozen_value)
+
+    def _count_frozen_values(self):
+        """See base class."""
+        return Counter(self._data.value_counts(self._positions(self.pivot_frozen)))
+
+    def _missing_keys(self, keys):
+        """See base class."""
+        return [key for key, found in zip(keys, self._data.contains_many(keys)) if not found]
+
+    def _existing_keys(self, keys):
+        """See base class."""
+        return [key for key, found in zip(keys, self._data.contains_many(keys)) if found]
+
+    def _delete_keys(self, keys):
+        """See base class."""
+        self._data.delete_many(keys)
+
+    def _first_key(self):
+        """See base class."""
+        return self._data.first_key()
+
+    def _rebuild_headers(self):
+        """See base class."""
+        frozen_positions = self._positions(self.pivot_frozen)
+        for header, indexes in ((self._row_header, self.pivot_rows), (self._column_header, self.pivot_columns)):
+            header.reset(indexes, self._index_key_getter(indexes), self.top_left_headers)
+            if not indexes:
+                continue
+            positions = self._positions(indexes)
+            unique_codes, counts = self._data.unique_codes(positions, frozen_positions, self.frozen_value)
+            if not len(counts):
+                continue
+            accepted = np.ones(len(counts), dtype=bool)
+            ranks = []
+            key_columns = []
+            for column, (index_id, position) in enumerate(zip(indexes, positions)):
+                codes = unique_codes[:, column]
+                decoder = self._data.decoder(position)
+                top_left_header = self.top_left_headers[index_id]
+                sort_keys = {}
+                for code in np.unique(codes).tolist():
+                    value = decoder[code]
+                    if top_left_header.accepts(value):
+                        sort_key = top_left_header.header_data(value)
+                        sort_keys[code] = sort_key if sort_key is not None else ""
+                accepted &= np.isin(codes, np.fromiter(sort_keys, dtype=np.int64, count=len(sort_keys)))
+                rank = np.zeros(len(decoder), dtype=np.int64)
+                ordered_codes = sorted(sort_keys, key=sort_keys.__getitem__)
+                rank[ordered_codes] = np.arange(len(ordered_codes))
+                ranks.append(rank[codes])
+                key_columns.append(sort_keys)
+            all_values = zip(*(self._data.decode(position, unique_codes[:, i]) for i, position in enumerate(positions)))
+            value_counts = dict(zip(all_values, counts.tolist()))
+            order = np.lexsort(ranks[::-1])
+            ordered = unique_codes[order[accepted[order]]]
+            values = list(zip(*(self._data.decode(position, ordered[:, i]) for i, position in enumerate(positions))))
+            sort_keys = [
+                list(row_keys)
+                for row_keys in zip(
+                    *([keys[code] for code in ordered[:, i].tolist()] for i, keys in enumerate(key_columns))
+                )
+            ]
+            header.load(value_counts, values, sort_keys)
+
+    def _packed_header_keys(self, indexes, header_values):
+        """Packs header values into composite key parts.
+
+        Args:
+            indexes (tuple): index ids
+            header_values (list of tuple): header values
+
+        Returns:
+            tuple: composite key parts and mask of header values that exist in data
+        """
+        positions = self._positions(indexes)
+        codes = np.zeros((len(header_values), len(positions)), dtype=np.int64)
+        valid = np.ones(len(header_values), dtype=bool)
+        for row, value in enumerate(header_values):
+            for column, (position, item) in enumerate(zip(positions, value)):
+                code = self._data.code_of(position, item)
+                if code is None:
+                    valid[row] = False
+                    break
+                codes[row, column] = code
+        return self._data.pack_codes(positions, codes), valid
+
+    def get_pivoted_data(self, row_mask, column_mask):
+        """See base class."""
+        if not self.rows and not self.columns:
+            return super().get_pivoted_data(row_mask, column_mask)
+        if self.pivot_rows and any(r >= len(self.rows) or r < 0 for r in row_mask):
+            raise ValueError("row_mask contains invalid indexes for current row pivot")
+        if self.pivot_columns and any(c >= len(self.columns) or c < 0 for c in column_mask):
+            raise ValueError("column_mask contains invalid indexes for current column pivot")
+        row_keys = [self.row_key(row) for row in row_mask]
+        column_keys = [self.column_key(column) for column in column_mask]
+        row_parts, valid_rows = self._packed_header_keys(self.pivot_rows, row_keys)
+        column_parts, valid_columns = self._packed_header_keys(self.pivot_columns, column_keys)
+        frozen_parts, valid_frozen = self._packed_header_keys(self.pivot_frozen, [self.frozen_value])
+        composites = row_parts[:, np.newaxis] + column_parts[np.newaxis, :] + frozen_parts[0]
+        valid = valid_rows[:, np.newaxis] & valid_columns[np.newaxis, :] & valid_frozen[0]
+        return self._data.gather(composites, valid).tolist()
+
+
+def _object_array(values):
+    """Creates a one-dimensional object array without NumPy trying to nest sequences.
+
+    Args:
+        values (list): array elements
+
+    Returns:
+        np.ndarray: object array
+    """
+    return np.fromiter(values, dtype=object, count=len(values))
+
+
+def _resized(array, capacity):
+    """Returns a copy of array with more rows.
+
+    Args:
+        array (np.ndarray): array to resize
+        capacity (int): new row count
+
+    Returns:
+        np.ndarray: resized array
+    """
+    resized = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+    resized[: len(array)] = array
+    return resized
@@ -13,8 +13,9 @@
 """Compound models. These models concatenate several 'single' models and one 'empty' model."""
 
 from __future__ import annotations
+from array import array
 import bisect
-from collections.abc import Callable, Iterable, Iterator, Sequence
+from collections.abc import Callable, Iterable, Sequence
 from functools import cache
 from typing import Any, ClassVar, Type
 from PySide6.QtCore import QAbstractTableModel, QModelIndex, QObject, Qt, QTimer, Signal, Slot
@@ -59,6 +60,10 @@ class CompoundStackedModel(CompoundTableModel):
 
     _ENTITY_CLASS_ID_FIELD: ClassVar[str] = "entity_class_id"
     FIELDS_REQUIRING_FILTER_DATA_CONVERSION: ClassVar[set[str]] = set()
+    _UPDATES_AFFECT_OTHER_ITEMS: ClassVar[bool] = False
+    """True if updating an item may change the filtered fields of other items of the same type."""
+    _AUTO_FILTER_DEPENDENCIES: ClassVar[set[ItemType]] = set()
+    """Other item types the filtered fields of the model's items derive from."""
 
     def __init__(self, parent: QObject, db_mngr: SpineDBManager, *db_maps: DatabaseMapping):
         """
@@ -85,6 +90,9 @@ class CompoundStackedModel(CompoundTableModel):
         )
         for db_map in self._db_maps:
             self.db_mngr.register_fetch_parent(db_map, self._fetch_parent)
+        self.db_mngr.items_added.connect(self._clear_auto_filter_data)
+        self.db_mngr.items_updated.connect(self._update_auto_filter_data)
+        self.db_mngr.items_removed.connect(self._clear_auto_filter_data)
 
     @classmethod
     @cache
@@ -132,6 +140,9 @@ class CompoundStackedModel(CompoundTableModel):
         """Connects signals so changes in the submodels are acknowledged by the compound."""
         model.modelReset.connect(lambda model=model: self._handle_single_model_reset(model))
         model.modelAboutToBeReset.connect(lambda model=model: self._handle_single_model_about_to_be_reset(model))
+        model.rowsInserted.connect(
+            lambda parent, first, last, model=model: self._handle_single_model_rows_inserted(model, first, last)
+        )
         model.dataChanged.connect(
             lambda top_left, bottom_right, roles, model=model: self._handle_single_model_data_changed(
                 top_left, bottom_right, roles, model
@@ -154,23 +165,33 @@ class CompoundStackedModel(CompoundTableModel):
         """Runs when given model is about to reset."""
         if model not in self.sub_models:
             return
-        removed_rows = []
-        for mapped_row in self._row_map_iterator_for_model(model):
-            try:
-                removed_rows.append(self._inv_row_map[mapped_row])
-            except KeyError:
-                pass
-        if not removed_rows:
+        block_range = self._row_map.block_range(model)
+        if block_range is None:
             return
-        for first, count in sorted(rows_to_row_count_tuples(removed_rows), reverse=True):
-            last = first + count - 1
-            tail_row_map = self._row_map[last + 1 :]
-            self.beginRemoveRows(QModelIndex(), first, last)
-            for key in self._row_map[first:]:
-                del self._inv_row_map[key]
-            del self._row_map[first:]
-            self._append_row_map(tail_row_map)
-            self.endRemoveRows()
+        first, count = block_range
+        self.beginRemoveRows(QModelIndex(), first, first + count - 1)
+        self._row_map.remove_block(model)
+        self.endRemoveRows()
+
+    def _handle_single_model_rows_inserted(self, model: SingleModelBase, first: int, last: int) -> None:
+        """Runs when rows have been inserted into given model."""
+        if model not in self.sub_models:
+            return
+        self._row_map.shift_sub_rows(model, first, last - first + 1)
+        if not self.filter_accepts_model(model):
+            return
+        sub_rows = array("q", model.accepted_rows(first, last))
+        if not sub_rows:
+            return
+        row = self._row_map.insertion_row(model, sub_rows[0])
+        if row is None:
+            row = self._get_row_for_insertion(self.sub_models.index(model) + 1)
+            self.beginInsertRows(QModelIndex(), row, row + len(sub_rows) - 1)
+            self._row_map.insert(row, model, sub_rows)
+        else:
+            self.beginInsertRows(QModelIndex(), row, row + len(sub_rows) - 1)
+            self._row_map.insert_sub_rows(model, sub_rows)
+        self.endInsertRows()
 
     def _handle_single_model_reset(self, model: SingleModelBase) -> None:
         """Runs when given model is reset."""
@@ -180,20 +201,17 @@ class CompoundStackedModel(CompoundTableModel):
             self._insert_single_model(model)
 
     def _refresh_single_model(self, model: SingleModelBase) -> None:
-        single_row_map = self._row_map_for_model(model)
         pos = self.sub_models.index(model) + 1
-        self._insert_row_map(pos, single_row_map)
+        self._insert_row_map(pos, model)
 
     def init_model(self) -> None:
         """Initializes the model."""
         self.beginResetModel()
         self.reset_db_maps([])
-        if self._row_map:
-            self._row_map.clear()
+        self._row_map.clear()
         for m in self.sub_models:
             m.deleteLater()
         self.sub_models.clear()
-        self._inv_row_map.clear()
         self._filter_class_ids = Asterisk
         self._auto_filter.clear()
         self.endResetModel()
@@ -247,22 +265,42 @@ class CompoundStackedModel(CompoundTableModel):
 
     def clear_auto_filter(self) -> None:
         self._auto_filter.clear()
+        self._invalidate_auto_filter()
         if not self._filter_timer.isActive():
             self._filter_timer.start()
 
     def auto_filter_data_map(self, column_i: int) -> dict[str, Any]:
-        data = {}
-        for sub_model, sub_row in self._row_map:
-            index = sub_model.index(sub_row, column_i)
-            data[index.data()] = index.data(Qt.ItemDataRole.EditRole)
-        return data
+        return self._visible_column_values(column_i)[1]
 
     def auto_filter_data_list(self, column_i: int) -> list[str]:
-        data = set()
-        for sub_model, sub_row in self._row_map:
-            if x := sub_model.index(sub_row, column_i).data():
-                data.add(x)
-        return sorted(data)
+        return sorted(x for x in self._visible_column_values(column_i)[0] if x)
+
+    def _visible_column_values(self, column_i: int) -> tuple[dict[str, int], dict[str, Any]]:
+        """Collects the distinct display values of visible rows in a column.
+
+        Single models whose rows are all visible contribute their maintained value counts;
+        values of partially visible models are looked up per visible row.
+
+        Args:
+            column_i: column
+
+        Returns:
+            mapping from display value to visible row count and mapping from display value to edit data
+        """
+        counts = {}
+        edit_data = {}
+        for model, sub_rows in self._row_map.blocks():
+            model_counts = model.column_value_counts(column_i)
+            if len(sub_rows) == model.rowCount():
+                for value, count in model_counts.counts().items():
+                    counts[value] = counts.get(value, 0) + count
+                edit_data.update(model_counts.edit_data())
+                continue
+            for sub_row in sub_rows:
+                value, value_edit_data = model_counts.value(model.item_id(sub_row))
+                counts[value] = counts.get(value, 0) + 1
+                edit_data[value] = value_edit_data
+        return counts, edit_data
 
     @Slot(int, object)
     def set_auto_filter(self, field: str, values: set | None) -> None:
@@ -280,24 +318,66 @@ class CompoundStackedModel(CompoundTableModel):
             del self._auto_filter[field]
         else:
             self._auto_filter[field] = values
+        self._invalidate_auto_filter()
         if not self._filter_timer.isActive():
             self._filter_timer.start()
         self.column_filter_changed.emit(self)
 
-    def _row_map_iterator_for_model(self, model: SingleModelBase) -> Iterator[tuple[SingleModelBase, int]]:
-        """Yields row map for the given model.
+    def _invalidate_auto_filter(self) -> None:
+        """Notifies single models that the shared auto filter has changed."""
+        for model in self.sub_models:
+            model.invalidate_auto_filter()
+
+    @Slot(str, object)
+    def _clear_auto_filter_data(self, item_type: ItemType, db_map_data: DBMapPublicItems) -> None:
+        """Drops the auto filter data of single models whose fields may derive from changed items.
+
+        Items of the model's own type are added to and removed from the indexes by the single models.
+
+        Args:
+            item_type: changed item type
+            db_map_data: changed items by database mapping
+        """
+        if item_type not in self._AUTO_FILTER_DEPENDENCIES:
+            return
+        for model in self.sub_models:
+            if model.db_map in db_map_data:
+                model.clear_auto_filter_data()
+
+    @Slot(str, object)
+    def _update_auto_filter_data(self, item_type: ItemType, db_map_data: DBMapPublicItems) -> None:
+        """Updates single models' auto filter data for updated items.
+
+        Args:
+            item_type: updated item type
+            db_map_data: updated items by database mapping
+        """
+        if item_type != self.item_type:
+            self._clear_auto_filter_data(item_type, db_map_data)
+            return
+        if self._UPDATES_AFFECT_OTHER_ITEMS:
+            for model in self.sub_models:
+                if model.db_map in db_map_data:
+                    model.clear_auto_filter_data()
+            return
+        for model in self.sub_models:
+            items = db_map_data.get(model.db_map)
+            if items:
+                model.update_auto_filter_data(item["id"] for item in items)
+
+    def _accepted_sub_rows(self, model: SingleModelBase) -> Iterable[int]:
+        """Returns the rows of given model that are shown in the compound model.
         Reimplemented to take filter status into account.
 
         Args:
             model: single model
 
-        Yields:
-            (model, row number) for each accepted row
+        Returns:
+            sorted accepted rows
         """
         if not self.filter_accepts_model(model):
-            return
-        for i in model.accepted_rows():
-            yield (model, i)
+            return ()
+        return model.accepted_rows()
 
     @classmethod
     def _items_per_class(cls, items: Iterable[PublicItem]) -> dict[TempId, list[PublicItem]]:
@@ -358,34 +438,27 @@ class CompoundStackedModel(CompoundTableModel):
         return model
 
     def _insert_single_model(self, model: SingleModelBase) -> None:
-        single_row_map = self._row_map_for_model(model)
         pos = self._get_insert_position(model)
-        self._insert_row_map(pos, single_row_map)
+        self._insert_row_map(pos, model)
         self.sub_models.insert(pos, model)
 
     def _get_row_for_insertion(self, pos: int) -> int:
         for model in self.sub_models[pos:]:
-            first_row_map_item = next(self._row_map_iterator_for_model(model), None)
-            if first_row_map_item is not None:
-                try:
-                    return self._inv_row_map[first_row_map_item]
-                except KeyError:
-                    # Sometimes the submodel is not yet in the inverted row map.
-                    # In this case we just skip it and try another insertion point.
-                    pass
+            block_range = self._row_map.block_range(model)
+            if block_range is not None:
+                return block_range[0]
         return self.rowCount()
 
-    def _insert_row_map(self, pos: int, single_row_map: list[tuple[SingleModelBase, int]]) -> None:
-        if not single_row_map:
+    def _insert_row_map(self, pos: int, model: SingleModelBase) -> None:
+        sub_rows = array("q", self._accepted_sub_rows(model))
+        if not sub_rows:
             # Emit layoutChanged to trigger fetching.
             self.layoutChanged.emit()
             return
         row = self._get_row_for_insertion(pos)
-        last = row + len(single_row_map) - 1
+        last = row + len(sub_rows) - 1
         self.beginInsertRows(QModelIndex(), row, last)
-        self._row_map, tail_row_map = self._row_map[:row], self._row_map[row:]
-        self._append_row_map(single_row_map)
-        self._append_row_map(tail_row_map)
+        self._row_map.insert(row, model, sub_rows)
         self.endInsertRows()
 
     def remove_rows(self, rows: Iterable[int]) -> None:
@@ -449,31 +522,27 @@ class CompoundStackedModel(CompoundTableModel):
                 if not removed_ids:
                     continue
                 removed_invisible_rows = set()
-                removed_visible_rows = []
+                removed_compound_rows = []
                 for row in range(model.rowCount()):
                     id_ = model._main_data[row]
                     if id_ in removed_ids:
                         removed_ids.remove(id_)
-                        if (model, row) in self._inv_row_map:
-                            removed_visible_rows.append(row)
+                        compound_row = self._row_map.compound_row(model, row)
+                        if compound_row is not None:
+                            removed_compound_rows.append(compound_row)
                         else:
                             removed_invisible_rows.add(row)
-                removed_compound_rows = [self._inv_row_map[(model, row)] for row in removed_visible_rows]
                 if removed_invisible_rows:
                     new_kept_rows = self._delete_rows_from_single_model(model, removed_invisible_rows)
-                    self._update_single_model_rows_in_row_map(model, new_kept_rows)
+                    self._row_map.remap_sub_rows(model, new_kept_rows)
                 for first_compound_row, count in sorted(rows_to_row_count_tuples(removed_compound_rows), reverse=True):
                     self.beginRemoveRows(QModelIndex(), first_compound_row, first_compound_row + count - 1)
                     removed_model_rows = {
                         self._row_map[r][1] for r in range(first_compound_row, first_compound_row + count)
                     }
                     new_kept_rows = self._delete_rows_from_single_model(model, removed_model_rows)
-                    for row in removed_model_rows:
-                        del self._inv_row_map[(model, row)]
-                    self._update_single_model_rows_in_row_map(model, new_kept_rows)
-                    del self._row_map[first_compound_row : first_compound_row + count]
-                    for row, mapped_row in enumerate(self._row_map[first_compound_row:]):
-                        self._inv_row_map[mapped_row] = row + first_compound_row
+                    self._row_map.remove_rows(first_compound_row, count)
+                    self._row_map.remap_sub_rows(model, new_kept_rows)
                     self.endRemoveRows()
                 if model.rowCount() == 0:
                     emptied_single_model_indexes.append(model_index)
@@ -498,28 +567,9 @@ class CompoundStackedModel(CompoundTableModel):
                 sorted_deleted_rows.append(row)
             else:
                 new_kept_rows[row] = row - len(sorted_deleted_rows)
-        for row in reversed(sorted_deleted_rows):
-            del model._main_data[row]
+        model.drop_rows(sorted_deleted_rows)
         return new_kept_rows
 
-    def _update_single_model_rows_in_row_map(self, model: SingleModelBase, new_rows: dict[int, int]) -> None:
-        """Rewrites single model rows in row map.
-
-        Args:
-            model: single model whose rows to update
-            new_rows: mapping from old row index to updated index
-        """
-        new_inv_row_map = {}
-        for row, new_row in new_rows.items():
-            try:
-                compound_row = self._inv_row_map.pop((model, row))
-            except KeyError:
-                continue
-            self._row_map[compound_row] = (model, new_row)
-            new_inv_row_map[(model, new_row)] = compound_row
-        for mapped_row, compound_row in new_inv_row_map.items():
-            self._inv_row_map[mapped_row] = compound_row
-
     def db_item(self, index: QModelIndex) -> PublicItem:
         sub_index = self.map_to_sub(index)
         return sub_index.model().db_item(sub_index)
@@ -532,7 +582,9 @@ class CompoundStackedModel(CompoundTableModel):
         return sub_model.db_map, sub_model.item_id(sub_index.row())
 
     def tear_down(self) -> None:
-        return
+        self.db_mngr.items_added.disconnect(self._clear_auto_filter_data)
+        self.db_mngr.items_updated.disconnect(self._update_auto_filter_data)
+        self.db_mngr.items_removed.disconnect(self._clear_auto_filter_data)
 
 
 class FilterEntityMixin:
@@ -608,12 +660,12 @@ class EditParameterValueMixin:
                     ids = {item["id"] for item in class_items}
                     changed_rows = []
                     for single_row in range(single_model.rowCount()):
-                        key = (single_model, single_row)
+                        compound_row = self._row_map.compound_row(single_model, single_row)
                         if (
-                            key in self._inv_row_map
+                            compound_row is not None
                             and (item_id := single_model.index(single_row, 0).data(ITEM_ID_ROLE)) in ids
                         ):
-                            changed_rows.append(self._inv_row_map[key])
+                            changed_rows.append(compound_row)
                             ids.remove(item_id)
         if changed_rows:
             column_count = self.columnCount()
@@ -684,9 +736,8 @@ class MetadataIndicatorMixin:
                     sub_row = sub_model.row_for_associated_metadata_item(metadata)
                     if sub_row is None:
                         continue
-                    try:
-                        row = self._inv_row_map[(sub_model, sub_row)]
-                    except KeyError:
+                    row = self._row_map.compound_row(sub_model, sub_row)
+                    if row is None:
                         continue
                     if top_row is None:
                         top_row = row
@@ -716,6 +767,13 @@ class CompoundParameterDefinitionModel(EditParameterValueMixin, CompoundStackedM
     FIELDS_REQUIRING_FILTER_DATA_CONVERSION = {
         "parameter_type_list",
     }
+    _AUTO_FILTER_DEPENDENCIES = {
+        "entity_class",
+        "parameter_type",
+        "parameter_value_list",
+        "list_value",
+        "parameter_group",
+    }
 
 
 class CompoundParameterValueModel(
@@ -729,6 +787,15 @@ class CompoundParameterValueModel(
     FIELDS_REQUIRING_FILTER_DATA_CONVERSION = {
         "entity_byname",
     }
+    _AUTO_FILTER_DEPENDENCIES = {
+        "entity_class",
+        "entity",
+        "parameter_definition",
+        "alternative",
+        "parameter_value_list",
+        "list_value",
+        "parameter_group",
+    }
     METADATA_ITEM_TYPE = "parameter_value_metadata"
     METADATA_INDICATOR_COLUMN = field_index("parameter_definition_name", PARAMETER_VALUE_FIELD_MAP)
     _PARAMETER_GROUP_COLUMN = field_index("parameter_group_name", PARAMETER_VALUE_FIELD_MAP)
@@ -783,6 +850,7 @@ class CompoundEntityAlternativeModel(FilterAlternativeMixin, FilterEntityMixin,
     field_map = ENTITY_ALTERNATIVE_FIELD_MAP
     _single_model_type = SingleEntityAlternativeModel
     FIELDS_REQUIRING_FILTER_DATA_CONVERSION = {"entity_byname", "active"}
+    _AUTO_FILTER_DEPENDENCIES = {"entity_class", "entity", "alternative"}
     _ACTIVE_COLUMN = field_index("active", ENTITY_ALTERNATIVE_FIELD_MAP)
 
     def auto_filter_data_map(self, column_i: int) -> dict[str, Any]:
@@ -797,6 +865,8 @@ class CompoundEntityModel(MetadataIndicatorMixin, FilterEntityMixin, CompoundSta
     _single_model_type = SingleEntityModel
     _ENTITY_CLASS_ID_FIELD = "class_id"
     FIELDS_REQUIRING_FILTER_DATA_CONVERSION = {"entity_byname", "lat", "lon", "alt"}
+    _UPDATES_AFFECT_OTHER_ITEMS = True  # Renaming an entity changes the bynames of entities it is an element of.
+    _AUTO_FILTER_DEPENDENCIES = {"entity_class"}
     METADATA_ITEM_TYPE = "entity_metadata"
     METADATA_INDICATOR_COLUMN = field_index("name", ENTITY_FIELD_MAP)
 
@@ -12,12 +12,248 @@
 
 """Models that vertically concatenate two or more table models."""
 
+from array import array
+import bisect
+from collections.abc import Iterable, Iterator
 from typing import Any, Optional
 from PySide6.QtCore import QModelIndex, QObject, Qt, Slot
 from spinetoolbox.mvcmodels.minimal_table_model import MinimalTableModel
 from .single_models import SingleModelBase
 
 
+class RowMap:
+    """Maps compound model rows to sub model rows and back.
+
+    Each sub model shown in the compound model occupies a contiguous block of compound rows.
+    The block stores the sub model rows it shows as a sorted array,
+    and a prefix sum table of block sizes gives the first compound row of each block.
+    Rows are then mapped by bisecting the prefix sums or the block's sub model rows.
+    """
+
+    def __init__(self):
+        self._models: list[SingleModelBase] = []
+        self._sub_rows: list[array] = []
+        self._offsets: list[int] = [0]
+        self._block_indexes: dict[SingleModelBase, int] = {}
+
+    def __len__(self):
+        return self._offsets[-1]
+
+    def __getitem__(self, row: int) -> tuple[SingleModelBase, int]:
+        """Returns the sub model and sub model row of given compound row.
+
+        Args:
+            row: compound row; negative rows count from the end
+
+        Returns:
+            sub model and row
+        """
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("row out of range")
+        block = bisect.bisect_right(self._offsets, row) - 1
+        return self._models[block], self._sub_rows[block][row - self._offsets[block]]
+
+    def __iter__(self) -> Iterator[tuple[SingleModelBase, int]]:
+        for model, sub_rows in zip(self._models, self._sub_rows):
+            for sub_row in sub_rows:
+                yield model, sub_row
+
+    def blocks(self) -> Iterator[tuple[SingleModelBase, array]]:
+        """Yields the sub models in the map with their sorted sub rows."""
+        yield from zip(self._models, self._sub_rows)
+
+    def compound_row(self, model: SingleModelBase, sub_row: int) -> Optional[int]:
+        """Returns the compound row of given sub model row.
+
+        Args:
+            model: sub model
+            sub_row: sub model row
+
+        Returns:
+            compound row or None if the row is not in the map
+        """
+        block = self._block_indexes.get(model)
+        if block is None:
+            return None
+        sub_rows = self._sub_rows[block]
+        position = bisect.bisect_left(sub_rows, sub_row)
+        if position == len(sub_rows) or sub_rows[position] != sub_row:
+            return None
+        return self._offsets[block] + position
+
+    def block_range(self, model: SingleModelBase) -> Optional[tuple[int, int]]:
+        """Returns the compound rows occupied by given sub model.
+
+        Args:
+            model: sub model
+
+        Returns:
+            first compound row and row count or None if the model is not in the map
+        """
+        block = self._block_indexes.get(model)
+        if block is None:
+            return None
+        return self._offsets[block], len(self._sub_rows[block])
+
+    def sub_rows(self, model: SingleModelBase) -> array:
+        """Returns the sub model rows of given sub model that are in the map.
+
+        Args:
+            model: sub model
+
+        Returns:
+            sorted sub model rows
+        """
+        block = self._block_indexes.get(model)
+        return self._sub_rows[block] if block is not None else array("q")
+
+    def clear(self) -> None:
+        """Empties the map."""
+        self._models.clear()
+        self._sub_rows.clear()
+        self._offsets = [0]
+        self._block_indexes.clear()
+
+    def append(self, model: SingleModelBase, sub_rows: Iterable[int]) -> None:
+        """Appends sub model rows to the end of the map.
+
+        Args:
+            model: sub model
+            sub_rows: sorted sub model rows
+        """
+        self.insert(len(self), model, sub_rows)
+
+    def insert(self, row: int, model: SingleModelBase, sub_rows: Iterable[int]) -> None:
+        """Inserts sub model rows as a block starting from given compound row.
+
+        Args:
+            row: compound row at the boundary of two blocks or at the end of the map
+            model: sub model
+            sub_rows: sorted sub model rows
+        """
+        sub_rows = array("q", sub_rows)
+        if not sub_rows:
+            return
+        if model in self._block_indexes:
+            self.remove_block(model)
+        block = bisect.bisect_left(self._offsets, row)
+        if block == len(self._offsets) or self._offsets[block] != row:
+            raise ValueError(f"row {row} is not at block boundary")
+        self._models.insert(block, model)
+        self._sub_rows.insert(block, sub_rows)
+        self._offsets.insert(block, row)
+        self._update_blocks_from(block)
+
+    def insertion_row(self, model: SingleModelBase, sub_row: int) -> Optional[int]:
+        """Returns the compound row where given sub model row would be inserted.
+
+        Args:
+            model: sub model
+            sub_row: sub model row
+
+        Returns:
+            compound row or None if the model is not in the map
+        """
+        block = self._block_indexes.get(model)
+        if block is None:
+            return None
+        return self._offsets[block] + bisect.bisect_left(self._sub_rows[block], sub_row)
+
+    def insert_sub_rows(self, model: SingleModelBase, sub_rows: Iterable[int]) -> None:
+        """Inserts sub model rows into the block of given sub model.
+
+        The rows must fall between two consecutive rows of the block
+        so that they occupy a contiguous range of compound rows.
+
+        Args:
+            model: sub model that is in the map
+            sub_rows: sorted sub model rows
+        """
+        sub_rows = array("q", sub_rows)
+        if not sub_rows:
+            return
+        block = self._block_indexes[model]
+        block_sub_rows = self._sub_rows[block]
+        position = bisect.bisect_left(block_sub_rows, sub_rows[0])
+        block_sub_rows[position:position] = sub_rows
+        self._update_blocks_from(block)
+
+    def shift_sub_rows(self, model: SingleModelBase, first: int, count: int) -> None:
+        """Shifts sub model rows after rows have been inserted into the sub model.
+
+        Args:
+            model: sub model
+            first: first inserted sub model row
+            count: number of inserted rows
+        """
+        block = self._block_indexes.get(model)
+        if block is None:
+            return
+        sub_rows = self._sub_rows[block]
+        for i in range(bisect.bisect_left(sub_rows, first), len(sub_rows)):
+            sub_rows[i] += count
+
+    def remove_block(self, model: SingleModelBase) -> None:
+        """Removes all rows of given sub model.
+
+        Args:
+            model: sub model
+        """
+        block = self._block_indexes.get(model)
+        if block is None:
+            return
+        del self._models[block]
+        del self._sub_rows[block]
+        del self._offsets[block]
+        del self._block_indexes[model]
+        self._update_blocks_from(block)
+
+    def remove_rows(self, first: int, count: int) -> None:
+        """Removes a range of compound rows that belong to a single block.
+
+        Args:
+            first: first compound row to remove
+            count: number of rows to remove
+        """
+        block = bisect.bisect_right(self._offsets, first) - 1
+        position = first - self._offsets[block]
+        sub_rows = self._sub_rows[block]
+        if position + count > len(sub_rows):
+            raise ValueError("rows span multiple blocks")
+        del sub_rows[position : position + count]
+        if not sub_rows:
+            self.remove_block(self._models[block])
+            return
+        self._update_blocks_from(block)
+
+    def remap_sub_rows(self, model: SingleModelBase, new_rows: dict[int, int]) -> None:
+        """Rewrites the sub model rows of given sub model, e.g. after rows have been deleted from it.
+
+        Args:
+            model: sub model
+            new_rows: mapping from old sub model row to new sub model row; must contain all rows in the map
+        """
+        block = self._block_indexes.get(model)
+        if block is not None:
+            self._sub_rows[block] = array("q", (new_rows[row] for row in self._sub_rows[block]))
+
+    def _update_blocks_from(self, block: int) -> None:
+        """Recomputes prefix sums and block indexes starting from given block.
+
+        Args:
+            block: first block to update
+        """
+        offset = self._offsets[block - 1] + len(self._sub_rows[block - 1]) if block > 0 else 0
+        del self._offsets[block:]
+        for i in range(block, len(self._models)):
+            self._offsets.append(offset)
+            self._block_indexes[self._models[i]] = i
+            offset += len(self._sub_rows[i])
+        self._offsets.append(offset)
+
+
 class CompoundTableModel(MinimalTableModel):
     """A model that concatenates several sub table models vertically."""
 
@@ -29,10 +265,7 @@ class CompoundTableModel(MinimalTableModel):
         """
         super().__init__(parent=parent, header=header)
         self.sub_models: list[SingleModelBase] = []
-        self._row_map: list[tuple[SingleModelBase, int]] = []  # Maps compound row to tuple (sub_model, sub_row)
-        self._inv_row_map: dict[tuple[SingleModelBase, int], int] = (
-            {}
-        )  # Maps tuple (sub_model, sub_row) to compound row
+        self._row_map = RowMap()
         self._next_sub_model: Optional[SingleModelBase] = None
 
     def map_to_sub(self, index):
@@ -62,9 +295,8 @@ class CompoundTableModel(MinimalTableModel):
         Returns:
             QModelIndex: the equivalent index in the compound model
         """
-        try:
-            row = self._inv_row_map[sub_model, sub_index.row()]
-        except KeyError:
+        row = self._row_map.compound_row(sub_model, sub_index.row())
+        if row is None:
             return QModelIndex()
         return self.index(row, sub_index.column())
 
@@ -78,47 +310,22 @@ class CompoundTableModel(MinimalTableModel):
             self.fetchMore(QModelIndex())
 
     def _do_refresh(self):
-        """Recomputes the row and inverse row maps."""
+        """Recomputes the row map."""
         self._row_map.clear()
-        self._inv_row_map.clear()
         for model in self.sub_models:
-            row_map = self._row_map_for_model(model)
-            self._append_row_map(row_map)
-
-    def _append_row_map(self, row_map):
-        """Appends given row map to the tail of the model.
-
-        Args:
-            row_map (list): tuples (model, row number)
-        """
-        for model_row_tup in row_map:
-            self._inv_row_map[model_row_tup] = len(self._row_map)
-            self._row_map.append(model_row_tup)
-
-    def _row_map_iterator_for_model(self, model):
-        """Yields row map for given model.
-        The base class implementation just yields all model rows.
-
-        Args:
-            model (MinimalTableModel)
-
-        Yields:
-            tuple: (model, row number)
-        """
-        for i in range(model.rowCount()):
-            yield (model, i)
+            self._row_map.append(model, self._accepted_sub_rows(model))
 
-    def _row_map_for_model(self, model):
-        """Returns row map for given model.
-        The base class implementation just returns all model rows.
+    def _accepted_sub_rows(self, model):
+        """Returns the rows of given model that are shown in the compound model.
+        The base class implementation returns all model rows.
 
         Args:
             model (MinimalTableModel)
 
         Returns:
-            list: tuples (model, row number)
+            Iterable of int: sorted row numbers
         """
-        return list(self._row_map_iterator_for_model(model))
+        return range(model.rowCount())
 
     def canFetchMore(self, parent):
         """Returns True if any of the submodels that haven't been fetched yet can fetch more."""
@@ -12,16 +12,229 @@
 
 """Provides PivotModel."""
 
+from bisect import bisect_left, bisect_right
+from collections import Counter
 from collections.abc import Callable, Mapping, Sequence
 import operator
 from typing import Optional, Union
 from ...helpers import tuple_itemgetter
 
 
+class _HeaderIndex:
+    """Sorted unique header values of pivot rows or columns.
+
+    Header values are reference counted by the data keys that map to them
+    so that adding and removing data updates the sorted headers incrementally.
+    """
+
+    _BULK_THRESHOLD = 64
+    """Number of changed header values above which the headers are merged in one go instead of bisecting."""
+
+    def __init__(self):
+        self.values = []  # header values sorted by header data
+        self._sort_keys = []  # sort keys parallel to values
+        self._sort_keys_by_value = {}  # sort keys of accepted header values
+        self._counts = {}  # number of data keys that map to each header value
+        self._indexes = ()
+        self._index_getter = None
+        self._top_left_headers = {}
+
+    def reset(self, indexes, index_getter, top_left_headers):
+        """Clears the index and sets the indexes it follows.
+
+        Args:
+            indexes (tuple): index ids of the header
+            index_getter (Callable): function that extracts header value from data key
+            top_left_headers (dict): mapping from index id to top left header
+        """
+        self.values = []
+        self._sort_keys = []
+        self._sort_keys_by_value = {}
+        self._counts = {}
+        self._indexes = indexes
+        self._index_getter = index_getter
+        self._top_left_headers = top_left_headers
+
+    def add(self, keys):
+        """Adds data keys to the index.
+
+        Args:
+            keys (Iterable of tuple): data keys
+
+        Returns:
+            int: number of added header values
+        """
+        if not self._indexes:
+            return 0
+        return self.add_counts(Counter(map(self._index_getter, keys)))
+
+    def add_counts(self, value_counts):
+        """Adds header values to the index.
+
+        Args:
+            value_counts (Mapping): mapping from header value to the number of data keys referring to it
+
+        Returns:
+            int: number of added header values
+        """
+        if not self._indexes:
+            return 0
+        counts = self._counts
+        additions = []
+        for value, value_count in value_counts.items():
+            count = counts.get(value, 0)
+            counts[value] = count + value_count
+            if count == 0:
+                sort_key = self._sort_key(value)
+                if sort_key is not None:
+                    self._sort_keys_by_value[value] = sort_key
+                    additions.append((sort_key, value))
+        if not additions:
+            return 0
+        if len(additions) > self._BULK_THRESHOLD:
+            additions.sort(key=operator.itemgetter(0))
+            positions = [bisect_right(self._sort_keys, sort_key) for sort_key, _ in additions]
+            self._sort_keys = _merge_at(self._sort_keys, positions, [item[0] for item in additions])
+            self.values = _merge_at(self.values, positions, [item[1] for item in additions])
+        else:
+            for sort_key, value in additions:
+                position = bisect_right(self._sort_keys, sort_key)
+                self._sort_keys.insert(position, sort_key)
+                self.values.insert(position, value)
+        return len(additions)
+
+    def load(self, value_counts, values, sort_keys):
+        """Replaces the contents of the index by presorted header values.
+
+        Args:
+            value_counts (Mapping): mapping from header value to the number of data keys referring to it
+            values (list of tuple): accepted header values in sorted order
+            sort_keys (list of list): sort keys of values
+        """
+        self._counts = dict(value_counts)
+        self.values = values
+        self._sort_keys = sort_keys
+        self._sort_keys_by_value = dict(zip(values, sort_keys))
+
+    def remove(self, keys):
+        """Removes data keys from the index.
+
+        Args:
+            keys (Iterable of tuple): data keys
+
+        Returns:
+            int: number of removed header values
+        """
+        if not self._indexes:
+            return 0
+        counts = self._counts
+        removed_values = []
+        for value, value_count in Counter(map(self._index_getter, keys)).items():
+            count = counts[value] - value_count
+            if count:
+                counts[value] = count
+            else:
+                del counts[value]
+                if value in self._sort_keys_by_value:
+                    removed_values.append(value)
+        if not removed_values:
+            return 0
+        if len(removed_values) > self._BULK_THRESHOLD:
+            positions = sorted(self._position(value, self._sort_keys_by_value.pop(value)) for value in removed_values)
+            self._sort_keys = _drop_at(self._sort_keys, positions)
+            self.values = _drop_at(self.values, positions)
+        else:
+            for value in removed_values:
+                position = self._position(value, self._sort_keys_by_value.pop(value))
+                del self._sort_keys[position]
+                del self.values[position]
+        return len(removed_values)
+
+    def _sort_key(self, value):
+        """Returns sort key for header value or None if the value is not accepted.
+
+        Args:
+            value (tuple): header value
+
+        Returns:
+            list: sort key
+        """
+        sort_key = []
+        for header_name, header_id in zip(self._indexes, value):
+            header = self._top_left_headers[header_name]
+            if not header.accepts(header_id):
+                return None
+            header_data = header.header_data(header_id)
+            sort_key.append(header_data if header_data is not None else "")
+        return sort_key
+
+    def _position(self, value, sort_key):
+        """Returns position of header value in values.
+
+        Args:
+            value (tuple): header value
+            sort_key (list): value's sort key
+
+        Returns:
+            int: position
+        """
+        position = bisect_left(self._sort_keys, sort_key)
+        for i in range(position, len(self.values)):
+            if self._sort_keys[i] != sort_key:
+                break
+            if self.values[i] == value:
+                return i
+        return self.values.index(value)
+
+
+def _merge_at(items, positions, additions):
+    """Returns a new list with additions inserted into items at given positions.
+
+    Runs between the insertion points are copied as slices, so the cost is linear in list length
+    with a low constant instead of a Python-level pass over every item.
+
+    Args:
+        items (list): original items
+        positions (list of int): insertion positions in items in ascending order, one per addition
+        additions (list): items to insert
+
+    Returns:
+        list: merged items
+    """
+    merged = []
+    previous = 0
+    for position, addition in zip(positions, additions):
+        if position != previous:
+            merged += items[previous:position]
+            previous = position
+        merged.append(addition)
+    merged += items[previous:]
+    return merged
+
+
+def _drop_at(items, positions):
+    """Returns a new list without items at given positions.
+
+    Args:
+        items (list): original items
+        positions (list of int): unique positions to drop in ascending order
+
+    Returns:
+        list: remaining items
+    """
+    kept = []
+    previous = 0
+    for position in positions:
+        kept += items[previous:position]
+        previous = position + 1
+    kept += items[previous:]
+    return kept
+
+
 class PivotModel:
     def __init__(self):
         self._data = {}  # dictionary of unpivoted data
-        self.index_values = {}  # Maps index id to a sorted set of values for that index
+        self.index_values = {}  # Maps index id to a counter of the values of that index
         self.index_ids = ()  # ids of the indexes in _data, cannot contain duplicates
         self.top_left_headers = {}
         self.pivot_rows = ()  # current selected rows indexes
@@ -30,8 +243,18 @@ class PivotModel:
         self.frozen_value = ()  # current selected value of index_frozen
         # operator.itemgetter placeholder used to translate pivot to keys in _data
         self._key_getter: Optional[Callable[[Union[Mapping, Sequence]], tuple]] = None
-        self._row_data_header = []  # header values for row data
-        self._column_data_header = []  # header values for column data
+        self._frozen_getter: Callable[[Sequence], tuple] = lambda _: ()
+        self._frozen_value_counts = Counter()  # number of data keys for each frozen value
+        self._row_header = _HeaderIndex()  # header values for row data
+        self._column_header = _HeaderIndex()  # header values for column data
+
+    @property
+    def _row_data_header(self):
+        return self._row_header.values
+
+    @property
+    def _column_data_header(self):
+        return self._column_header.values
 
     def reset_model(self, data, top_left_headers=(), rows=(), columns=(), frozen=(), frozen_value=()):
         """Resets the model."""
@@ -46,14 +269,57 @@ class PivotModel:
         self.pivot_frozen = ()
         self.frozen_value = ()
         # create data dict with keys as long as index_ids
-        self._data = data
-        self.index_values = dict(zip(top_left_headers, zip(*data.keys())))
         self.index_ids = tuple(top_left_headers)
+        self._data = self._make_data(data)
+        self.index_values = self._count_index_values()
         self.top_left_headers = top_left_headers
         self.set_pivot(rows, columns, frozen, frozen_value)
 
+    def _make_data(self, data):
+        """Returns the container that stores model data.
+
+        Args:
+            data (dict): pivot model data
+
+        Returns:
+            MutableMapping: data container
+        """
+        return data
+
+    def _count_index_values(self):
+        """Counts the values of each index in data.
+
+        Returns:
+            dict: mapping from index id to value counter
+        """
+        if not self._data:
+            return {}
+        return {index_id: Counter(values) for index_id, values in zip(self.index_ids, zip(*self._data))}
+
+    def _count_header_values(self, indexes):
+        """Counts the header values of given indexes in data that matches current frozen value.
+
+        Args:
+            indexes (tuple): index ids
+
+        Returns:
+            Mapping: mapping from header value to number of data keys
+        """
+        if not indexes:
+            return {}
+        index_getter = self._index_key_getter(indexes)
+        return Counter(map(index_getter, self._keys_matching_frozen_value(list(self._data))))
+
+    def _count_frozen_values(self):
+        """Counts the frozen values in data.
+
+        Returns:
+            Counter: mapping from frozen value to number of data keys
+        """
+        return Counter(map(self._frozen_getter, self._data))
+
     def clear_model(self):
-        self._data = {}
+        self._data = self._make_data({})
         self.index_values = {}
         self.index_ids = ()
         self.pivot_rows = ()
@@ -61,8 +327,10 @@ class PivotModel:
         self.pivot_frozen = ()
         self.frozen_value = ()
         self._key_getter = None
-        self._row_data_header = []
-        self._column_data_header = []
+        self._frozen_getter = lambda _: ()
+        self._frozen_value_counts = Counter()
+        self._row_header = _HeaderIndex()
+        self._column_header = _HeaderIndex()
 
     def update_model(self, data):
         self._data.update(data)
@@ -76,34 +344,121 @@ class PivotModel:
         Returns:
             tuple: added row count and added column count
         """
-        addable_data = {k: v for k, v in data.items() if v is not None or k not in self._data}
+        if not data:
+            return 0, 0
+        new_keys = self._missing_keys(list(data))
+        new_key_set = set(new_keys)
+        addable_data = {k: v for k, v in data.items() if v is not None or k in new_key_set}
         if not addable_data:
             return 0, 0
         self._data.update(addable_data)
-        if not any(self.frozen_value):
-            first = next(iter(self._data), None)
-            frozen_getter = self._index_key_getter(self.pivot_frozen)
-            self.frozen_value = frozen_getter(first)
-        self.index_values = dict(zip(self.index_ids, zip(*self._data.keys())))
-        old_row_count = len(self._row_data_header)
-        old_column_count = len(self._column_data_header)
-        self._row_data_header = self._get_unique_index_values(self.pivot_rows)
-        self._column_data_header = self._get_unique_index_values(self.pivot_columns)
-        added_row_count = len(self._row_data_header) - old_row_count
-        added_column_count = len(self._column_data_header) - old_column_count
+        if not new_keys:
+            return 0, 0
+        if not self.index_values:
+            self.index_values = {index_id: Counter() for index_id in self.index_ids}
+        self._update_index_values(new_keys, Counter.update)
+        self._frozen_value_counts.update(map(self._frozen_getter, new_keys))
+        if self.pivot_frozen and not any(self.frozen_value):
+            frozen_value = self._frozen_getter(self._first_key())
+            if frozen_value != self.frozen_value:
+                self.frozen_value = frozen_value
+                old_row_count = len(self._row_data_header)
+                old_column_count = len(self._column_data_header)
+                self._rebuild_headers()
+                return len(self._row_data_header) - old_row_count, len(self._column_data_header) - old_column_count
+        header_keys = self._keys_matching_frozen_value(new_keys)
+        added_row_count = self._row_header.add(header_keys)
+        added_column_count = self._column_header.add(header_keys)
         return added_row_count, added_column_count
 
     def remove_from_model(self, data):
-        self._data = {key: self._data[key] for key in self._data if key not in data}
-        self.index_values = dict(zip(self.index_ids, zip(*self._data.keys())))
-        old_row_count = len(self._row_data_header)
-        old_column_count = len(self._column_data_header)
-        self._row_data_header = self._get_unique_index_values(self.pivot_rows)
-        self._column_data_header = self._get_unique_index_values(self.pivot_columns)
-        removed_row_count = old_row_count - len(self._row_data_header)
-        removed_column_count = old_column_count - len(self._column_data_header)
+        removed_keys = self._existing_keys(list(data))
+        if not removed_keys:
+            return 0, 0
+        self._delete_keys(removed_keys)
+        self._update_index_values(removed_keys, Counter.subtract)
+        self._frozen_value_counts.subtract(map(self._frozen_getter, removed_keys))
+        self._frozen_value_counts = +self._frozen_value_counts
+        header_keys = self._keys_matching_frozen_value(removed_keys)
+        removed_row_count = self._row_header.remove(header_keys)
+        removed_column_count = self._column_header.remove(header_keys)
         return removed_row_count, removed_column_count
 
+    def _missing_keys(self, keys):
+        """Returns keys that are not in data.
+
+        Args:
+            keys (list of tuple): data keys
+
+        Returns:
+            list of tuple: keys not in data
+        """
+        return [key for key in keys if key not in self._data]
+
+    def _existing_keys(self, keys):
+        """Returns keys that are in data.
+
+        Args:
+            keys (list of tuple): data keys
+
+        Returns:
+            list of tuple: keys in data
+        """
+        return [key for key in keys if key in self._data]
+
+    def _delete_keys(self, keys):
+        """Deletes existing keys from data.
+
+        Args:
+            keys (list of tuple): data keys
+        """
+        for key in keys:
+            del self._data[key]
+
+    def _first_key(self):
+        """Returns the first key in data or None if data is empty.
+
+        Returns:
+            tuple: data key
+        """
+        return next(iter(self._data), None)
+
+    def _update_index_values(self, keys, update):
+        """Updates index value counters.
+
+        Args:
+            keys (Iterable of tuple): data keys
+            update (Callable): either Counter.update or Counter.subtract
+        """
+        for index_id, values in zip(self.index_ids, zip(*keys)):
+            counter = self.index_values[index_id]
+            update(counter, values)
+            if update is Counter.subtract:
+                for value in set(values):
+                    if counter[value] <= 0:
+                        del counter[value]
+
+    def _keys_matching_frozen_value(self, keys):
+        """Filters data keys that match current frozen value.
+
+        Args:
+            keys (list of tuple): data keys
+
+        Returns:
+            list of tuple: matching keys
+        """
+        if not self.pivot_frozen:
+            return keys
+        frozen_getter = self._frozen_getter
+        frozen_value = self.frozen_value
+        return [key for key in keys if frozen_getter(key) == frozen_value]
+
+    def _rebuild_headers(self):
+        """Rebuilds row and column headers from scratch."""
+        for header, indexes in ((self._row_header, self.pivot_rows), (self._column_header, self.pivot_columns)):
+            header.reset(indexes, self._index_key_getter(indexes), self.top_left_headers)
+            header.add_counts(self._count_header_values(indexes))
+
     def frozen_values(self, data):
         """Collects frozen values from data.
 
@@ -113,8 +468,30 @@ class PivotModel:
         Returns:
             set of tuple: frozen values
         """
-        frozen_getter = self._index_key_getter(self.pivot_frozen)
-        return {frozen_getter(item) for item in data}
+        return set(map(self._frozen_getter, data))
+
+    def has_frozen_value(self, value):
+        """Checks if there is data for given frozen value.
+
+        Args:
+            value (tuple): frozen value
+
+        Returns:
+            bool: True if data contains the frozen value, False otherwise
+        """
+        return self._frozen_value_counts[value] > 0
+
+    def index_combinations(self, indexes):
+        """Returns unique combinations of values of given indexes in data.
+
+        Args:
+            indexes (tuple): index ids
+
+        Returns:
+            list of tuple: unique value combinations
+        """
+        index_getter = self._index_key_getter(indexes)
+        return list(dict.fromkeys(map(index_getter, self._data)))
 
     def _check_pivot(self, rows, columns, frozen, frozen_value):
         """Checks if given pivot is valid.
@@ -202,8 +579,8 @@ class PivotModel:
         order = tuple(self.index_ids.index(i) for i in self.pivot_rows + self.pivot_columns + self.pivot_frozen)
         order = tuple(sorted(range(len(order)), key=order.__getitem__))
         self._key_getter = tuple_itemgetter(operator.itemgetter(*order), len(order))
-        self._row_data_header = self._get_unique_index_values(self.pivot_rows)
-        self._column_data_header = self._get_unique_index_values(self.pivot_columns)
+        self._update_frozen_getter()
+        self._rebuild_headers()
 
     def set_frozen_value(self, value):
         """Sets values for the frozen indexes.
@@ -226,6 +603,12 @@ class PivotModel:
         if len(frozen) != len(self.frozen_value):
             raise ValueError("'frozen' must have same length as 'self.frozen_value'")
         self.pivot_frozen = tuple(frozen)
+        self._update_frozen_getter()
+
+    def _update_frozen_getter(self):
+        """Updates frozen value getter and frozen value counts according to current frozen indexes."""
+        self._frozen_getter = self._index_key_getter(self.pivot_frozen)
+        self._frozen_value_counts = self._count_frozen_values()
 
     def get_pivoted_data(self, row_mask, column_mask):
         """Returns data for indexes in row_mask and column_mask.
@@ -34,6 +34,7 @@ from ..widgets.custom_delegates import (
     ScenarioAlternativeTableDelegate,
 )
 from .colors import fixed_field_color, pivot_table_header_color
+from .columnar_pivot_model import ColumnarPivotModel
 from .pivot_model import PivotModel
 
 if TYPE_CHECKING:
@@ -484,7 +485,9 @@ class PivotTableModelBase(QAbstractTableModel):
         if not data:
             return
         row_count, column_count = self.model.remove_from_model(data)
-        removed_frozen_values = self.model.frozen_values(data) - self.model.frozen_values(self.model._data)
+        removed_frozen_values = {
+            value for value in self.model.frozen_values(data) if not self.model.has_frozen_value(value)
+        }
         if removed_frozen_values:
             self.frozen_values_removed.emit(removed_frozen_values)
         if row_count > 0:
@@ -942,12 +945,15 @@ class PivotTableModelBase(QAbstractTableModel):
 class ParameterValuePivotTableModel(PivotTableModelBase):
     """A model for the pivot table in parameter_value input type."""
 
-    def __init__(self, parent):
+    def __init__(self, parent, columnar_storage=False):
         """
         Args:
             parent (SpineDBEditor)
+            columnar_storage (bool): if True, store pivot data in columnar arrays
         """
         super().__init__(parent)
+        if columnar_storage:
+            self.model = ColumnarPivotModel()
         self._entity_class_fetch_parent = FlexibleFetchParent(
             "entity_class",
             handle_items_added=self._handle_entity_classes_added,
@@ -13,9 +13,10 @@
 """Single models for parameter definitions and values (as 'for a single entity')."""
 
 from __future__ import annotations
+import bisect
 from collections.abc import Iterable, Iterator
 import math
-from typing import TYPE_CHECKING, ClassVar
+from typing import TYPE_CHECKING, Any, ClassVar
 from PySide6.QtCore import QModelIndex, Qt, Slot
 from PySide6.QtGui import QColor
 from spinedb_api import Asterisk, DatabaseMapping
@@ -35,6 +36,7 @@ from ...mvcmodels.shared import (
 )
 from ...parameter_type_validation import ValidationKey
 from ..selection_for_filtering import AlternativeSelection, EntitySelection, ScenarioSelection
+from .auto_filter_index import AutoFilterIndex, ColumnValueCounts
 from .colors import fixed_field_color
 from .utils import (
     ENTITY_ALTERNATIVE_FIELD_MAP,
@@ -50,27 +52,152 @@ if TYPE_CHECKING:
 
 
 class HalfSortedTableModel(MinimalTableModel[TempId]):
+    """A table of item ids that is sorted on reset and keeps the sort order when rows are added.
+
+    Sort keys are computed once when a row enters the model,
+    so rows whose items change later keep their position.
+    """
+
+    _MAX_INSERTED_RANGES: ClassVar[int] = 100
+    """Maximum number of separate row ranges :meth:`add_rows` inserts before it resets the model instead."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._sort_keys: list = []
+        self._ids: dict[TempId, Any] = {}
+        """Ids in the model and their sort keys."""
+
+    def clear(self):
+        """Clears all data in model."""
+        self.reset_model()
+
     def reset_model(self, main_data: list[TempId] | None = None):
         """Reset model."""
-        if main_data is None:
-            main_data = []
+        ids = list(dict.fromkeys(main_data)) if main_data is not None else []
+        keys = [self._sort_key(id_) for id_ in ids]
+        order = sorted(range(len(ids)), key=keys.__getitem__)
         self.beginResetModel()
-        self._main_data = sorted(main_data, key=self._sort_key)
+        self._main_data = [ids[i] for i in order]
+        self._sort_keys = [keys[i] for i in order]
+        self._ids = dict(zip(ids, keys))
         self.endResetModel()
 
     def add_rows(self, data: list[TempId]) -> None:
-        data = [item for item in data if item not in self._main_data]
-        if not data:
+        """Merges new ids into the model.
+
+        Each contiguous range of new rows is inserted with its own insert notification,
+        unless the new rows are scattered into so many ranges that a reset is cheaper.
+
+        Args:
+            data: item ids
+        """
+        ids = [id_ for id_ in dict.fromkeys(data) if id_ not in self._ids]
+        if not ids:
             return
-        self.beginResetModel()
-        self._main_data += data
-        self._main_data.sort(key=self._sort_key)
-        self.endResetModel()
+        keys = [self._sort_key(id_) for id_ in ids]
+        ranges = []
+        for i in sorted(range(len(ids)), key=keys.__getitem__):
+            position = bisect.bisect_right(self._sort_keys, keys[i])
+            if ranges and ranges[-1][0] == position:
+                ranges[-1][1].append(ids[i])
+                ranges[-1][2].append(keys[i])
+            else:
+                ranges.append((position, [ids[i]], [keys[i]]))
+        self._ids.update(zip(ids, keys))
+        self._ids_about_to_be_added(ids)
+        if len(ranges) > self._MAX_INSERTED_RANGES:
+            self.beginResetModel()
+            self._main_data = _merge(self._main_data, ((position, range_ids) for position, range_ids, _ in ranges))
+            self._sort_keys = _merge(self._sort_keys, ((position, range_keys) for position, _, range_keys in ranges))
+            self.endResetModel()
+            return
+        inserted_count = 0
+        for position, range_ids, range_keys in ranges:
+            first = position + inserted_count
+            self.beginInsertRows(QModelIndex(), first, first + len(range_ids) - 1)
+            self._main_data[first:first] = range_ids
+            self._sort_keys[first:first] = range_keys
+            self.endInsertRows()
+            inserted_count += len(range_ids)
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if row < 0 or count < 1 or row + count > self.rowCount():
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        removed_ids = self._main_data[row : row + count]
+        self._ids_about_to_be_removed(removed_ids)
+        for id_ in removed_ids:
+            del self._ids[id_]
+        del self._main_data[row : row + count]
+        del self._sort_keys[row : row + count]
+        self.endRemoveRows()
+        return True
+
+    def drop_rows(self, rows: Iterable[int]) -> None:
+        """Deletes rows without notifying views; caller is responsible for the notifications.
+
+        Args:
+            rows: rows to delete
+        """
+        rows = sorted(rows, reverse=True)
+        self._ids_about_to_be_removed([self._main_data[row] for row in rows])
+        for row in rows:
+            del self._ids[self._main_data[row]]
+            del self._main_data[row]
+            del self._sort_keys[row]
+
+    def row_of(self, item_id: TempId) -> int:
+        """Finds the row of an item by bisecting the sort keys.
+
+        Args:
+            item_id: id of an item in the model
+
+        Returns:
+            row
+        """
+        row = bisect.bisect_left(self._sort_keys, self._ids[item_id])
+        while self._main_data[row] != item_id:
+            row += 1
+        return row
+
+    def _ids_about_to_be_added(self, ids: list[TempId]) -> None:
+        """Called before new ids are inserted into the model.
+
+        Args:
+            ids: new ids
+        """
+
+    def _ids_about_to_be_removed(self, ids: list[TempId]) -> None:
+        """Called before ids are deleted from the model.
+
+        Args:
+            ids: ids to delete
+        """
 
     def _sort_key(self, item_id: TempId) -> str | tuple[str, ...]:
         raise NotImplementedError()
 
 
+def _merge(sorted_list: list, insertions: Iterable[tuple[int, list]]) -> list:
+    """Builds a new list with sublists inserted into given positions.
+
+    Args:
+        sorted_list: original list
+        insertions: pairs of original position and sublist to insert there in ascending position order
+
+    Returns:
+        merged list
+    """
+    merged = []
+    previous = 0
+    for position, sublist in insertions:
+        merged += sorted_list[previous:position]
+        merged += sublist
+        previous = position
+    merged += sorted_list[previous:]
+    return merged
+
+
 class SingleModelBase(HalfSortedTableModel):
     """Base class for all single models that go in a CompoundModelBase subclass."""
 
@@ -94,6 +221,8 @@ class SingleModelBase(HalfSortedTableModel):
         self._mapped_table = self.db_map.mapped_table(parent.item_type)
         self.entity_class_id = entity_class_id
         self._auto_filter: dict[str, set] = {}
+        self._auto_filter_index = AutoFilterIndex(self._auto_filter_value_by_id)
+        self._column_value_counts: dict[int, ColumnValueCounts] = {}
         self.committed = committed
 
     def __lt__(self, other):
@@ -163,27 +292,113 @@ class SingleModelBase(HalfSortedTableModel):
     def _display_value_for_forced_comparison(self, item: PublicItem) -> str:
         raise NotImplementedError()
 
+    def _auto_filter_value(self, item: PublicItem, field: str) -> Any:
+        """Returns the value of item's field that is compared against the auto filter.
+
+        Args:
+            item: item
+            field: field name
+
+        Returns:
+            field value
+        """
+        if field in self._AUTO_FILTER_FORCE_COMPARE_DISPLAY_VALUES:
+            return self._display_value_for_forced_comparison(item)
+        return item[field]
+
+    def _auto_filter_value_by_id(self, item_id: TempId, field: str) -> Any:
+        return self._auto_filter_value(self._mapped_table[item_id], field)
+
     def filter_accepts_item(self, item: PublicItem) -> bool:
         if not self._auto_filter:
             return True
-        for field, values in self._auto_filter.items():
-            if field in self._AUTO_FILTER_FORCE_COMPARE_DISPLAY_VALUES:
-                display_value = self._display_value_for_forced_comparison(item)
-                if display_value not in values:
-                    return False
-            elif item[field] not in values:
-                return False
-        return True
+        item_id = item["id"]
+        if item_id in self._ids:
+            return item_id in self._auto_filter_index.accepted_ids(self._ids, self._auto_filter)
+        return all(self._auto_filter_value(item, field) in values for field, values in self._auto_filter.items())
 
     def set_auto_filter(self, auto_filter: dict[str, set | None]) -> None:
         self._auto_filter = auto_filter
+        self._auto_filter_index.invalidate_filter()
+
+    def invalidate_auto_filter(self) -> None:
+        """Notifies the model that the contents of the shared auto filter have changed."""
+        self._auto_filter_index.invalidate_filter()
+
+    def update_auto_filter_data(self, ids: Iterable[TempId]) -> None:
+        """Re-indexes updated items for auto filtering and marks their filter menu values stale.
+
+        Args:
+            ids: ids of updated items; ids that are not in the model are ignored
+        """
+        ids = [id_ for id_ in ids if id_ in self._ids]
+        self._auto_filter_index.update(ids, self._auto_filter)
+        for counts in self._column_value_counts.values():
+            counts.invalidate(ids)
+
+    def clear_auto_filter_data(self) -> None:
+        """Drops the auto filter index and filter menu values, e.g. when items the fields are derived from change."""
+        self._auto_filter_index.clear()
+        self._column_value_counts.clear()
+
+    def column_value_counts(self, column: int) -> ColumnValueCounts:
+        """Returns the distinct display values of a column and their counts.
 
-    def accepted_rows(self) -> Iterator[int]:
-        """Yields accepted rows, for convenience."""
+        Values of items added or updated since the last call are computed here.
+
+        Args:
+            column: column
+
+        Returns:
+            value counts
+        """
+        counts = self._column_value_counts.get(column)
+        if counts is None:
+            counts = self._column_value_counts[column] = ColumnValueCounts()
+            counts.invalidate(self._main_data)
+        for id_ in list(counts.stale_ids()):
+            index = self.index(self.row_of(id_), column)
+            counts.insert(id_, index.data(), index.data(Qt.ItemDataRole.EditRole))
+        return counts
+
+    def reset_model(self, main_data: list[TempId] | None = None) -> None:
+        self.clear_auto_filter_data()
+        super().reset_model(main_data)
+
+    def _ids_about_to_be_added(self, ids: list[TempId]) -> None:
+        self._auto_filter_index.add(ids, self._auto_filter)
+        for counts in self._column_value_counts.values():
+            counts.invalidate(ids)
+
+    def _ids_about_to_be_removed(self, ids: list[TempId]) -> None:
+        self._auto_filter_index.remove(ids)
+        for counts in self._column_value_counts.values():
+            counts.remove(ids)
+
+    def accepted_rows(self, first: int = 0, last: int | None = None) -> Iterator[int]:
+        """Yields accepted rows, for convenience.
+
+        Args:
+            first: first row to check
+            last: last row to check; None means the last row of the model
+
+        Yields:
+            accepted rows
+        """
         mapped_table = self._mapped_table
-        for row in range(self.rowCount()):
-            item = mapped_table[self._main_data[row]]
-            if self.filter_accepts_item(item):
+        if last is None:
+            last = self.rowCount() - 1
+        if not self._auto_filter:
+            for row in range(first, last + 1):
+                if self.filter_accepts_item(mapped_table[self._main_data[row]]):
+                    yield row
+            return
+        accepted_ids = self._auto_filter_index.accepted_ids(self._ids, self._auto_filter)
+        if not accepted_ids:
+            return
+        for row in range(first, last + 1):
+            id_ = self._main_data[row]
+            if id_ in accepted_ids and self.filter_accepts_item(mapped_table[id_]):
                 yield row
 
     def _get_ref(self, db_item: PublicItem, field: str) -> PublicItem | None:
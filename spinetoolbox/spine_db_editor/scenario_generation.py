@@ -12,30 +12,86 @@
 
 """Contains functions for automatically generating scenarios from a set of alternatives."""
 
-from itertools import compress, permutations
+from itertools import combinations, islice
 
 
-def all_combinations(alternatives):
-    """Creates all possible combinations of alternatives.
+def iter_combinations(alternatives, max_count=None):
+    """Yields all non-empty combinations of alternatives.
+
+    Combinations are generated lazily in order of increasing size;
+    within a size, the order of alternatives is preserved.
 
     Args:
-        alternatives (Iterable of Any): alternatives
+        alternatives (Sequence of Any): alternatives
+        max_count (int, optional): maximum number of combinations to yield; None yields all
+
+    Yields:
+        list: alternatives for a scenario
+    """
+    generator = (
+        list(combination)
+        for size in range(1, len(alternatives) + 1)
+        for combination in combinations(alternatives, size)
+    )
+    if max_count is not None:
+        generator = islice(generator, max_count)
+    yield from generator
+
+
+def combination_count(alternative_count):
+    """Returns the number of scenarios :func:`iter_combinations` yields.
+
+    Args:
+        alternative_count (int): number of alternatives
+
+    Returns:
+        int: number of non-empty combinations
+    """
+    return 2**alternative_count - 1
+
+
+def iter_combinations_with_base(alternatives, base, max_count=None):
+    """Yields all unique non-empty combinations of alternatives with base alternative prepended to each.
+
+    The combinations come in the same order as from :func:`iter_combinations`
+    with duplicates that result from prepending the base alternative left out.
+
+    Args:
+        alternatives (Sequence of Any): alternatives; must contain base
+        base (Any): base alternative
+        max_count (int, optional): maximum number of combinations to yield; None yields all
+
+    Yields:
+        list: alternatives for a scenario
+    """
+    base_index = alternatives.index(base)
+
+    def generate():
+        for size in range(1, len(alternatives) + 1):
+            for indexes in combinations(range(len(alternatives)), size):
+                if base_index in indexes:
+                    # Same as the combination without base which has been yielded earlier.
+                    if size == 1:
+                        yield [base]
+                    continue
+                yield [base] + [alternatives[i] for i in indexes]
+
+    generator = generate()
+    if max_count is not None:
+        generator = islice(generator, max_count)
+    yield from generator
+
+
+def combination_with_base_count(alternative_count):
+    """Returns the number of scenarios :func:`iter_combinations_with_base` yields.
+
+    Args:
+        alternative_count (int): number of alternatives including base
 
     Returns:
-        list of list: lists containing alternatives for each scenario
+        int: number of unique combinations
     """
-    count = len(alternatives)
-    proto_selection = count * [False]
-    scenarios = []
-    for i in range(count):
-        proto_selection[i] = True
-        if i != count - 1:
-            selections = set(permutations(proto_selection, count))
-        else:
-            selections = (proto_selection,)
-        for selection in selections:
-            scenarios.append(list(compress(alternatives, selection)))
-    return scenarios
+    return 2 ** (alternative_count - 1) if alternative_count > 0 else 0
 
 
 def unique_alternatives(alternatives):
@@ -48,3 +104,18 @@ def unique_alternatives(alternatives):
         list of list: tuples containing alternatives for each scenario
     """
     return [[alternative] for alternative in alternatives]
+
+
+def batched(iterable, batch_size):
+    """Lazily splits iterable into lists of at most batch_size elements.
+
+    Args:
+        iterable (Iterable of Any): iterable to split
+        batch_size (int): maximum batch size
+
+    Yields:
+        list: batch
+    """
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
@@ -16,7 +16,14 @@ from enum import Enum, auto, unique
 from PySide6.QtCore import Qt, Slot
 from PySide6.QtWidgets import QMessageBox, QWidget
 from ...helpers import signal_waiter
-from ..scenario_generation import all_combinations, unique_alternatives
+from ..scenario_generation import (
+    batched,
+    combination_count,
+    combination_with_base_count,
+    iter_combinations,
+    iter_combinations_with_base,
+    unique_alternatives,
+)
 
 
 @unique
@@ -27,10 +34,21 @@ class _ScenarioNameResolution(Enum):
     CANCEL_OPERATION = auto()
 
 
+@unique
+class _ScenarioCountResolution(Enum):
+    GENERATE_ALL = auto()
+    PREVIEW = auto()
+    CANCEL_OPERATION = auto()
+
+
 class ScenarioGenerator(QWidget):
     """A dialog where users can generate scenarios from given alternatives."""
 
     _TYPE_LABELS = ("All combinations", "Scenario for each alternative")
+    _LARGE_SCENARIO_COUNT = 1000
+    """Scenario count above which user is asked to confirm the operation."""
+    _INSERT_CHUNK_SIZE = 1000
+    """Number of scenarios added to the database in one go."""
 
     def __init__(self, parent, db_map, alternatives, spine_db_editor):
         """
@@ -79,63 +97,103 @@ class ScenarioGenerator(QWidget):
         alternative_list = self._ui.alternative_list
         alternative_order = {alternative_list.item(row).text(): row for row in range(alternative_list.count())}
         alternatives = sorted(self._alternatives, key=lambda a: alternative_order[a["name"]])
-        scenario_alternatives = {self._TYPE_LABELS[0]: all_combinations, self._TYPE_LABELS[1]: unique_alternatives}[
-            operation_label
-        ](alternatives)
-        if self._ui.use_base_alternative_check_box.checkState() == Qt.CheckState.Checked:
-            self._insert_base_alternative(scenario_alternatives)
-            if operation_label == self._TYPE_LABELS[0]:
-                _ensure_unique(scenario_alternatives)
-        suffix = _suffix(len(scenario_alternatives))
-        generated_scenario_names = [
-            scenario_prefix + suffix.format(count) for count in range(1, len(scenario_alternatives) + 1)
-        ]
+        base = self._base_alternative(alternatives)
+        if operation_label == self._TYPE_LABELS[0]:
+            if base is None:
+                scenario_count = combination_count(len(alternatives))
+            else:
+                scenario_count = combination_with_base_count(len(alternatives))
+            resolution = self._check_scenario_count(scenario_count)
+            if resolution == _ScenarioCountResolution.CANCEL_OPERATION:
+                return
+            if resolution == _ScenarioCountResolution.PREVIEW:
+                scenario_count = min(scenario_count, self._LARGE_SCENARIO_COUNT)
+            if base is None:
+                scenario_alternatives = iter_combinations(alternatives, scenario_count)
+            else:
+                scenario_alternatives = iter_combinations_with_base(alternatives, base, scenario_count)
+        else:
+            scenario_count = len(alternatives)
+            scenario_alternatives = unique_alternatives(alternatives)
+            if base is not None:
+                scenario_alternatives = (
+                    scenario if scenario[0] is base else [base] + scenario for scenario in scenario_alternatives
+                )
+        suffix = _suffix(scenario_count)
+
+        def generated_scenario_names():
+            return (scenario_prefix + suffix.format(count) for count in range(1, scenario_count + 1))
+
         scenario_items = self._db_editor.db_mngr.get_items(self._db_map, "scenario")
         existing_scenario_names = {item["name"] for item in scenario_items}
-        resolution = self._check_existing_scenarios(generated_scenario_names, existing_scenario_names)
+        resolution = self._check_existing_scenarios(generated_scenario_names(), existing_scenario_names)
         if resolution == _ScenarioNameResolution.CANCEL_OPERATION:
             return
-        if resolution == _ScenarioNameResolution.NO_CONFLICT:
-            new_scenarios = generated_scenario_names
-            scenarios_to_modify = generated_scenario_names
-        else:
-            new_scenarios = [name for name in generated_scenario_names if name not in existing_scenario_names]
-            if resolution == _ScenarioNameResolution.OVERWRITE:
-                scenarios_to_modify = generated_scenario_names
-            else:
-                scenarios_to_modify = new_scenarios
-        self._generate_scenarios(new_scenarios, scenarios_to_modify, scenario_alternatives)
+        self._generate_scenarios(
+            zip(generated_scenario_names(), scenario_alternatives),
+            existing_scenario_names,
+            modify_existing=resolution != _ScenarioNameResolution.LEAVE_AS_IS,
+        )
         self.close()
 
-    def _generate_scenarios(self, new_scenarios, scenarios_to_modify, scenario_alternatives):
-        """Generates scenarios with all possible combinations of given alternatives.
+    def _generate_scenarios(self, named_scenario_alternatives, existing_scenario_names, modify_existing):
+        """Generates scenarios and their alternatives chunk by chunk.
 
         Args:
-            new_scenarios (Iterable of str): names of new scenarios to create
-            scenarios_to_modify (Iterable of str): names of scenarios to modify
-            scenario_alternatives (list of list): alternative items for each scenario
+            named_scenario_alternatives (Iterable of tuple): scenario names and lists of alternative items
+            existing_scenario_names (set of str): names of scenarios that already exist in the database
+            modify_existing (bool): if True, overwrite the alternatives of existing scenarios
         """
-        if new_scenarios:
-            with signal_waiter(
-                self._db_editor.db_mngr.items_added, condition=lambda item_type, _: item_type == "scenario"
-            ) as waiter:
-                self._db_editor.db_mngr.add_items(
-                    "scenario", {self._db_map: [{"name": name} for name in new_scenarios]}
-                )
-                waiter.wait()
-        searchable_scenario_names = set(scenarios_to_modify)
-        scenario_definitions_by_id = {}
-        alternative_iter = iter(scenario_alternatives)
-        scenario_items = self._db_editor.db_mngr.get_items(self._db_map, "scenario")
-        for item in scenario_items:
-            if item["name"] not in searchable_scenario_names:
-                continue
-            scenario_definitions_by_id[item["id"]] = [a["id"] for a in next(alternative_iter)]
-        scenario_alternative_data = [
-            {"id": scenario_id, "alternative_id_list": alternative_ids}
-            for scenario_id, alternative_ids in scenario_definitions_by_id.items()
-        ]
-        self._db_editor.db_mngr.set_scenario_alternatives({self._db_map: scenario_alternative_data})
+        db_mngr = self._db_editor.db_mngr
+        identifier = db_mngr.get_command_identifier()
+        for chunk in batched(named_scenario_alternatives, self._INSERT_CHUNK_SIZE):
+            new_scenarios = [{"name": name} for name, _ in chunk if name not in existing_scenario_names]
+            if new_scenarios:
+                with signal_waiter(
+                    db_mngr.items_added, condition=lambda item_type, _: item_type == "scenario"
+                ) as waiter:
+                    db_mngr.add_items("scenario", {self._db_map: new_scenarios}, identifier=identifier)
+                    waiter.wait()
+            scenario_alternative_data = []
+            for name, alternatives in chunk:
+                if not modify_existing and name in existing_scenario_names:
+                    continue
+                scenario = self._db_map.get_item("scenario", name=name)
+                alternative_ids = [a["id"] for a in alternatives]
+                scenario_alternative_data.append({"id": scenario["id"], "alternative_id_list": alternative_ids})
+            if scenario_alternative_data:
+                db_mngr.set_scenario_alternatives({self._db_map: scenario_alternative_data}, identifier=identifier)
+
+    def _check_scenario_count(self, scenario_count):
+        """Asks user for confirmation if the operation would generate a large number of scenarios.
+
+        Args:
+            scenario_count (int): number of scenarios the operation would generate
+
+        Returns:
+            _ScenarioCountResolution: action to take
+        """
+        if scenario_count <= self._LARGE_SCENARIO_COUNT:
+            return _ScenarioCountResolution.GENERATE_ALL
+        message_box = QMessageBox(
+            QMessageBox.Icon.Warning,
+            "Large number of scenarios",
+            f"The operation would generate {scenario_count} scenarios.",
+            QMessageBox.StandardButton.NoButton,
+            self,
+        )
+        message_box.addButton("Generate all", QMessageBox.ButtonRole.AcceptRole)
+        preview_button = message_box.addButton(
+            f"Generate first {self._LARGE_SCENARIO_COUNT}", QMessageBox.ButtonRole.ActionRole
+        )
+        cancel_button = message_box.addButton(QMessageBox.StandardButton.Cancel)
+        message_box.exec()
+        clicked_button = message_box.clickedButton()
+        if clicked_button is None or clicked_button is cancel_button:
+            return _ScenarioCountResolution.CANCEL_OPERATION
+        if clicked_button is preview_button:
+            return _ScenarioCountResolution.PREVIEW
+        return _ScenarioCountResolution.GENERATE_ALL
 
     def _check_existing_scenarios(self, proposed_scenario_names, existing_scenario_names):
         """Checks if proposed scenarios exist, and if so, prompts users what to do.
@@ -176,44 +234,21 @@ class ScenarioGenerator(QWidget):
         """
         self._ui.base_alternative_combo_box.setEnabled(check_box_state == Qt.CheckState.Checked.value)
 
-    def _insert_base_alternative(self, scenario_alternatives):
-        """Prepends base alternative to scenario alternatives if it has been enabled.
-
-        If base alternative is already in scenario alternatives, make sure it comes first.
+    def _base_alternative(self, alternatives):
+        """Returns the base alternative if it has been enabled.
 
         Args:
-            scenario_alternatives (list of list): scenario alternatives
+            alternatives (list of CacheItem): alternatives
+
+        Returns:
+            CacheItem: base alternative or None if not enabled
         """
+        if self._ui.use_base_alternative_check_box.checkState() != Qt.CheckState.Checked:
+            return None
         base_name = self._ui.base_alternative_combo_box.currentText()
         if not base_name:
-            return
-        base = next(iter(a for a in self._alternatives if a["name"] == base_name))
-        for alternatives in scenario_alternatives:
-            try:
-                existing_index = [a["name"] for a in alternatives].index(base_name)
-            except ValueError:
-                alternatives.insert(0, base)
-            else:
-                if existing_index != 0:
-                    alternatives.insert(0, alternatives.pop(existing_index))
-
-
-def _ensure_unique(scenario_alternatives):
-    """Removes duplicate scenario alternatives.
-
-    Args:
-        scenario_alternatives (list of list): scenario alternatives
-    """
-    duplicate_indexes = set()
-    for i, alternatives in enumerate(scenario_alternatives):
-        if i in duplicate_indexes:
-            continue
-        names = [a["name"] for a in alternatives]
-        for j, other in enumerate(scenario_alternatives[i + 1 :]):
-            if names == [a["name"] for a in other]:
-                duplicate_indexes.add(i + 1 + j)
-    for remove_index in reversed(sorted(duplicate_indexes)):
-        scenario_alternatives.pop(remove_index)
+            return None
+        return next(iter(a for a in alternatives if a["name"] == base_name))
 
 
 def _find_base_alternative(names):
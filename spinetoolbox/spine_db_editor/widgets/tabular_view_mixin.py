@@ -51,7 +51,11 @@ class TabularViewMixin:
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._pivot_table_models = {
-            self._PARAMETER_VALUE: ParameterValuePivotTableModel(self),
+            self._PARAMETER_VALUE: ParameterValuePivotTableModel(
+                self,
+                columnar_storage=self.db_mngr.qsettings.value("appSettings/columnarPivotTable", defaultValue="false")
+                == "true",
+            ),
             self._ELEMENT: ElementPivotTableModel(self),
             self._INDEX_EXPANSION: IndexExpansionPivotTableModel(self),
             self._SCENARIO_ALTERNATIVE: ScenarioAlternativePivotTableModel(self),
@@ -595,7 +599,7 @@ class TabularViewMixin:
         Returns:
             list: frozen value
         """
-        return list(dict.fromkeys(zip(*[self.pivot_table_model.model.index_values.get(k, []) for k in frozen])).keys())
+        return self.pivot_table_model.model.index_combinations(frozen)
 
     @Slot()
     def _change_frozen_value(self):
@@ -62,9 +62,12 @@ from spinedb_api.parameter_value import (
 from spinedb_api.spine_io.exporters.excel import export_spine_database_to_xlsx
 from spinedb_api.temp_id import TempId
 from .cache_graphs import EntityScenarioActivityGraph, RelationshipClassGraph, RelationshipGraph
+from .commit_index import CommitIndex, commit_index_path
+from .config import TYPE_VALIDATION_CACHE_PATH
 from .database_display_names import NameRegistry
 from .fetch_parent import FetchParent
 from .helpers import DBMapDictItems, DBMapPublicItems, busy_effect, normcase_database_url_path, plain_to_tool_tip
+from .item_indexes import CascadeIndex, FieldIndexCache
 from .mvcmodels.shared import INVALID_TYPE, PARAMETER_TYPE_VALIDATION_ROLE, PARSED_ROLE, TYPE_NOT_VALIDATED, VALID_TYPE
 from .parameter_type_validation import ParameterTypeValidator
 from .spine_db_commands import (
@@ -76,6 +79,7 @@ from .spine_db_commands import (
 )
 from .spine_db_icon_manager import SpineDBIconManager
 from .spine_db_worker import SpineDBWorker
+from .value_render_cache import NOT_CACHED, ValueRenderCache
 from .widgets.options_dialog import OptionsDialog
 
 ValidatedValueCache = dict[str, dict[int, dict[int, bool]]]
@@ -162,11 +166,16 @@ class SpineDBManager(QObject):
         self.relationship_graph = RelationshipGraph()
         self.entity_scenario_activity_graph = EntityScenarioActivityGraph()
         for graph in (self.relationship_class_graph, self.relationship_graph, self.entity_scenario_activity_graph):
-            for signal in (self.items_updated, self.items_removed):
-                signal.connect(graph.maybe_invalidate_caches_after_data_changed)
             for signal in (self.database_refreshed, self.database_reset):
                 signal.connect(graph.invalidate_caches)
             self.more_data_fetched.connect(graph.maybe_invalidate_caches_after_fetch)
+        self._cascade_index = CascadeIndex()
+        self._field_index = FieldIndexCache()
+        self._render_cache = ValueRenderCache()
+        for index in (self._cascade_index, self._field_index, self._render_cache):
+            for signal in (self.database_refreshed, self.database_reset):
+                signal.connect(index.invalidate_caches)
+        self.more_data_fetched.connect(self._render_cache.maybe_invalidate_caches_after_fetch)
         self.undo_stack: dict[DatabaseMapping, AgedUndoStack] = {}
         self.undo_action: dict[DatabaseMapping, QAction] = {}
         self.redo_action: dict[DatabaseMapping, QAction] = {}
@@ -175,8 +184,19 @@ class SpineDBManager(QObject):
         self._cmd_id = 0
         self._synchronous = synchronous
         self._validated_values: ValidatedValueCache = {"parameter_definition": {}, "parameter_value": {}}
-        self._parameter_type_validator = ParameterTypeValidator(self)
+        try:
+            worker_count = int(settings.value("appSettings/typeValidationWorkers", defaultValue=0) or 0)
+        except (TypeError, ValueError):
+            worker_count = 0
+        persist_cache = settings.value("appSettings/persistTypeValidationCache", defaultValue="true") == "true"
+        self._parameter_type_validator = ParameterTypeValidator(
+            self,
+            worker_count=worker_count if worker_count > 0 else None,
+            cache_path=TYPE_VALIDATION_CACHE_PATH if persist_cache else None,
+        )
         self._parameter_type_validator.validated.connect(self._parameter_value_validated)
+        self._persist_commit_indexes = settings.value("appSettings/persistCommitIndex", defaultValue="false") == "true"
+        self._commit_indexes: dict[DatabaseMapping, CommitIndex] = {}
         self._no_prompt_urls: set[str] = set()
 
     def _connect_signals(self) -> None:
@@ -278,6 +298,38 @@ class SpineDBManager(QObject):
         if item_type == "entity_class":
             self.get_icon_mngr(db_map).update_icon_caches(items)
 
+    def update_item_indexes(self, db_map: DatabaseMapping, item_type: ItemType, items: Iterable[PublicItem]) -> None:
+        """Runs when items are added, updated or removed. Updates item lookup indexes and cached graphs.
+
+        Workers call this before waking up fetch parents and emitting the data changed signals
+        so that listeners never see stale indexes.
+        """
+        db_map_data = {db_map: items}
+        self._cascade_index.update_indexes_after_data_changed(item_type, db_map_data)
+        self._field_index.update_indexes_after_data_changed(item_type, db_map_data)
+        self._render_cache.update_caches_after_data_changed(item_type, db_map_data)
+        for graph in (self.relationship_class_graph, self.relationship_graph, self.entity_scenario_activity_graph):
+            graph.update_caches_after_data_changed(item_type, db_map_data)
+
+    def update_item_indexes_after_fetch(
+        self, db_map: DatabaseMapping, item_type: ItemType, items: Iterable[PublicItem]
+    ) -> None:
+        """Adds fetched items to item lookup indexes.
+
+        Caller is responsible for holding the database mapping's lock.
+        """
+        self._cascade_index.insert_fetched_items(db_map, item_type, items)
+        self._field_index.insert_fetched_items(db_map, item_type, items)
+
+    def _fetch_all_for_indexes(self, db_map: DatabaseMapping, item_type: ItemType) -> None:
+        """Fetches the remaining items of given type and adds them to item lookup indexes.
+
+        Caller is responsible for holding the database mapping's lock.
+        """
+        fetched_items = db_map.do_fetch_all(db_map.mapped_table(item_type))
+        if fetched_items:
+            self.update_item_indexes_after_fetch(db_map, item_type, fetched_items)
+
     @property
     def db_maps(self) -> set[DatabaseMapping]:
         return set(self._db_maps.values())
@@ -365,6 +417,9 @@ class SpineDBManager(QObject):
         else:
             worker.close_db_map()  # NOTE: This calls ThreadPoolExecutor.shutdown() which waits for Futures to finish
             worker.clean_up()
+        commit_index = self._commit_indexes.pop(db_map, None)
+        if commit_index is not None:
+            commit_index.save()
         with self._lock_lock:
             with suppress(KeyError):
                 del self._db_locks[db_map]
@@ -372,6 +427,9 @@ class SpineDBManager(QObject):
         del self._validated_values["parameter_value"][id(db_map)]
         for graph in (self.relationship_class_graph, self.relationship_graph, self.entity_scenario_activity_graph):
             graph.invalidate_caches(db_map)
+        self._cascade_index.invalidate_caches(db_map)
+        self._field_index.invalidate_caches(db_map)
+        self._render_cache.invalidate_caches(db_map)
         self.undo_stack[db_map].cleanChanged.disconnect()
         del self.undo_stack[db_map]
         del self.undo_action[db_map]
@@ -445,6 +503,9 @@ class SpineDBManager(QObject):
         with self._lock_lock:
             self._db_locks[db_map] = RLock()
         self._db_maps[url] = db_map
+        self._commit_indexes[db_map] = CommitIndex(
+            db_map, commit_index_path(db_map) if self._persist_commit_indexes else None
+        )
         self._validated_values["parameter_definition"][id(db_map)] = {}
         self._validated_values["parameter_value"][id(db_map)] = {}
         stack = self.undo_stack[db_map] = AgedUndoStack(self)
@@ -677,6 +738,7 @@ class SpineDBManager(QObject):
             return
         self._validated_values["parameter_definition"][id(db_map)].clear()
         self._validated_values["parameter_value"][id(db_map)].clear()
+        self._render_cache.invalidate_caches(db_map)
         self.undo_stack[db_map].clear()
         self.receive_session_rolled_back({db_map})
 
@@ -744,8 +806,8 @@ class SpineDBManager(QObject):
         for the given field.
         """
         with self.get_lock(db_map):
-            mapped_table = db_map.mapped_table(item_type)
-            return [x for x in db_map.find(mapped_table) if x.get(field) == value]
+            self._fetch_all_for_indexes(db_map, item_type)
+            return [item.public_item for item in self._field_index.find(db_map, item_type, field, value)]
 
     def get_item_by_field(
         self, db_map: DatabaseMapping, item_type: ItemType, field: str, value: Any
@@ -754,7 +816,10 @@ class SpineDBManager(QObject):
         that has the given value for the given field
         Returns an empty dictionary if none found.
         """
-        return next(iter(self.get_items_by_field(db_map, item_type, field, value)), {})
+        with self.get_lock(db_map):
+            self._fetch_all_for_indexes(db_map, item_type)
+            items = self._field_index.find(db_map, item_type, field, value)
+            return items[0].public_item if items else {}
 
     @staticmethod
     def display_data_from_parsed(parsed_data: Value) -> str:
@@ -819,6 +884,8 @@ class SpineDBManager(QObject):
     ) -> Optional[Union[int, Value]]:
         """Returns the value or default value of a parameter.
 
+        Values rendered for display, tool tip and text alignment roles are cached.
+
         Args:
             db_map: database mapping
             item: parameter value item, parameter definition item, or list value item
@@ -833,6 +900,30 @@ class SpineDBManager(QObject):
             except KeyError:
                 return TYPE_NOT_VALIDATED
             return VALID_TYPE if is_valid else INVALID_TYPE
+        if role not in ValueRenderCache.CACHED_ROLES:
+            value, _ = self._render_value(db_map, item, role)
+            return value
+        key = (id(db_map), item.item_type, item["id"].private_id, role)
+        value = self._render_cache.get(key)
+        if value is NOT_CACHED:
+            generation = self._render_cache.generation
+            value, dependencies = self._render_value(db_map, item, role)
+            self._render_cache.put(key, value, generation, dependencies)
+        return value
+
+    def _render_value(
+        self, db_map: DatabaseMapping, item: PublicItem, role: Union[int, Qt.ItemDataRole]
+    ) -> tuple[Optional[Union[int, Value]], list[tuple[ItemType, int]]]:
+        """Renders the value or default value of a parameter.
+
+        Args:
+            db_map: database mapping
+            item: parameter value item, parameter definition item, or list value item
+            role: data role
+
+        Returns:
+            value corresponding to role and the types and private ids of other items the value depends on
+        """
         if role == Qt.ItemDataRole.ToolTipRole:
             try:
                 is_valid = self._validated_values[item.item_type][id(db_map)][item["id"].private_id]
@@ -840,7 +931,10 @@ class SpineDBManager(QObject):
                 pass
             else:
                 if not is_valid:
-                    return self._tool_tip_for_invalid_parameter_type(item)
+                    dependencies = []
+                    if item.item_type == "parameter_value":
+                        dependencies.append(("parameter_definition", item["parameter_definition_id"].private_id))
+                    return self._tool_tip_for_invalid_parameter_type(item), dependencies
         value_field, type_field = {
             "parameter_value": ("value", "type"),
             "list_value": ("value", "type"),
@@ -849,10 +943,17 @@ class SpineDBManager(QObject):
         complex_types = {"array": "Array", "time_series": "Time series", "time_pattern": "Time pattern", "map": "Map"}
         if role == Qt.ItemDataRole.DisplayRole and item[type_field] in complex_types:
             list_value_id = item["id"] if item.item_type == "list_value" else item["list_value_id"]
-            return self._format_list_value(db_map, item.item_type, complex_types[item[type_field]], list_value_id)
+            dependencies = []
+            if list_value_id is not None and item.item_type != "list_value":
+                dependencies.append(("list_value", list_value_id.private_id))
+                list_value = self.get_item(db_map, "list_value", list_value_id)
+                if list_value:
+                    dependencies.append(("parameter_value_list", list_value["parameter_value_list_id"].private_id))
+            formatted = self._format_list_value(db_map, item.item_type, complex_types[item[type_field]], list_value_id)
+            return formatted, dependencies
         if role == Qt.ItemDataRole.EditRole:
-            return join_value_and_type(item[value_field], item[type_field])
-        return self.format_value(item["parsed_value"], role=role)
+            return join_value_and_type(item[value_field], item[type_field]), []
+        return self.format_value(item["parsed_value"], role=role), []
 
     def get_value_from_data(
         self, data: Optional[str], role: Qt.ItemDataRole = Qt.ItemDataRole.DisplayRole
@@ -1041,20 +1142,21 @@ class SpineDBManager(QObject):
                 self.add_items("metadata", {db_map: metadata_items}, identifier=identifier)
             self.update_items(item_type, {db_map: items}, identifier=identifier)
 
-    def set_scenario_alternatives(self, db_map_data: DBMapDictItems) -> None:
+    def set_scenario_alternatives(self, db_map_data: DBMapDictItems, identifier: Optional[int] = None) -> None:
         """Sets scenario alternatives in db.
 
         Args:
             db_map_data: lists of items to set keyed by DatabaseMapping
+            identifier: command identifier; if None, a new identifier is created for each database
         """
         db_map_error_log = {}
         for db_map, data in db_map_data.items():
-            identifier = self.get_command_identifier()
+            db_map_identifier = identifier if identifier is not None else self.get_command_identifier()
             items_to_add, ids_to_remove, errors = self.get_data_to_set_scenario_alternatives(db_map, data)
             if ids_to_remove:
-                self.remove_items({db_map: {"scenario_alternative": ids_to_remove}}, identifier=identifier)
+                self.remove_items({db_map: {"scenario_alternative": ids_to_remove}}, identifier=db_map_identifier)
             if items_to_add:
-                self.add_items("scenario_alternative", {db_map: items_to_add}, identifier=identifier)
+                self.add_items("scenario_alternative", {db_map: items_to_add}, identifier=db_map_identifier)
             if errors:
                 db_map_error_log.setdefault(db_map, []).extend([str(x) for x in errors])
         if any(db_map_error_log.values()):
@@ -1136,16 +1238,6 @@ class SpineDBManager(QObject):
         self, item_type: ItemType, db_map_data: DBMapDictItems, identifier: Optional[int] = None, **kwargs
     ) -> None:
         """Pushes commands to add items to undo stack."""
-        if item_type == "entity_class" or item_type == "superclass_subclass":
-            for db_map in db_map_data:
-                self.relationship_class_graph.invalidate_caches(db_map)
-                self.relationship_graph.invalidate_caches(db_map)
-        elif item_type == "entity":
-            for db_map in db_map_data:
-                self.relationship_graph.invalidate_caches(db_map)
-        elif item_type in {"scenario_alternative", "entity_alternative"}:
-            for db_map in db_map_data:
-                self.entity_scenario_activity_graph.invalidate_caches(db_map)
         if identifier is None:
             identifier = self.get_command_identifier()
         for db_map, data in db_map_data.items():
@@ -1292,91 +1384,50 @@ class SpineDBManager(QObject):
         self, db_map_ids: dict[DatabaseMapping, Iterable[TempId]]
     ) -> dict[DatabaseMapping, list[PublicItem]]:
         """Finds and returns cascading entity classes for the given dimension ids."""
-        db_map_cascading_data = {}
-        for db_map, dimension_ids in db_map_ids.items():
-            dimension_ids = set(dimension_ids)
-            with self.get_lock(db_map):
-                class_table = db_map.mapped_table("entity_class")
-                db_map.do_fetch_all(class_table)
-                for item in class_table.values():
-                    if item.is_valid() and not dimension_ids.isdisjoint(item["dimension_id_list"]):
-                        db_map_cascading_data.setdefault(db_map, []).append(item.public_item)
-        return db_map_cascading_data
+        return self._find_cascading_items("entity_class", db_map_ids)
 
     def find_cascading_entities(
         self, db_map_ids: dict[DatabaseMapping, Iterable[TempId]]
     ) -> dict[DatabaseMapping, list[PublicItem]]:
         """Finds and returns cascading entities for the given element ids."""
-        db_map_cascading_data = {}
-        for db_map, element_ids in db_map_ids.items():
-            element_ids = set(element_ids)
-            with self.get_lock(db_map):
-                entity_table = db_map.mapped_table("entity")
-                db_map.do_fetch_all(entity_table)
-                for item in entity_table.values():
-                    if item.is_valid() and not element_ids.isdisjoint(item["element_id_list"]):
-                        db_map_cascading_data.setdefault(db_map, []).append(item.public_item)
-        return db_map_cascading_data
+        return self._find_cascading_items("entity", db_map_ids)
 
     def find_cascading_parameter_definitions(
         self, db_map_ids: dict[DatabaseMapping, Iterable[TempId]]
     ) -> dict[DatabaseMapping, list[PublicItem]]:
         """Finds and returns cascading parameter definitions or values for the given entity_class ids."""
-        db_map_cascading_data = {}
-        for db_map, entity_class_ids in db_map_ids.items():
-            entity_class_ids = set(entity_class_ids)
-            with self.get_lock(db_map):
-                definition_table = db_map.mapped_table("parameter_definition")
-                db_map.do_fetch_all(definition_table)
-                for item in definition_table.values():
-                    if item.is_valid() and item["entity_class_id"] in entity_class_ids:
-                        db_map_cascading_data.setdefault(db_map, []).append(item.public_item)
-        return db_map_cascading_data
+        return self._find_cascading_items("parameter_definition", db_map_ids)
 
     def find_cascading_parameter_values_by_entity(
         self, db_map_ids: dict[DatabaseMapping, Iterable[TempId]]
     ) -> dict[DatabaseMapping, list[PublicItem]]:
         """Finds and returns cascading parameter values for the given entity ids."""
-        db_map_cascading_data = {}
-        for db_map, entity_ids in db_map_ids.items():
-            entity_ids = set(entity_ids)
-            with self.get_lock(db_map):
-                parameter_table = db_map.mapped_table("parameter_value")
-                db_map.do_fetch_all(parameter_table)
-                for item in parameter_table.values():
-                    if item.is_valid() and item["entity_id"] in entity_ids:
-                        db_map_cascading_data.setdefault(db_map, []).append(item.public_item)
-        return db_map_cascading_data
+        return self._find_cascading_items("parameter_value", db_map_ids)
 
     def find_cascading_scenario_alternatives_by_scenario(
         self, db_map_ids: dict[DatabaseMapping, Iterable[TempId]]
     ) -> dict[DatabaseMapping, list[PublicItem]]:
         """Finds and returns cascading scenario alternatives for the given scenario ids."""
-        db_map_cascading_data = {}
-        for db_map, ids in db_map_ids.items():
-            ids = set(ids)
-            with self.get_lock(db_map):
-                scenario_alternative_table = db_map.mapped_table("scenario_alternative")
-                db_map.do_fetch_all(scenario_alternative_table)
-                for item in scenario_alternative_table.values():
-                    if item.is_valid() and item["scenario_id"] in ids:
-                        db_map_cascading_data.setdefault(db_map, []).append(item.public_item)
-        return db_map_cascading_data
+        return self._find_cascading_items("scenario_alternative", db_map_ids)
 
     def find_groups_by_entity(
         self, db_map_ids: dict[DatabaseMapping, Iterable[TempId]]
     ) -> dict[DatabaseMapping, list[PublicItem]]:
         """Finds and returns groups for the given entity ids."""
-        db_map_group_data = {}
-        for db_map, entity_ids in db_map_ids.items():
-            entity_ids = set(entity_ids)
+        return self._find_cascading_items("entity_group", db_map_ids)
+
+    def _find_cascading_items(
+        self, item_type: ItemType, db_map_ids: dict[DatabaseMapping, Iterable[TempId]]
+    ) -> dict[DatabaseMapping, list[PublicItem]]:
+        """Finds items of given type that refer to given ids using the cascade index."""
+        db_map_cascading_data = {}
+        for db_map, ids in db_map_ids.items():
             with self.get_lock(db_map):
-                entity_group_table = db_map.mapped_table("entity_group")
-                db_map.do_fetch_all(entity_group_table)
-                for item in entity_group_table.values():
-                    if item.is_valid() and item["entity_id"] in entity_ids:
-                        db_map_group_data.setdefault(db_map, []).append(item.public_item)
-        return db_map_group_data
+                self._fetch_all_for_indexes(db_map, item_type)
+                items = self._cascade_index.find(db_map, item_type, ids)
+            if items:
+                db_map_cascading_data[db_map] = [item.public_item for item in items]
+        return db_map_cascading_data
 
     def duplicate_scenario(
         self, scen_data: dict[DatabaseMapping, dict[str, Iterable[TempId]]], dup_name: str, db_map: DatabaseMapping
@@ -1534,17 +1585,44 @@ class SpineDBManager(QObject):
                 caller.file_exported.emit(file_path, 1.0, False)
 
     def get_items_for_commit(self, db_map: DatabaseMapping, commit_id: TempId) -> dict[str, list[TempId]]:
+        """Returns the ids of items that were last added or updated by given commit.
+
+        Items that have not been fetched yet are fetched with queries targeted at the commit.
+
+        Args:
+            db_map: database mapping
+            commit_id: commit id
+
+        Returns:
+            mapping from item type to item ids
+        """
         try:
-            worker = self._workers[db_map]
+            commit_index = self._commit_indexes[db_map]
         except KeyError:
             return {}
-        return worker.commit_cache.get(commit_id.db_id, {})
+        items_for_commit = {}
+        fetched_item_types = []
+        with self.get_lock(db_map):
+            for item_type, db_ids in commit_index.item_ids(commit_id.db_id).items():
+                mapped_table = db_map.mapped_table(item_type)
+                if any(mapped_table.get(db_id) is None for db_id in db_ids):
+                    fetched_items = db_map.fetch_more(item_type, commit_id=commit_id.db_id)
+                    self.update_item_indexes_after_fetch(db_map, item_type, fetched_items)
+                    fetched_item_types.append(item_type)
+                items = (mapped_table.get(db_id) for db_id in db_ids)
+                ids = [item["id"] for item in items if item is not None and item.is_valid()]
+                if ids:
+                    items_for_commit[item_type] = ids
+        for item_type in fetched_item_types:
+            self.more_data_fetched.emit(db_map, item_type)
+        return items_for_commit
 
     @Slot(list, list)
     def _parameter_value_validated(self, keys, is_valid_list):
         for key, is_valid in zip(keys, is_valid_list):
             with suppress(KeyError):
                 self._validated_values[key.item_type][key.db_map_id][key.item_private_id] = is_valid
+                self._render_cache.invalidate_items(key.db_map_id, key.item_type, (key.item_private_id,))
 
     def _clear_validated_value_ids(self, item_type: ItemType, db_map_data: DBMapPublicItems) -> None:
         db_map_validated_values = self._validated_values[item_type]
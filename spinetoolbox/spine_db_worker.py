@@ -12,15 +12,44 @@
 
 """The SpineDBWorker class."""
 
+import time
 from PySide6.QtCore import QObject, QTimer, Signal, Slot
 from PySide6.QtWidgets import QApplication
 from spinedb_api import Asterisk, DatabaseMapping
-from spinedb_api.temp_id import TempId
 from .fetch_parent import FetchParent
 from .helpers import busy_effect
 from .qthread_pool_executor import QtBasedThreadPoolExecutor, SynchronousExecutor
 
 _CHUNK_SIZE = 10000
+"""Number of rows fetched by the first query of an item type."""
+_MIN_CHUNK_SIZE = 1000
+_MAX_CHUNK_SIZE = 500000
+_CHUNK_DURATION = 0.5
+"""Targeted time in seconds it takes to query and handle a chunk."""
+
+
+class ChunkSizer:
+    """Scales the number of rows fetched per query such that querying and handling a chunk
+    takes roughly ``_CHUNK_DURATION`` seconds."""
+
+    def __init__(self):
+        self.size = _CHUNK_SIZE
+
+    def update(self, row_count: int, elapsed_time: float) -> None:
+        """Adapts chunk size to the time it took to query and handle the latest chunk.
+
+        Args:
+            row_count: number of rows in the chunk
+            elapsed_time: time in seconds it took to query and handle the chunk
+        """
+        if row_count < self.size:
+            return
+        if elapsed_time <= 0.0:
+            target = 2 * self.size
+        else:
+            target = int(row_count * _CHUNK_DURATION / elapsed_time)
+        target = max(self.size // 2, min(2 * self.size, target))
+        self.size = max(_MIN_CHUNK_SIZE, min(_MAX_CHUNK_SIZE, target))
 
 
 class SpineDBWorker(QObject):
@@ -35,9 +64,10 @@ class SpineDBWorker(QObject):
         self._db_map = None
         self._executor = (SynchronousExecutor if synchronous else QtBasedThreadPoolExecutor)()
         self._parents_by_type = {}
-        self.commit_cache: dict[int, dict[str, list[TempId]]] = {}
         self._parents_fetching = {}
         self._offsets = {}
+        self._chunk_sizers: dict[str, ChunkSizer] = {}
+        self._chunk_starts: dict[str, int] = {}
         self._fetched_item_types = set()
         self._query_advanced.connect(self._fetch_more_later)
 
@@ -83,7 +113,9 @@ class SpineDBWorker(QObject):
         item_type = parent.fetch_item_type
         index = parent.index
         parent_pos = parent.position(self._db_map)
-        items = self._db_map.get_items(item_type, fetch=False, skip_removed=False)
+        # The next chunk may be landing in the mapping in the background.
+        with self._db_mngr.get_lock(self._db_map):
+            items = self._db_map.get_items(item_type, fetch=False, skip_removed=False)
         if index is not None:
             # Build index from where we left and get items from it
             index_pos = index.position(self._db_map)
@@ -149,6 +181,8 @@ class SpineDBWorker(QObject):
         with self._db_mngr.get_lock(self._db_map):
             has_external_commits = self._db_map.has_external_commits()
         if not has_external_commits or fully_fetched:
+            if not fully_fetched and self._reached_latest_chunk(parent):
+                self._prefetch(item_type)
             something_fetched = self._iterate_mapping(parent)
             if fully_fetched:
                 if not something_fetched:
@@ -161,11 +195,54 @@ class SpineDBWorker(QObject):
             self._parents_fetching[item_type].add(parent)
             return
         self._parents_fetching[item_type] = {parent}
+        self._submit_query(item_type)
+
+    def _reached_latest_chunk(self, parent):
+        """Checks if parent has consumed the mapping up to the latest fetched chunk.
+
+        Args:
+            parent (FetchParent): fetch parent
+
+        Returns:
+            bool: True if parent is about to iterate the latest chunk
+        """
+        chunk_start = self._chunk_starts.get(parent.fetch_item_type)
+        if chunk_start is None:
+            return False
+        if parent.index is not None:
+            return parent.index.position(self._db_map) >= chunk_start
+        return parent.position(self._db_map) >= chunk_start
+
+    def _prefetch(self, item_type):
+        """Queries the next chunk in the background while the latest one is being iterated.
+
+        At most one query per item type is in flight, and a new one is started only
+        when some parent has reached the latest chunk, so at most one chunk is fetched ahead.
+
+        Args:
+            item_type (str): item type
+        """
+        if item_type in self._parents_fetching or item_type in self._fetched_item_types:
+            return
+        self._parents_fetching[item_type] = set()
+        self._submit_query(item_type)
+
+    def _submit_query(self, item_type):
+        """Queries the next chunk of given item type in a background thread.
+
+        Args:
+            item_type (str): item type
+        """
+        # Fetching may be reset while the query is in flight, so hold on to the sizer.
+        chunk_sizer = self._chunk_sizers.setdefault(item_type, ChunkSizer())
 
         def callback(future):
-            self._handle_query_advanced(item_type, future.result())
+            chunk, query_time = future.result()
+            start = time.perf_counter()
+            self._handle_query_advanced(item_type, chunk)
+            chunk_sizer.update(len(chunk), query_time + time.perf_counter() - start)
 
-        self._executor.submit(self._busy_db_map_fetch_more, item_type).add_done_callback(callback)
+        self._executor.submit(self._busy_db_map_fetch_more, item_type, chunk_sizer.size).add_done_callback(callback)
 
     @Slot(object)
     def _fetch_more_later(self, parents):
@@ -173,31 +250,28 @@ class SpineDBWorker(QObject):
             QTimer.singleShot(0, lambda parent=parent: self._do_fetch_more(parent))
 
     @busy_effect
-    def _busy_db_map_fetch_more(self, item_type):
+    def _busy_db_map_fetch_more(self, item_type, chunk_size):
         offset = self._offsets.setdefault(item_type, 0)
+        start = time.perf_counter()
         with self._db_mngr.get_lock(self._db_map):
-            chunk = self._db_map.fetch_more(item_type, limit=_CHUNK_SIZE, offset=offset)
-        if len(chunk) < _CHUNK_SIZE:
+            if self._db_map.closed:
+                return [], 0.0
+            self._chunk_starts[item_type] = len(self._db_map.mapped_table(item_type))
+            chunk = self._db_map.fetch_more(item_type, limit=chunk_size, offset=offset)
+            self._db_mngr.update_item_indexes_after_fetch(self._db_map, item_type, chunk)
+        query_time = time.perf_counter() - start
+        if len(chunk) < chunk_size:
             self._fetched_item_types.add(item_type)
         self._offsets[item_type] += len(chunk)
-        return chunk
+        return chunk, query_time
 
     def _handle_query_advanced(self, item_type, chunk):
-        self._populate_commit_cache(item_type, chunk)
         self._db_mngr.update_icons(self._db_map, item_type, chunk)
         self._db_mngr.more_data_fetched.emit(self._db_map, item_type)
         parents = self._parents_fetching.pop(item_type, ())
         if parents and not self._db_map.closed:
             self._query_advanced.emit(parents)
 
-    def _populate_commit_cache(self, item_type, items):
-        if item_type == "commit":
-            return
-        for item in items:
-            commit_id = item.get("commit_id")
-            if commit_id is not None:
-                self.commit_cache.setdefault(commit_id, {}).setdefault(item_type, []).append(item["id"])
-
     def close_db_map(self) -> None:
         with self._db_mngr.get_lock(self._db_map):
             for parents in self._parents_by_type.values():
@@ -224,6 +298,7 @@ class SpineDBWorker(QObject):
         """
         with self._db_mngr.get_lock(self._db_map):
             items, errors = self._db_map.add_items(item_type, *orig_items, check=check)
+            self._db_mngr.update_item_indexes(self._db_map, item_type, items)
         if errors:
             self._db_mngr.error_msg.emit({self._db_map: errors})
         self._db_mngr.update_icons(self._db_map, item_type, items)
@@ -249,6 +324,7 @@ class SpineDBWorker(QObject):
         """
         with self._db_mngr.get_lock(self._db_map):
             items, errors = self._db_map.update_items(item_type, *orig_items, check=check)
+            self._db_mngr.update_item_indexes(self._db_map, item_type, items)
         if errors:
             self._db_mngr.error_msg.emit({self._db_map: errors})
         self._db_mngr.update_icons(self._db_map, item_type, items)
@@ -266,6 +342,7 @@ class SpineDBWorker(QObject):
         """
         with self._db_mngr.get_lock(self._db_map):
             added, updated, errors = self._db_map.add_update_items(item_type, *orig_items, check=check)
+            self._db_mngr.update_item_indexes(self._db_map, item_type, added + updated)
         if errors:
             self._db_mngr.error_msg.emit({self._db_map: errors})
         self._db_mngr.items_added.emit(item_type, {self._db_map: added})
@@ -284,6 +361,7 @@ class SpineDBWorker(QObject):
         """
         with self._db_mngr.get_lock(self._db_map):
             items, errors = self._db_map.remove_items(item_type, *ids, check=check)
+            self._db_mngr.update_item_indexes(self._db_map, item_type, items)
         if errors:
             self._db_mngr.error_msg.emit({self._db_map: errors})
         self._db_mngr.items_removed.emit(item_type, {self._db_map: items})
@@ -302,6 +380,7 @@ class SpineDBWorker(QObject):
             self._db_mngr.error_msg.emit({self._db_map: errors})
         if Asterisk in ids:
             items = self._db_map.get_items(item_type)
+        self._db_mngr.update_item_indexes(self._db_map, item_type, items)
         self._db_mngr.update_icons(self._db_map, item_type, items)
         self._db_mngr.items_added.emit(item_type, {self._db_map: items})
         return items
@@ -314,7 +393,6 @@ class SpineDBWorker(QObject):
     def reset_session(self):
         """Resets session."""
         self._db_map.reset()
-        self.commit_cache.clear()
         self._reset_fetching()
 
     def _reset_fetching(self):
@@ -322,5 +400,7 @@ class SpineDBWorker(QObject):
             for parent in self._get_parents(parent_type):
                 parent.reset()
         self._offsets.clear()
+        self._chunk_sizers.clear()
+        self._chunk_starts.clear()
         self._fetched_item_types.clear()
         self._parents_fetching.clear()
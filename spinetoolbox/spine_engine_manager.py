@@ -16,7 +16,11 @@ import json
 import queue
 import threading
 from spine_engine.server.util.event_data_converter import EventDataConverter
-from spinetoolbox.server.engine_client import ClientSecurityModel, EngineClient
+from spinetoolbox.server.engine_client import ClientSecurityModel
+from spinetoolbox.server.engine_client_pool import engine_client_pool
+
+_RUNNER_FINISH_TIMEOUT = 1.0
+"""Time in seconds to wait for the remote runner thread to finish before its client is closed."""
 
 
 class SpineEngineManagerBase:
@@ -237,9 +241,9 @@ class RemoteSpineEngineManager(SpineEngineManagerBase):
         self.exec_job_id = ""  # Job Id of RemoteExecutionService for stopping the execution
         self.q = queue.Queue()  # Queue for sending events forward to SpineEngineWorker
 
-    def make_engine_client(self, host, port, security, sec_folder, ping=True):
-        """Creates a client for connecting to Spine Engine Server."""
-        self.engine_client = EngineClient(host, port, security, sec_folder, ping)
+    def make_engine_client(self, host, port, security, sec_folder):
+        """Checks out a client for connecting to Spine Engine Server from the client pool."""
+        self.engine_client = engine_client_pool.acquire(host, port, security, sec_folder)
 
     def run_engine(self, engine_data):
         """Makes an engine client for communicating with the engine server.
@@ -265,10 +269,20 @@ class RemoteSpineEngineManager(SpineEngineManagerBase):
         return self.q.get()
 
     def clean_up(self):
-        """Closes EngineClient and joins _runner thread if still active."""
-        self.engine_client.close()
+        """Returns EngineClient to the client pool and joins _runner thread if still active.
+
+        If the thread does not finish promptly, the client is in unknown state and is closed instead.
+        """
+        if self.engine_client is None:
+            return
+        if self._runner.is_alive():
+            self._runner.join(timeout=_RUNNER_FINISH_TIMEOUT)
         if self._runner.is_alive():
+            engine_client_pool.discard(self.engine_client)
             self._runner.join()
+        else:
+            engine_client_pool.release(self.engine_client)
+        self.engine_client = None
 
     def stop_engine(self):
         """Sends a request to stop execution on Server then waits for _runner thread to end."""
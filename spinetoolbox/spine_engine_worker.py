@@ -13,18 +13,35 @@
 """Contains GUIUpdater and SpineEngineWorker classes."""
 
 import copy
-from PySide6.QtCore import QObject, QThread, Signal, Slot
+import os
+from PySide6.QtCore import QObject, QThread, QTimer, Signal, Slot
 from spine_engine.exception import EngineInitFailed, RemoteEngineInitFailed
 from spine_engine.spine_engine import ItemExecutionFinishState, SpineEngineState
 from spine_engine.utils.helpers import ExecutionDirection
+from .execution_message_buffer import ExecutionMessageBuffer
 from .project_item.project_item import ProjectItem
 from .spine_engine_manager import LocalSpineEngineManager, make_engine_manager
 from .widgets.options_dialog import OptionsDialog
 
+MESSAGE_FLUSH_INTERVAL = 100
+"""Time in milliseconds between applying buffered execution messages to project items."""
+
 
 class GUIUpdater(QObject):
     """Contains slots for updating UI widgets based on messages received from the engine worker."""
 
+    def __init__(self, message_buffer):
+        """
+        Args:
+            message_buffer (ExecutionMessageBuffer): buffer of event and process messages
+        """
+        super().__init__()
+        self._message_buffer = message_buffer
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(MESSAGE_FLUSH_INTERVAL)
+        self._flush_timer.timeout.connect(self.flush_messages)
+
     @Slot(list)
     def handle_dag_execution_started(self, project_items):
         for item in project_items:
@@ -51,13 +68,30 @@ class GUIUpdater(QObject):
             if hasattr(icon, "animation_signaller"):
                 icon.animation_signaller.animation_stopped.emit()
 
-    @Slot(object, str, str, str)
-    def handle_event_message_arrived(self, item, filter_id, msg_type, msg_text):
-        item.add_event_message(filter_id, msg_type, msg_text)
+    @Slot()
+    def schedule_message_flush(self):
+        """Applies buffered messages once the flush interval has passed."""
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
 
-    @Slot(object, str, str, str)
-    def handle_process_message_arrived(self, item, filter_id, msg_type, msg_text):
-        item.add_process_message(filter_id, msg_type, msg_text)
+    @Slot()
+    def flush_messages(self):
+        """Applies buffered messages to project items immediately."""
+        self._flush_timer.stop()
+        for batch in self._message_buffer.take_batches():
+            item = batch.item
+            for is_process_message, msg_type, msg_text in batch.head:
+                _add_message(item, batch.filter_id, is_process_message, msg_type, msg_text)
+            if batch.dropped_count:
+                if batch.spool_path is not None:
+                    log_location = f"full log on disk: <a href='file:///{batch.spool_path}'>{batch.spool_path}</a>"
+                else:
+                    log_location = "failed to write full log on disk"
+                item.add_event_message(
+                    batch.filter_id, "msg_warning", f"Output lines dropped: {batch.dropped_count}, {log_location}"
+                )
+            for is_process_message, msg_type, msg_text in batch.messages:
+                _add_message(item, batch.filter_id, is_process_message, msg_type, msg_text)
 
     @Slot(dict, object)
     def handle_prompt_arrived(self, prompt, engine_mngr, logger=None):
@@ -84,6 +118,22 @@ class GUIUpdater(QObject):
                 icon.animation_signaller.animation_stopped.emit()
 
 
+def _add_message(item, filter_id, is_process_message, msg_type, msg_text):
+    """Adds an event or process message to item.
+
+    Args:
+        item (ProjectItem or LoggingConnection or LoggingJump): message's recipient
+        filter_id (str): filter identifier
+        is_process_message (bool): True for process messages, False for event messages
+        msg_type (str): message type
+        msg_text (str): message text
+    """
+    if is_process_message:
+        item.add_process_message(filter_id, msg_type, msg_text)
+    else:
+        item.add_event_message(filter_id, msg_type, msg_text)
+
+
 class SpineEngineWorker(QObject):
     finished = Signal(object)
     _mark_items_ignored = Signal(list)
@@ -92,11 +142,13 @@ class SpineEngineWorker(QObject):
     _node_execution_finished = Signal(object, object, object)
     _event_message_arrived = Signal(object, str, str, str)
     _process_message_arrived = Signal(object, str, str, str)
+    _messages_available = Signal()
+    _messages_flush_requested = Signal()
     _prompt_arrived = Signal(dict, object, object)
     _flash_arrived = Signal(object)
     _all_items_failed = Signal(list)
 
-    def __init__(self, engine_data, dag, dag_identifier, project_items, connections, logger, job_id):
+    def __init__(self, engine_data, dag, dag_identifier, project_items, connections, logger, job_id, profiler=None):
         """
         Args:
             engine_data (dict): engine data
@@ -106,6 +158,7 @@ class SpineEngineWorker(QObject):
             connections (dict): mapping from jump name to :class:`LoggingConnection` or :class:`LoggingJump`
             logger (LoggerInterface): a logger
             job_id (str): Job id for remote execution
+            profiler (ExecutionProfiler, optional): profiler to record execution timeline
         """
         super().__init__()
         self._engine_data = engine_data
@@ -125,7 +178,10 @@ class SpineEngineWorker(QObject):
         self._thread = QThread()
         self.moveToThread(self._thread)
         self._thread.started.connect(self.do_work)
-        self._gui_updater = GUIUpdater()
+        self._message_buffer = ExecutionMessageBuffer()
+        self._buffer_messages = False
+        self._gui_updater = GUIUpdater(self._message_buffer)
+        self._profiler = profiler
 
     @property
     def job_id(self):
@@ -175,12 +231,13 @@ class SpineEngineWorker(QObject):
             self._event_message_arrived.connect(self._handle_event_message_arrived_silent)
             self._process_message_arrived.connect(self._handle_process_message_arrived_silent)
             return
+        self._buffer_messages = True
         self._mark_items_ignored.connect(self._gui_updater.handle_node_execution_ignored)
         self._dag_execution_started.connect(self._gui_updater.handle_dag_execution_started)
         self._node_execution_started.connect(self._gui_updater.handle_node_execution_started)
         self._node_execution_finished.connect(self._gui_updater.handle_node_execution_finished)
-        self._event_message_arrived.connect(self._gui_updater.handle_event_message_arrived)
-        self._process_message_arrived.connect(self._gui_updater.handle_process_message_arrived)
+        self._messages_available.connect(self._gui_updater.schedule_message_flush)
+        self._messages_flush_requested.connect(self._gui_updater.flush_messages)
         self._prompt_arrived.connect(self._gui_updater.handle_prompt_arrived)
         self._flash_arrived.connect(self._gui_updater.handle_flash_arrived)
 
@@ -232,6 +289,8 @@ class SpineEngineWorker(QObject):
     @Slot()
     def do_work(self):
         """Does the work and emits finished when done."""
+        if self._profiler is not None:
+            self._profiler.start_dag(self.dag_identifier, graph=self.dag)
         try:
             self._engine_mngr.run_engine(self._engine_data)
         except EngineInitFailed as error:
@@ -250,6 +309,8 @@ class SpineEngineWorker(QObject):
             return
         while True:
             event_type, data = self._engine_mngr.get_engine_event()
+            if self._profiler is not None:
+                self._profiler.record_event(self.dag_identifier, event_type, data)
             self._process_event(event_type, data)
             if event_type == "dag_exec_finished":
                 self._engine_final_state = data
@@ -259,6 +320,7 @@ class SpineEngineWorker(QObject):
                 self._engine_final_state = str(SpineEngineState.FAILED)
                 self._all_items_failed.emit(list(self._project_items.values()))
                 break
+        self._messages_flush_requested.emit()
         self.finished.emit(self)
 
     def _process_event(self, event_type, data):
@@ -289,13 +351,11 @@ class SpineEngineWorker(QObject):
         item = self._project_items[msg["item_name"]]
         if msg["type"] == "execution_failed_to_start":
             msg_text = f"Program <b>{msg['program']}</b> failed to start: {msg['error']}"
-            self._event_message_arrived.emit(item, msg["filter_id"], "msg_error", msg_text)
+            self._add_event_message(item, msg["filter_id"], "msg_error", msg_text)
         elif msg["type"] == "execution_started":
-            self._event_message_arrived.emit(
-                item, msg["filter_id"], "msg", f"\tStarting program <b>{msg['program']}</b>"
-            )
-            self._event_message_arrived.emit(item, msg["filter_id"], "msg", f"\tArguments: <b>{msg['args']}</b>")
-            self._event_message_arrived.emit(
+            self._add_event_message(item, msg["filter_id"], "msg", f"\tStarting program <b>{msg['program']}</b>")
+            self._add_event_message(item, msg["filter_id"], "msg", f"\tArguments: <b>{msg['args']}</b>")
+            self._add_event_message(
                 item, msg["filter_id"], "msg_warning", "\tExecution is in progress. See messages below (stdout&stderr)"
             )
 
@@ -309,7 +369,7 @@ class SpineEngineWorker(QObject):
                 f"Unable to start persistent process <b>{msg['args']}</b>: {msg['error']}."
                 "Please go to Settings->Tools and check your setup."
             )
-            self._event_message_arrived.emit(item, msg["filter_id"], "msg_error", msg_text)
+            self._add_event_message(item, msg["filter_id"], "msg_error", msg_text)
         elif msg_type == "persistent_killed":
             self._logger.persistent_killed(item, msg["filter_id"])
         elif msg_type == "stdin":
@@ -319,10 +379,10 @@ class SpineEngineWorker(QObject):
         elif msg_type == "stderr":
             self._logger.add_persistent_stderr(item, msg["filter_id"], msg["data"])
         elif msg_type == "execution_started":
-            self._event_message_arrived.emit(
+            self._add_event_message(
                 item, msg["filter_id"], "msg", f"*** Starting execution on persistent process <b>{msg['args']}</b> ***"
             )
-            self._event_message_arrived.emit(item, msg["filter_id"], "msg_warning", "See Console for messages")
+            self._add_event_message(item, msg["filter_id"], "msg_warning", "See Console for messages")
         else:
             raise RuntimeError(f"Logic error: unknown persistent execution msg_type '{msg_type}'")
 
@@ -342,38 +402,61 @@ class SpineEngineWorker(QObject):
                 "<br/>For Python Tools, select a kernel spec in the Tool specification editor."
                 "<br/>For Julia Tools, select a kernel spec from File->Settings->Tools."
             )
-            self._event_message_arrived.emit(item, msg["filter_id"], "msg_error", msg_text)
+            self._add_event_message(item, msg["filter_id"], "msg_error", msg_text)
         elif msg["type"] == "conda_not_found":
             msg_text = (
                 f"{msg['error']}<br/>Couldn't call Conda. Set up <b>Conda executable</b> "
                 f"in <b>File->Settings->Tools</b>."
             )
-            self._event_message_arrived.emit(item, msg["filter_id"], "msg_error", msg_text)
+            self._add_event_message(item, msg["filter_id"], "msg_error", msg_text)
         elif msg["type"] == "execution_failed_to_start":
             msg_text = f"Execution on kernel <b>{msg['kernel_name']}</b> failed to start: {msg['error']}"
-            self._event_message_arrived.emit(item, msg["filter_id"], "msg_error", msg_text)
+            self._add_event_message(item, msg["filter_id"], "msg_error", msg_text)
         elif msg["type"] == "kernel_spec_exe_not_found":
             msg_text = (
                 f"Invalid kernel spec ({msg['kernel_name']}). File <b>{msg['kernel_exe_path']}</b> " f"does not exist."
             )
-            self._event_message_arrived.emit(item, msg["filter_id"], "msg_error", msg_text)
+            self._add_event_message(item, msg["filter_id"], "msg_error", msg_text)
         elif msg["type"] == "execution_started":
-            self._event_message_arrived.emit(
+            self._add_event_message(
                 item, msg["filter_id"], "msg", f"*** Starting execution on kernel spec <b>{msg['kernel_name']}</b> ***"
             )
-            self._event_message_arrived.emit(item, msg["filter_id"], "msg_warning", "See Console for messages")
+            self._add_event_message(item, msg["filter_id"], "msg_warning", "See Console for messages")
         elif msg["type"] == "kernel_shutdown":
             self._logger.kernel_shutdown.emit(item, msg["filter_id"])
 
     def _handle_process_msg(self, data):
         item_name = data["item_name"]
         item = self._project_items.get(item_name) or self._connections.get(item_name)
-        self._process_message_arrived.emit(item, data["filter_id"], data["msg_type"], data["msg_text"])
+        if not self._buffer_messages:
+            self._process_message_arrived.emit(item, data["filter_id"], data["msg_type"], data["msg_text"])
+            return
+        data_dir = getattr(item, "data_dir", None)
+        spool_dir = os.path.join(data_dir, "logs") if data_dir is not None else None
+        if self._message_buffer.add_process_message(
+            item, data["filter_id"], data["msg_type"], data["msg_text"], spool_dir
+        ):
+            self._messages_available.emit()
 
     def _handle_event_msg(self, data):
         item_name = data["item_name"]
         item = self._project_items.get(item_name) or self._connections.get(item_name)
-        self._event_message_arrived.emit(item, data["filter_id"], data["msg_type"], data["msg_text"])
+        self._add_event_message(item, data["filter_id"], data["msg_type"], data["msg_text"])
+
+    def _add_event_message(self, item, filter_id, msg_type, msg_text):
+        """Sends an event message to the item or buffers it for the next GUI update.
+
+        Args:
+            item (ProjectItem or LoggingConnection or LoggingJump): message's recipient
+            filter_id (str): filter identifier
+            msg_type (str): message type
+            msg_text (str): message text
+        """
+        if not self._buffer_messages:
+            self._event_message_arrived.emit(item, filter_id, msg_type, msg_text)
+            return
+        if self._message_buffer.add_event_message(item, filter_id, msg_type, msg_text):
+            self._messages_available.emit()
 
     def _handle_node_execution_started(self, data):
         """Starts item icon animation when executing forward."""
@@ -387,6 +470,7 @@ class SpineEngineWorker(QObject):
         if data["item_state"] == ItemExecutionFinishState.SUCCESS:
             self.successful_executions.append((item, direction))
         self._executing_items.discard(item)
+        self._messages_flush_requested.emit()
         # NOTE: A single item may seemingly finish multiple times
         # when the execution is stopped by user during filtered execution.
         self._node_execution_finished.emit(item, direction, data["item_state"])
@@ -408,6 +492,7 @@ class SpineEngineWorker(QObject):
             self._engine_mngr.stop_engine()
         else:
             self._engine_mngr.clean_up()
+        self._message_buffer.close()
         self._gui_updater = None
         self._thread.quit()
         self._thread.wait()
@@ -34,7 +34,7 @@ from PySide6.QtWidgets import (QApplication, QDockWidget, QFrame, QGraphicsView,
     QWidget)
 
 from spinetoolbox.widgets.custom_qgraphicsviews import DesignQGraphicsView
-from spinetoolbox.widgets.custom_qtextbrowser import CustomQTextBrowser
+from spinetoolbox.widgets.event_log_view import EventLogView
 from spinetoolbox import resources_icons_rc
 
 class Ui_MainWindow(object):
@@ -256,14 +256,13 @@ class Ui_MainWindow(object):
         self.verticalLayout_7 = QVBoxLayout()
         self.verticalLayout_7.setSpacing(0)
         self.verticalLayout_7.setObjectName(u"verticalLayout_7")
-        self.textBrowser_eventlog = CustomQTextBrowser(self.dockWidgetContents)
-        self.textBrowser_eventlog.setObjectName(u"textBrowser_eventlog")
-        sizePolicy.setHeightForWidth(self.textBrowser_eventlog.sizePolicy().hasHeightForWidth())
-        self.textBrowser_eventlog.setSizePolicy(sizePolicy)
-        self.textBrowser_eventlog.setContextMenuPolicy(Qt.ContextMenuPolicy.DefaultContextMenu)
-        self.textBrowser_eventlog.setOpenLinks(False)
+        self.tableView_eventlog = EventLogView(self.dockWidgetContents)
+        self.tableView_eventlog.setObjectName(u"tableView_eventlog")
+        sizePolicy.setHeightForWidth(self.tableView_eventlog.sizePolicy().hasHeightForWidth())
+        self.tableView_eventlog.setSizePolicy(sizePolicy)
+        self.tableView_eventlog.setContextMenuPolicy(Qt.ContextMenuPolicy.DefaultContextMenu)
 
-        self.verticalLayout_7.addWidget(self.textBrowser_eventlog)
+        self.verticalLayout_7.addWidget(self.tableView_eventlog)
 
         self.toolButton_executions = QToolButton(self.dockWidgetContents)
         self.toolButton_executions.setObjectName(u"toolButton_executions")
@@ -365,8 +364,8 @@ class Ui_MainWindow(object):
 
         self.dockWidget_item.setWidget(self.dockWidgetContents_3)
         MainWindow.addDockWidget(Qt.DockWidgetArea.TopDockWidgetArea, self.dockWidget_item)
-        QWidget.setTabOrder(self.graphicsView, self.textBrowser_eventlog)
-        QWidget.setTabOrder(self.textBrowser_eventlog, self.listView_console_executions)
+        QWidget.setTabOrder(self.graphicsView, self.tableView_eventlog)
+        QWidget.setTabOrder(self.tableView_eventlog, self.listView_console_executions)
         QWidget.setTabOrder(self.listView_console_executions, self.toolButton_executions)
         QWidget.setTabOrder(self.toolButton_executions, self.tabWidget_item_properties)
 
@@ -751,6 +751,41 @@ class Ui_SettingsForm(object):
 
         self.verticalLayout_4.addWidget(self.checkBox_db_editor_show_undo)
 
+        self.checkBox_columnar_pivot_table = QCheckBox(self.groupBox_db_editor_general)
+        self.checkBox_columnar_pivot_table.setObjectName(u"checkBox_columnar_pivot_table")
+
+        self.verticalLayout_4.addWidget(self.checkBox_columnar_pivot_table)
+
+        self.horizontalLayout_type_validation_workers = QHBoxLayout()
+        self.horizontalLayout_type_validation_workers.setObjectName(u"horizontalLayout_type_validation_workers")
+        self.label_type_validation_workers = QLabel(self.groupBox_db_editor_general)
+        self.label_type_validation_workers.setObjectName(u"label_type_validation_workers")
+
+        self.horizontalLayout_type_validation_workers.addWidget(self.label_type_validation_workers)
+
+        self.spinBox_type_validation_workers = QSpinBox(self.groupBox_db_editor_general)
+        self.spinBox_type_validation_workers.setObjectName(u"spinBox_type_validation_workers")
+        self.spinBox_type_validation_workers.setMaximum(64)
+
+        self.horizontalLayout_type_validation_workers.addWidget(self.spinBox_type_validation_workers)
+
+        self.horizontalSpacer_type_validation_workers = QSpacerItem(40, 20, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum)
+
+        self.horizontalLayout_type_validation_workers.addItem(self.horizontalSpacer_type_validation_workers)
+
+
+        self.verticalLayout_4.addLayout(self.horizontalLayout_type_validation_workers)
+
+        self.checkBox_persist_type_validation_cache = QCheckBox(self.groupBox_db_editor_general)
+        self.checkBox_persist_type_validation_cache.setObjectName(u"checkBox_persist_type_validation_cache")
+
+        self.verticalLayout_4.addWidget(self.checkBox_persist_type_validation_cache)
+
+        self.checkBox_persist_commit_index = QCheckBox(self.groupBox_db_editor_general)
+        self.checkBox_persist_commit_index.setObjectName(u"checkBox_persist_commit_index")
+
+        self.verticalLayout_4.addWidget(self.checkBox_persist_commit_index)
+
 
         self.verticalLayout_9.addWidget(self.groupBox_db_editor_general)
 
@@ -1126,7 +1161,11 @@ class Ui_SettingsForm(object):
         QWidget.setTabOrder(self.lineEdit_conda_path, self.toolButton_browse_conda)
         QWidget.setTabOrder(self.toolButton_browse_conda, self.checkBox_commit_at_exit)
         QWidget.setTabOrder(self.checkBox_commit_at_exit, self.checkBox_db_editor_show_undo)
-        QWidget.setTabOrder(self.checkBox_db_editor_show_undo, self.checkBox_entity_tree_sticky_selection)
+        QWidget.setTabOrder(self.checkBox_db_editor_show_undo, self.checkBox_columnar_pivot_table)
+        QWidget.setTabOrder(self.checkBox_columnar_pivot_table, self.spinBox_type_validation_workers)
+        QWidget.setTabOrder(self.spinBox_type_validation_workers, self.checkBox_persist_type_validation_cache)
+        QWidget.setTabOrder(self.checkBox_persist_type_validation_cache, self.checkBox_persist_commit_index)
+        QWidget.setTabOrder(self.checkBox_persist_commit_index, self.checkBox_entity_tree_sticky_selection)
         QWidget.setTabOrder(self.checkBox_entity_tree_sticky_selection, self.checkBox_hide_empty_classes)
         QWidget.setTabOrder(self.checkBox_hide_empty_classes, self.checkBox_auto_expand_entities)
         QWidget.setTabOrder(self.checkBox_auto_expand_entities, self.checkBox_merge_dbs)
@@ -1349,6 +1388,23 @@ class Ui_SettingsForm(object):
 #endif // QT_CONFIG(tooltip)
         self.checkBox_commit_at_exit.setText(QCoreApplication.translate("SettingsForm", u"Commit session before closing", None))
         self.checkBox_db_editor_show_undo.setText(QCoreApplication.translate("SettingsForm", u"Show undo notifications", None))
+#if QT_CONFIG(tooltip)
+        self.checkBox_columnar_pivot_table.setToolTip(QCoreApplication.translate("SettingsForm", u"<html><head/><body><p>Store pivot table data in NumPy arrays instead of a dictionary. Uses less memory and keeps large pivot tables responsive. Takes effect when the pivot table is next opened.</p></body></html>", None))
+#endif // QT_CONFIG(tooltip)
+        self.checkBox_columnar_pivot_table.setText(QCoreApplication.translate("SettingsForm", u"Columnar pivot table storage", None))
+        self.label_type_validation_workers.setText(QCoreApplication.translate("SettingsForm", u"Type validation workers", None))
+#if QT_CONFIG(tooltip)
+        self.spinBox_type_validation_workers.setToolTip(QCoreApplication.translate("SettingsForm", u"<html><head/><body><p>Number of worker processes that validate parameter types. Automatic uses a count based on the number of CPUs. Takes effect when Spine Toolbox is restarted.</p></body></html>", None))
+#endif // QT_CONFIG(tooltip)
+        self.spinBox_type_validation_workers.setSpecialValueText(QCoreApplication.translate("SettingsForm", u"Automatic", None))
+#if QT_CONFIG(tooltip)
+        self.checkBox_persist_type_validation_cache.setToolTip(QCoreApplication.translate("SettingsForm", u"<html><head/><body><p>Save parameter type validation results on disk so values that were already validated are skipped when a database is reopened. Takes effect when Spine Toolbox is restarted.</p></body></html>", None))
+#endif // QT_CONFIG(tooltip)
+        self.checkBox_persist_type_validation_cache.setText(QCoreApplication.translate("SettingsForm", u"Cache type validation results", None))
+#if QT_CONFIG(tooltip)
+        self.checkBox_persist_commit_index.setToolTip(QCoreApplication.translate("SettingsForm", u"<html><head/><body><p>Save the index of items touched by each commit next to SQLite databases so Commit viewer opens faster next time. Takes effect when Spine Toolbox is restarted.</p></body></html>", None))
+#endif // QT_CONFIG(tooltip)
+        self.checkBox_persist_commit_index.setText(QCoreApplication.translate("SettingsForm", u"Save commit index of SQLite databases", None))
         self.groupBox_entity_tree.setTitle(QCoreApplication.translate("SettingsForm", u"\"Entity tree\"", None))
 #if QT_CONFIG(tooltip)
         self.checkBox_entity_tree_sticky_selection.setToolTip(QCoreApplication.translate("SettingsForm", u"<html><head/><body><p>Controls how selecting items in Object tree <span style=\" font-weight:600;\">using the left mouse button</span> works. </p><p>When unchecked [default], Single selection is enabled. Pressing the Ctrl-button down enables multiple selection.</p><p>When checked, Multiple selection is enabled. Pressing the Ctrl-button down enables single selection.</p></body></html>", None))
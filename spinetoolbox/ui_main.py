@@ -55,7 +55,8 @@ from spine_engine.load_project_items import load_item_specification_factories
 from spine_engine.project_item.project_item_specification_factory import ProjectItemSpecificationFactory
 from spine_engine.spine_engine import _set_resource_limits
 from spine_engine.utils.helpers import resolve_julia_executable, resolve_julia_project, resolve_python_interpreter
-from spinetoolbox.server.engine_client import ClientSecurityModel, EngineClient, RemoteEngineInitFailed
+from spinetoolbox.server.engine_client import ClientSecurityModel, RemoteEngineInitFailed
+from spinetoolbox.server.engine_client_pool import engine_client_pool
 from .config import DEFAULT_WORK_DIR, ONLINE_DOCUMENTATION_URL, SPINE_DB_API_DOCUMENTATION_URL, SPINE_TOOLBOX_REPO_URL
 from .helpers import (
     ChildCyclingKeyPressFilter,
@@ -241,8 +242,9 @@ class ToolboxUI(QMainWindow):
         self.active_link_item: JumpOrLink | None = None
         self._selected_item_names: set[str] = set()
         self.execution_in_progress = False
+        self.execution_profile_path: str | None = None
         self._anchor_callbacks: dict[str, Callable[[], None]] = {}
-        self.ui.textBrowser_eventlog.set_toolbox(self)
+        self.ui.tableView_eventlog.set_toolbox(self)
         self.shutdown_and_clear_settings = False
         # DB manager
         self.db_mngr = SpineDBManager(self._qsettings, self)
@@ -332,7 +334,7 @@ class ToolboxUI(QMainWindow):
         self.msg_warning.connect(self.add_warning_message)
         self.msg_proc.connect(self.add_process_message)
         self.msg_proc_error.connect(self.add_process_error_message)
-        self.ui.textBrowser_eventlog.anchorClicked.connect(self.open_anchor)
+        self.ui.tableView_eventlog.anchorClicked.connect(self.open_anchor)
         # Message box signals
         self.information_box.connect(self._show_message_box)
         self.error_box.connect(self._show_error_box)
@@ -634,7 +636,7 @@ class ToolboxUI(QMainWindow):
         if self._project is not None:
             if not self.close_project():
                 return
-        self.ui.textBrowser_eventlog.clear()
+        self.ui.tableView_eventlog.clear()
         self.undo_stack.clear()
         self._project = SpineToolboxProject(
             self,
@@ -724,7 +726,7 @@ class ToolboxUI(QMainWindow):
         self.update_window_title()
         # Populate project model with project items
         if clear_event_log:
-            self.ui.textBrowser_eventlog.clear()
+            self.ui.tableView_eventlog.clear()
         try:
             success = self._project.load(self._item_specification_factories, self.item_factories, self._confirm_project_upgrade)
         except (ProjectLoadingFailed, ProjectUpgradeFailed, InvalidProjectDict) as error:
@@ -913,7 +915,7 @@ class ToolboxUI(QMainWindow):
         self.undo_stack.clear()
         self.update_window_title()
         if clear_event_log:
-            self.ui.textBrowser_eventlog.clear()
+            self.ui.tableView_eventlog.clear()
         return True
 
     @Slot()
@@ -1078,11 +1080,11 @@ class ToolboxUI(QMainWindow):
     def refresh_active_elements(self, active_project_item, active_link_item, selected_item_names):
         self._selected_item_names = selected_item_names
         self._update_execute_selected_enabled()
-        self.ui.textBrowser_eventlog.set_item_log_selected(False)
+        self.ui.tableView_eventlog.set_item_log_selected(False)
         self._set_active_project_item(active_project_item)
         self._set_active_link_item(active_link_item)
         self._activate_properties_tab()
-        self.ui.textBrowser_eventlog.set_item_log_selected(True)
+        self.ui.tableView_eventlog.set_item_log_selected(True)
 
     def _activate_properties_tab(self):
         if self.active_project_item:
@@ -1550,8 +1552,8 @@ class ToolboxUI(QMainWindow):
         Args:
             msg (str): String written to QTextBrowser
         """
-        message = format_log_message("msg", msg, self.ui.textBrowser_eventlog, self.show_datetime)
-        self.ui.textBrowser_eventlog.append(message)
+        message = format_log_message("msg", msg, self.ui.tableView_eventlog, self.show_datetime)
+        self.ui.tableView_eventlog.append(message)
 
     @Slot(str)
     def add_success_message(self, msg):
@@ -1560,8 +1562,8 @@ class ToolboxUI(QMainWindow):
         Args:
             msg (str): String written to QTextBrowser
         """
-        message = format_log_message("msg_success", msg, self.ui.textBrowser_eventlog, self.show_datetime)
-        self.ui.textBrowser_eventlog.append(message)
+        message = format_log_message("msg_success", msg, self.ui.tableView_eventlog, self.show_datetime)
+        self.ui.tableView_eventlog.append(message)
 
     @Slot(str)
     def add_error_message(self, msg):
@@ -1570,8 +1572,8 @@ class ToolboxUI(QMainWindow):
         Args:
             msg (str): String written to QTextBrowser
         """
-        message = format_log_message("msg_error", msg, self.ui.textBrowser_eventlog, self.show_datetime)
-        self.ui.textBrowser_eventlog.append(message)
+        message = format_log_message("msg_error", msg, self.ui.tableView_eventlog, self.show_datetime)
+        self.ui.tableView_eventlog.append(message)
 
     @Slot(str)
     def add_warning_message(self, msg):
@@ -1580,8 +1582,8 @@ class ToolboxUI(QMainWindow):
         Args:
             msg (str): String written to QTextBrowser
         """
-        message = format_log_message("msg_warning", msg, self.ui.textBrowser_eventlog, self.show_datetime)
-        self.ui.textBrowser_eventlog.append(message)
+        message = format_log_message("msg_warning", msg, self.ui.tableView_eventlog, self.show_datetime)
+        self.ui.tableView_eventlog.append(message)
 
     @Slot(str)
     def add_process_message(self, msg):
@@ -1590,8 +1592,8 @@ class ToolboxUI(QMainWindow):
         Args:
             msg (str): String written to QTextBrowser
         """
-        message = format_log_message("msg", msg, self.ui.textBrowser_eventlog)
-        self.ui.textBrowser_eventlog.append(message)
+        message = format_log_message("msg", msg, self.ui.tableView_eventlog)
+        self.ui.tableView_eventlog.append(message)
 
     @Slot(str)
     def add_process_error_message(self, msg):
@@ -1600,8 +1602,8 @@ class ToolboxUI(QMainWindow):
         Args:
             msg (str): String written to QTextBrowser
         """
-        message = format_log_message("msg_error", msg, self.ui.textBrowser_eventlog)
-        self.ui.textBrowser_eventlog.append(message)
+        message = format_log_message("msg_error", msg, self.ui.tableView_eventlog)
+        self.ui.tableView_eventlog.append(message)
 
     def override_console_and_execution_list(self):
         self._override_console()
@@ -1810,7 +1812,7 @@ class ToolboxUI(QMainWindow):
             return
         self.msg.emit(f"Connecting to Spine Engine Server at <b>{host}:{port}</b>")
         try:
-            engine_client = EngineClient(host, port, sec_model, sec_folder)
+            engine_client = engine_client_pool.acquire(host, port, sec_model, sec_folder)
         except RemoteEngineInitFailed as e:
             self.msg_error.emit(f"Server is not responding. {e}. Check settings in <b>File->Settings->Engine</b>.")
             return
@@ -1822,7 +1824,7 @@ class ToolboxUI(QMainWindow):
                 f.write(project_file)
         except Exception as e:
             self.msg_error.emit(f"Saving the downloaded file to '{zip_path}' failed. [{type(e).__name__}: {e}")
-            engine_client.close()
+            engine_client_pool.release(engine_client)
             return
         # Extract the saved file
         self.msg.emit(f"Extracting project file project_package.zip to: {project_dir}")
@@ -1835,9 +1837,9 @@ class ToolboxUI(QMainWindow):
                     self.msg_error.emit(f"Zip-file {zip_path} test failed. First bad file: {first_bad_file}")
             except Exception as e:
                 self.msg_error.emit(f"Problem in extracting downloaded project: {e}")
-                engine_client.close()
+                engine_client_pool.release(engine_client)
                 return
-        engine_client.close()
+        engine_client_pool.release(engine_client)
         try:
             os.remove(zip_path)  # Remove downloaded project_package.zip
         except OSError:
@@ -2139,11 +2141,13 @@ class ToolboxUI(QMainWindow):
         self._close_consoles()
         if self._project is not None:
             self._project.tear_down()
+        engine_client_pool.close_all()
         for item_type in self.item_factories:
             for editor in self.get_all_multi_tab_spec_editors(item_type):
                 editor.close()
         if self.shutdown_and_clear_settings:
             clear_qsettings(self._qsettings)
+        self.ui.tableView_eventlog.tear_down()
         event.accept()
 
     def _serialize_selected_items(self):
@@ -2336,8 +2340,8 @@ class ToolboxUI(QMainWindow):
         self.ui.actionExecute_project.setEnabled(False)
         self.ui.actionExecute_selection.setEnabled(False)
         self.ui.actionStop_execution.setEnabled(True)
-        self.ui.textBrowser_eventlog.verticalScrollBar().setValue(
-            self.ui.textBrowser_eventlog.verticalScrollBar().maximum()
+        self.ui.tableView_eventlog.verticalScrollBar().setValue(
+            self.ui.tableView_eventlog.verticalScrollBar().maximum()
         )
 
     @Slot()
@@ -2346,6 +2350,22 @@ class ToolboxUI(QMainWindow):
         self._update_execute_enabled()
         self._update_execute_selected_enabled()
         self.ui.actionStop_execution.setEnabled(False)
+        if self.execution_profile_path is not None:
+            self._write_execution_profile()
+
+    def _write_execution_profile(self):
+        """Logs execution time summary and writes the timeline of latest execution to a Chrome trace file."""
+        profiler = self._project.execution_profiler
+        if profiler is None:
+            return
+        for line in profiler.summary():
+            self.msg.emit(line)
+        try:
+            profiler.write_chrome_trace(self.execution_profile_path)
+        except OSError as error:
+            self.msg_error.emit(f"Failed to write execution profile: {error}")
+            return
+        self.msg.emit(f"Execution profile written to {self.execution_profile_path}")
 
     @Slot(str)
     def set_icon_and_properties_ui(self, item_name):
@@ -2716,7 +2736,7 @@ class ToolboxUI(QMainWindow):
         Args:
             timestamp (str): Time stamp
         """
-        self.ui.textBrowser_eventlog.make_log_entry_point(timestamp)
+        self.ui.tableView_eventlog.make_log_entry_point(timestamp)
 
     def add_log_message(self, item_name: str, filter_id: str, msg_type: MessageType, message: str) -> None:
         """Adds a message to an item's execution log.
@@ -2727,5 +2747,5 @@ class ToolboxUI(QMainWindow):
             msg_type: Type of the message.
             message: Message to log.
         """
-        message = format_log_message(msg_type, message, self.ui.textBrowser_eventlog)
-        self.ui.textBrowser_eventlog.add_log_message(item_name, filter_id, message)
+        message = format_log_message(msg_type, message, self.ui.tableView_eventlog)
+        self.ui.tableView_eventlog.add_log_message(item_name, filter_id, message)
@@ -0,0 +1,187 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+"""A bounded cache of parameter values rendered for item views."""
+
+from __future__ import annotations
+from collections import OrderedDict
+from collections.abc import Iterable
+from threading import Lock
+from typing import Any, ClassVar
+from PySide6.QtCore import Qt, Slot
+from spinedb_api import DatabaseMapping
+from spinedb_api.helpers import ItemType
+from .fetch_parent import DBMapMixedItems
+
+RENDER_CACHE_SIZE = 100000
+"""Maximum number of rendered values kept in cache."""
+NOT_CACHED = object()
+"""Returned by :meth:`ValueRenderCache.get` when value is not in cache."""
+
+RenderKey = tuple[int, ItemType, int, int]
+"""Database mapping id, item type, item's private id and role."""
+ItemKey = tuple[int, ItemType, int]
+"""Database mapping id, item type and item's private id."""
+
+
+class ValueRenderCache:
+    """Least recently used cache of values rendered by :meth:`SpineDBManager.get_value`.
+
+    Besides the rendered item itself, a value may depend on other items such as list values;
+    the dependencies are recorded so that changing any of them drops exactly the affected values.
+    The cache is accessed from both the GUI thread and database worker threads;
+    values rendered while an invalidation was going on are not cached, see :attr:`generation`.
+    """
+
+    CACHED_ROLES: ClassVar[frozenset[int]] = frozenset(
+        {Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole, Qt.ItemDataRole.TextAlignmentRole}
+    )
+    """Roles whose rendered values are cached."""
+    DEPENDENCY_ITEM_TYPES: ClassVar[set[ItemType]] = {
+        "parameter_value",
+        "parameter_definition",
+        "list_value",
+        "parameter_value_list",
+    }
+    """Types of items that rendered values may depend on."""
+
+    def __init__(self, size: int = RENDER_CACHE_SIZE):
+        """
+        Args:
+            size: maximum number of cached values
+        """
+        self._size = size
+        self._lock = Lock()
+        self._values: OrderedDict[RenderKey, tuple[Any, tuple[ItemKey, ...]]] = OrderedDict()
+        self._keys_by_item: dict[ItemKey, set[RenderKey]] = {}
+        self._generation = 0
+
+    def __len__(self):
+        return len(self._values)
+
+    @property
+    def generation(self) -> int:
+        """Number that changes whenever values are invalidated; read it before rendering a value to cache."""
+        return self._generation
+
+    def get(self, key: RenderKey) -> Any:
+        """Returns a cached value.
+
+        Args:
+            key: render key
+
+        Returns:
+            rendered value or :data:`NOT_CACHED`
+        """
+        with self._lock:
+            try:
+                value, _ = self._values[key]
+            except KeyError:
+                return NOT_CACHED
+            self._values.move_to_end(key)
+            return value
+
+    def put(
+        self, key: RenderKey, value: Any, generation: int, dependencies: Iterable[tuple[ItemType, int]] = ()
+    ) -> None:
+        """Caches a rendered value unless something was invalidated while the value was being rendered.
+
+        Args:
+            key: render key
+            value: rendered value
+            generation: value of :attr:`generation` before rendering started
+            dependencies: types and private ids of other items the value was rendered from
+        """
+        db_map_id, item_type, private_id, _ = key
+        item_keys = ((db_map_id, item_type, private_id),) + tuple(
+            (db_map_id, dependency_type, dependency_id) for dependency_type, dependency_id in dependencies
+        )
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._drop(key)
+            self._values[key] = (value, item_keys)
+            for item_key in item_keys:
+                self._keys_by_item.setdefault(item_key, set()).add(key)
+            while len(self._values) > self._size:
+                self._drop(next(iter(self._values)))
+
+    def invalidate_items(self, db_map_id: int, item_type: ItemType, private_ids: Iterable[int]) -> None:
+        """Drops the values rendered from given items.
+
+        Args:
+            db_map_id: id of database mapping
+            item_type: item type
+            private_ids: items' private ids
+        """
+        with self._lock:
+            self._generation += 1
+            for private_id in private_ids:
+                for key in self._keys_by_item.get((db_map_id, item_type, private_id), set()).copy():
+                    self._drop(key)
+
+    @Slot(object)
+    def invalidate_caches(self, db_map: DatabaseMapping) -> None:
+        """Drops all values of given database mapping.
+
+        Args:
+            db_map: database mapping
+        """
+        db_map_id = id(db_map)
+        with self._lock:
+            self._generation += 1
+            for key in [key for key in self._values if key[0] == db_map_id]:
+                self._drop(key)
+
+    def update_caches_after_data_changed(self, item_type: ItemType, db_map_data: DBMapMixedItems) -> None:
+        """Drops values rendered from added, updated or removed items.
+
+        Args:
+            item_type: item type
+            db_map_data: mapping from database mapping to changed items
+        """
+        if item_type not in self.DEPENDENCY_ITEM_TYPES:
+            return
+        for db_map, items in db_map_data.items():
+            self.invalidate_items(id(db_map), item_type, (item["id"].private_id for item in items if item))
+
+    @Slot(object, str)
+    def maybe_invalidate_caches_after_fetch(self, db_map: DatabaseMapping, item_type: ItemType) -> None:
+        """Drops values that depend on items of fetched type since they may have been rendered without them.
+
+        Args:
+            db_map: database mapping
+            item_type: fetched item type
+        """
+        if item_type not in ("list_value", "parameter_value_list"):
+            return
+        db_map_id = id(db_map)
+        with self._lock:
+            self._generation += 1
+            for item_key in [key for key in self._keys_by_item if key[0] == db_map_id and key[1] == item_type]:
+                for key in self._keys_by_item.get(item_key, set()).copy():
+                    self._drop(key)
+
+    def _drop(self, key: RenderKey) -> None:
+        """Removes a value and its dependency records.
+
+        Args:
+            key: render key
+        """
+        try:
+            _, item_keys = self._values.pop(key)
+        except KeyError:
+            return
+        for item_key in item_keys:
+            keys = self._keys_by_item[item_key]
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_item[item_key]
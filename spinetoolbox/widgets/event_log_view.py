@@ -0,0 +1,381 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Contains a list view for Event Log."""
+
+from collections import OrderedDict
+from PySide6.QtCore import QModelIndex, QPoint, QPointF, QRect, QSize, Qt, QTimer, QUrl, Signal, Slot
+from PySide6.QtGui import QAbstractTextDocumentLayout, QAction, QKeySequence, QPalette, QTextDocument
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QApplication,
+    QHeaderView,
+    QMenu,
+    QStyle,
+    QStyledItemDelegate,
+    QTableView,
+)
+from ..mvcmodels.event_log_model import INDENT_ROLE, ITEM_NAME_ROLE, EventLogModel
+
+_INDENT_WIDTH = 12
+_HIGHLIGHT_WIDTH = 3
+
+
+class EventLogView(QTableView):
+    """A single column view that shows Event Log lines.
+
+    All lines have the same height, so the view needs to lay out and draw only the visible lines.
+    """
+
+    anchorClicked = Signal(QUrl)
+    """Emitted when a link in a log line is clicked."""
+    _ALL_RUNS = "All executions"
+
+    def __init__(self, parent):
+        """
+        Args:
+            parent (QWidget): Parent widget
+        """
+        super().__init__(parent)
+        self._toolbox = None
+        self._executing_timestamp = None
+        self._highlighted_item_name = None
+        self._max_line_length = 0
+        self._model = EventLogModel(self)
+        self.setModel(self._model)
+        self.destroyed.connect(self._model.close)
+        self._delegate = _LogLineDelegate(self)
+        self.setItemDelegate(self._delegate)
+        self.horizontalHeader().hide()
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.verticalHeader().hide()
+        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.verticalHeader().setMinimumSectionSize(1)
+        self.verticalHeader().setDefaultSectionSize(self.fontMetrics().lineSpacing() + 2)
+        self.setShowGrid(False)
+        self.setWordWrap(False)
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.setHorizontalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setMouseTracking(True)
+        self._scroll_to_bottom_timer = QTimer(self)
+        self._scroll_to_bottom_timer.setSingleShot(True)
+        self._scroll_to_bottom_timer.setInterval(0)
+        self._scroll_to_bottom_timer.timeout.connect(self.scrollToBottom)
+        self._executions_menu = QMenu(self)
+        self._executions_menu.aboutToShow.connect(self._populate_executions_menu)
+        self._executions_menu.triggered.connect(self._select_execution)
+        self._copy_action = QAction("Copy", self)
+        self._copy_action.setShortcut(QKeySequence.StandardKey.Copy)
+        self._copy_action.setShortcutContext(Qt.ShortcutContext.WidgetShortcut)
+        self._copy_action.triggered.connect(self.copy)
+        self.addAction(self._copy_action)
+        self._model.rowsInserted.connect(self._update_line_width)
+        self._model.modelReset.connect(self._update_column_width)
+
+    def set_toolbox(self, toolbox):
+        self._toolbox = toolbox
+        self._toolbox.ui.toolButton_executions.setMenu(self._executions_menu)
+        self._toolbox.ui.toolButton_executions.hide()
+
+    def highlighted_item_name(self):
+        """Returns the name of the item whose log lines are highlighted.
+
+        Returns:
+            str: item name or None
+        """
+        return self._highlighted_item_name
+
+    @Slot(str)
+    def append(self, text):
+        """Appends a message that does not belong to any execution.
+
+        Args:
+            text (str): formatted message
+        """
+        at_bottom = self._is_at_bottom()
+        self._model.append(text)
+        if at_bottom:
+            self._scroll_to_bottom_timer.start()
+
+    def contextMenuEvent(self, event):
+        """Shows a context menu with copy and clear actions.
+
+        Args:
+            event (QContextMenuEvent): Received event
+        """
+        menu = QMenu(self)
+        menu.addAction(self._copy_action)
+        self._copy_action.setEnabled(self.selectionModel().hasSelection())
+        menu.addSeparator()
+        clear_action = menu.addAction("Clear")
+        clear_action.triggered.connect(self.clear)
+        menu.exec(event.globalPos())
+
+    @Slot()
+    def copy(self):
+        """Copies the plain text of selected lines to clipboard."""
+        rows = sorted(index.row() for index in self.selectionModel().selectedIndexes())
+        if not rows:
+            return
+        document = QTextDocument()
+        lines = []
+        for row in rows:
+            document.setHtml(self._model.index(row, 0).data())
+            lines.append(document.toPlainText())
+        QApplication.clipboard().setText("\n".join(lines))
+
+    @Slot()
+    def clear(self):
+        self._model.clear()
+        self._max_line_length = 0
+        self._delegate.clear_cache()
+        self.reset_executions_button_text()
+
+    def tear_down(self):
+        """Deletes the spool file of the log; messages logged afterwards are discarded."""
+        self._scroll_to_bottom_timer.stop()
+        self._model.close()
+
+    @Slot()
+    def _populate_executions_menu(self):
+        texts = [self._ALL_RUNS] + self.execution_timestamps()
+        self._executions_menu.clear()
+        for text in texts:
+            action = self._executions_menu.addAction(text)
+            action.setCheckable(True)
+            action.setChecked(text == self._toolbox.ui.toolButton_executions.text())
+
+    def reset_executions_button_text(self):
+        self._toolbox.ui.toolButton_executions.setText(self._ALL_RUNS)
+        self._toolbox.ui.toolButton_executions.setVisible(False)
+
+    @Slot(QAction)
+    def _select_execution(self, action):
+        text = action.text()
+        self._toolbox.ui.toolButton_executions.setText(text)
+        if text == self._ALL_RUNS:
+            self.select_all_executions()
+            return
+        self.select_execution(text)
+
+    def make_log_entry_point(self, timestamp):
+        """Starts a new execution in the log and shows only its lines.
+
+        Args:
+            timestamp (str): time stamp
+        """
+        self._toolbox.ui.toolButton_executions.setVisible(True)
+        self._executing_timestamp = timestamp
+        self.select_execution(timestamp)
+
+    def add_log_message(self, item_name, filter_id, message):
+        """Adds a message to an item's execution log.
+
+        Args:
+            item_name (str): item name
+            filter_id (str): filter identifier
+            message (str): formatted message
+        """
+        at_bottom = self._is_at_bottom()
+        self._model.add_message(self._executing_timestamp, item_name, filter_id, message)
+        if at_bottom:
+            self._scroll_to_bottom_timer.start()
+
+    def execution_timestamps(self):
+        return self._model.execution_timestamps()
+
+    def select_all_executions(self):
+        self._set_visible_execution(None)
+
+    def select_execution(self, timestamp):
+        self._toolbox.ui.toolButton_executions.setText(timestamp)
+        self._set_visible_execution(timestamp)
+
+    def _set_visible_execution(self, timestamp):
+        """Shows the lines of given execution.
+
+        Args:
+            timestamp (str, optional): execution time stamp or None to show all executions
+        """
+        if timestamp == self._model.visible_timestamp():
+            return
+        self._model.set_visible_timestamp(timestamp)
+        self.set_item_log_selected(True)
+
+    def set_item_log_selected(self, selected) -> None:
+        """Highlights the log lines of active project item or link and scrolls to them.
+
+        Args:
+            selected (bool): True to highlight the lines, False to remove highlight
+        """
+        item_name = None
+        if selected and self._toolbox is not None:
+            active_item = self._toolbox.active_project_item or self._toolbox.active_link_item
+            if active_item:
+                item_name = active_item.name
+        if item_name == self._highlighted_item_name:
+            return
+        self._highlighted_item_name = item_name
+        self.viewport().update()
+        if item_name is None:
+            return
+        timestamp = self._model.visible_timestamp()
+        if timestamp is None:
+            timestamp = self._executing_timestamp
+        row = self._model.item_title_row(timestamp, item_name)
+        if row is not None:
+            self.scrollTo(self._model.index(row, 0), QAbstractItemView.ScrollHint.PositionAtTop)
+
+    def mouseMoveEvent(self, event):
+        super().mouseMoveEvent(event)
+        if self._anchor_at(event.position().toPoint()):
+            self.viewport().setCursor(Qt.CursorShape.PointingHandCursor)
+        else:
+            self.viewport().unsetCursor()
+
+    def mouseReleaseEvent(self, event):
+        super().mouseReleaseEvent(event)
+        if event.button() != Qt.MouseButton.LeftButton:
+            return
+        anchor = self._anchor_at(event.position().toPoint())
+        if anchor:
+            self.anchorClicked.emit(QUrl(anchor))
+
+    def _anchor_at(self, position):
+        """Finds the link under a position in viewport.
+
+        Args:
+            position (QPoint): position in viewport coordinates
+
+        Returns:
+            str: link target or empty string
+        """
+        index = self.indexAt(position)
+        if not index.isValid():
+            return ""
+        rect = self.visualRect(index)
+        document = self._delegate.document(index)
+        local_position = position - rect.topLeft() - QPoint(self._delegate.indentation(index), 0)
+        return document.documentLayout().anchorAt(QPointF(local_position))
+
+    def _is_at_bottom(self):
+        if self._scroll_to_bottom_timer.isActive():
+            return True
+        scrollbar = self.verticalScrollBar()
+        return scrollbar.value() >= scrollbar.maximum() - 1
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_column_width()
+
+    @Slot(QModelIndex, int, int)
+    def _update_line_width(self, parent, first, last):
+        """Widens the column if the longest line has grown."""
+        if self._model.max_line_length > self._max_line_length:
+            self._max_line_length = self._model.max_line_length
+            self._update_column_width()
+
+    @Slot()
+    def _update_column_width(self):
+        """Makes the column as wide as the longest line but at least as wide as the viewport."""
+        self._max_line_length = self._model.max_line_length
+        line_width = self._delegate.line_width(self._max_line_length, self.fontMetrics())
+        self.setColumnWidth(0, max(line_width, self.viewport().width()))
+
+
+class _LogLineDelegate(QStyledItemDelegate):
+    """Draws formatted log lines."""
+
+    _DOCUMENT_CACHE_SIZE = 512
+
+    def __init__(self, parent):
+        """
+        Args:
+            parent (EventLogView): Event Log view
+        """
+        super().__init__(parent)
+        self._view = parent
+        self._documents = OrderedDict()
+
+    def clear_cache(self):
+        """Clears cached documents."""
+        self._documents.clear()
+
+    def document(self, index):
+        """Returns a laid out text document for the line at given index.
+
+        Args:
+            index (QModelIndex): index
+
+        Returns:
+            QTextDocument: document
+        """
+        html = index.data()
+        document = self._documents.get(html)
+        if document is not None:
+            self._documents.move_to_end(html)
+            return document
+        document = QTextDocument()
+        document.setDocumentMargin(0)
+        document.setDefaultFont(self._view.font())
+        document.setHtml(html)
+        self._documents[html] = document
+        if len(self._documents) > self._DOCUMENT_CACHE_SIZE:
+            self._documents.popitem(last=False)
+        return document
+
+    @staticmethod
+    def indentation(index):
+        """Returns the horizontal indentation of the line at given index.
+
+        Args:
+            index (QModelIndex): index
+
+        Returns:
+            int: indentation in pixels
+        """
+        return _HIGHLIGHT_WIDTH + 2 + index.data(INDENT_ROLE) * _INDENT_WIDTH
+
+    def paint(self, painter, option, index):
+        style = option.widget.style() if option.widget is not None else QApplication.style()
+        self.initStyleOption(option, index)
+        option.text = ""
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, option, painter, option.widget)
+        painter.save()
+        item_name = index.data(ITEM_NAME_ROLE)
+        if item_name is not None and item_name == self._view.highlighted_item_name():
+            highlight_rect = QRect(option.rect.topLeft(), QSize(_HIGHLIGHT_WIDTH, option.rect.height()))
+            painter.fillRect(highlight_rect, option.palette.color(QPalette.ColorRole.Highlight))
+        painter.translate(option.rect.left() + self.indentation(index), option.rect.top())
+        context = QAbstractTextDocumentLayout.PaintContext()
+        context.palette = QPalette(option.palette)
+        if option.state & QStyle.StateFlag.State_Selected:
+            context.palette.setColor(QPalette.ColorRole.Text, option.palette.color(QPalette.ColorRole.HighlightedText))
+        context.clip = QRect(0, 0, option.rect.width(), option.rect.height())
+        painter.setClipRect(context.clip)
+        self.document(index).documentLayout().draw(painter, context)
+        painter.restore()
+
+    @staticmethod
+    def line_width(length, metrics):
+        """Estimates the width of a line.
+
+        Args:
+            length (int): line's length in characters
+            metrics (QFontMetrics): font metrics
+
+        Returns:
+            int: width in pixels
+        """
+        max_indent = _HIGHLIGHT_WIDTH + 2 + 2 * _INDENT_WIDTH
+        return max_indent + (length + 1) * metrics.averageCharWidth() * 5 // 4
@@ -174,6 +174,12 @@ class SpineDBEditorSettingsMixin:
         snap_entities = self._qsettings.value("appSettings/snapEntities", defaultValue="false")
         merge_dbs = self._qsettings.value("appSettings/mergeDBs", defaultValue="true")
         db_editor_show_undo = int(self._qsettings.value("appSettings/dbEditorShowUndo", defaultValue="2"))
+        columnar_pivot_table = self._qsettings.value("appSettings/columnarPivotTable", defaultValue="false")
+        type_validation_workers = int(self._qsettings.value("appSettings/typeValidationWorkers", defaultValue="0"))
+        persist_type_validation_cache = self._qsettings.value(
+            "appSettings/persistTypeValidationCache", defaultValue="true"
+        )
+        persist_commit_index = self._qsettings.value("appSettings/persistCommitIndex", defaultValue="false")
         max_ent_dim_count = int(self._qsettings.value("appSettings/maxEntityDimensionCount", defaultValue="5"))
         build_iters = int(self._qsettings.value("appSettings/layoutAlgoBuildIterations", defaultValue="12"))
         spread_factor = int(self._qsettings.value("appSettings/layoutAlgoSpreadFactor", defaultValue="100"))
@@ -193,6 +199,10 @@ class SpineDBEditorSettingsMixin:
         self.ui.checkBox_merge_dbs.setChecked(merge_dbs == "true")
         if db_editor_show_undo == 2:
             self.ui.checkBox_db_editor_show_undo.setChecked(True)
+        self.ui.checkBox_columnar_pivot_table.setChecked(columnar_pivot_table == "true")
+        self.ui.spinBox_type_validation_workers.setValue(type_validation_workers)
+        self.ui.checkBox_persist_type_validation_cache.setChecked(persist_type_validation_cache == "true")
+        self.ui.checkBox_persist_commit_index.setChecked(persist_commit_index == "true")
         self.ui.spinBox_max_ent_dim_count.setValue(max_ent_dim_count)
         self.ui.spinBox_layout_algo_max_iterations.setValue(build_iters)
         self.ui.spinBox_layout_algo_spread_factor.setValue(spread_factor)
@@ -220,6 +230,16 @@ class SpineDBEditorSettingsMixin:
         self._qsettings.setValue("appSettings/mergeDBs", merge_dbs)
         db_editor_show_undo = str(self.ui.checkBox_db_editor_show_undo.checkState().value)
         self._qsettings.setValue("appSettings/dbEditorShowUndo", db_editor_show_undo)
+        columnar_pivot_table = "true" if self.ui.checkBox_columnar_pivot_table.checkState().value else "false"
+        self._qsettings.setValue("appSettings/columnarPivotTable", columnar_pivot_table)
+        type_validation_workers = str(self.ui.spinBox_type_validation_workers.value())
+        self._qsettings.setValue("appSettings/typeValidationWorkers", type_validation_workers)
+        persist_type_validation_cache = (
+            "true" if self.ui.checkBox_persist_type_validation_cache.checkState().value else "false"
+        )
+        self._qsettings.setValue("appSettings/persistTypeValidationCache", persist_type_validation_cache)
+        persist_commit_index = "true" if self.ui.checkBox_persist_commit_index.checkState().value else "false"
+        self._qsettings.setValue("appSettings/persistCommitIndex", persist_commit_index)
         max_ent_dim_count = str(self.ui.spinBox_layout_algo_max_iterations.value())
         self._qsettings.setValue("appSettings/maxEntityDimensionCount", max_ent_dim_count)
         build_iters = str(self.ui.spinBox_layout_algo_max_iterations.value())
@@ -0,0 +1,141 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Unit tests for the ``event_log_model`` module."""
+
+import unittest
+from PySide6.QtTest import QAbstractItemModelTester
+from spinetoolbox.mvcmodels.event_log_model import INDENT_ROLE, ITEM_NAME_ROLE, EventLogModel, EventLogSpool
+from tests.mock_helpers import TestCaseWithQApplication
+
+
+class TestEventLogSpool(unittest.TestCase):
+    def test_records_are_read_back_from_disk(self):
+        spool = EventLogSpool()
+        try:
+            ids = [spool.append(record) for record in ("first", "söcönd", "")]
+            self.assertEqual(ids, [0, 1, 2])
+            self.assertEqual(len(spool), 3)
+            spool._read_cache.clear()
+            self.assertEqual([spool.read(record_id) for record_id in ids], ["first", "söcönd", ""])
+        finally:
+            spool.close()
+
+
+class TestEventLogModel(TestCaseWithQApplication):
+    def setUp(self):
+        self._model = EventLogModel()
+        self._tester = QAbstractItemModelTester(self._model, QAbstractItemModelTester.FailureReportingMode.Fatal)
+
+    def tearDown(self):
+        self._model.close()
+        self._model.deleteLater()
+
+    def _rows(self):
+        return [
+            (self._model.index(row, 0).data(), self._model.index(row, 0).data(INDENT_ROLE))
+            for row in range(self._model.rowCount())
+        ]
+
+    def test_item_messages_are_grouped_by_item_and_filter(self):
+        self._model.append("plain 1")
+        self._model.add_message("t1", "A", "", "a1")
+        self._model.add_message("t1", "A", "f1", "f1 1")
+        self._model.add_message("t1", "A", "", "a2")
+        self._model.add_message("t1", "B", "", "b1")
+        self._model.add_message("t1", "A", "f1", "f1 2")
+        self._model.append("plain 2")
+        self.assertEqual(
+            self._rows(),
+            [
+                ("plain 1", 0),
+                ("<b>A</b>", 0),
+                ("a1", 1),
+                ("<b>f1</b>", 1),
+                ("f1 1", 2),
+                ("f1 2", 2),
+                ("a2", 1),
+                ("<b>B</b>", 0),
+                ("b1", 1),
+                ("plain 2", 0),
+            ],
+        )
+        self.assertEqual(self._model.index(5, 0).data(ITEM_NAME_ROLE), "A")
+        self.assertIsNone(self._model.index(9, 0).data(ITEM_NAME_ROLE))
+
+    def test_multiline_messages_are_split_into_lines(self):
+        self._model.append("<span style='color:red;'>first<br/>second\nthird &lt;3</span>")
+        self.assertEqual(
+            self._rows(),
+            [
+                ("<span style='color:red;'>first</span>", 0),
+                ("<span style='color:red;'>second</span>", 0),
+                ("<span style='color:red;'>third &lt;3</span>", 0),
+            ],
+        )
+        self.assertEqual(self._model.max_line_length, len("third <3"))
+
+    def test_switching_executions_shows_only_their_lines(self):
+        self._model.add_message("t1", "A", "", "t1 a")
+        self._model.append("plain")
+        self._model.add_message("t2", "A", "", "t2 a")
+        self.assertEqual(self._model.execution_timestamps(), ["t1", "t2"])
+        self._model.set_visible_timestamp("t2")
+        self.assertEqual(self._rows(), [("plain", 0), ("<b>A</b>", 0), ("t2 a", 1)])
+        self.assertEqual(self._model.item_title_row("t2", "A"), 1)
+        self.assertIsNone(self._model.item_title_row("t1", "A"))
+        self._model.add_message("t1", "A", "filter", "hidden")
+        self.assertEqual(self._model.rowCount(), 3)
+        self._model.set_visible_timestamp(None)
+        self.assertEqual(
+            self._rows(),
+            [
+                ("<b>A</b>", 0),
+                ("t1 a", 1),
+                ("<b>filter</b>", 1),
+                ("hidden", 2),
+                ("plain", 0),
+                ("<b>A</b>", 0),
+                ("t2 a", 1),
+            ],
+        )
+
+    def test_lines_added_to_earlier_items_move_later_items_down(self):
+        self._model.add_message("t1", "A", "", "a1")
+        self._model.add_message("t1", "B", "", "b1")
+        self.assertEqual(self._model.item_title_row("t1", "B"), 2)
+        self._model.add_message("t1", "A", "", "a2\na3")
+        self.assertEqual(self._model.item_title_row("t1", "B"), 4)
+        self._model.add_message("t1", "A", "f1", "f1 1")
+        self.assertEqual(self._model.item_title_row("t1", "B"), 6)
+        self.assertEqual(self._model.rowCount(), 8)
+        self.assertEqual(self._model.index(7, 0).data(), "b1")
+
+    def test_messages_added_after_closing_are_discarded(self):
+        self._model.append("before")
+        self._model.close()
+        self._model.append("after")
+        self._model.add_message("t1", "A", "", "a")
+        self.assertEqual(self._model.rowCount(), 1)
+
+    def test_clear_removes_all_lines(self):
+        self._model.add_message("t1", "A", "", "a")
+        self._model.append("plain")
+        self._model.clear()
+        self.assertEqual(self._model.rowCount(), 0)
+        self.assertEqual(self._model.execution_timestamps(), [])
+        self._model.append("new")
+        self.assertEqual(self._rows(), [("new", 0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
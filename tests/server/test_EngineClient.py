@@ -12,8 +12,10 @@
 
 """Contains tests for the EngineClient class."""
 
+import json
 import os
 from pathlib import Path
+import queue
 from tempfile import TemporaryDirectory
 import time
 import unittest
@@ -22,7 +24,14 @@ import zmq
 from spine_engine.exception import RemoteEngineInitFailed
 from spine_engine.execution_managers.persistent_execution_manager import PythonPersistentExecutionManager
 from spine_engine.server.engine_server import EngineServer, ServerSecurityModel
-from spinetoolbox.server.engine_client import ClientSecurityModel, EngineClient
+from spine_engine.server.util.server_message import ServerMessage
+from spinetoolbox.server.engine_client import (
+    ClientSecurityModel,
+    EngineClient,
+    IncrementalUploadNotSupported,
+    _server_capabilities,
+)
+from spinetoolbox.server.project_manifest import file_digest
 from tests.mock_helpers import TestCaseWithQApplication, clean_up_toolbox, create_toolboxui_with_project
 
 client_sec_dir = os.path.join(str(Path(__file__).parent), "client_secfolder")
@@ -82,9 +91,9 @@ class TestEngineClient(TestCaseWithQApplication):
         client1 = EngineClient("localhost", 5601, ClientSecurityModel.NONE, "", ping=False)
         client2 = EngineClient("localhost", 5601, ClientSecurityModel.NONE, "", ping=False)
         client3 = EngineClient("localhost", 5601, ClientSecurityModel.NONE, "", ping=False)
-        client1._check_connectivity(1000)
-        client2._check_connectivity(1000)
-        client3._check_connectivity(1000)
+        client1.check_connectivity(1000)
+        client2.check_connectivity(1000)
+        client3.check_connectivity(1000)
         self.assertFalse(client1.dealer_socket.closed)
         self.assertFalse(client1.pull_socket.closed)
         self.assertFalse(client2.dealer_socket.closed)
@@ -155,6 +164,136 @@ class TestEngineClient(TestCaseWithQApplication):
         self.assertTrue(len(job_id) == 32)
         client.close()
 
+    def test_server_without_capabilities_does_not_support_incremental_upload(self):
+        client = EngineClient("localhost", 5601, ClientSecurityModel.NONE, "")
+        self.assertFalse(client.supports_incremental_upload())
+        client.close()
+
+    def test_sync_project_raises_when_server_does_not_support_incremental_upload(self):
+        client = EngineClient("localhost", 5601, ClientSecurityModel.NONE, "")
+        with self.assertRaises(IncrementalUploadNotSupported):
+            client.sync_project("Hello World", self._temp_dir.name, {})
+        client.close()
+
+    def test_sync_project_sends_only_missing_files_in_chunks(self):
+        project_dir = Path(self._temp_dir.name, "sync_project")
+        project_dir.mkdir()
+        Path(project_dir, "unchanged.txt").write_bytes(b"old")
+        Path(project_dir, "data").mkdir()
+        Path(project_dir, "data", "changed.txt").write_bytes(b"0123456789")
+        client = EngineClient("localhost", 5601, ClientSecurityModel.NONE, "")
+        sent = []
+        replies = [
+            ServerMessage("sync_project", "job", '{"missing": ["data/changed.txt"]}').to_bytes(),
+            ServerMessage("upload_file_chunk", "job", "").to_bytes(),
+            ServerMessage("upload_file_chunk", "job", "").to_bytes(),
+            ServerMessage("upload_file_chunk", "job", "").to_bytes(),
+            ServerMessage("finish_sync", "job", "").to_bytes(),
+        ]
+        with mock.patch.object(client, "dealer_socket") as dealer_socket:
+            dealer_socket.send_multipart.side_effect = sent.append
+            dealer_socket.recv_multipart.side_effect = [[b"", reply] for reply in replies]
+            job_id = client.sync_project("sync_project", str(project_dir), {"manifest": "is sent as is"}, chunk_size=4)
+        self.assertEqual(job_id, "job")
+        commands = [ServerMessage.parse(frames[0]) for frames in sent]
+        self.assertEqual(
+            [command.getCommand() for command in commands],
+            ["sync_project", "upload_file_chunk", "upload_file_chunk", "upload_file_chunk", "finish_sync"],
+        )
+        self.assertEqual(
+            commands[0].getData(), {"project_dir_name": "sync_project", "manifest": {"manifest": "is sent as is"}}
+        )
+        self.assertEqual(
+            [command.getData() for command in commands[1:4]],
+            [
+                {"path": "data/changed.txt", "offset": 0, "final": False},
+                {"path": "data/changed.txt", "offset": 4, "final": False},
+                {"path": "data/changed.txt", "offset": 8, "final": True},
+            ],
+        )
+        self.assertEqual([frames[1] for frames in sent[1:4]], [b"0123", b"4567", b"89"])
+        client.close()
+
+    def test_download_files_writes_chunked_file_through_partial_file(self):
+        client = EngineClient("localhost", 5601, ClientSecurityModel.NONE, "")
+        client.client_project_dir = self._temp_dir.name
+        data = b"0123456789"
+        digest = _digest(data)
+        frames = [
+            [b"incoming_file", b"output/result.sqlite"],
+            _chunk_frame("output/result.sqlite", 0, data[:4], len(data)),
+            _chunk_frame("output/result.sqlite", 4, data[4:8], len(data)),
+            _chunk_frame("output/result.sqlite", 8, data[8:], len(data), digest),
+            [b"END"],
+        ]
+        q = queue.Queue()
+        with mock.patch.object(client, "rcv_next", side_effect=frames):
+            client.download_files(q)
+        result_path = Path(self._temp_dir.name, "output", "result.sqlite")
+        self.assertEqual(result_path.read_bytes(), data)
+        self.assertFalse(Path(self._temp_dir.name, "output", "result.sqlite.part").exists())
+        messages = []
+        while not q.empty():
+            messages.append(q.get()[1]["msg_type"])
+        self.assertEqual(messages, ["warning", "neutral", "neutral"])
+        client.close()
+
+    def test_download_files_overwrites_stale_partial_file(self):
+        client = EngineClient("localhost", 5601, ClientSecurityModel.NONE, "")
+        client.client_project_dir = self._temp_dir.name
+        data = b"0123456789"
+        Path(self._temp_dir.name, "result.dat.part").write_bytes(b"stale data from earlier")
+        frames = [_chunk_frame("result.dat", 0, data, len(data), _digest(data)), [b"END"]]
+        with mock.patch.object(client, "rcv_next", side_effect=frames):
+            client.download_files(queue.Queue())
+        self.assertEqual(Path(self._temp_dir.name, "result.dat").read_bytes(), data)
+        self.assertFalse(Path(self._temp_dir.name, "result.dat.part").exists())
+        client.close()
+
+    def test_download_files_removes_partial_file_of_interrupted_transfer(self):
+        client = EngineClient("localhost", 5601, ClientSecurityModel.NONE, "")
+        client.client_project_dir = self._temp_dir.name
+        data = b"0123456789"
+        frames = [_chunk_frame("result.dat", 0, data[:4], len(data)), [b"END"]]
+        with mock.patch.object(client, "rcv_next", side_effect=frames):
+            client.download_files(queue.Queue())
+        self.assertFalse(Path(self._temp_dir.name, "result.dat").exists())
+        self.assertFalse(Path(self._temp_dir.name, "result.dat.part").exists())
+        client.close()
+
+    def test_download_files_rejects_file_with_wrong_checksum(self):
+        client = EngineClient("localhost", 5601, ClientSecurityModel.NONE, "")
+        client.client_project_dir = self._temp_dir.name
+        frames = [_chunk_frame("result.dat", 0, b"corrupted", 9, _digest(b"original")), [b"END"]]
+        q = queue.Queue()
+        with mock.patch.object(client, "rcv_next", side_effect=frames):
+            client.download_files(q)
+        self.assertEqual(q.get()[1]["msg_type"], "fail")
+        self.assertFalse(Path(self._temp_dir.name, "result.dat").exists())
+        self.assertFalse(Path(self._temp_dir.name, "result.dat.part").exists())
+        client.close()
+
+    def test_download_files_rejects_transfer_that_does_not_start_from_beginning(self):
+        client = EngineClient("localhost", 5601, ClientSecurityModel.NONE, "")
+        client.client_project_dir = self._temp_dir.name
+        data = b"0123456789"
+        frames = [
+            _chunk_frame("result.dat", 4, data[4:8], len(data)),
+            _chunk_frame("result.dat", 8, data[8:], len(data), _digest(data)),
+            _chunk_frame("result.dat", 0, data[:5], len(data)),
+            _chunk_frame("result.dat", 5, data[5:], len(data), _digest(data)),
+            [b"END"],
+        ]
+        q = queue.Queue()
+        with mock.patch.object(client, "rcv_next", side_effect=frames):
+            client.download_files(q)
+        message = q.get()[1]
+        self.assertEqual(message["msg_type"], "fail")
+        self.assertIn("did not start from the beginning", message["text"])
+        self.assertEqual(q.get()[1]["msg_type"], "neutral")
+        self.assertEqual(Path(self._temp_dir.name, "result.dat").read_bytes(), data)
+        client.close()
+
     def test_remove_project_from_server(self):
         project_zip_fpath = os.path.join(str(Path(__file__).parent), "helloworld.zip")
         client = EngineClient("localhost", 5601, ClientSecurityModel.NONE, "")
@@ -181,3 +320,26 @@ class TestEngineClient(TestCaseWithQApplication):
             elapsed_t3 = client.get_elapsed_time()
             mock_t.assert_called()
             self.assertEqual("16 min 40.0 s", elapsed_t3)
+
+
+class TestServerCapabilities(unittest.TestCase):
+    def test_capabilities_are_read_from_ping_data(self):
+        self.assertEqual(_server_capabilities({"capabilities": ["sync_project", 2]}), frozenset(["sync_project"]))
+
+    def test_ping_without_capabilities(self):
+        self.assertEqual(_server_capabilities(""), frozenset())
+        self.assertEqual(_server_capabilities({"capabilities": "sync_project"}), frozenset())
+
+
+def _digest(data):
+    with TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir, "data")
+        path.write_bytes(data)
+        return file_digest(str(path))
+
+
+def _chunk_frame(path, offset, chunk, size, digest=None):
+    header = {"path": path, "offset": offset, "size": size, "final": digest is not None}
+    if digest is not None:
+        header["digest"] = digest
+    return [b"file_chunk", json.dumps(header).encode("utf-8"), chunk]
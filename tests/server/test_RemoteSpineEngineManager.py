@@ -17,6 +17,8 @@ from unittest import mock
 from spine_engine import ItemExecutionFinishState
 from spine_engine.server.util.event_data_converter import EventDataConverter
 from spine_engine.utils.helpers import ExecutionDirection
+from spinetoolbox.server.engine_client import ClientSecurityModel, EngineClient
+from spinetoolbox.server.engine_client_pool import EngineClientPool
 from spinetoolbox.spine_engine_manager import RemoteSpineEngineManager
 
 
@@ -48,11 +50,34 @@ class TestRemoteSpineEngineManager(unittest.TestCase):
         }
         self._run_engine(attribs)
 
+    def test_clean_up_returns_client_to_pool(self):
+        pool = EngineClientPool()
+        client = mock.create_autospec(EngineClient, instance=True)
+        client.configure_mock(host="", port="49152", sec_model=ClientSecurityModel.NONE, sec_folder="")
+        client.start_execution.return_value = ("remote_execution_started", "12345", "abcdefg123")
+        client.rcv_next.side_effect = self.yield_events_dag_succeeds()
+        client.get_elapsed_time.return_value = "1 s"
+        remote_engine_mngr = RemoteSpineEngineManager()
+        with (
+            mock.patch("spinetoolbox.spine_engine_manager.engine_client_pool", pool),
+            mock.patch("spinetoolbox.server.engine_client_pool.EngineClient", return_value=client),
+        ):
+            remote_engine_mngr.run_engine({"settings": {}, "project_dir": ""})
+            while remote_engine_mngr.get_engine_event()[0] != "dag_exec_finished":
+                pass
+            remote_engine_mngr.clean_up()
+        self.assertIsNone(remote_engine_mngr.engine_client)
+        client.reset.assert_called_once()
+        self.assertEqual(pool.idle_client_count(), 1)
+
     def _run_engine(self, attribs):
         remote_engine_mngr = RemoteSpineEngineManager()
         engine_data = {"settings": {}, "project_dir": ""}
         # NOTE: This patch does not work without spec=True
-        with mock.patch("spinetoolbox.spine_engine_manager.EngineClient", **attribs, spec=True) as mock_client:
+        with (
+            mock.patch("spinetoolbox.spine_engine_manager.engine_client_pool", EngineClientPool()),
+            mock.patch("spinetoolbox.server.engine_client_pool.EngineClient", **attribs, spec=True) as mock_client,
+        ):
             remote_engine_mngr.run_engine(engine_data)
             remote_engine_mngr.stop_engine()
             mock_client.assert_called()
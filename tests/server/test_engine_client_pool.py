@@ -0,0 +1,113 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Unit tests for the ``engine_client_pool`` module."""
+
+import unittest
+from unittest import mock
+from spine_engine.exception import RemoteEngineInitFailed
+from spine_engine.server.engine_server import EngineServer, ServerSecurityModel
+from spinetoolbox.server.engine_client import ClientSecurityModel
+from spinetoolbox.server.engine_client_pool import MAX_IDLE_CLIENTS, EngineClientPool
+
+
+def _fake_client(host, port, sec_model, sec_folder):
+    return mock.MagicMock(host=host, port=port, sec_model=sec_model, sec_folder=sec_folder)
+
+
+class TestEngineClientPool(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch("spinetoolbox.server.engine_client_pool.EngineClient", side_effect=_fake_client)
+        self._client_class = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_released_client_is_reused(self):
+        pool = EngineClientPool()
+        client = pool.acquire("localhost", 5601, ClientSecurityModel.NONE, "")
+        pool.release(client)
+        client.reset.assert_called_once()
+        self.assertEqual(pool.idle_client_count(), 1)
+        self.assertIs(pool.acquire("localhost", "5601", ClientSecurityModel.NONE, ""), client)
+        self._client_class.assert_called_once()
+        client.check_connectivity.assert_not_called()
+        client.set_start_time.assert_called_once()
+        self.assertEqual(pool.idle_client_count(), 0)
+
+    def test_checked_out_client_is_not_shared(self):
+        pool = EngineClientPool()
+        client1 = pool.acquire("localhost", 5601, ClientSecurityModel.NONE, "")
+        client2 = pool.acquire("localhost", 5601, ClientSecurityModel.NONE, "")
+        self.assertIsNot(client1, client2)
+
+    def test_clients_are_pooled_by_server_and_security_settings(self):
+        pool = EngineClientPool()
+        client = pool.acquire("localhost", 5601, ClientSecurityModel.NONE, "")
+        pool.release(client)
+        self.assertIsNot(pool.acquire("localhost", 5602, ClientSecurityModel.NONE, ""), client)
+        self.assertIsNot(pool.acquire("localhost", 5601, ClientSecurityModel.STONEHOUSE, "keys"), client)
+        self.assertEqual(pool.idle_client_count(), 1)
+
+    def test_stale_client_is_health_checked_and_dropped_if_server_does_not_respond(self):
+        pool = EngineClientPool(health_check_interval=-1.0)
+        client = pool.acquire("localhost", 5601, ClientSecurityModel.NONE, "")
+        pool.release(client)
+        client.check_connectivity.side_effect = RemoteEngineInitFailed("timeout")
+        new_client = pool.acquire("localhost", 5601, ClientSecurityModel.NONE, "")
+        self.assertIsNot(new_client, client)
+        client.close.assert_called_once()
+
+    def test_stale_client_that_responds_is_reused(self):
+        pool = EngineClientPool(health_check_interval=-1.0)
+        client = pool.acquire("localhost", 5601, ClientSecurityModel.NONE, "")
+        pool.release(client)
+        self.assertIs(pool.acquire("localhost", 5601, ClientSecurityModel.NONE, ""), client)
+        client.check_connectivity.assert_called_once()
+
+    def test_excess_idle_clients_are_closed(self):
+        pool = EngineClientPool()
+        clients = [pool.acquire("localhost", 5601, ClientSecurityModel.NONE, "") for _ in range(MAX_IDLE_CLIENTS + 1)]
+        for client in clients:
+            pool.release(client)
+        self.assertEqual(pool.idle_client_count(), MAX_IDLE_CLIENTS)
+        clients[-1].close.assert_called_once()
+
+    def test_close_all_closes_idle_clients(self):
+        pool = EngineClientPool()
+        client = pool.acquire("localhost", 5601, ClientSecurityModel.NONE, "")
+        pool.release(client)
+        pool.close_all()
+        client.close.assert_called_once()
+        self.assertEqual(pool.idle_client_count(), 0)
+
+
+class TestEngineClientPoolWithServer(unittest.TestCase):
+    def setUp(self):
+        self._server = EngineServer("tcp", 5603, ServerSecurityModel.NONE, "")
+        self._pool = EngineClientPool(health_check_interval=-1.0)
+
+    def tearDown(self):
+        self._pool.close_all()
+        self._server.close()
+
+    def test_reused_client_stays_connected(self):
+        client = self._pool.acquire("localhost", 5603, ClientSecurityModel.NONE, "")
+        client.connect_pull_socket("5604")
+        self._pool.release(client)
+        self.assertFalse(client.dealer_socket.closed)
+        reused_client = self._pool.acquire("localhost", 5603, ClientSecurityModel.NONE, "")
+        self.assertIs(reused_client, client)
+        reused_client.check_connectivity(1000)
+        self._pool.release(reused_client)
+
+
+if __name__ == "__main__":
+    unittest.main()
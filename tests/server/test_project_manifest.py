@@ -0,0 +1,73 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Unit tests for the ``project_manifest`` module."""
+
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+from unittest import mock
+from spinetoolbox.server import project_manifest
+from spinetoolbox.server.project_manifest import file_digest, make_manifest, read_file_chunks
+
+
+class TestMakeManifest(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = TemporaryDirectory()
+        self._project_dir = Path(self._temp_dir.name, "project")
+        self._project_dir.mkdir()
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_manifest_contains_all_files_with_relative_paths(self):
+        Path(self._project_dir, "a.txt").write_bytes(b"a")
+        Path(self._project_dir, "sub").mkdir()
+        Path(self._project_dir, "sub", "b.txt").write_bytes(b"bb")
+        manifest = make_manifest(str(self._project_dir))
+        self.assertEqual(
+            manifest,
+            {
+                "a.txt": {"digest": file_digest(str(Path(self._project_dir, "a.txt"))), "size": 1},
+                "sub/b.txt": {"digest": file_digest(str(Path(self._project_dir, "sub", "b.txt"))), "size": 2},
+            },
+        )
+        self.assertNotEqual(manifest["a.txt"]["digest"], manifest["sub/b.txt"]["digest"])
+
+    def test_cached_digests_are_reused_for_unchanged_files(self):
+        cache_path = str(Path(self._project_dir, ".spinetoolbox", "local", "manifest.json"))
+        unchanged = Path(self._project_dir, "unchanged.txt")
+        unchanged.write_bytes(b"same")
+        changed = Path(self._project_dir, "changed.txt")
+        changed.write_bytes(b"before")
+        first_manifest = make_manifest(str(self._project_dir), cache_path)
+        self.assertTrue(os.path.exists(cache_path))
+        self.assertNotIn(".spinetoolbox/local/manifest.json", first_manifest)
+        changed.write_bytes(b"after and longer")
+        with mock.patch.object(project_manifest, "file_digest", wraps=file_digest) as digest_function:
+            second_manifest = make_manifest(str(self._project_dir), cache_path)
+            digest_function.assert_called_once_with(str(changed))
+        self.assertEqual(second_manifest["unchanged.txt"], first_manifest["unchanged.txt"])
+        self.assertEqual(second_manifest["changed.txt"]["digest"], file_digest(str(changed)))
+
+
+class TestReadFileChunks(unittest.TestCase):
+    def test_file_is_split_into_chunks(self):
+        with TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir, "file.bin")
+            path.write_bytes(b"abcdefg")
+            self.assertEqual(list(read_file_chunks(str(path), 3)), [b"abc", b"def", b"g"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -286,3 +286,54 @@ class TestPivotModel(unittest.TestCase):
         self.assertEqual(model.frozen_value, (1,))
         self.assertEqual(model._row_data_header, [("a",), ("b",), ("c",)])
         self.assertEqual(model._column_data_header, [("aa",), ("cc",)])
+
+    def test_add_to_model_inserts_new_headers_in_sorted_order(self):
+        model = PivotModel()
+        model.reset_model({("b", "bb", 1): 1.0}, INDEX_IDS)
+        model.set_pivot(["test1"], ["test2"], ["test3"], (1,))
+        added = model.add_to_model({("c", "cc", 1): 2.0, ("a", "bb", 1): 3.0, ("a", "aa", 2): 4.0})
+        self.assertEqual(added, (2, 1))
+        self.assertEqual(model._row_data_header, [("a",), ("b",), ("c",)])
+        self.assertEqual(model._column_data_header, [("bb",), ("cc",)])
+        self.assertEqual(model.index_values["test1"], {"a": 2, "b": 1, "c": 1})
+        self.assertTrue(model.has_frozen_value((2,)))
+
+    def test_headers_are_kept_until_last_referring_key_is_removed(self):
+        model = PivotModel()
+        model.reset_model(dict(DATA), INDEX_IDS)
+        model.set_pivot(["test1"], ["test2", "test3"], [], ())
+        self.assertEqual(model.remove_from_model({("a", "aa", 1): None}), (0, 1))
+        self.assertEqual(model._row_data_header, [("a",), ("b",), ("c",), ("d",), ("e",)])
+        self.assertEqual(model.remove_from_model({("a", "bb", 2): None}), (1, 1))
+        self.assertEqual(model._row_data_header, [("b",), ("c",), ("d",), ("e",)])
+        self.assertNotIn("a", model.index_values["test1"])
+
+    def test_large_chunks_match_full_rebuild(self):
+        data = {(f"e{i % 97}", f"p{i % 13}", i % 5): float(i) for i in range(1000)}
+        model = PivotModel()
+        model.reset_model({}, INDEX_IDS)
+        model.set_pivot(["test1"], ["test2"], ["test3"], (0,))
+        keys = list(data)
+        for start in range(0, len(keys), 300):
+            model.add_to_model({key: data[key] for key in keys[start : start + 300]})
+        self.assertEqual(model._row_data_header, model._get_unique_index_values(("test1",)))
+        self.assertEqual(model._column_data_header, model._get_unique_index_values(("test2",)))
+        model.remove_from_model({key: None for key in keys[::3]})
+        self.assertEqual(model._row_data_header, model._get_unique_index_values(("test1",)))
+        self.assertEqual(model._column_data_header, model._get_unique_index_values(("test2",)))
+        model.remove_from_model({key: None for key in keys if key[2] == 4})
+        self.assertFalse(model.has_frozen_value((4,)))
+        self.assertTrue(model.has_frozen_value((3,)))
+
+    def test_interleaved_bulk_additions_and_removals_keep_headers_sorted(self):
+        data = {(f"e{(i * 37) % 1000:03}", f"p{i % 7}", i % 2): float(i) for i in range(1000)}
+        model = PivotModel()
+        model.reset_model({}, INDEX_IDS)
+        model.set_pivot(["test1"], ["test2"], ["test3"], (0,))
+        keys = list(data)
+        for start in range(0, len(keys), 200):
+            model.add_to_model({key: data[key] for key in keys[start : start + 200]})
+            self.assertEqual(model._row_data_header, model._get_unique_index_values(("test1",)))
+        model.remove_from_model({key: None for key in keys[::2]})
+        self.assertEqual(model._row_data_header, model._get_unique_index_values(("test1",)))
+        self.assertEqual(model._row_header._sort_keys, [[value[0]] for value in model._row_data_header])
@@ -0,0 +1,85 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+"""Unit tests for the ``auto_filter_index`` module."""
+
+import unittest
+from spinetoolbox.spine_db_editor.mvcmodels.auto_filter_index import AutoFilterIndex, ColumnValueCounts
+
+
+class TestAutoFilterIndex(unittest.TestCase):
+    def setUp(self):
+        self._items = {
+            1: {"class": "A", "name": "x"},
+            2: {"class": "A", "name": "y"},
+            3: {"class": "B", "name": "x"},
+        }
+        self._lookups = 0
+        self._index = AutoFilterIndex(self._field_value)
+
+    def _field_value(self, item_id, field):
+        self._lookups += 1
+        return self._items[item_id][field]
+
+    def test_combined_filters_intersect(self):
+        auto_filter = {"class": {"A"}, "name": {"x", "z"}}
+        self.assertEqual(self._index.accepted_ids(self._items.keys(), auto_filter), {1})
+        self.assertEqual(self._lookups, 6)
+        self._index.invalidate_filter()
+        auto_filter["class"] = {"A", "B"}
+        self.assertEqual(self._index.accepted_ids(self._items.keys(), auto_filter), {1, 3})
+        self.assertEqual(self._lookups, 6)
+
+    def test_added_updated_and_removed_items_are_tracked(self):
+        auto_filter = {"name": {"x"}}
+        self.assertEqual(self._index.accepted_ids(self._items.keys(), auto_filter), {1, 3})
+        self._items[4] = {"class": "B", "name": "x"}
+        self._index.add([4], auto_filter)
+        self.assertEqual(self._index.accepted_ids(self._items.keys(), auto_filter), {1, 3, 4})
+        self._items[1]["name"] = "y"
+        self._index.update([1], auto_filter)
+        self.assertEqual(self._index.accepted_ids(self._items.keys(), auto_filter), {3, 4})
+        del self._items[3]
+        self._index.remove([3])
+        self.assertEqual(self._index.accepted_ids(self._items.keys(), auto_filter), {4})
+        self._index.invalidate_filter()
+        self.assertEqual(self._index.accepted_ids(self._items.keys(), auto_filter), {4})
+
+    def test_clear_rebuilds_indexes_on_demand(self):
+        auto_filter = {"class": {"B"}}
+        self.assertEqual(self._index.accepted_ids(self._items.keys(), auto_filter), {3})
+        self._items[3]["class"] = "A"
+        self._index.clear()
+        self.assertEqual(self._index.accepted_ids(self._items.keys(), auto_filter), set())
+
+
+class TestColumnValueCounts(unittest.TestCase):
+    def test_counts_follow_inserted_invalidated_and_removed_items(self):
+        counts = ColumnValueCounts()
+        counts.invalidate([1, 2, 3])
+        self.assertEqual(counts.stale_ids(), {1, 2, 3})
+        counts.insert(1, "x", ("x",))
+        counts.insert(2, "x", ("x",))
+        counts.insert(3, "y", ("y",))
+        self.assertEqual(counts.stale_ids(), set())
+        self.assertEqual(counts.counts(), {"x": 2, "y": 1})
+        self.assertEqual(counts.edit_data(), {"x": ("x",), "y": ("y",)})
+        self.assertEqual(counts.value(3), ("y", ("y",)))
+        counts.invalidate([3])
+        self.assertEqual(counts.counts(), {"x": 2})
+        self.assertEqual(counts.edit_data(), {"x": ("x",)})
+        counts.insert(3, "x", ("x",))
+        counts.remove([1, 2])
+        self.assertEqual(counts.counts(), {"x": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
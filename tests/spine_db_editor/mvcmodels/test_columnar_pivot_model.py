@@ -0,0 +1,159 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Unit tests for the ``columnar_pivot_model`` module."""
+
+import unittest
+from unittest import mock
+from spinetoolbox.spine_db_editor.mvcmodels.columnar_pivot_model import ColumnarPivotData, ColumnarPivotModel
+from spinetoolbox.spine_db_editor.mvcmodels.pivot_model import PivotModel
+
+
+class _Header:
+    @staticmethod
+    def accepts(header_id):
+        return True
+
+    def header_data(self, header_id):
+        return str(header_id)
+
+
+class _OddRejectingHeader:
+    @staticmethod
+    def accepts(header_id):
+        return not header_id.endswith(("1", "3"))
+
+    def header_data(self, header_id):
+        return header_id[::-1]
+
+
+INDEX_IDS = {"entity": _Header(), "parameter": _Header(), "alternative": _Header()}
+
+
+def _make_data(count):
+    return {(f"e{i % 31}", f"p{i % 7}", f"alt{i % 3}"): float(i) for i in range(count)}
+
+
+class TestColumnarPivotData(unittest.TestCase):
+    def test_behaves_like_dict(self):
+        data = ColumnarPivotData(2)
+        data[("a", 1)] = 1.0
+        data.update({("b", 2): 2.0, ("a", 1): 3.0})
+        self.assertEqual(len(data), 2)
+        self.assertEqual(data[("a", 1)], 3.0)
+        self.assertIn(("b", 2), data)
+        self.assertNotIn(("b", 1), data)
+        self.assertNotIn(("c", 1), data)
+        self.assertEqual(dict(data), {("a", 1): 3.0, ("b", 2): 2.0})
+        del data[("a", 1)]
+        self.assertEqual(list(data), [("b", 2)])
+        with self.assertRaises(KeyError):
+            data[("a", 1)]
+
+    def test_keys_survive_code_width_growth_and_compaction(self):
+        data = ColumnarPivotData(2)
+        for i in range(5000):
+            data[(i, ("x", i))] = i
+        for i in range(0, 5000, 3):
+            del data[(i, ("x", i))]
+        data.update({(i, ("x", i)): -i for i in range(4000, 6000)})
+        expected = {(i, ("x", i)): i for i in range(4000) if i % 3}
+        expected.update({(i, ("x", i)): -i for i in range(4000, 6000)})
+        self.assertEqual(dict(data), expected)
+
+    def test_composite_keys_fall_back_to_python_integers_when_int64_overflows(self):
+        data = ColumnarPivotData(4)
+        items = {(i, -i, str(i), (i,)): i for i in range(70000)}
+        data.update(items)
+        self.assertEqual(data[(65536, -65536, "65536", (65536,))], 65536)
+        self.assertEqual(len(data), len(items))
+
+    def test_value_counts(self):
+        data = ColumnarPivotData(2)
+        data.update({("a", 1): None, ("a", 2): None, ("b", 1): None})
+        self.assertEqual(data.value_counts((0,)), {("a",): 2, ("b",): 1})
+        self.assertEqual(data.value_counts((0,), (1,), (1,)), {("a",): 1, ("b",): 1})
+        self.assertEqual(data.value_counts((0,), (1,), (3,)), {})
+
+    def test_batched_membership_and_deletion(self):
+        data = ColumnarPivotData(2)
+        data.update({("a", 1): 1.0, ("a", 2): 2.0, ("b", 1): 3.0})
+        keys = [("a", 2), ("c", 1), ("b", 1), ("b", 2), ("a",)]
+        self.assertEqual(data.contains_many(keys).tolist(), [True, False, True, False, False])
+        data.delete_many(keys)
+        self.assertEqual(dict(data), {("a", 1): 1.0})
+        self.assertEqual(data.contains_many(keys).tolist(), [False, False, False, False, False])
+
+    def test_first_key(self):
+        data = ColumnarPivotData(2)
+        self.assertIsNone(data.first_key())
+        data.update({("a", 1): 1.0, ("b", 2): 2.0})
+        self.assertEqual(data.first_key(), ("a", 1))
+        del data[("a", 1)]
+        self.assertEqual(data.first_key(), ("b", 2))
+        del data[("b", 2)]
+        self.assertIsNone(data.first_key())
+
+
+class TestColumnarPivotModel(unittest.TestCase):
+    def _assert_models_equal(self, model, reference):
+        self.assertEqual(model.rows, reference.rows)
+        self.assertEqual(model.columns, reference.columns)
+        self.assertEqual(dict(model._data), dict(reference._data))
+        self.assertEqual(model.index_values, reference.index_values)
+        rows = range(len(reference.rows)) if reference.rows else [0]
+        columns = range(len(reference.columns)) if reference.columns else [0]
+        self.assertEqual(model.get_pivoted_data(rows, columns), reference.get_pivoted_data(rows, columns))
+
+    def test_matches_dict_backed_model(self):
+        data = _make_data(500)
+        model = ColumnarPivotModel()
+        reference = PivotModel()
+        for pivot_model in (model, reference):
+            pivot_model.reset_model(dict(data), INDEX_IDS, ("entity",), ("parameter",), ("alternative",), ("alt1",))
+        self._assert_models_equal(model, reference)
+        removed = {key: None for key in list(data)[::4]}
+        added = {("new", "p0", "alt1"): 1.0, ("e0", "new", "alt2"): 2.0}
+        self.assertEqual(model.remove_from_model(removed), reference.remove_from_model(removed))
+        self.assertEqual(model.add_to_model(added), reference.add_to_model(added))
+        self._assert_models_equal(model, reference)
+        for pivot_model in (model, reference):
+            pivot_model.set_pivot(("alternative", "parameter"), (), ("entity",), ("e3",))
+        self._assert_models_equal(model, reference)
+
+    def test_headers_match_dict_backed_model_when_values_are_rejected(self):
+        headers = {"entity": _OddRejectingHeader(), "parameter": _Header(), "alternative": _Header()}
+        data = {(f"e{i % 17}", f"p{i % 5}", f"alt{i % 2}"): float(i) for i in range(300)}
+        model = ColumnarPivotModel()
+        reference = PivotModel()
+        for pivot_model in (model, reference):
+            pivot_model.reset_model(dict(data), headers, ("entity", "parameter"), ("alternative",), (), ())
+        self._assert_models_equal(model, reference)
+        for pivot_model in (model, reference):
+            pivot_model.set_pivot(("parameter",), ("entity",), ("alternative",), ("alt0",))
+        self._assert_models_equal(model, reference)
+
+    def test_adding_data_does_not_iterate_over_existing_keys(self):
+        model = ColumnarPivotModel()
+        model.reset_model(_make_data(100), INDEX_IDS, ("entity",), ("parameter", "alternative"), (), ())
+        with mock.patch.object(ColumnarPivotData, "__iter__", side_effect=AssertionError("full iteration")):
+            self.assertEqual(model.add_to_model({("new", "p0", "alt0"): 1.0}), (1, 0))
+            self.assertEqual(model.remove_from_model({("new", "p0", "alt0"): None}), (1, 0))
+
+    def test_all_indexes_frozen(self):
+        model = ColumnarPivotModel()
+        model.reset_model({("a", "b", "c"): 2.3}, INDEX_IDS, (), (), tuple(INDEX_IDS), ("a", "b", "c"))
+        self.assertEqual(model.get_pivoted_data([0], [0]), [[2.3]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -27,6 +27,7 @@ from spinetoolbox.spine_db_editor.mvcmodels.compound_models import (
     CompoundParameterDefinitionModel,
     CompoundParameterValueModel,
 )
+from spinetoolbox.spine_db_editor.mvcmodels.utils import ENTITY_FIELD_MAP, field_index
 from tests.mock_helpers import assert_table_model_data, assert_table_model_data_pytest, fetch_model
 from ..helpers import TestBase
 
@@ -111,7 +112,7 @@ class TestCompoundParameterDefinitionModel:
             assert waiter.args == ([ValidationKey("parameter_definition", id(db_map), weight["id"].private_id)], [True])
         expected = [["Widget", "weight", None, None, "a lot", None, None, db_name]]
         assert_table_model_data_pytest(model, expected)
-        while db_mngr.parameter_type_validator._sent_task_count != 0:
+        while db_mngr.parameter_type_validator.pending_task_count != 0:
             QApplication.processEvents()
         with signal_waiter(db_mngr.parameter_type_validator.validated, timeout=5.0) as waiter:
             model.setData(model.index(0, 2), ("float",), Qt.ItemDataRole.EditRole)
@@ -122,7 +123,7 @@ class TestCompoundParameterDefinitionModel:
                 [ValidationKey("parameter_definition", id(db_map), weight["id"].private_id)],
                 [False],
             )
-        while db_mngr.parameter_type_validator._sent_task_count != 0:
+        while db_mngr.parameter_type_validator.pending_task_count != 0:
             QApplication.processEvents()
         model.tear_down()
 
@@ -767,7 +768,7 @@ class TestCompoundParameterValueModel(TestBase):
                     ValidationKey("parameter_value", id(self._db_map), weight_value["id"].private_id): True,
                 },
             )
-        while self._db_mngr.parameter_type_validator._sent_task_count != 0:
+        while self._db_mngr.parameter_type_validator.pending_task_count != 0:
             QApplication.processEvents()
         with signal_waiter(self._db_mngr.parameter_type_validator.validated, timeout=5.0) as waiter:
             self._db_mngr.update_items(
@@ -781,7 +782,7 @@ class TestCompoundParameterValueModel(TestBase):
                     ValidationKey("parameter_value", id(self._db_map), weight_value["id"].private_id): False,
                 },
             )
-        while self._db_mngr.parameter_type_validator._sent_task_count != 0:
+        while self._db_mngr.parameter_type_validator.pending_task_count != 0:
             QApplication.processEvents()
         model.tear_down()
 
@@ -1088,6 +1089,24 @@ class TestCompoundEntityAlternativeModel:
             mock_signal.assert_not_called()
         model.tear_down()
 
+    def test_auto_filter_data_is_cleared_only_by_dependency_item_types(self, db_mngr, db_map, parent_object):
+        with db_map:
+            db_map.add_entity_class(name="Widget")
+            db_map.add_entity(entity_class_name="Widget", name="clock")
+            db_map.add_entity_alternative(
+                entity_class_name="Widget", entity_byname=("clock",), alternative_name="Base", active=True
+            )
+        model = CompoundEntityAlternativeModel(parent_object, db_mngr, db_map)
+        fetch_model(model)
+        sub_model = model.sub_models[0]
+        with mock.patch.object(sub_model, "clear_auto_filter_data") as mock_clear:
+            db_mngr.add_items("scenario", {db_map: [{"name": "scen"}]})
+            mock_clear.assert_not_called()
+            widget_class = db_map.entity_class(name="Widget")
+            db_mngr.update_items("entity_class", {db_map: [{"id": widget_class["id"], "name": "Gadget"}]})
+            mock_clear.assert_called_once_with()
+        model.tear_down()
+
 
 @pytest.fixture()
 def compound_entity_model(db_mngr, db_map, parent_object):
@@ -1139,6 +1158,35 @@ class TestCompoundEntityModel:
         ]
         assert_table_model_data_pytest(compound_entity_model, expected)
 
+    def test_committed_items_added_to_existing_class_are_inserted_without_reset(
+        self, compound_entity_model, db_map, db_name
+    ):
+        with db_map:
+            db_map.add_entity_class(name="Gadget")
+            db_map.add_entity(entity_class_name="Gadget", name="b")
+            db_map.add_entity_class(name="Widget")
+            db_map.add_entity(entity_class_name="Widget", name="w")
+            db_map.commit_session("Add test data.")
+        fetch_model(compound_entity_model)
+        with db_map:
+            a = db_map.add_entity(entity_class_name="Gadget", name="a")
+            c = db_map.add_entity(entity_class_name="Gadget", name="c")
+            db_map.commit_session("Add more test data.")
+        reset_listener = mock.MagicMock()
+        compound_entity_model.modelReset.connect(reset_listener)
+        inserted_ranges = []
+        compound_entity_model.rowsInserted.connect(lambda parent, first, last: inserted_ranges.append((first, last)))
+        compound_entity_model.handle_items_added({db_map: [a, c]})
+        expected = [
+            ["Gadget", "a", "a", None, None, None, None, None, None, db_name],
+            ["Gadget", "b", "b", None, None, None, None, None, None, db_name],
+            ["Gadget", "c", "c", None, None, None, None, None, None, db_name],
+            ["Widget", "w", "w", None, None, None, None, None, None, db_name],
+        ]
+        assert_table_model_data_pytest(compound_entity_model, expected)
+        assert inserted_ranges == [(0, 0), (2, 2)]
+        reset_listener.assert_not_called()
+
     def test_filtering_by_scenario(self, compound_entity_model, db_map, db_name):
         with db_map:
             scenario = db_map.add_scenario(name="Scenario")
@@ -1273,6 +1321,60 @@ class TestCompoundEntityModel:
         ]
         assert_table_model_data_pytest(compound_entity_model, expected)
 
+    def test_auto_filter_follows_updated_items(self, compound_entity_model, db_mngr, db_map, db_name):
+        with db_map:
+            db_map.add_entity_class(name="Widget")
+            db_map.add_entity(entity_class_name="Widget", name="clock")
+            calendar = db_map.add_entity(entity_class_name="Widget", name="calendar")
+            db_map.add_entity_class(dimension_name_list=["Widget"])
+            db_map.add_entity(entity_class_name="Widget__", entity_byname=("calendar",))
+        fetch_model(compound_entity_model)
+        with signal_waiter(compound_entity_model.layoutChanged) as waiter:
+            compound_entity_model.set_auto_filter("entity_byname", {("clock",), ("watch",)})
+            waiter.wait()
+        expected = [["Widget", "clock", "clock", None, None, None, None, None, None, db_name]]
+        assert_table_model_data_pytest(compound_entity_model, expected)
+        db_mngr.update_items("entity", {db_map: [{"id": calendar["id"], "name": "watch"}]})
+        compound_entity_model.refresh()
+        expected = [
+            ["Widget", "watch", "watch", None, None, None, None, None, None, db_name],
+            ["Widget", "clock", "clock", None, None, None, None, None, None, db_name],
+            ["Widget__", "calendar__", "watch", None, None, None, None, None, None, db_name],
+        ]
+        assert_table_model_data_pytest(compound_entity_model, expected)
+        db_mngr.update_items("entity", {db_map: [{"id": calendar["id"], "name": "calendar"}]})
+        compound_entity_model.refresh()
+        expected = [["Widget", "clock", "clock", None, None, None, None, None, None, db_name]]
+        assert_table_model_data_pytest(compound_entity_model, expected)
+
+    def test_auto_filter_data_follows_added_updated_and_removed_items(
+        self, compound_entity_model, db_mngr, db_map, db_name
+    ):
+        with db_map:
+            db_map.add_entity_class(name="Widget")
+            db_map.add_entity(entity_class_name="Widget", name="clock")
+            calendar = db_map.add_entity(entity_class_name="Widget", name="calendar")
+            db_map.add_entity(entity_class_name="Widget", name="tablet")
+        fetch_model(compound_entity_model)
+        name_column = field_index("name", ENTITY_FIELD_MAP)
+        assert compound_entity_model.auto_filter_data_list(name_column) == ["calendar", "clock", "tablet"]
+        with signal_waiter(compound_entity_model.non_committed_items_added) as waiter:
+            db_mngr.add_items("entity", {db_map: [{"entity_class_name": "Widget", "name": "watch"}]})
+            waiter.wait()
+        assert compound_entity_model.auto_filter_data_list(name_column) == ["calendar", "clock", "tablet", "watch"]
+        db_mngr.update_items("entity", {db_map: [{"id": calendar["id"], "name": "radio"}]})
+        assert compound_entity_model.auto_filter_data_list(name_column) == ["clock", "radio", "tablet", "watch"]
+        db_mngr.remove_items({db_map: {"entity": [calendar["id"]]}})
+        while compound_entity_model.rowCount() == 4:
+            QApplication.processEvents()
+        assert compound_entity_model.auto_filter_data_list(name_column) == ["clock", "tablet", "watch"]
+        with signal_waiter(compound_entity_model.layoutChanged) as waiter:
+            compound_entity_model.set_auto_filter("name", {"tablet", "watch"})
+            waiter.wait()
+        assert compound_entity_model.auto_filter_data_list(name_column) == ["tablet", "watch"]
+        byname_column = field_index("entity_byname", ENTITY_FIELD_MAP)
+        assert compound_entity_model.auto_filter_data_map(byname_column) == {"tablet": ("tablet",), "watch": ("watch",)}
+
     def test_set_auto_filter_in_shape_blob_column(self, compound_entity_model, db_map, db_name):
         with db_map:
             db_map.add_entity_class(name="Widget")
@@ -0,0 +1,73 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+"""Unit tests for the ``compound_table_model`` module."""
+
+import unittest
+from spinetoolbox.spine_db_editor.mvcmodels.compound_table_model import RowMap
+
+
+class TestRowMap(unittest.TestCase):
+    def setUp(self):
+        self._row_map = RowMap()
+        self._row_map.append("a", [0, 2, 5])
+        self._row_map.append("b", [1])
+        self._row_map.append("c", [0, 1])
+
+    def test_maps_rows_both_ways(self):
+        self.assertEqual(len(self._row_map), 6)
+        expected = [("a", 0), ("a", 2), ("a", 5), ("b", 1), ("c", 0), ("c", 1)]
+        self.assertEqual(list(self._row_map), expected)
+        for row, (model, sub_row) in enumerate(expected):
+            self.assertEqual(self._row_map[row], (model, sub_row))
+            self.assertEqual(self._row_map.compound_row(model, sub_row), row)
+        self.assertEqual(self._row_map[-1], ("c", 1))
+        self.assertIsNone(self._row_map.compound_row("a", 1))
+        self.assertIsNone(self._row_map.compound_row("d", 0))
+        with self.assertRaises(IndexError):
+            self._row_map[6]
+
+    def test_insert_block_between_blocks(self):
+        self._row_map.insert(3, "d", [3, 4])
+        self.assertEqual(self._row_map.block_range("d"), (3, 2))
+        self.assertEqual(self._row_map.block_range("b"), (5, 1))
+        self.assertEqual(self._row_map[4], ("d", 4))
+        self.assertEqual(self._row_map.compound_row("c", 1), 7)
+        with self.assertRaises(ValueError):
+            self._row_map.insert(1, "e", [0])
+
+    def test_remove_block(self):
+        self._row_map.remove_block("a")
+        self.assertEqual(list(self._row_map), [("b", 1), ("c", 0), ("c", 1)])
+        self.assertEqual(self._row_map.block_range("c"), (1, 2))
+        self.assertIsNone(self._row_map.block_range("a"))
+
+    def test_remove_rows_and_remap_sub_rows(self):
+        self._row_map.remove_rows(1, 1)
+        self._row_map.remap_sub_rows("a", {0: 0, 5: 4})
+        self.assertEqual(list(self._row_map), [("a", 0), ("a", 4), ("b", 1), ("c", 0), ("c", 1)])
+        self.assertEqual(self._row_map.compound_row("a", 4), 1)
+        self._row_map.remove_rows(2, 1)
+        self.assertIsNone(self._row_map.block_range("b"))
+        self.assertEqual(self._row_map.compound_row("c", 0), 2)
+        with self.assertRaises(ValueError):
+            self._row_map.remove_rows(1, 2)
+
+    def test_clear(self):
+        self._row_map.clear()
+        self.assertEqual(len(self._row_map), 0)
+        self.assertEqual(list(self._row_map), [])
+        self._row_map.append("a", [1])
+        self.assertEqual(self._row_map[0], ("a", 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
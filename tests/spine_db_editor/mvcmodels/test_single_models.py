@@ -155,3 +155,52 @@ class TestSingleEntityModel:
         for column in range(model.columnCount()):
             assert model.index(0, column).data(HAS_METADATA_ROLE)
             assert not model.index(1, column).data(HAS_METADATA_ROLE)
+
+    def test_add_rows_merges_rows_into_sorted_positions(self, single_entity_model, db_map, gadget):
+        with db_map:
+            entities = {name: db_map.add_entity(class_id=gadget["id"], name=name) for name in "abcdef"}
+        model = single_entity_model
+        model.reset_model([entities["b"]["id"], entities["e"]["id"]])
+        inserted_ranges = []
+        model.rowsInserted.connect(lambda parent, first, last: inserted_ranges.append((first, last)))
+        reset_listener = []
+        model.modelReset.connect(lambda: reset_listener.append(True))
+        model.add_rows([entities[name]["id"] for name in ("f", "a", "c", "e", "d")])
+        assert [model.index(row, 1).data() for row in range(model.rowCount())] == list("abcdef")
+        assert inserted_ranges == [(0, 0), (2, 3), (5, 5)]
+        assert not reset_listener
+
+    def test_add_rows_resets_model_when_rows_are_scattered(self, single_entity_model, db_map, gadget, monkeypatch):
+        with db_map:
+            entities = {name: db_map.add_entity(class_id=gadget["id"], name=name) for name in "abcde"}
+        model = single_entity_model
+        monkeypatch.setattr(model, "_MAX_INSERTED_RANGES", 1)
+        model.reset_model([entities["b"]["id"], entities["d"]["id"]])
+        reset_listener = []
+        model.modelReset.connect(lambda: reset_listener.append(True))
+        model.add_rows([entities[name]["id"] for name in ("e", "c", "a")])
+        assert [model.index(row, 1).data() for row in range(model.rowCount())] == list("abcde")
+        assert reset_listener == [True]
+        model.drop_rows([0, 4])
+        assert model.item_ids() == {entities[name]["id"] for name in "bcd"}
+        model.add_rows([entities["a"]["id"]])
+        assert [model.index(row, 1).data() for row in range(model.rowCount())] == list("abcd")
+
+    def test_row_of_finds_rows_after_merges_and_removals(self, single_entity_model, db_map, gadget):
+        with db_map:
+            entities = {name: db_map.add_entity(class_id=gadget["id"], name=name) for name in "abcdef"}
+        model = single_entity_model
+        model.reset_model([entities["b"]["id"], entities["e"]["id"]])
+        model.add_rows([entities[name]["id"] for name in ("f", "a", "c", "d")])
+        model.removeRows(1, 1)
+        for row in range(model.rowCount()):
+            assert model.row_of(model.item_id(row)) == row
+
+    def test_column_value_counts_include_merged_rows(self, single_entity_model, db_map, gadget):
+        with db_map:
+            entities = {name: db_map.add_entity(class_id=gadget["id"], name=name) for name in ("a", "b", "c")}
+        model = single_entity_model
+        model.reset_model([entities["a"]["id"], entities["c"]["id"]])
+        assert model.column_value_counts(1).counts() == {"a": 1, "c": 1}
+        model.add_rows([entities["b"]["id"]])
+        assert model.column_value_counts(1).counts() == {"a": 1, "b": 1, "c": 1}
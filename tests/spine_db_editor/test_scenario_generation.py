@@ -0,0 +1,86 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Unit tests for Database editor's ``scenario_generation`` module."""
+
+import unittest
+from spinetoolbox.spine_db_editor.scenario_generation import (
+    batched,
+    combination_count,
+    combination_with_base_count,
+    iter_combinations,
+    iter_combinations_with_base,
+    unique_alternatives,
+)
+
+
+class TestIterCombinations(unittest.TestCase):
+    def test_empty_alternatives_give_no_combinations(self):
+        self.assertEqual(list(iter_combinations([])), [])
+
+    def test_combinations_are_ordered_by_size(self):
+        self.assertEqual(
+            list(iter_combinations(["a", "b", "c"])),
+            [["a"], ["b"], ["c"], ["a", "b"], ["a", "c"], ["b", "c"], ["a", "b", "c"]],
+        )
+
+    def test_max_count_caps_combinations(self):
+        self.assertEqual(list(iter_combinations(["a", "b", "c"], 4)), [["a"], ["b"], ["c"], ["a", "b"]])
+
+    def test_count_matches_combination_count(self):
+        alternatives = list(range(12))
+        self.assertEqual(len(list(iter_combinations(alternatives))), combination_count(len(alternatives)))
+
+    def test_large_alternative_sets_are_generated_lazily(self):
+        combinations = iter_combinations(list(range(60)), max_count=3)
+        self.assertEqual(list(combinations), [[0], [1], [2]])
+
+
+class TestIterCombinationsWithBase(unittest.TestCase):
+    def test_base_is_prepended_and_duplicates_are_skipped(self):
+        self.assertEqual(
+            list(iter_combinations_with_base(["a", "Base", "b"], "Base")),
+            [["Base", "a"], ["Base"], ["Base", "b"], ["Base", "a", "b"]],
+        )
+
+    def test_order_matches_deduplicated_combinations(self):
+        alternatives = ["a", "b", "Base", "c", "d"]
+        expected = []
+        seen = set()
+        for combination in iter_combinations(alternatives):
+            scenario = ["Base"] + [alternative for alternative in combination if alternative != "Base"]
+            if tuple(scenario) not in seen:
+                seen.add(tuple(scenario))
+                expected.append(scenario)
+        self.assertEqual(list(iter_combinations_with_base(alternatives, "Base")), expected)
+        self.assertEqual(len(expected), combination_with_base_count(len(alternatives)))
+
+    def test_max_count_caps_combinations(self):
+        combinations = iter_combinations_with_base(list(range(60)), 0, max_count=3)
+        self.assertEqual(list(combinations), [[0], [0, 1], [0, 2]])
+
+
+class TestUniqueAlternatives(unittest.TestCase):
+    def test_each_alternative_gets_own_scenario(self):
+        self.assertEqual(unique_alternatives(["a", "b"]), [["a"], ["b"]])
+
+
+class TestBatched(unittest.TestCase):
+    def test_splits_into_batches(self):
+        self.assertEqual(list(batched(range(5), 2)), [[0, 1], [2, 3], [4]])
+
+    def test_empty_iterable_gives_no_batches(self):
+        self.assertEqual(list(batched([], 2)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -130,3 +130,24 @@ class TestCommitViewer:
                     ["a__b", "", "a ǀ b", "", "", "", "", "", "A__B", "A ǀ B", "", "a ǀ b"],
                 ]
                 assert_table_model_data_pytest(affected_items_table.model(), expected)
+
+    def test_unfetched_items_are_shown(self, db_mngr, db_map, ui_settings, parent_widget):
+        with db_map:
+            db_map.add_entity_class(name="Widget")
+            db_map.add_entity(entity_class_name="Widget", name="clock")
+            db_map.add_entity(entity_class_name="Widget", name="watch")
+            db_map.commit_session("Add test data")
+        db_mngr.reset_session(db_map)
+        with create_commit_viewer(db_mngr, db_map, ui_settings, parent_widget) as commit_viewer:
+            current_tab = commit_viewer.centralWidget().currentWidget()
+            commit_list = current_tab._ui.commit_list
+            assert commit_list.topLevelItemCount() == 2
+            commit_list.setCurrentItem(commit_list.topLevelItem(0))
+            affected_item_tab_widget = current_tab._ui.affected_item_tab_widget
+            while affected_item_tab_widget.count() != 1:
+                QApplication.processEvents()
+            affected_items_table = affected_item_tab_widget.widget(0).table
+            while affected_items_table.rowCount() != 2:
+                QApplication.processEvents()
+            names = {affected_items_table.item(row, 0).text() for row in range(2)}
+            assert names == {"clock", "watch"}
@@ -376,9 +376,11 @@ class TestParameterValueTableWithExistingData:
 
     @pytest.fixture()
     def limited_chunk_size(self, monkeypatch):
-        monkeypatch.setattr(
-            "spinetoolbox.spine_db_worker._CHUNK_SIZE", TestParameterValueTableWithExistingData._CHUNK_SIZE
-        )
+        # The next chunk is fetched ahead of the table, so the table gets two chunks.
+        for name in ("_CHUNK_SIZE", "_MIN_CHUNK_SIZE", "_MAX_CHUNK_SIZE"):
+            monkeypatch.setattr(
+                "spinetoolbox.spine_db_worker." + name, TestParameterValueTableWithExistingData._CHUNK_SIZE // 2
+            )
 
     @pytest.fixture()
     def db_map(self, db_name, db_mngr, logger, tmp_path, limited_chunk_size):
@@ -69,6 +69,46 @@ class TestScenarioGenerator(TestBase):
             },
         )
 
+    def test_all_combinations_with_base_alternative(self):
+        self._db_mngr.add_items("alternative", {self._db_map: [{"name": "alt1"}, {"name": "alt2"}]})
+        alternatives = self._db_map.get_items("alternative")
+        scenario_generator = ScenarioGenerator(self._db_editor, self._db_map, alternatives, self._db_editor)
+        scenario_generator._ui.scenario_prefix_edit.setText("S_")
+        scenario_generator._ui.operation_combo_box.setCurrentText("All combinations")
+        scenario_generator._ui.use_base_alternative_check_box.setCheckState(Qt.CheckState.Checked)
+        scenario_generator._ui.button_box.accepted.emit()
+        scenario_id_to_name = {s["id"]: s["name"] for s in self._db_map.get_items("scenario")}
+        alternative_id_to_name = {a["id"]: a["name"] for a in self._db_map.get_items("alternative")}
+        alternatives_by_scenario = {}
+        for item in sorted(self._db_map.get_items("scenario_alternative"), key=lambda x: x["rank"]):
+            alternatives_by_scenario.setdefault(scenario_id_to_name[item["scenario_id"]], []).append(
+                alternative_id_to_name[item["alternative_id"]]
+            )
+        self.assertEqual(
+            alternatives_by_scenario,
+            {
+                "S_1": ["Base"],
+                "S_2": ["Base", "alt1"],
+                "S_3": ["Base", "alt2"],
+                "S_4": ["Base", "alt1", "alt2"],
+            },
+        )
+
+    def test_scenarios_are_inserted_in_chunks_as_single_undo_step(self):
+        self._db_mngr.add_items("alternative", {self._db_map: [{"name": f"alt{n}"} for n in range(4)]})
+        alternatives = self._db_map.get_items("alternative")
+        scenario_generator = ScenarioGenerator(self._db_editor, self._db_map, alternatives, self._db_editor)
+        scenario_generator._INSERT_CHUNK_SIZE = 4
+        scenario_generator._ui.scenario_prefix_edit.setText("S_")
+        scenario_generator._ui.operation_combo_box.setCurrentText("All combinations")
+        scenario_generator._ui.use_base_alternative_check_box.setCheckState(Qt.CheckState.Unchecked)
+        undo_stack = self._db_mngr.undo_stack[self._db_map]
+        command_count = undo_stack.count()
+        scenario_generator._ui.button_box.accepted.emit()
+        self.assertEqual(len(self._db_map.get_items("scenario")), 31)
+        self.assertEqual(len(self._db_map.get_items("scenario_alternative")), 5 * 2**4)
+        self.assertEqual(undo_stack.count(), command_count + 1)
+
 
 if __name__ == "__main__":
     unittest.main()
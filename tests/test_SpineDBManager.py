@@ -29,6 +29,7 @@ from spinedb_api.parameter_value import Map, ParameterValueFormatError, from_dat
 from spinedb_api.spine_io.importers.excel_reader import get_mapped_data_from_xlsx
 from spinetoolbox.fetch_parent import FlexibleFetchParent
 from spinetoolbox.helpers import signal_waiter
+from spinetoolbox.parameter_type_validation import ValidationKey
 from spinetoolbox.spine_db_manager import SpineDBManager
 from tests.mock_helpers import TestCaseWithQApplication
 
@@ -765,6 +766,111 @@ class TestFindCascadingItems(TestCaseWithQApplication):
         self.assertEqual(self._db_mngr.find_groups_by_entity({self._db_map: [o1_id]}), {})
 
 
+class TestGetItemsByField(TestCaseWithQApplication):
+    def setUp(self):
+        mock_settings = MagicMock()
+        mock_settings.value.side_effect = lambda *args, **kwargs: 0
+        self._db_mngr = SpineDBManager(mock_settings, None)
+        self._logger = MagicMock()
+        self._db_map = self._db_mngr.get_db_map("sqlite://", self._logger, create=True)
+        self._db_mngr.name_registry.register(self._db_map.sa_url, "test_database")
+
+    def tearDown(self):
+        self._db_mngr.close_all_sessions()
+        while not self._db_map.closed:
+            QApplication.processEvents()
+        self._db_mngr.clean_up()
+
+    def test_lookups_follow_added_updated_and_removed_items(self):
+        self._db_mngr.add_items("entity_class", {self._db_map: [{"name": "O1"}, {"name": "O2"}]})
+        o1_id = self._db_map.entity_class(name="O1")["id"]
+        o2_id = self._db_map.entity_class(name="O2")["id"]
+        self._db_mngr.add_items("entity", {self._db_map: [{"class_id": o1_id, "name": "o1"}]})
+        entities = self._db_mngr.get_items_by_field(self._db_map, "entity", "class_id", o1_id)
+        self.assertEqual([entity["name"] for entity in entities], ["o1"])
+        self._db_mngr.add_items("entity", {self._db_map: [{"class_id": o2_id, "name": "o2"}]})
+        self.assertEqual(self._db_mngr.get_item_by_field(self._db_map, "entity", "class_id", o2_id)["name"], "o2")
+        o1 = self._db_map.entity(entity_class_name="O1", name="o1")
+        self._db_mngr.update_items("entity", {self._db_map: [{"id": o1["id"], "name": "renamed"}]})
+        self.assertEqual(self._db_mngr.get_item_by_field(self._db_map, "entity", "name", "renamed")["id"], o1["id"])
+        self.assertEqual(self._db_mngr.get_item_by_field(self._db_map, "entity", "name", "o1"), {})
+        self._db_mngr.remove_items({self._db_map: {"entity": {o1["id"]}}})
+        self.assertEqual(self._db_mngr.get_items_by_field(self._db_map, "entity", "class_id", o1_id), [])
+
+    def test_computed_field_lookups_follow_updates_of_referenced_items(self):
+        self._db_mngr.add_items("entity_class", {self._db_map: [{"name": "O1"}]})
+        self._db_mngr.add_items("entity", {self._db_map: [{"entity_class_name": "O1", "name": "o1"}]})
+        entities = self._db_mngr.get_items_by_field(self._db_map, "entity", "entity_class_name", "O1")
+        self.assertEqual([entity["name"] for entity in entities], ["o1"])
+        class_id = self._db_map.entity_class(name="O1")["id"]
+        self._db_mngr.update_items("entity_class", {self._db_map: [{"id": class_id, "name": "Renamed"}]})
+        self.assertEqual(self._db_mngr.get_items_by_field(self._db_map, "entity", "entity_class_name", "O1"), [])
+        entities = self._db_mngr.get_items_by_field(self._db_map, "entity", "entity_class_name", "Renamed")
+        self.assertEqual([entity["name"] for entity in entities], ["o1"])
+
+
+class TestGetValueRenderCache(TestCaseWithQApplication):
+    def setUp(self):
+        mock_settings = MagicMock()
+        mock_settings.value.side_effect = lambda *args, **kwargs: 0
+        self._db_mngr = SpineDBManager(mock_settings, None)
+        self._logger = MagicMock()
+        self._db_map = self._db_mngr.get_db_map("sqlite://", self._logger, create=True)
+
+    def tearDown(self):
+        self._db_mngr.close_all_sessions()
+        while not self._db_map.closed:
+            QApplication.processEvents()
+        self._db_mngr.clean_up()
+
+    def test_list_value_display_follows_list_updates(self):
+        with self._db_map:
+            import_functions.import_data(
+                self._db_map,
+                entity_classes=[("Object",)],
+                entities=[("Object", "thing")],
+                parameter_value_lists=[("colors", Map(["a"], [1.0]))],
+                parameter_definitions=[("Object", "x", None, "colors")],
+                parameter_values=[("Object", "thing", "x", Map(["a"], [1.0]))],
+            )
+        value_item = self._db_map.parameter_value(
+            entity_class_name="Object", entity_byname=("thing",), parameter_definition_name="x", alternative_name="Base"
+        )
+        self.assertEqual(
+            self._db_mngr.get_value(self._db_map, value_item, Qt.ItemDataRole.DisplayRole), "colors[0] Map"
+        )
+        value_list = self._db_map.parameter_value_list(name="colors")
+        self._db_mngr.update_items("parameter_value_list", {self._db_map: [{"id": value_list["id"], "name": "shades"}]})
+        self.assertEqual(
+            self._db_mngr.get_value(self._db_map, value_item, Qt.ItemDataRole.DisplayRole), "shades[0] Map"
+        )
+        list_value = self._db_map.list_value(parameter_value_list_name="shades", index=0)
+        self._db_mngr.update_items("list_value", {self._db_map: [{"id": list_value["id"], "index": 3}]})
+        self.assertEqual(
+            self._db_mngr.get_value(self._db_map, value_item, Qt.ItemDataRole.DisplayRole), "shades[3] Map"
+        )
+
+    def test_tool_tip_follows_type_validation(self):
+        with self._db_map:
+            self._db_map.add_entity_class(name="Object")
+            self._db_map.add_entity(entity_class_name="Object", name="thing")
+            self._db_map.add_parameter_definition(entity_class_name="Object", name="x", parameter_type_list=("str",))
+            value_item = self._db_map.add_parameter_value(
+                entity_class_name="Object",
+                entity_byname=("thing",),
+                parameter_definition_name="x",
+                alternative_name="Base",
+                parsed_value=2.3,
+            )
+        self.assertIsNone(self._db_mngr.get_value(self._db_map, value_item, Qt.ItemDataRole.ToolTipRole))
+        key = ValidationKey("parameter_value", id(self._db_map), value_item["id"].private_id)
+        self._db_mngr._parameter_value_validated([key], [False])
+        self.assertEqual(
+            self._db_mngr.get_value(self._db_map, value_item, Qt.ItemDataRole.ToolTipRole),
+            "<qt>Expected value's type to be <b>str</b>.</qt>",
+        )
+
+
 class TestCommitSession(TestCaseWithQApplication):
     def setUp(self):
         mock_settings = MagicMock()
@@ -370,6 +370,51 @@ class TestSpineToolboxProject(TestCaseWithQApplication):
             self.assertTrue(dc3_executable.execute_called)
             self.assertTrue(dc5_executable.execute_called)
 
+    def test_incremental_execution_skips_items_with_unchanged_inputs(self):
+        project = self.toolbox.project()
+        data_connection = add_dc(project, self.toolbox.item_factories, "DC")
+        view = add_view(project, self.toolbox.item_factories, "View")
+        project.add_connection(
+            LoggingConnection(data_connection.name, "right", view.name, "left", toolbox=self.toolbox)
+        )
+        executables = {}
+
+        def make_item(name, *args, **kwargs):
+            executables[name] = self._make_mock_executable(project.get_item(name))
+            return executables[name]
+
+        def app_setting(key, defaultValue=None):
+            return "true" if key == "appSettings/incrementalExecution" else defaultValue
+
+        messages = []
+        self.toolbox.msg.connect(messages.append)
+        with (
+            mock.patch("spine_engine.spine_engine.SpineEngine.make_item") as mock_make_item,
+            mock.patch.object(project.app_settings, "value") as mock_value,
+        ):
+            mock_make_item.side_effect = make_item
+            mock_value.side_effect = app_setting
+            self._execute_project()
+            self.assertEqual({name for name, item in executables.items() if item.execute_called}, {"DC", "View"})
+            executables.clear()
+            with mock.patch("spinetoolbox.project.make_settings_dict_for_engine"):
+                project.execute_project()
+            self.assertEqual(executables, {})
+            self.assertEqual(messages[-1], "All items are up to date. Nothing to execute.")
+            view_dict = {**view.item_dict(), "changed": True}
+            with mock.patch.object(view, "item_dict", return_value=view_dict):
+                self._execute_project()
+            self.assertEqual({name for name, item in executables.items() if item.execute_called}, {"View"})
+            self.assertIn("Skipping up-to-date items: DC", messages)
+            executables.clear()
+            data_connection_dict = {**data_connection.item_dict(), "changed": True}
+            with (
+                mock.patch.object(data_connection, "item_dict", return_value=data_connection_dict),
+                mock.patch.object(view, "item_dict", return_value=view_dict),
+            ):
+                self._execute_project()
+            self.assertEqual({name for name, item in executables.items() if item.execute_called}, {"DC", "View"})
+
     def test_making_a_yellow_feedback_loop_makes_a_jump_instead(self):
         item1 = add_dc(self.toolbox.project(), self.toolbox.item_factories, "DC")
         item2 = add_view(self.toolbox.project(), self.toolbox.item_factories, "View")
@@ -637,6 +682,41 @@ class TestSpineToolboxProject(TestCaseWithQApplication):
         item = self.toolbox.project().get_item("test item")
         self.assertEqual(item.kwargs, {"type": "Tester", "a": {"b": 1, "c": 2, "d": 3}})
 
+    def test_load_propagates_resources_through_connections_once(self):
+        project = self.toolbox.project()
+        dc = add_dc(project, self.toolbox.item_factories, "DC")
+        add_tool(project, self.toolbox.item_factories, "Tool 1")
+        add_tool(project, self.toolbox.item_factories, "Tool 2")
+        data_file = Path(self._temp_dir.name, "a.txt")
+        data_file.touch()
+        dc.add_data_files([data_file])
+        project.add_connection(LoggingConnection("DC", "right", "Tool 1", "left", toolbox=self.toolbox))
+        project.add_connection(LoggingConnection("DC", "bottom", "Tool 2", "top", toolbox=self.toolbox))
+        project.add_connection(LoggingConnection("Tool 1", "right", "Tool 2", "left", toolbox=self.toolbox))
+        project.save()
+        self.assertTrue(self.toolbox.close_project(ask_confirmation=False))
+        with (
+            mock.patch.object(self.toolbox, "update_recent_projects"),
+            mock.patch("spinetoolbox.link.Link.update_icons", autospec=True) as update_icons,
+        ):
+            self.assertTrue(self.toolbox.restore_project(self._temp_dir.name, ask_confirmation=False))
+        project = self.toolbox.project()
+        self.assertEqual(project.get_item("Tool 1")._input_file_model.rowCount(), 1)
+        self.assertEqual(project.get_item("Tool 2")._input_file_model.rowCount(), 1)
+        self.assertEqual(
+            sorted(call.args[0].connection.name for call in update_icons.call_args_list),
+            sorted(connection.name for connection in project.connections),
+        )
+
+    def test_descendant_names_yields_each_descendant_once(self):
+        project = self.toolbox.project()
+        for name in ("a", "b", "c", "d"):
+            add_dc(project, self.toolbox.item_factories, name)
+        for source, destination in (("a", "b"), ("a", "c"), ("b", "d"), ("c", "d")):
+            project.add_connection(LoggingConnection(source, "right", destination, "left", toolbox=self.toolbox))
+        descendants = list(project.descendant_names("a"))
+        self.assertEqual(sorted(descendants), ["b", "c", "d"])
+
     def test_saving_item_movement_in_consumer_mode(self):
         project = self.toolbox.project()
         add_dc(project, self.toolbox.item_factories, "My connection")
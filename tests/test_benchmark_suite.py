@@ -0,0 +1,39 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Smoke tests for the benchmark suite in ``benchmarks/``."""
+
+import os.path
+from tempfile import TemporaryDirectory
+import unittest
+from unittest import mock
+import pyperf
+from benchmarks.data_generator import CACHE_DIR_ENV_VAR, VALUE_COUNTS
+from benchmarks.run_suite import run_suite
+
+
+class TestRunSuite(unittest.TestCase):
+    def test_sized_benchmark_runs_with_fast_option(self):
+        with TemporaryDirectory() as temp_dir:
+            output_file = os.path.join(temp_dir, "results.json")
+            with mock.patch.dict(os.environ, {CACHE_DIR_ENV_VAR: os.path.join(temp_dir, "databases")}):
+                failed = run_suite(output_file, [VALUE_COUNTS[0]], ["entity_scenario_activity"], ["--fast"])
+            self.assertEqual(failed, [])
+            suite = pyperf.BenchmarkSuite.load(output_file)
+            self.assertEqual(
+                suite.get_benchmark_names(),
+                [f"EntityScenarioActivityGraph.entity_activities[cold, {VALUE_COUNTS[0]} values]"],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,7 +9,6 @@
 # Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
 # this program. If not, see <http://www.gnu.org/licenses/>.
 ######################################################################################################################
-import networkx as nx
 import pytest
 from spinedb_api import DatabaseMapping
 from spinetoolbox.cache_graphs import EntityScenarioActivityGraph, RelationshipClassGraph, RelationshipGraph
@@ -82,7 +81,7 @@ class TestRelationshipClassGraph:
         assert graph.is_any_id_reachable(db_map, any_any["id"], {a["id"]})
         assert not graph.is_any_id_reachable(db_map, any_any["id"], {b["id"]})
 
-    def test_invalidate_caches(self, db_map):
+    def test_classes_added_after_first_query_are_found(self, db_map):
         graph = RelationshipClassGraph()
         with db_map:
             a = db_map.add_entity_class(name="A")
@@ -90,32 +89,41 @@ class TestRelationshipClassGraph:
             a_b = db_map.add_entity_class(dimension_name_list=["A", "B"])
         assert graph.is_any_id_reachable(db_map, a_b["id"], {a["id"]})
         b_a = db_map.add_entity_class(dimension_name_list=["B", "A"])
+        b_a__ = db_map.add_entity_class(dimension_name_list=["B__A"])
+        assert graph.is_any_id_reachable(db_map, b_a["id"], {a["id"]})
+        assert graph.is_any_id_reachable(db_map, b_a__["id"], {a["id"]})
+
+    def test_invalidate_caches(self, db_map):
+        graph = RelationshipClassGraph()
+        with db_map:
+            a = db_map.add_entity_class(name="A")
+            db_map.add_entity_class(name="B")
+            a_b = db_map.add_entity_class(dimension_name_list=["A", "B"])
+        assert graph.is_any_id_reachable(db_map, a_b["id"], {a["id"]})
+        a_b.remove()
         other_db_map = DatabaseMapping("sqlite:///", create=True)
         graph.invalidate_caches(other_db_map)
-        with pytest.raises(nx.exception.NetworkXError):
-            graph.is_any_id_reachable(db_map, b_a["id"], {a["id"]})
+        assert graph.is_any_id_reachable(db_map, a_b["id"], {a["id"]})
         graph.invalidate_caches(db_map)
-        assert graph.is_any_id_reachable(db_map, b_a["id"], {a["id"]})
+        assert not graph.is_any_id_reachable(db_map, a_b["id"], {a["id"]})
 
-    def test_maybe_invalidate_caches_after_data_changed(self, db_map):
+    def test_update_caches_after_data_changed(self, db_map):
         graph = RelationshipClassGraph()
         with db_map:
             a = db_map.add_entity_class(name="A")
             db_map.add_entity_class(name="B")
             a_b = db_map.add_entity_class(dimension_name_list=["A", "B"])
+            b_a = db_map.add_entity_class(dimension_name_list=["B", "A"])
         assert graph.is_any_id_reachable(db_map, a_b["id"], {a["id"]})
-        b_a = db_map.add_entity_class(dimension_name_list=["B", "A"])
-        graph.maybe_invalidate_caches_after_data_changed("alternative", {db_map: [db_map.alternative(name="Base")]})
-        with pytest.raises(nx.exception.NetworkXError):
-            graph.is_any_id_reachable(db_map, b_a["id"], {a["id"]})
-        other_db_map = DatabaseMapping("sqlite:///", create=True)
-        graph.maybe_invalidate_caches_after_data_changed("entity_class", {other_db_map: []})
-        with pytest.raises(nx.exception.NetworkXError):
-            graph.is_any_id_reachable(db_map, b_a["id"], {a["id"]})
-        graph.maybe_invalidate_caches_after_data_changed("entity_class", {db_map: [b_a]})
+        assert graph.is_any_id_reachable(db_map, b_a["id"], {a["id"]})
+        a_b.remove()
+        graph.update_caches_after_data_changed("alternative", {db_map: [db_map.alternative(name="Base")]})
+        assert graph.is_any_id_reachable(db_map, a_b["id"], {a["id"]})
+        graph.update_caches_after_data_changed("entity_class", {db_map: [a_b]})
+        assert not graph.is_any_id_reachable(db_map, a_b["id"], {a["id"]})
         assert graph.is_any_id_reachable(db_map, b_a["id"], {a["id"]})
 
-    def test_maybe_invalidate_caches_after_data_changed_superclass_subclass(self, db_map):
+    def test_update_caches_after_data_changed_superclass_subclass(self, db_map):
         graph = RelationshipClassGraph()
         with db_map:
             a = db_map.add_entity_class(name="A")
@@ -124,27 +132,9 @@ class TestRelationshipClassGraph:
             any_any = db_map.add_entity_class(dimension_name_list=["Any", "Any"])
         assert graph.is_any_id_reachable(db_map, any_any["id"], {a["id"]})
         super_sub.remove()
-        graph.maybe_invalidate_caches_after_data_changed("superclass_subclass", {db_map: [super_sub]})
+        graph.update_caches_after_data_changed("superclass_subclass", {db_map: [super_sub]})
         assert not graph.is_any_id_reachable(db_map, any_any["id"], {a["id"]})
 
-    def test_maybe_invalidate_caches_after_fetch(self, db_map):
-        graph = RelationshipClassGraph()
-        with db_map:
-            a = db_map.add_entity_class(name="A")
-            db_map.add_entity_class(name="B")
-            a_b = db_map.add_entity_class(dimension_name_list=["A", "B"])
-        assert graph.is_any_id_reachable(db_map, a_b["id"], {a["id"]})
-        b_a = db_map.add_entity_class(dimension_name_list=["B", "A"])
-        graph.maybe_invalidate_caches_after_fetch("alternative", db_map)
-        with pytest.raises(nx.exception.NetworkXError):
-            graph.is_any_id_reachable(db_map, b_a["id"], {a["id"]})
-        other_db_map = DatabaseMapping("sqlite:///", create=True)
-        graph.maybe_invalidate_caches_after_fetch("entity_class", other_db_map)
-        with pytest.raises(nx.exception.NetworkXError):
-            graph.is_any_id_reachable(db_map, b_a["id"], {a["id"]})
-        graph.maybe_invalidate_caches_after_fetch("entity_class", db_map)
-        assert graph.is_any_id_reachable(db_map, b_a["id"], {a["id"]})
-
     def test_maybe_invalidate_caches_after_fetch_superclass_subclass(self, db_map):
         graph = RelationshipClassGraph()
         with db_map:
@@ -154,7 +144,9 @@ class TestRelationshipClassGraph:
             any_any = db_map.add_entity_class(dimension_name_list=["Any", "Any"])
         assert graph.is_any_id_reachable(db_map, any_any["id"], {a["id"]})
         super_sub.remove()
-        graph.maybe_invalidate_caches_after_fetch("superclass_subclass", db_map)
+        graph.maybe_invalidate_caches_after_fetch(db_map, "entity_class")
+        assert graph.is_any_id_reachable(db_map, any_any["id"], {a["id"]})
+        graph.maybe_invalidate_caches_after_fetch(db_map, "superclass_subclass")
         assert not graph.is_any_id_reachable(db_map, any_any["id"], {a["id"]})
 
 
@@ -177,6 +169,20 @@ class TestRelationshipGraph:
         assert not graph.is_any_id_reachable(db_map, item_a["id"], {relationship_item["id"]})
         assert not graph.is_any_id_reachable(db_map, item_a_["id"], {relationship_item["id"]})
 
+    def test_updated_entity_elements_are_followed(self, db_map):
+        graph = RelationshipGraph()
+        with db_map:
+            db_map.add_entity_class(name="A")
+            item_a = db_map.add_entity(entity_class_name="A", name="a")
+            item_b = db_map.add_entity(entity_class_name="A", name="b")
+            db_map.add_entity_class(dimension_name_list=["A"])
+            relationship = db_map.add_entity(entity_class_name="A__", entity_byname=("a",))
+        assert graph.is_any_id_reachable(db_map, relationship["id"], {item_a["id"]})
+        relationship.update(entity_byname=("b",))
+        graph.update_caches_after_data_changed("entity", {db_map: [relationship]})
+        assert not graph.is_any_id_reachable(db_map, relationship["id"], {item_a["id"]})
+        assert graph.is_any_id_reachable(db_map, relationship["id"], {item_b["id"]})
+
 
 class TestEntityScenarioActivityGraph:
     def test_minimum_setup(self, db_map):
@@ -272,3 +278,98 @@ class TestEntityScenarioActivityGraph:
             db_map.add_scenario_alternative(scenario_id=scenario["id"], alternative_id=alternative_id, rank=0)
         graph = EntityScenarioActivityGraph()
         assert graph.is_entity_active(db_map, toolbar_relationship["id"], scenario["id"]) is expected
+
+    def test_entity_activities_answers_many_entities_at_once(self, db_map):
+        base_alternative = db_map.alternative(name="Base")
+        with db_map:
+            db_map.add_entity_class(name="Widget")
+            toolbar = db_map.add_entity(entity_class_name="Widget", name="toolbar")
+            menu = db_map.add_entity(entity_class_name="Widget", name="menu")
+            button = db_map.add_entity(entity_class_name="Widget", name="button")
+            db_map.add_entity_alternative(entity_id=toolbar["id"], alternative_id=base_alternative["id"], active=True)
+            db_map.add_entity_alternative(entity_id=menu["id"], alternative_id=base_alternative["id"], active=False)
+            scenario = db_map.add_scenario(name="Scenario")
+            empty_scenario = db_map.add_scenario(name="Empty scenario")
+            db_map.add_scenario_alternative(scenario_id=scenario["id"], alternative_id=base_alternative["id"], rank=0)
+        graph = EntityScenarioActivityGraph()
+        entity_ids = [toolbar["id"], menu["id"], button["id"]]
+        assert graph.entity_activities(db_map, entity_ids, scenario["id"]) == [True, False, None]
+        assert graph.entity_activities(db_map, entity_ids, empty_scenario["id"]) == [None, None, None]
+
+    def test_update_caches_after_entity_alternative_changes(self, db_map):
+        base_alternative = db_map.alternative(name="Base")
+        with db_map:
+            db_map.add_entity_class(name="Widget")
+            toolbar = db_map.add_entity(entity_class_name="Widget", name="toolbar")
+            db_map.add_entity_class(dimension_name_list=["Widget"])
+            toolbar_relationship = db_map.add_entity(entity_class_name="Widget__", entity_byname=("toolbar",))
+            scenario = db_map.add_scenario(name="Scenario")
+            db_map.add_scenario_alternative(scenario_id=scenario["id"], alternative_id=base_alternative["id"], rank=0)
+        graph = EntityScenarioActivityGraph()
+        entity_ids = [toolbar["id"], toolbar_relationship["id"]]
+        assert graph.entity_activities(db_map, entity_ids, scenario["id"]) == [None, None]
+        entity_alternative = db_map.add_entity_alternative(
+            entity_id=toolbar["id"], alternative_id=base_alternative["id"], active=False
+        )
+        graph.update_caches_after_data_changed("entity_alternative", {db_map: [entity_alternative]})
+        assert graph.entity_activities(db_map, entity_ids, scenario["id"]) == [False, False]
+        entity_alternative.update(active=True)
+        graph.update_caches_after_data_changed("entity_alternative", {db_map: [entity_alternative]})
+        assert graph.entity_activities(db_map, entity_ids, scenario["id"]) == [True, None]
+        entity_alternative.remove()
+        graph.update_caches_after_data_changed("entity_alternative", {db_map: [entity_alternative]})
+        assert graph.entity_activities(db_map, entity_ids, scenario["id"]) == [None, None]
+
+    def test_update_caches_after_entity_alternative_moves_to_another_alternative(self, db_map):
+        base_alternative = db_map.alternative(name="Base")
+        with db_map:
+            other_alternative = db_map.add_alternative(name="Other")
+            db_map.add_entity_class(name="Widget")
+            entity = db_map.add_entity(entity_class_name="Widget", name="toolbar")
+            entity_alternative = db_map.add_entity_alternative(
+                entity_id=entity["id"], alternative_id=base_alternative["id"], active=False
+            )
+            scenario = db_map.add_scenario(name="Scenario")
+            db_map.add_scenario_alternative(scenario_id=scenario["id"], alternative_id=base_alternative["id"], rank=0)
+        graph = EntityScenarioActivityGraph()
+        assert graph.is_entity_active(db_map, entity["id"], scenario["id"]) is False
+        entity_alternative.update(alternative_id=other_alternative["id"])
+        graph.update_caches_after_data_changed("entity_alternative", {db_map: [entity_alternative]})
+        assert graph.is_entity_active(db_map, entity["id"], scenario["id"]) is None
+        assert EntityScenarioActivityGraph().is_entity_active(db_map, entity["id"], scenario["id"]) is None
+
+    def test_update_caches_after_scenario_alternative_changes(self, db_map):
+        base_alternative = db_map.alternative(name="Base")
+        with db_map:
+            top_alternative = db_map.add_alternative(name="Top")
+            db_map.add_entity_class(name="Widget")
+            entity = db_map.add_entity(entity_class_name="Widget", name="toolbar")
+            db_map.add_entity_alternative(entity_id=entity["id"], alternative_id=base_alternative["id"], active=False)
+            db_map.add_entity_alternative(entity_id=entity["id"], alternative_id=top_alternative["id"], active=True)
+            scenario = db_map.add_scenario(name="Scenario")
+            db_map.add_scenario_alternative(scenario_id=scenario["id"], alternative_id=base_alternative["id"], rank=0)
+        graph = EntityScenarioActivityGraph()
+        assert graph.is_entity_active(db_map, entity["id"], scenario["id"]) is False
+        scenario_alternative = db_map.add_scenario_alternative(
+            scenario_id=scenario["id"], alternative_id=top_alternative["id"], rank=1
+        )
+        graph.update_caches_after_data_changed("scenario_alternative", {db_map: [scenario_alternative]})
+        assert graph.is_entity_active(db_map, entity["id"], scenario["id"]) is True
+        scenario_alternative.remove()
+        graph.update_caches_after_data_changed("scenario_alternative", {db_map: [scenario_alternative]})
+        assert graph.is_entity_active(db_map, entity["id"], scenario["id"]) is False
+
+    def test_update_caches_after_entity_class_changes(self, db_map):
+        alternative_id = db_map.alternative(name="Base")["id"]
+        with db_map:
+            widget_class = db_map.add_entity_class(name="Widget", active_by_default=False)
+            db_map.add_entity(entity_class_name="Widget", name="toolbar")
+            db_map.add_entity_class(dimension_name_list=["Widget"])
+            toolbar_relationship = db_map.add_entity(entity_class_name="Widget__", entity_byname=("toolbar",))
+            scenario = db_map.add_scenario(name="Scenario")
+            db_map.add_scenario_alternative(scenario_id=scenario["id"], alternative_id=alternative_id, rank=0)
+        graph = EntityScenarioActivityGraph()
+        assert graph.is_entity_active(db_map, toolbar_relationship["id"], scenario["id"]) is False
+        widget_class.update(active_by_default=True)
+        graph.update_caches_after_data_changed("entity_class", {db_map: [widget_class]})
+        assert graph.is_entity_active(db_map, toolbar_relationship["id"], scenario["id"]) is None
@@ -0,0 +1,97 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+"""Unit tests for the ``commit_index`` module."""
+
+import os.path
+import pytest
+from spinedb_api import DatabaseMapping
+from spinetoolbox.commit_index import COMMIT_INDEX_SUFFIX, CommitIndex, commit_index_path
+
+
+@pytest.fixture()
+def db_url(tmp_path):
+    return "sqlite:///" + str(tmp_path / "db.sqlite")
+
+
+def _commit_ids(db_map):
+    return [commit["id"].db_id for commit in db_map.get_items("commit")]
+
+
+class TestCommitIndex:
+    def test_items_are_found_by_their_commit(self, db_url):
+        with DatabaseMapping(db_url, create=True) as db_map:
+            db_map.add_entity_class(name="Widget")
+            db_map.add_entity(entity_class_name="Widget", name="clock")
+            db_map.add_alternative(name="alt")
+            db_map.commit_session("Add test data.")
+            first_commit_id, second_commit_id = _commit_ids(db_map)
+            clock_id = db_map.entity(entity_class_name="Widget", name="clock")["id"].db_id
+            alternative_id = db_map.alternative(name="alt")["id"].db_id
+            base_id = db_map.alternative(name="Base")["id"].db_id
+            commit_index = CommitIndex(db_map)
+            assert commit_index.item_ids(first_commit_id) == {"alternative": [base_id]}
+            assert commit_index.item_ids(second_commit_id) == {"alternative": [alternative_id], "entity": [clock_id]}
+
+    def test_later_commits_are_indexed_incrementally(self, db_url):
+        with DatabaseMapping(db_url, create=True) as db_map:
+            db_map.add_entity_class(name="Widget")
+            db_map.add_entity(entity_class_name="Widget", name="clock")
+            db_map.add_entity(entity_class_name="Widget", name="watch")
+            db_map.commit_session("Add test data.")
+            commit_index = CommitIndex(db_map)
+            _, data_commit_id = _commit_ids(db_map)
+            assert len(commit_index.item_ids(data_commit_id)["entity"]) == 2
+            db_map.entity(entity_class_name="Widget", name="clock").update(description="Ticks.")
+            db_map.commit_session("Update clock.")
+            update_commit_id = _commit_ids(db_map)[-1]
+            clock_id = db_map.entity(entity_class_name="Widget", name="clock")["id"].db_id
+            watch_id = db_map.entity(entity_class_name="Widget", name="watch")["id"].db_id
+            assert commit_index.item_ids(data_commit_id) == {"entity": [watch_id]}
+            assert commit_index.item_ids(update_commit_id) == {"entity": [clock_id]}
+
+    def test_index_is_saved_and_loaded(self, db_url):
+        with DatabaseMapping(db_url, create=True) as db_map:
+            db_map.add_alternative(name="alt")
+            db_map.commit_session("Add test data.")
+            data_commit_id = _commit_ids(db_map)[-1]
+            alternative_id = db_map.alternative(name="alt")["id"].db_id
+            path = commit_index_path(db_map)
+            assert path.endswith("db.sqlite" + COMMIT_INDEX_SUFFIX)
+            commit_index = CommitIndex(db_map, path)
+            assert commit_index.item_ids(data_commit_id) == {"alternative": [alternative_id]}
+            commit_index.save()
+        assert os.path.exists(path)
+        with DatabaseMapping(db_url) as db_map:
+            commit_index = CommitIndex(db_map, path)
+            assert commit_index._indexed_up_to["alternative"] == data_commit_id
+            assert commit_index.item_ids(data_commit_id) == {"alternative": [alternative_id]}
+
+    def test_index_of_another_database_is_discarded(self, db_url):
+        with DatabaseMapping(db_url, create=True) as db_map:
+            db_map.add_alternative(name="alt")
+            db_map.commit_session("Add test data.")
+            path = commit_index_path(db_map)
+            commit_index = CommitIndex(db_map, path)
+            commit_index.item_ids(_commit_ids(db_map)[-1])
+            commit_index.save()
+        os.remove(db_url[len("sqlite:///") :])
+        with DatabaseMapping(db_url, create=True) as db_map:
+            db_map.add_alternative(name="alt")
+            db_map.add_alternative(name="other")
+            db_map.commit_session("Add other test data.")
+            alternative_ids = [db_map.alternative(name=name)["id"].db_id for name in ("alt", "other")]
+            commit_index = CommitIndex(db_map, path)
+            assert commit_index.item_ids(_commit_ids(db_map)[-1]) == {"alternative": alternative_ids}
+
+    def test_in_memory_database_has_no_index_path(self):
+        with DatabaseMapping("sqlite://", create=True) as db_map:
+            assert commit_index_path(db_map) is None
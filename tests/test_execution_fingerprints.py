@@ -0,0 +1,127 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Unit tests for the ``execution_fingerprints`` module."""
+
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+import networkx as nx
+from spine_engine.project_item.project_item_resource import file_resource
+from spinetoolbox.execution_fingerprints import (
+    ExecutionFingerprints,
+    incremental_execution_permits,
+    item_fingerprint,
+    path_stamps,
+    resource_stamp,
+)
+
+
+class TestItemFingerprint(unittest.TestCase):
+    def test_layout_does_not_affect_fingerprint(self):
+        item_dict = {"type": "Tool", "x": 0.0, "y": 0.0, "description": "", "cmd_line_args": []}
+        fingerprint = item_fingerprint(item_dict, None, [], [])
+        moved_dict = {**item_dict, "x": 10.0, "description": "moved"}
+        self.assertEqual(item_fingerprint(moved_dict, None, [], []), fingerprint)
+        modified_dict = {**item_dict, "cmd_line_args": ["--verbose"]}
+        self.assertNotEqual(item_fingerprint(modified_dict, None, [], []), fingerprint)
+        self.assertNotEqual(item_fingerprint(item_dict, None, [{"filter_settings": {}}], []), fingerprint)
+
+    def test_program_files_of_specification_are_stamped(self):
+        with TemporaryDirectory() as temp_dir:
+            program = Path(temp_dir, "src", "script.py")
+            program.parent.mkdir()
+            program.write_text("print('hello')")
+            spec_dict = {
+                "name": "spec",
+                "includes": ["script.py"],
+                "includes_main_path": "src",
+                "definition_file_path": os.path.join(temp_dir, "spec.json"),
+            }
+            fingerprint = item_fingerprint({"type": "Tool"}, spec_dict, [], [])
+            program.write_text("print('hello, world')")
+            self.assertNotEqual(item_fingerprint({"type": "Tool"}, spec_dict, [], []), fingerprint)
+
+
+class TestStamps(unittest.TestCase):
+    def test_file_resource_stamp_follows_file_contents(self):
+        with TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir, "data.csv")
+            resource = file_resource("DC", str(path))
+            missing_stamp = resource_stamp(resource)
+            path.write_text("a,b")
+            stamp = resource_stamp(resource)
+            self.assertNotEqual(stamp, missing_stamp)
+            path.write_text("a,b,c")
+            self.assertNotEqual(resource_stamp(resource), stamp)
+            self.assertEqual(resource_stamp(resource, include_file_state=False), missing_stamp[:4])
+
+    def test_path_stamps_finds_serialized_paths(self):
+        with TemporaryDirectory() as temp_dir:
+            Path(temp_dir, "file.txt").write_text("data")
+            item_dict = {
+                "type": "Data Connection",
+                "file_references": [{"type": "path", "relative": True, "path": "file.txt"}],
+                "url": {"dialect": "sqlite", "database": {"type": "path", "relative": True, "path": "missing.sqlite"}},
+            }
+            stamps = path_stamps(item_dict, temp_dir)
+        self.assertEqual(len(stamps), 2)
+        self.assertEqual(stamps[0][0], "file.txt")
+        self.assertEqual(stamps[0][1][0], 4)
+        self.assertEqual(stamps[1], ["missing.sqlite", None])
+
+
+class TestIncrementalExecutionPermits(unittest.TestCase):
+    def test_changed_items_and_their_successors_are_permitted(self):
+        with TemporaryDirectory() as temp_dir:
+            store = ExecutionFingerprints(temp_dir)
+            for name in ("a", "b", "c", "d"):
+                store.set(name, name)
+            dag = nx.DiGraph([("a", "b"), ("b", "c"), ("a", "d")])
+            fingerprints = {"a": "a", "b": "changed", "c": "c", "d": "d"}
+            all_permitted = dict.fromkeys(dag.nodes, True)
+            self.assertEqual(
+                incremental_execution_permits(dag, all_permitted, fingerprints, store),
+                {"a": False, "b": True, "c": True, "d": False},
+            )
+            selected = {"a": False, "b": False, "c": True, "d": True}
+            self.assertEqual(
+                incremental_execution_permits(dag, selected, fingerprints, store),
+                {"a": False, "b": False, "c": False, "d": False},
+            )
+
+
+class TestExecutionFingerprints(unittest.TestCase):
+    def test_fingerprints_are_saved_to_project_local_data(self):
+        with TemporaryDirectory() as temp_dir:
+            store = ExecutionFingerprints(temp_dir)
+            self.assertIsNone(store.get("a"))
+            store.set("a", "fingerprint a")
+            store.set("b", "fingerprint b")
+            store.discard(["b", "c"])
+            store.save()
+            loaded = ExecutionFingerprints(temp_dir)
+            self.assertEqual(loaded.get("a"), "fingerprint a")
+            self.assertIsNone(loaded.get("b"))
+
+    def test_corrupted_file_is_ignored(self):
+        with TemporaryDirectory() as temp_dir:
+            store = ExecutionFingerprints(temp_dir)
+            store.save()
+            with open(store._path, "w") as fingerprint_file:
+                fingerprint_file.write("{not json")
+            self.assertIsNone(ExecutionFingerprints(temp_dir).get("a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+"""Unit tests for the ``execution_message_buffer`` module."""
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+from spinetoolbox.execution_message_buffer import ExecutionMessageBuffer
+
+
+class TestExecutionMessageBuffer(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = TemporaryDirectory()
+        self._buffer = ExecutionMessageBuffer(capacity=3)
+
+    def tearDown(self):
+        self._buffer.close()
+        self._temp_dir.cleanup()
+
+    def test_messages_are_batched_per_item_and_filter(self):
+        self.assertTrue(self._buffer.add_event_message("item 1", "", "msg", "starting"))
+        self.assertFalse(self._buffer.add_process_message("item 1", "", "msg", "line 1"))
+        self.assertFalse(self._buffer.add_process_message("item 2", "filter", "msg_error", "oops"))
+        batches = self._buffer.take_batches()
+        self.assertEqual(len(batches), 2)
+        self.assertEqual((batches[0].item, batches[0].filter_id), ("item 1", ""))
+        self.assertEqual(batches[0].messages, [(False, "msg", "starting"), (True, "msg", "line 1")])
+        self.assertEqual(batches[0].dropped_count, 0)
+        self.assertIsNone(batches[0].spool_path)
+        self.assertEqual((batches[1].item, batches[1].filter_id), ("item 2", "filter"))
+        self.assertEqual(batches[1].messages, [(True, "msg_error", "oops")])
+        self.assertEqual(self._buffer.take_batches(), [])
+        self.assertTrue(self._buffer.add_process_message("item 1", "", "msg", "line 2"))
+
+    def test_full_ring_drops_oldest_process_messages_and_spools_output_to_disk(self):
+        spool_dir = str(Path(self._temp_dir.name, "logs"))
+        self._buffer.add_event_message("item", "", "msg", "starting")
+        for line in range(5):
+            self._buffer.add_process_message("item", "", "msg", f"line {line}", spool_dir)
+        batches = self._buffer.take_batches()
+        self.assertEqual(len(batches), 1)
+        batch = batches[0]
+        self.assertEqual(batch.head, [(False, "msg", "starting")])
+        self.assertEqual(batch.dropped_count, 2)
+        self.assertEqual(batch.messages, [(True, "msg", "line 2"), (True, "msg", "line 3"), (True, "msg", "line 4")])
+        self.assertEqual(Path(batch.spool_path).parent, Path(spool_dir))
+        self._buffer.add_process_message("item", "", "msg", "line 5", spool_dir)
+        batch = self._buffer.take_batches()[0]
+        self.assertEqual(batch.dropped_count, 0)
+        self.assertEqual(batch.messages, [(True, "msg", "line 5")])
+        self._buffer.close()
+        self.assertEqual(
+            Path(batch.spool_path).read_text(encoding="utf-8").splitlines(), [f"line {line}" for line in range(6)]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
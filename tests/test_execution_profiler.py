@@ -0,0 +1,111 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Unit tests for the ``execution_profiler`` module."""
+
+import unittest
+import networkx as nx
+from spine_engine.utils.helpers import ExecutionDirection
+from spinetoolbox.execution_profiler import ExecutionProfiler
+
+
+class _Clock:
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self):
+        return self.time
+
+
+class TestExecutionProfiler(unittest.TestCase):
+    def setUp(self):
+        self._clock = _Clock()
+        self._profiler = ExecutionProfiler(self._clock)
+
+    def _record(self, time, dag_id, event_type, data):
+        self._clock.time = time
+        self._profiler.record_event(dag_id, event_type, data)
+
+    def _execute_item(self, dag_id, item_name, start, end):
+        self._record(start, dag_id, "exec_started", {"item_name": item_name, "direction": ExecutionDirection.FORWARD})
+        self._record(
+            end,
+            dag_id,
+            "exec_finished",
+            {"item_name": item_name, "direction": ExecutionDirection.FORWARD, "item_state": "SUCCESS"},
+        )
+
+    def test_dag_profile_aggregates_item_times_and_finds_critical_path(self):
+        graph = nx.DiGraph([("a", "b"), ("a", "c"), ("b", "d"), ("c", "d")])
+        self._profiler.start_dag("1/1", graph=graph)
+        self._execute_item("1/1", "a", 0.0, 1.0)
+        self._execute_item("1/1", "b", 1.0, 2.0)
+        self._execute_item("1/1", "c", 1.0, 4.0)
+        self._execute_item("1/1", "d", 4.0, 4.5)
+        self._record(5.0, "1/1", "dag_exec_finished", "COMPLETED")
+        profiles = self._profiler.dag_profiles()
+        self.assertEqual(len(profiles), 1)
+        profile = profiles[0]
+        self.assertEqual(profile.wall_time, 5.0)
+        self.assertEqual(profile.busy_time, 5.5)
+        self.assertEqual(profile.critical_path(), (["a", "c", "d"], 4.5))
+        self.assertEqual(
+            self._profiler.summary(),
+            ["DAG 1/1: 5.00 s wall time, 5.50 s busy, critical path a -> c -> d (4.50 s)"],
+        )
+
+    def test_filter_spans_cover_messages_of_each_filter(self):
+        self._profiler.start_dag(0)
+        self._record(1.0, 0, "event_msg", {"item_name": "a", "filter_id": "", "msg_type": "msg", "msg_text": "x"})
+        self._record(2.0, 0, "process_msg", {"item_name": "a", "filter_id": "f1", "msg_type": "msg", "msg_text": "x"})
+        self._record(3.0, 0, "event_msg", {"item_name": "a", "filter_id": "f2", "msg_type": "msg", "msg_text": "x"})
+        self._record(4.0, 0, "event_msg", {"item_name": "a", "filter_id": "f1", "msg_type": "msg", "msg_text": "x"})
+        spans = {span.filter_id: (span.start, span.end) for span in self._profiler.dag_profiles()[0].filter_spans}
+        self.assertEqual(spans, {"f1": (2.0, 4.0), "f2": (3.0, 3.0)})
+
+    def test_chrome_trace_packs_overlapping_spans_on_separate_threads(self):
+        self._clock.time = 10.0
+        self._profiler.start_dag("1/2", graph=nx.DiGraph([("a", "b")]))
+        self._execute_item("1/2", "a", 10.0, 11.0)
+        self._record(10.5, "1/2", "exec_started", {"item_name": "c", "direction": ExecutionDirection.FORWARD})
+        self._execute_item("1/2", "b", 11.0, 12.0)
+        self._record(12.5, "1/2", "dag_exec_finished", "COMPLETED")
+        self._profiler.start_dag("2/2")
+        trace = self._profiler.chrome_trace()
+        self.assertEqual(trace["displayTimeUnit"], "ms")
+        spans = {
+            event["name"]: (event["pid"], event["tid"], event["ts"], event["dur"])
+            for event in trace["traceEvents"]
+            if event["ph"] == "X"
+        }
+        self.assertEqual(
+            spans,
+            {
+                "DAG 1/2": (1, 0, 0.0, 2.5e6),
+                "a": (1, 1, 0.0, 1e6),
+                "c": (1, 2, 0.5e6, 2e6),
+                "b": (1, 1, 1e6, 1e6),
+                "DAG 2/2": (2, 0, 2.5e6, 0.0),
+            },
+        )
+        process_names = {
+            event["pid"]: event["args"]["name"] for event in trace["traceEvents"] if event["name"] == "process_name"
+        }
+        self.assertEqual(process_names, {1: "DAG 1/2", 2: "DAG 2/2"})
+
+    def test_unknown_events_are_ignored(self):
+        self._profiler.record_event(0, "prompt", {})
+        self.assertEqual(self._profiler.dag_profiles(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
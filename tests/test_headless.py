@@ -0,0 +1,234 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Unit tests for the ``headless`` module."""
+
+from argparse import ArgumentTypeError, Namespace
+import json
+import os.path
+import pathlib
+from tempfile import TemporaryDirectory
+import threading
+import unittest
+from unittest import mock
+from PySide6.QtCore import QEvent
+from spine_engine import SpineEngineState
+from spine_engine.exception import EngineInitFailed, RemoteEngineInitFailed
+from spine_engine.spine_engine import ItemExecutionFinishState
+from spine_engine.utils.helpers import ExecutionDirection
+from spinetoolbox.headless import ActionsWithProject, Status
+from spinetoolbox.main import _positive_int
+from tests.mock_helpers import TestCaseWithQApplication
+
+
+class _FakeEngineManager:
+    """Engine manager that replays node events of a single item DAG."""
+
+    def __init__(self, start_barrier=None):
+        self._start_barrier = start_barrier
+        self._events = []
+
+    def run_engine(self, engine_data):
+        item_name = next(iter(engine_data["items"]))
+        final_state = engine_data.get("final_state", "COMPLETED")
+        self._events = [
+            ("exec_started", {"item_name": item_name, "direction": "FORWARD"}),
+            ("exec_finished", {"item_name": item_name, "direction": "FORWARD", "item_state": "SUCCESS"}),
+            ("dag_exec_finished", final_state),
+        ]
+        if self._start_barrier is not None:
+            self._start_barrier.wait(timeout=5.0)
+
+    def get_engine_event(self):
+        return self._events.pop(0)
+
+
+def _engine_data(item_name, final_state="COMPLETED"):
+    return {"items": {item_name: {}}, "final_state": final_state}
+
+
+class TestActionsWithProjectDagExecution(TestCaseWithQApplication):
+    def _make_task(self, jobs, profile_out=None):
+        task = ActionsWithProject(Namespace(jobs=jobs, profile_out=profile_out), QEvent.Type.User, None)
+        self.addCleanup(task.deleteLater)
+        return task
+
+    def test_events_of_concurrent_dags_reach_event_processing(self):
+        task = self._make_task(jobs=2)
+        barrier = threading.Barrier(2)
+        with (
+            mock.patch("spinetoolbox.headless.make_engine_manager") as make_engine_manager,
+            mock.patch.object(task, "_process_engine_event") as process_engine_event,
+        ):
+            make_engine_manager.side_effect = lambda *args, **kwargs: _FakeEngineManager(barrier)
+            status = task._execute_dags([_engine_data("a"), _engine_data("b")], "")
+        self.assertEqual(status, Status.OK)
+        self.assertEqual(make_engine_manager.call_count, 2)
+        started_items = {
+            call.args[1]["item_name"] for call in process_engine_event.call_args_list if call.args[0] == "exec_started"
+        }
+        self.assertEqual(started_items, {"a", "b"})
+        finished_dags = [call for call in process_engine_event.call_args_list if call.args[0] == "dag_exec_finished"]
+        self.assertEqual(len(finished_dags), 2)
+
+    def test_failed_dag_stops_pending_dags(self):
+        task = self._make_task(jobs=1)
+        failed_state = str(SpineEngineState.FAILED)
+        engine_data_list = [_engine_data("a", failed_state), _engine_data("b"), _engine_data("c")]
+        with (
+            mock.patch("spinetoolbox.headless.make_engine_manager") as make_engine_manager,
+            mock.patch.object(task, "_process_engine_event") as process_engine_event,
+        ):
+            make_engine_manager.side_effect = lambda *args, **kwargs: _FakeEngineManager()
+            status = task._execute_dags(engine_data_list, "")
+        self.assertEqual(status, Status.ERROR)
+        make_engine_manager.assert_called_once()
+        process_engine_event.assert_called_with("dag_exec_finished", failed_state)
+
+    def test_engine_that_fails_to_start_fails_execution(self):
+        task = self._make_task(jobs=2)
+        errors = []
+        task._logger.msg_error.connect(errors.append)
+        with mock.patch("spinetoolbox.headless.make_engine_manager") as make_engine_manager:
+            make_engine_manager.side_effect = EngineInitFailed("no engine")
+            status = task._execute_dags([_engine_data("a")], "")
+        self.assertEqual(status, Status.ERROR)
+        self.assertEqual(errors, ["Engine failed to start: no engine"])
+
+    def test_profile_out_writes_chrome_trace(self):
+        with TemporaryDirectory() as temp_dir:
+            trace_path = os.path.join(temp_dir, "trace.json")
+            task = self._make_task(jobs=2, profile_out=trace_path)
+            messages = []
+            task._logger.msg.connect(messages.append)
+            with (
+                mock.patch("spinetoolbox.headless.make_engine_manager") as make_engine_manager,
+                mock.patch.object(task, "_process_engine_event"),
+            ):
+                make_engine_manager.side_effect = lambda *args, **kwargs: _FakeEngineManager()
+                status = task._execute_dags([_engine_data("a"), _engine_data("b")], "")
+            self.assertEqual(status, Status.OK)
+            with open(trace_path, encoding="utf-8") as trace_file:
+                trace = json.load(trace_file)
+        item_events = [event for event in trace["traceEvents"] if event["ph"] == "X" and event["cat"] == "item"]
+        self.assertEqual(sorted(event["name"] for event in item_events), ["a", "b"])
+        self.assertEqual({event["pid"] for event in item_events}, {1, 2})
+        self.assertEqual(messages[-1], f"Execution profile written to {trace_path}")
+
+
+class TestActionsWithProjectIncrementalExecution(TestCaseWithQApplication):
+    def _make_task(self, project_dir):
+        task = ActionsWithProject(
+            Namespace(jobs=1, select=None, deselect=None, incremental=True, profile_out=None), QEvent.Type.User, None
+        )
+        self.addCleanup(task.deleteLater)
+        task._project_dir = pathlib.Path(project_dir)
+        task._plugin_specifications = {}
+        task._specification_dicts = {}
+        task._jump_dicts = []
+        return task
+
+    @staticmethod
+    def _make_dag_executor(task, executed):
+        def execute_dags(engine_data_list, job_id, dags):
+            for engine_data in engine_data_list:
+                for name, permitted in engine_data["execution_permits"].items():
+                    if permitted:
+                        executed.append(name)
+                        task._process_engine_event(
+                            "exec_finished",
+                            {
+                                "item_name": name,
+                                "direction": ExecutionDirection.FORWARD,
+                                "item_state": ItemExecutionFinishState.SUCCESS,
+                            },
+                        )
+            return Status.OK
+
+        return execute_dags
+
+    def test_only_items_with_changed_inputs_and_their_successors_are_executed(self):
+        with TemporaryDirectory() as temp_dir:
+            task = self._make_task(temp_dir)
+            task._item_dicts = {"a": {"type": "Data Connection"}, "b": {"type": "Tool"}, "c": {"type": "Tool"}}
+            task._connection_dicts = [
+                {"name": "a -> b", "from": ["a", "right"], "to": ["b", "left"]},
+                {"name": "b -> c", "from": ["b", "right"], "to": ["c", "left"]},
+            ]
+            executed = []
+            with (
+                mock.patch.object(task, "_execute_dags", side_effect=self._make_dag_executor(task, executed)),
+                mock.patch("spinetoolbox.headless.make_settings_dict_for_engine", return_value={}),
+            ):
+                self.assertEqual(task._execute_project(), Status.OK)
+                self.assertEqual(sorted(executed), ["a", "b", "c"])
+                executed.clear()
+                self.assertEqual(task._execute_project(), Status.OK)
+                self.assertEqual(executed, [])
+                task._item_dicts["b"]["cmd_line_args"] = ["--fast"]
+                self.assertEqual(task._execute_project(), Status.OK)
+                self.assertEqual(sorted(executed), ["b", "c"])
+
+    def test_changed_file_in_upstream_data_directory_executes_downstream_items(self):
+        with TemporaryDirectory() as temp_dir:
+            task = self._make_task(temp_dir)
+            task._item_dicts = {"a": {"type": "Data Connection", "file_references": []}, "b": {"type": "Tool"}}
+            task._connection_dicts = [{"name": "a -> b", "from": ["a", "right"], "to": ["b", "left"]}]
+            data_dir = pathlib.Path(temp_dir, ".spinetoolbox", "items", "a")
+            data_dir.mkdir(parents=True)
+            data_file = data_dir / "data.csv"
+            data_file.write_text("1,2\n", encoding="utf-8")
+            executed = []
+            with (
+                mock.patch.object(task, "_execute_dags", side_effect=self._make_dag_executor(task, executed)),
+                mock.patch("spinetoolbox.headless.make_settings_dict_for_engine", return_value={}),
+            ):
+                self.assertEqual(task._execute_project(), Status.OK)
+                self.assertEqual(sorted(executed), ["a", "b"])
+                executed.clear()
+                self.assertEqual(task._execute_project(), Status.OK)
+                self.assertEqual(executed, [])
+                data_file.write_text("1,2\n3,4\n", encoding="utf-8")
+                self.assertEqual(task._execute_project(), Status.OK)
+                self.assertEqual(executed, ["b"])
+
+
+class TestActionsWithProjectRemoteExecution(TestCaseWithQApplication):
+    def test_client_is_discarded_when_synchronization_fails(self):
+        with TemporaryDirectory() as temp_dir:
+            task = ActionsWithProject(Namespace(jobs=1), QEvent.Type.User, None)
+            self.addCleanup(task.deleteLater)
+            task._project_dir = pathlib.Path(temp_dir)
+            task._server_config = {"host": "localhost", "port": "5601", "security_model": "", "security_folder": ""}
+            client = mock.MagicMock()
+            client.supports_incremental_upload.return_value = True
+            client.sync_project.side_effect = RemoteEngineInitFailed("timed out")
+            with mock.patch("spinetoolbox.headless.engine_client_pool") as pool:
+                pool.acquire.return_value = client
+                self.assertEqual(task._prepare_remote_execution(), "")
+            pool.discard.assert_called_once_with(client)
+            pool.release.assert_not_called()
+
+
+class TestPositiveInt(unittest.TestCase):
+    def test_accepts_positive_integers(self):
+        self.assertEqual(_positive_int("3"), 3)
+
+    def test_rejects_zero_and_non_integers(self):
+        for value in ("0", "-1", "1.5", "many"):
+            with self.subTest(value=value):
+                with self.assertRaises(ArgumentTypeError):
+                    _positive_int(value)
+
+
+if __name__ == "__main__":
+    unittest.main()
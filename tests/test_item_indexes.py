@@ -0,0 +1,194 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+import pytest
+from spinedb_api import DatabaseMapping
+from spinetoolbox.item_indexes import CascadeIndex, FieldIndexCache, ItemIndex
+
+
+@pytest.fixture()
+def db_map():
+    with DatabaseMapping("sqlite://", create=True) as db_map:
+        yield db_map
+
+
+class TestItemIndex:
+    def test_items_are_found_by_value(self):
+        index = ItemIndex("class_id", multivalued=False)
+        index.insert([{"id": 1, "class_id": 10}, {"id": 2, "class_id": 20}, {"id": 3, "class_id": 10}])
+        assert index.ids([10]) == [1, 3]
+        assert index.ids([10, 20]) == [1, 3, 2]
+        assert index.ids([30]) == []
+
+    def test_reinserting_item_moves_it_under_new_value(self):
+        index = ItemIndex("class_id", multivalued=False)
+        index.insert([{"id": 1, "class_id": 10}])
+        index.insert([{"id": 1, "class_id": 20}])
+        assert index.ids([10]) == []
+        assert index.ids([20]) == [1]
+
+    def test_multivalued_field(self):
+        index = ItemIndex("element_id_list", multivalued=True)
+        index.insert([{"id": 1, "element_id_list": (10, 10, 20)}, {"id": 2, "element_id_list": (20,)}])
+        assert index.ids([10]) == [1]
+        assert index.ids([20]) == [1, 2]
+        assert index.matches({"element_id_list": (30, 20)}, {20})
+        assert not index.matches({"element_id_list": (30,)}, {20})
+
+
+class TestCascadeIndex:
+    def test_finds_parameter_values_by_entity(self, db_map):
+        cascade_index = CascadeIndex()
+        with db_map:
+            db_map.add_entity_class(name="Object")
+            db_map.add_parameter_definition(entity_class_name="Object", name="Y")
+            db_map.add_alternative(name="alt")
+            entity1 = db_map.add_entity(entity_class_name="Object", name="o1")
+            entity2 = db_map.add_entity(entity_class_name="Object", name="o2")
+            value1 = db_map.add_parameter_value(
+                entity_class_name="Object",
+                entity_byname=("o1",),
+                parameter_definition_name="Y",
+                alternative_name="Base",
+                parsed_value=2.3,
+            )
+        values = cascade_index.find(db_map, "parameter_value", [entity1["id"]])
+        assert [value["id"] for value in values] == [value1["id"]]
+        assert cascade_index.find(db_map, "parameter_value", [entity2["id"]]) == []
+
+    def test_added_items_are_found_after_signal(self, db_map):
+        cascade_index = CascadeIndex()
+        with db_map:
+            db_map.add_entity_class(name="Object")
+            db_map.add_entity(entity_class_name="Object", name="o1")
+            group_entity = db_map.add_entity(entity_class_name="Object", name="g1")
+        assert cascade_index.find(db_map, "entity_group", [group_entity["id"]]) == []
+        with db_map:
+            group = db_map.add_entity_group(entity_class_name="Object", group_name="g1", member_name="o1")
+        cascade_index.update_indexes_after_data_changed("entity_group", {db_map: [group]})
+        groups = cascade_index.find(db_map, "entity_group", [group_entity["id"]])
+        assert [item["id"] for item in groups] == [group["id"]]
+
+    def test_removed_items_are_skipped_and_restored_ones_found_again(self, db_map):
+        cascade_index = CascadeIndex()
+        with db_map:
+            object_class = db_map.add_entity_class(name="Object")
+            relationship_class = db_map.add_entity_class(dimension_name_list=["Object"])
+        assert [c["id"] for c in cascade_index.find(db_map, "entity_class", [object_class["id"]])] == [
+            relationship_class["id"]
+        ]
+        relationship_class.remove()
+        assert cascade_index.find(db_map, "entity_class", [object_class["id"]]) == []
+        relationship_class.restore()
+        assert [c["id"] for c in cascade_index.find(db_map, "entity_class", [object_class["id"]])] == [
+            relationship_class["id"]
+        ]
+
+    def test_fetched_items_are_found(self, tmp_path):
+        url = "sqlite:///" + str(tmp_path / "db.sqlite")
+        with DatabaseMapping(url, create=True) as db_map:
+            db_map.add_entity_class(name="Object")
+            db_map.add_parameter_definition(entity_class_name="Object", name="X")
+            db_map.commit_session("Add test data.")
+        cascade_index = CascadeIndex()
+        with DatabaseMapping(url) as db_map:
+            object_class_id = db_map.entity_class(name="Object")["id"]
+            assert cascade_index.find(db_map, "parameter_definition", [object_class_id]) == []
+            definitions = db_map.fetch_more("parameter_definition")
+            cascade_index.insert_fetched_items(db_map, "parameter_definition", definitions)
+            assert [item["name"] for item in cascade_index.find(db_map, "parameter_definition", [object_class_id])] == [
+                "X"
+            ]
+
+    def test_items_added_without_signal_are_found(self, db_map):
+        cascade_index = CascadeIndex()
+        with db_map:
+            db_map.add_entity_class(name="Object")
+            db_map.add_parameter_definition(entity_class_name="Object", name="X")
+        object_class_id = db_map.entity_class(name="Object")["id"]
+        assert len(cascade_index.find(db_map, "parameter_definition", [object_class_id])) == 1
+        with db_map:
+            db_map.add_parameter_definition(entity_class_name="Object", name="Y")
+        assert len(cascade_index.find(db_map, "parameter_definition", [object_class_id])) == 2
+
+
+class TestFieldIndexCache:
+    def test_finds_items_by_field_value(self, db_map):
+        field_index = FieldIndexCache()
+        with db_map:
+            db_map.add_entity_class(name="Object")
+            db_map.add_parameter_definition(entity_class_name="Object", name="X")
+            db_map.add_parameter_definition(entity_class_name="Object", name="Y")
+        definitions = field_index.find(db_map, "parameter_definition", "name", "Y")
+        assert [definition["name"] for definition in definitions] == ["Y"]
+        assert field_index.find(db_map, "parameter_definition", "name", "Z") == []
+
+    def test_updated_items_are_reindexed(self, db_map):
+        field_index = FieldIndexCache()
+        with db_map:
+            db_map.add_entity_class(name="Object")
+            definition = db_map.add_parameter_definition(entity_class_name="Object", name="X")
+        assert len(field_index.find(db_map, "parameter_definition", "name", "X")) == 1
+        definition.update(name="Y")
+        field_index.update_indexes_after_data_changed("parameter_definition", {db_map: [definition]})
+        assert field_index.find(db_map, "parameter_definition", "name", "X") == []
+        assert [item["id"] for item in field_index.find(db_map, "parameter_definition", "name", "Y")] == [
+            definition["id"]
+        ]
+
+    def test_computed_field_index_is_dropped_when_data_changes(self, db_map):
+        field_index = FieldIndexCache()
+        with db_map:
+            object_class = db_map.add_entity_class(name="Object")
+            db_map.add_entity(entity_class_name="Object", name="o1")
+        assert len(field_index.find(db_map, "entity", "entity_class_name", "Object")) == 1
+        object_class.update(name="Thing")
+        field_index.update_indexes_after_data_changed("entity_class", {db_map: [object_class]})
+        assert field_index.find(db_map, "entity", "entity_class_name", "Object") == []
+        assert len(field_index.find(db_map, "entity", "entity_class_name", "Thing")) == 1
+
+    def test_fetched_items_are_inserted_to_every_index_of_their_type(self, tmp_path):
+        url = "sqlite:///" + str(tmp_path / "db.sqlite")
+        with DatabaseMapping(url, create=True) as db_map:
+            db_map.add_entity_class(name="Object")
+            db_map.add_entity(entity_class_name="Object", name="o1")
+            db_map.commit_session("Add test data.")
+        field_index = FieldIndexCache()
+        with DatabaseMapping(url) as db_map:
+            class_id = db_map.entity_class(name="Object")["id"]
+            assert field_index.find(db_map, "entity", "name", "o1") == []
+            assert field_index.find(db_map, "entity", "class_id", class_id) == []
+            assert field_index.find(db_map, "entity", "entity_class_name", "Object") == []
+            entities = db_map.fetch_more("entity")
+            field_index.insert_fetched_items(db_map, "entity", entities)
+            assert [item["name"] for item in field_index.find(db_map, "entity", "name", "o1")] == ["o1"]
+            assert [item["name"] for item in field_index.find(db_map, "entity", "class_id", class_id)] == ["o1"]
+            assert [item["name"] for item in field_index.find(db_map, "entity", "entity_class_name", "Object")] == [
+                "o1"
+            ]
+
+    def test_unhashable_values_are_searched_linearly(self, db_map):
+        field_index = FieldIndexCache()
+        with db_map:
+            db_map.add_scenario(name="scenario")
+        scenarios = field_index.find(db_map, "scenario", "alternative_name_list", [])
+        assert [scenario["name"] for scenario in scenarios] == ["scenario"]
+
+    def test_least_recently_used_indexes_are_evicted(self, db_map):
+        field_index = FieldIndexCache(budget=2)
+        with db_map:
+            db_map.add_entity_class(name="Object")
+            db_map.add_entity(entity_class_name="Object", name="o1")
+            db_map.add_entity(entity_class_name="Object", name="o2")
+        field_index.find(db_map, "entity", "name", "o1")
+        field_index.find(db_map, "entity_class", "name", "Object")
+        assert field_index.find(db_map, "entity", "name", "o2")[0]["name"] == "o2"
+        assert list(field_index._indexes) == [(db_map, "entity", "name")]
@@ -9,12 +9,18 @@
 # Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
 # this program. If not, see <http://www.gnu.org/licenses/>.
 ######################################################################################################################
+from concurrent.futures import Future
 import unittest
 from unittest import mock
 from PySide6.QtWidgets import QApplication
-from spinedb_api import to_database
+from spinedb_api import Map, to_database
 from spinetoolbox.helpers import signal_waiter
-from spinetoolbox.parameter_type_validation import ValidationKey
+from spinetoolbox.parameter_type_validation import (
+    CHUNK_SIZE,
+    ParameterTypeValidator,
+    ValidatableValue,
+    ValidationKey,
+)
 from tests.mock_helpers import MockSpineDBManager, TestCaseWithQApplication
 
 
@@ -31,7 +37,6 @@ class TestTypeValidator(TestCaseWithQApplication):
         logger = mock.MagicMock()
         self._db_map = self._db_mngr.get_db_map("sqlite://", logger, create=True)
         self._db_mngr.name_registry.register(self._db_map.sa_url, self.db_codename)
-        self._db_mngr.parameter_type_validator.set_interval(0)
 
     def tearDown(self):
         self._db_mngr.close_all_sessions()
@@ -106,6 +111,67 @@ class TestTypeValidator(TestCaseWithQApplication):
                 ([ValidationKey("parameter_value", id(self._db_map), fish_n_chips_price["id"].private_id)], [True]),
             )
 
+    def test_map_value_is_validated_by_worker_and_cached(self):
+        self._assert_success(self._db_map.add_entity_class_item(name="Recipe"))
+        value, value_type = to_database(Map(["a", "b"], [Map(["x"], [1.0]), Map(["y"], [2.0])]))
+        definition = self._assert_success(
+            self._db_map.add_parameter_definition_item(
+                name="prices",
+                entity_class_name="Recipe",
+                parameter_type_list=("1d_map",),
+                default_value=value,
+                default_type=value_type,
+            )
+        )
+        validator = self._db_mngr.parameter_type_validator
+        expected = ([ValidationKey("parameter_definition", id(self._db_map), definition["id"].private_id)], [False])
+        with signal_waiter(validator.validated, timeout=10.0) as waiter:
+            validator.start_validating(self._db_mngr, self._db_map, [definition["id"]])
+            waiter.wait()
+            self.assertEqual(waiter.args, expected)
+        self.assertEqual(len(validator._result_cache()), 1)
+        with mock.patch.object(validator, "_submit_chunks") as submit_chunks:
+            with signal_waiter(validator.validated, timeout=5.0) as waiter:
+                validator.start_validating(self._db_mngr, self._db_map, [definition["id"]])
+                waiter.wait()
+                self.assertEqual(waiter.args, expected)
+            submit_chunks.assert_called_once()
+        self.assertEqual(validator._task_queue, [])
+
+
+class TestParameterTypeValidatorChunkSize(TestCaseWithQApplication):
+    def test_chunk_size_adapts_to_validation_time(self):
+        validator = ParameterTypeValidator(worker_count=1)
+        self.assertEqual(validator.chunk_size, CHUNK_SIZE)
+        validator._adapt_chunk_size(CHUNK_SIZE, 0.001)
+        self.assertEqual(validator.chunk_size, 2 * CHUNK_SIZE)
+        validator._adapt_chunk_size(2 * CHUNK_SIZE, 10.0)
+        self.assertEqual(validator.chunk_size, CHUNK_SIZE)
+        validator._adapt_chunk_size(1, 10.0)
+        self.assertEqual(validator.chunk_size, CHUNK_SIZE)
+        validator.tear_down()
+        validator.deleteLater()
+
+
+class TestParameterTypeValidatorWorkerFailure(TestCaseWithQApplication):
+    def test_chunk_is_validated_in_process_when_worker_fails(self):
+        validator = ParameterTypeValidator(worker_count=1)
+        key = ValidationKey("parameter_value", 1, 2)
+        validator._hashes_in_flight[key] = "hash"
+        validator._chunks_in_flight = 1
+        future = Future()
+        future.set_exception(RuntimeError("worker died"))
+        with signal_waiter(validator.validated, timeout=1.0) as waiter:
+            with mock.patch("spinetoolbox.parameter_type_validation.logging") as logging:
+                validator._handle_chunk_validated(future, [ValidatableValue(key, ((), None, None, None))])
+            waiter.wait()
+            self.assertEqual(waiter.args, ([key], [True]))
+        logging.error.assert_called_once()
+        self.assertEqual(validator.pending_task_count, 0)
+        self.assertEqual(validator._result_cache(), {"hash": True})
+        validator.tear_down()
+        validator.deleteLater()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -18,11 +18,12 @@ from PySide6.QtWidgets import QApplication
 from spinedb_api import DatabaseMapping, to_database
 from spinedb_api.import_functions import import_data
 from spinetoolbox.fetch_parent import ItemTypeFetchParent
+from spinetoolbox.spine_db_worker import ChunkSizer, SpineDBWorker
 
 
 class ExampleItemTypeFetchParent(ItemTypeFetchParent):
-    def __init__(self, item_type, parent):
-        super().__init__(item_type, owner=parent)
+    def __init__(self, item_type, parent, chunk_size=1000):
+        super().__init__(item_type, owner=parent, chunk_size=chunk_size)
         self.handle_items_added = MagicMock()
 
 
@@ -366,3 +367,67 @@ class TestSpineDBFetcher:
         assert not missing, f"Missing {len(missing)} entities from fetch, e.g.: {sorted(missing)[:5]}"
         assert len(fetched_entity_names & expected_names) == entity_count
         fetcher.set_obsolete(True)
+
+    def test_next_chunk_is_fetched_ahead_of_parent(self, db_mngr, logger, parent_object, tmp_path, monkeypatch):
+        for name in ("_CHUNK_SIZE", "_MIN_CHUNK_SIZE", "_MAX_CHUNK_SIZE"):
+            monkeypatch.setattr("spinetoolbox.spine_db_worker." + name, 10)
+        db_url = "sqlite:///" + str(tmp_path / "test.sqlite")
+        with DatabaseMapping(db_url, create=True) as db_map:
+            import_data(db_map, entity_classes=(("oc",),), entities=[("oc", f"entity_{i:02d}") for i in range(25)])
+            db_map.commit_session("Add test data")
+        db_map.close()
+        db_map = db_mngr.get_db_map(db_url, logger)
+        db_mngr.name_registry.register(db_map.sa_url, "prefetch_test_db")
+        entity_table = db_map.mapped_table("entity")
+        fetcher = ExampleItemTypeFetchParent("entity", parent_object, chunk_size=5)
+        expected_positions_and_mapped_counts = [(5, 20), (10, 20), (15, 25), (20, 25), (25, 25)]
+        for expected_position, expected_mapped_count in expected_positions_and_mapped_counts:
+            assert db_mngr.can_fetch_more(db_map, fetcher)
+            db_mngr.fetch_more(db_map, fetcher)
+            while fetcher.is_busy(db_map):
+                QApplication.processEvents()
+            assert fetcher.position(db_map) == expected_position
+            assert len(entity_table) == expected_mapped_count
+        fetcher.set_obsolete(True)
+
+    def test_resetting_session_while_query_is_in_flight(self, db_mngr, logger, parent_object, tmp_path, monkeypatch):
+        db_url = "sqlite:///" + str(tmp_path / "test.sqlite")
+        with DatabaseMapping(db_url, create=True) as db_map:
+            import_data(db_map, alternatives=("alt",))
+            db_map.commit_session("Add test data")
+        db_map.close()
+        db_map = db_mngr.get_db_map(db_url, logger)
+        db_mngr.name_registry.register(db_map.sa_url, "reset_test_db")
+        worker = db_mngr._workers[db_map]
+        fetch_more = SpineDBWorker._busy_db_map_fetch_more
+
+        def fetch_more_and_reset(self, item_type, chunk_size):
+            result = fetch_more(self, item_type, chunk_size)
+            worker.reset_session()
+            return result
+
+        monkeypatch.setattr(SpineDBWorker, "_busy_db_map_fetch_more", fetch_more_and_reset)
+        fetcher = ExampleItemTypeFetchParent("alternative", parent_object)
+        db_mngr.fetch_more(db_map, fetcher)
+        assert worker._chunk_sizers == {}
+        assert db_mngr.can_fetch_more(db_map, fetcher)
+        fetcher.set_obsolete(True)
+
+
+class TestChunkSizer:
+    def test_size_adapts_to_query_and_handling_time(self, monkeypatch):
+        monkeypatch.setattr("spinetoolbox.spine_db_worker._CHUNK_SIZE", 10000)
+        monkeypatch.setattr("spinetoolbox.spine_db_worker._MIN_CHUNK_SIZE", 1000)
+        monkeypatch.setattr("spinetoolbox.spine_db_worker._MAX_CHUNK_SIZE", 30000)
+        sizer = ChunkSizer()
+        assert sizer.size == 10000
+        sizer.update(10000, 0.001)
+        assert sizer.size == 20000
+        sizer.update(20000, 0.001)
+        assert sizer.size == 30000
+        sizer.update(30000, 100.0)
+        assert sizer.size == 15000
+        sizer.update(15000, 1.0)
+        assert sizer.size == 7500
+        sizer.update(1, 100.0)
+        assert sizer.size == 7500
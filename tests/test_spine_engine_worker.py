@@ -12,12 +12,15 @@
 
 """Unit tests for ``spine_engine_worker`` module."""
 
+from pathlib import Path
+from tempfile import TemporaryDirectory
 import time
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, call
 from PySide6.QtCore import QObject, Slot
 from PySide6.QtWidgets import QApplication
-from spinetoolbox.spine_engine_worker import SpineEngineWorker
+from spinetoolbox.execution_message_buffer import ExecutionMessageBuffer
+from spinetoolbox.spine_engine_worker import GUIUpdater, SpineEngineWorker
 from tests.mock_helpers import TestCaseWithQApplication
 
 
@@ -49,6 +52,33 @@ class TestSpineEngineWorker(TestCaseWithQApplication):
             receiver.deleteLater()
 
 
+class TestGUIUpdater(TestCaseWithQApplication):
+    def test_flush_messages_applies_buffered_messages_and_drop_marker(self):
+        message_buffer = ExecutionMessageBuffer(capacity=2)
+        updater = GUIUpdater(message_buffer)
+        item = MagicMock()
+        temp_dir = TemporaryDirectory()
+        try:
+            message_buffer.add_event_message(item, "", "msg", "starting")
+            for line in range(3):
+                message_buffer.add_process_message(item, "", "msg", f"line {line}", temp_dir.name)
+            updater.flush_messages()
+            self.assertEqual(
+                item.add_process_message.call_args_list, [call("", "msg", "line 1"), call("", "msg", "line 2")]
+            )
+            self.assertEqual(len(item.add_event_message.call_args_list), 2)
+            self.assertEqual(item.add_event_message.call_args_list[0], call("", "msg", "starting"))
+            filter_id, msg_type, msg_text = item.add_event_message.call_args_list[1].args
+            self.assertEqual((filter_id, msg_type), ("", "msg_warning"))
+            self.assertTrue(msg_text.startswith("Output lines dropped: 1, full log on disk: "))
+            self.assertIn(str(next(Path(temp_dir.name).iterdir())), msg_text)
+            self.assertEqual(message_buffer.take_batches(), [])
+        finally:
+            message_buffer.close()
+            updater.deleteLater()
+            temp_dir.cleanup()
+
+
 class _Receiver(QObject):
     def __init__(self, worker):
         super().__init__()
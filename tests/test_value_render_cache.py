@@ -0,0 +1,68 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+"""Unit tests for the ``value_render_cache`` module."""
+
+import unittest
+from PySide6.QtCore import Qt
+from spinetoolbox.value_render_cache import NOT_CACHED, ValueRenderCache
+
+DISPLAY = Qt.ItemDataRole.DisplayRole
+TOOL_TIP = Qt.ItemDataRole.ToolTipRole
+
+
+class TestValueRenderCache(unittest.TestCase):
+    def setUp(self):
+        self._cache = ValueRenderCache(size=3)
+
+    def _put(self, key, value, dependencies=()):
+        self._cache.put(key, value, self._cache.generation, dependencies)
+
+    def test_least_recently_used_values_are_evicted(self):
+        for private_id in range(3):
+            self._put((1, "parameter_value", private_id, DISPLAY), str(private_id))
+        self.assertEqual(self._cache.get((1, "parameter_value", 0, DISPLAY)), "0")
+        self._put((1, "parameter_value", 3, DISPLAY), "3")
+        self.assertEqual(len(self._cache), 3)
+        self.assertIs(self._cache.get((1, "parameter_value", 1, DISPLAY)), NOT_CACHED)
+        self.assertEqual(self._cache.get((1, "parameter_value", 0, DISPLAY)), "0")
+
+    def test_invalidating_item_drops_its_roles_and_dependents(self):
+        self._put((1, "parameter_value", 0, DISPLAY), "list[0] Map", [("list_value", 5)])
+        self._put((1, "parameter_value", 0, TOOL_TIP), None)
+        self._put((1, "parameter_value", 1, DISPLAY), "2.3")
+        self._cache.invalidate_items(1, "list_value", [5])
+        self.assertIs(self._cache.get((1, "parameter_value", 0, DISPLAY)), NOT_CACHED)
+        self.assertIsNone(self._cache.get((1, "parameter_value", 0, TOOL_TIP)))
+        self._cache.invalidate_items(1, "parameter_value", [0])
+        self.assertIs(self._cache.get((1, "parameter_value", 0, TOOL_TIP)), NOT_CACHED)
+        self.assertEqual(self._cache.get((1, "parameter_value", 1, DISPLAY)), "2.3")
+
+    def test_value_rendered_during_invalidation_is_not_cached(self):
+        generation = self._cache.generation
+        self._cache.invalidate_items(1, "parameter_value", [0])
+        self._cache.put((1, "parameter_value", 0, DISPLAY), "stale", generation)
+        self.assertIs(self._cache.get((1, "parameter_value", 0, DISPLAY)), NOT_CACHED)
+
+    def test_fetching_list_values_drops_values_that_depend_on_lists(self):
+        db_map = object()
+        other_db_map = object()
+        self._put((id(db_map), "parameter_value", 0, DISPLAY), "Map", [("list_value", 5)])
+        self._put((id(db_map), "parameter_value", 1, DISPLAY), "2.3")
+        self._put((id(other_db_map), "parameter_value", 0, DISPLAY), "Map", [("list_value", 5)])
+        self._cache.maybe_invalidate_caches_after_fetch(db_map, "list_value")
+        self.assertIs(self._cache.get((id(db_map), "parameter_value", 0, DISPLAY)), NOT_CACHED)
+        self.assertEqual(self._cache.get((id(db_map), "parameter_value", 1, DISPLAY)), "2.3")
+        self.assertEqual(self._cache.get((id(other_db_map), "parameter_value", 0, DISPLAY)), "Map")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+######################################################################################################################
+# Copyright (C) 2017-2022 Spine project consortium
+# Copyright Spine Toolbox contributors
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""Unit tests for the ``event_log_view`` module."""
+
+import unittest
+from unittest.mock import MagicMock
+from PySide6.QtCore import QEvent, QItemSelectionModel, QPoint, Qt, QUrl
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QApplication
+from spinetoolbox.widgets.event_log_view import EventLogView
+from tests.mock_helpers import TestCaseWithQApplication
+
+
+class TestEventLogView(TestCaseWithQApplication):
+    def setUp(self):
+        self._toolbox = MagicMock()
+        self._toolbox.active_project_item = None
+        self._toolbox.active_link_item = None
+        self._view = EventLogView(None)
+        self._view.set_toolbox(self._toolbox)
+        self._view.resize(400, 300)
+        self._view.show()
+
+    def tearDown(self):
+        self._view.deleteLater()
+
+    def test_lines_of_selected_execution_are_shown(self):
+        self._view.append("plain")
+        self._view.make_log_entry_point("t1")
+        self._view.add_log_message("item", "", "first run")
+        self._view.make_log_entry_point("t2")
+        self._view.add_log_message("item", "", "second run")
+        model = self._view.model()
+        self.assertEqual(
+            [model.index(row, 0).data() for row in range(model.rowCount())], ["plain", "<b>item</b>", "second run"]
+        )
+        self.assertEqual(self._view.execution_timestamps(), ["t1", "t2"])
+        self._view.select_all_executions()
+        self.assertEqual(model.rowCount(), 5)
+        self._toolbox.ui.toolButton_executions.setText.assert_called_with("t2")
+
+    def test_active_item_is_highlighted(self):
+        self._view.make_log_entry_point("t1")
+        self._view.add_log_message("item", "", "message")
+        self._toolbox.active_project_item = MagicMock()
+        self._toolbox.active_project_item.name = "item"
+        self._view.set_item_log_selected(True)
+        self.assertEqual(self._view.highlighted_item_name(), "item")
+        self._view.set_item_log_selected(False)
+        self.assertIsNone(self._view.highlighted_item_name())
+
+    def test_clicking_link_emits_anchor_clicked(self):
+        self._view.append("<a href='file:///path/to/file'>file</a>")
+        anchor_listener = MagicMock()
+        self._view.anchorClicked.connect(anchor_listener)
+        rect = self._view.visualRect(self._view.model().index(0, 0))
+        indentation = self._view.itemDelegate().indentation(self._view.model().index(0, 0))
+        position = rect.topLeft() + QPoint(indentation + 2, rect.height() // 2)
+        QTest.mouseClick(self._view.viewport(), Qt.MouseButton.LeftButton, pos=position)
+        anchor_listener.assert_called_once_with(QUrl("file:///path/to/file"))
+        QTest.mouseClick(
+            self._view.viewport(), Qt.MouseButton.LeftButton, pos=rect.topLeft() + QPoint(rect.width() - 1, 0)
+        )
+        anchor_listener.assert_called_once()
+
+    def test_long_lines_widen_scrollable_area(self):
+        self._view.append("short")
+        QApplication.processEvents()
+        self._view.append(1000 * "x")
+        QApplication.processEvents()
+        self.assertGreater(self._view.horizontalScrollBar().maximum(), 0)
+
+    def test_copy_puts_plain_text_of_selected_lines_to_clipboard(self):
+        self._view.append("<b>first</b>")
+        self._view.append("second")
+        self._view.append("third")
+        model = self._view.model()
+        selection_model = self._view.selectionModel()
+        selection_model.select(model.index(0, 0), QItemSelectionModel.SelectionFlag.Select)
+        selection_model.select(model.index(2, 0), QItemSelectionModel.SelectionFlag.Select)
+        self._view.copy()
+        self.assertEqual(QApplication.clipboard().text(), "first\nthird")
+
+    def test_tear_down_deletes_spool_file(self):
+        self._view.append("message")
+        spool = self._view.model()._spool
+        self._view.tear_down()
+        self.assertTrue(spool.closed)
+        self._view.append("discarded")
+        self.assertEqual(self._view.model().rowCount(), 1)
+
+    def test_destroying_view_deletes_spool_file(self):
+        view = EventLogView(None)
+        spool = view.model()._spool
+        view.deleteLater()
+        QApplication.sendPostedEvents(view, QEvent.Type.DeferredDelete)
+        self.assertTrue(spool.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -66,6 +66,10 @@ class TestSettingsWidget(TestCaseWithQApplication):
             self.assertEqual(self._settings.value("pythonPath"), "")
             self.assertEqual(self._settings.value("pythonKernel"), "")
             self.assertEqual(self._settings.value("condaPath"), "")
+            self.assertEqual(self._settings.value("columnarPivotTable"), "false")
+            self.assertEqual(self._settings.value("typeValidationWorkers"), "0")
+            self.assertEqual(self._settings.value("persistTypeValidationCache"), "true")
+            self.assertEqual(self._settings.value("persistCommitIndex"), "false")
         finally:
             self._settings.endGroup()
         self._settings.beginGroup("engineSettings")